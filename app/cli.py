@@ -6,8 +6,10 @@ import sys
 import os
 import time
 from colorama import Fore, init
-from processing_manager import ProcessingManager
-from utils.logging_config import get_logger
+from utils.logging_config import get_logger, job_logging
+from utils.profiler import create_profiler
+from utils.run_snapshot import REPORT_NAMES
+from utils.warm_worker import DEFAULT_CACHE_SIZE
 
 logger = get_logger(__name__)
 init(autoreset=True)
@@ -85,7 +87,9 @@ class CliInterface:
         )
         parser.add_argument(
             "idf_file",
-            help="Path to the input IDF file"
+            nargs="?",
+            help="Path to the input IDF file (not needed with --run-queue, --queue-status, --regenerate-reports "
+                 "or the --worker-serve/--worker-status/--worker-stop commands)"
         )
         parser.add_argument(
             "--idd",
@@ -97,6 +101,136 @@ class CliInterface:
             default="output",
             help="Path to the output directory for reports (default: 'output')"
         )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Record wall/CPU time and peak memory per stage and write timings.json next to the reports"
+        )
+        parser.add_argument(
+            "--profile-cprofile",
+            action="store_true",
+            help="With --profile, also save a cProfile dump of the slowest stage (slowest-stage.prof)"
+        )
+        parser.add_argument(
+            "--climate-sweep",
+            nargs="*",
+            metavar="ZONE",
+            help="Simulate the model in every climate zone (or only the listed zones, e.g. A C or 1 4 8) "
+                 "in parallel and write an energy rating comparison instead of the regular reports"
+        )
+        parser.add_argument(
+            "--iso",
+            default="RESIDNTIAL 2023",
+            help="ISO type to rate against with --climate-sweep or --variants (default: 'RESIDNTIAL 2023')"
+        )
+        parser.add_argument(
+            "--energyplus-dir",
+            help="EnergyPlus installation directory, required with --climate-sweep and --variants"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Maximum concurrent simulations with --climate-sweep or --variants "
+                 "(default: one per zone/variant, up to the CPU count)"
+        )
+        parser.add_argument(
+            "--variants",
+            metavar="VARIANTS_JSON",
+            help="Simulate the patched model variants defined in this JSON file in parallel "
+                 "and rank them by energy rating instead of generating the regular reports"
+        )
+        parser.add_argument(
+            "--zone",
+            help="Climate zone simulated with --variants (e.g. A or 3)"
+        )
+        parser.add_argument(
+            "--lean-simulation",
+            action="store_true",
+            help="With --climate-sweep or --variants, simulate copies of the model that only request "
+                 "the tables and variables the reports read"
+        )
+        parser.add_argument(
+            "--sqlite-output",
+            action="store_true",
+            help="With --climate-sweep or --variants, request Output:SQLite and read the simulation "
+                 "results from eplusout.sql (eplustbl.csv/eplusout.csv remain the fallback)"
+        )
+        parser.add_argument(
+            "--rebuild-reports",
+            action="store_true",
+            help="Render every PDF even when an earlier run of the project has it with unchanged inputs"
+        )
+        parser.add_argument(
+            "--export-excel",
+            action="store_true",
+            help="Also write every extracted table to extracted-data.xlsx in the run folder "
+                 "(requires a license with Excel export)"
+        )
+        parser.add_argument(
+            "--regenerate-reports",
+            metavar="RUN_DIR",
+            help="Rebuild the PDFs of an earlier run from its run-snapshot.bin, without loading "
+                 "the model or the simulation"
+        )
+        parser.add_argument(
+            "--reports",
+            nargs="+",
+            choices=sorted(REPORT_NAMES),
+            help="With --regenerate-reports, only rebuild these reports"
+        )
+        parser.add_argument(
+            "--project-name",
+            help="With --regenerate-reports, project name shown in the report headers"
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Add the file to the persistent job queue (shared with the GUI) instead of processing it now"
+        )
+        parser.add_argument(
+            "--priority",
+            type=int,
+            default=0,
+            help="Priority of the job added with --enqueue; higher runs first (default: 0)"
+        )
+        parser.add_argument(
+            "--run-queue",
+            action="store_true",
+            help="Process the pending CLI jobs of the persistent queue, including jobs interrupted earlier"
+        )
+        parser.add_argument(
+            "--queue-status",
+            action="store_true",
+            help="Print the persistent job queue with throughput and average stage times"
+        )
+        parser.add_argument(
+            "--worker-serve",
+            action="store_true",
+            help="Run a warm worker that keeps the processing modules and recently loaded models "
+                 "in memory for --worker runs (stop it with Ctrl+C or --worker-stop)"
+        )
+        parser.add_argument(
+            "--worker",
+            action="store_true",
+            help="Process the file on the running warm worker instead of in this process "
+                 "(falls back to processing here when no worker is running)"
+        )
+        parser.add_argument(
+            "--worker-cache-size",
+            type=int,
+            default=DEFAULT_CACHE_SIZE,
+            help=f"Number of loaded models the warm worker keeps in memory (default: {DEFAULT_CACHE_SIZE})"
+        )
+        parser.add_argument(
+            "--worker-status",
+            action="store_true",
+            help="Print the running warm worker's uptime, jobs and cached models"
+        )
+        parser.add_argument(
+            "--worker-stop",
+            action="store_true",
+            help="Stop the running warm worker"
+        )
         return parser.parse_args()
     
     def handle_error(self, message: str, exit_code: int = 1) -> None:
@@ -110,10 +244,349 @@ class CliInterface:
         self.status_update(message)
         sys.exit(exit_code)
     
+    def run_climate_sweep(self, args: argparse.Namespace, profiler) -> bool:
+        """
+        Run a multi-climate sweep and print the score per zone.
+        
+        Args:
+            args: Parsed arguments
+            profiler: Run profiler
+            
+        Returns:
+            True if every zone was rated
+        """
+        from climate_sweep import ClimateSweep
+        
+        if not args.energyplus_dir:
+            self.handle_error("Error: --energyplus-dir is required with --climate-sweep")
+        
+        try:
+            sweep = ClimateSweep(
+                input_file=args.idf_file,
+                output_dir=args.output,
+                energyplus_dir=args.energyplus_dir,
+                iso_type=args.iso,
+                zones=args.climate_sweep,
+                max_workers=args.workers,
+                status_callback=self.status_update,
+                profiler=profiler,
+                lean_simulation=args.lean_simulation,
+                sqlite_output=args.sqlite_output
+            )
+        except ValueError as e:
+            self.handle_error(f"Error: {e}")
+        
+        self.processor = sweep
+        results = sweep.run()
+        
+        self.status_update(f"{'Zone':<6}{'Score':>7}{'Grade':>7}  Status")
+        for result in results:
+            score = '-' if result['score'] is None else result['score']
+            self.status_update(f"{result['zone']:<6}{score:>7}{result['grade'] or '-':>7}  {result['error'] or 'OK'}")
+        self.status_update(f"Climate sweep results written to {sweep.sweep_dir}")
+        
+        if profiler.enabled:
+            profiler.write_report(sweep.sweep_dir, input_file=args.idf_file, run_id=sweep.run_id, iso_type=args.iso)
+        profiler.write_trace(sweep.sweep_dir, input_file=args.idf_file, run_id=sweep.run_id, iso_type=args.iso)
+        return bool(results) and all(result['score'] is not None for result in results)
+    
+    def run_variants(self, args: argparse.Namespace, profiler) -> bool:
+        """
+        Run the parametric variants and print them ranked by score.
+        
+        Args:
+            args: Parsed arguments
+            profiler: Run profiler
+            
+        Returns:
+            True if every variant was rated
+        """
+        from parametric_variants import ParametricRun, load_variants
+        
+        if not args.energyplus_dir:
+            self.handle_error("Error: --energyplus-dir is required with --variants")
+        if not args.zone:
+            self.handle_error("Error: --zone is required with --variants")
+        
+        try:
+            parametric_run = ParametricRun(
+                input_file=args.idf_file,
+                variants=load_variants(args.variants),
+                output_dir=args.output,
+                energyplus_dir=args.energyplus_dir,
+                iso_type=args.iso,
+                zone=args.zone,
+                max_workers=args.workers,
+                status_callback=self.status_update,
+                profiler=profiler,
+                lean_simulation=args.lean_simulation,
+                sqlite_output=args.sqlite_output
+            )
+            self.processor = parametric_run
+            results = parametric_run.run()
+        except ValueError as e:
+            self.handle_error(f"Error: {e}")
+        
+        self.status_update(f"{'Rank':<6}{'Score':>7}{'Grade':>7}  {'Variant':<24}Status")
+        for result in results:
+            rank = '-' if result['rank'] is None else result['rank']
+            score = '-' if result['score'] is None else result['score']
+            self.status_update(f"{rank:<6}{score:>7}{result['grade'] or '-':>7}  {result['name']:<24}{result['error'] or 'OK'}")
+        self.status_update(f"Variant results written to {parametric_run.run_dir}")
+        
+        if profiler.enabled:
+            profiler.write_report(parametric_run.run_dir, input_file=args.idf_file, run_id=parametric_run.run_id, iso_type=args.iso)
+        profiler.write_trace(parametric_run.run_dir, input_file=args.idf_file, run_id=parametric_run.run_id, iso_type=args.iso)
+        return bool(results) and all(result['score'] is not None for result in results)
+    
+    def print_queue_status(self, job_queue) -> None:
+        """
+        Print the jobs of the persistent queue and its statistics.
+        
+        Args:
+            job_queue: JobQueue instance
+        """
+        self.status_update(f"Job queue: {job_queue.db_path}")
+        self.status_update(f"{'ID':<6}{'Kind':<6}{'Prio':>5}  {'Status':<11}Input")
+        for job in job_queue.list_jobs():
+            self.status_update(f"{job['id']:<6}{job['kind']:<6}{job['priority']:>5}  {job['status']:<11}{job['input_file']}")
+        
+        stats = job_queue.get_stats()
+        self.status_update(", ".join(f"{status}: {count}" for status, count in stats['counts'].items()))
+        if stats['jobs_per_hour']:
+            self.status_update(f"Throughput: {stats['jobs_per_hour']} jobs/hour")
+        for stage, average_s in stats['average_stage_s'].items():
+            self.status_update(f"Average {stage} time: {average_s}s")
+    
+    def excel_export_enabled(self, requested: bool) -> bool:
+        """
+        Check whether a requested Excel export is covered by the license.
+        
+        Args:
+            requested: Whether --export-excel was given
+            
+        Returns:
+            True if the export should be written
+        """
+        if not requested:
+            return False
+        from utils.license_manager import license_manager
+        if license_manager.is_feature_enabled("export_excel"):
+            return True
+        self.status_update("Warning: Excel export is not included in the current license; skipping it")
+        return False
+    
+    def regenerate_reports(self, args: argparse.Namespace, profiler) -> bool:
+        """
+        Rebuild the reports of an earlier run from its snapshot.
+        
+        Args:
+            args: Parsed arguments (regenerate_reports, reports, project_name, rebuild_reports, export_excel)
+            profiler: Run profiler
+            
+        Returns:
+            True if the reports were rebuilt
+        """
+        from processing_manager import ProcessingManager
+        
+        self.processor = ProcessingManager(
+            status_callback=self.status_update,
+            progress_callback=self.progress_update,
+            profiler=profiler
+        )
+        self.processor.reuse_unchanged_reports = not args.rebuild_reports
+        self.processor.selected_reports = set(args.reports) if args.reports else None
+        self.processor.export_excel = self.excel_export_enabled(args.export_excel)
+        return self.processor.regenerate_reports(args.regenerate_reports, project_name=args.project_name)
+    
+    def run_queue(self, job_queue, profile: bool = False, capture_cprofile: bool = False) -> bool:
+        """
+        Process pending CLI jobs of the persistent queue in priority order.
+        
+        Args:
+            job_queue: JobQueue instance
+            profile: Profile every job (each gets its own profiler and timings.json)
+            capture_cprofile: Also keep a cProfile dump of each job's slowest stage
+            
+        Returns:
+            True if every processed job succeeded
+        """
+        from processing_manager import ProcessingManager
+        from utils.job_queue import KIND_CLI
+        
+        recovered = job_queue.recover_interrupted()
+        if recovered:
+            self.status_update(f"Resuming {recovered} interrupted jobs")
+        
+        all_succeeded = True
+        while True:
+            job = job_queue.claim_next(kinds=[KIND_CLI])
+            if job is None:
+                return all_succeeded
+            
+            self.status_update(f"Processing job #{job['id']}: {job['input_file']}")
+            try:
+                with job_queue.lease(job['id']), job_logging(job['id'], job['output_dir']):
+                    self.processor = ProcessingManager(
+                        status_callback=self.status_update,
+                        progress_callback=self.progress_update,
+                        profiler=create_profiler(enabled=profile or capture_cprofile,
+                                                 capture_cprofile=capture_cprofile)
+                    )
+                    self.processor.reuse_unchanged_reports = not job.get('rebuild_reports', False)
+                    self.processor.export_excel = self.excel_export_enabled(job.get('export_excel', False))
+                    job_queue.start_stage(job['id'], 'reports')
+                    success = self.processor.process_idf(
+                        input_file=job['input_file'],
+                        idd_path=job.get('idd'),
+                        output_dir=job['output_dir']
+                    )
+                    job_queue.finish_stage(job['id'], 'reports', success)
+            except KeyboardInterrupt:
+                job_queue.release(job['id'])
+                self.status_update(f"Job #{job['id']} returned to the queue")
+                raise
+            except Exception as e:
+                logger.error(f"Error processing queued job {job['id']}: {e}", exc_info=True)
+                job_queue.finish(job['id'], False, str(e))
+                all_succeeded = False
+                continue
+            
+            job_queue.finish(job['id'], success, None if success else "Processing failed")
+            all_succeeded = all_succeeded and success
+            self.status_update(f"Job #{job['id']} {'completed successfully' if success else 'failed'}")
+    
+    def run_worker_command(self, args: argparse.Namespace) -> None:
+        """
+        Serve as the warm worker, or query or stop the running one.
+        
+        Args:
+            args: Parsed arguments (worker_serve, worker_status, worker_stop, worker_cache_size)
+        """
+        from utils.warm_worker import WarmWorker, WorkerUnavailable, worker_request
+        
+        if args.worker_serve:
+            worker = WarmWorker(cache_size=args.worker_cache_size, status_callback=self.status_update)
+            try:
+                worker.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            except RuntimeError as e:
+                self.handle_error(f"Error: {e}")
+            return
+        
+        try:
+            result = worker_request('status' if args.worker_status else 'shutdown')
+        except WorkerUnavailable as e:
+            self.handle_error(f"Error: {e}")
+            return
+        if args.worker_stop:
+            self.status_update("Warm worker stopping")
+            return
+        cache = result.get('cache') or {}
+        self.status_update(f"Warm worker pid {result.get('pid')}, up {result.get('uptime_s')}s, "
+                           f"{result.get('jobs_run')} jobs run")
+        self.status_update(f"Running job: {result.get('current_job') or '-'}")
+        self.status_update(f"Model cache: {cache.get('hits', 0)} hits, {cache.get('misses', 0)} misses, "
+                           f"{len(cache.get('files', []))}/{cache.get('max_entries', 0)} models loaded")
+        for file_path in cache.get('files', []):
+            self.status_update(f"  {file_path}")
+    
+    def run_on_worker(self, args: argparse.Namespace) -> bool:
+        """
+        Submit the run to the warm worker and print its messages.
+        
+        Args:
+            args: Parsed arguments
+            
+        Returns:
+            False if no warm worker is running (nothing was processed)
+        """
+        from utils.warm_worker import WorkerUnavailable, worker_request
+        
+        job = {
+            'input_file': os.path.abspath(args.idf_file),
+            'output_dir': os.path.abspath(args.output),
+            'idd': os.path.abspath(args.idd) if args.idd else None,
+            'rebuild_reports': args.rebuild_reports,
+            'export_excel': self.excel_export_enabled(args.export_excel),
+            'profile': args.profile,
+            'capture_cprofile': args.profile_cprofile,
+        }
+        
+        def on_message(message):
+            if message.get('type') == 'progress':
+                self.progress_update(message.get('value', 0.0))
+            else:
+                self.status_update(message.get('message', ''))
+        
+        start_time = time.time()
+        try:
+            result = worker_request('process', job, on_message)
+        except WorkerUnavailable as e:
+            self.status_update(f"Warning: {e}; processing in this process")
+            return False
+        
+        total_time = time.time() - start_time
+        model_note = " (model already loaded)" if result.get('model_cached') else ""
+        if result.get('success'):
+            self.status_update(f"Processing completed successfully in {total_time:.2f}s on the warm worker{model_note}")
+        else:
+            self.status_update(f"Processing failed on the warm worker after {total_time:.2f}s"
+                               + (f": {result['error']}" if result.get('error') else ""))
+        return True
+    
     def run(self) -> None:
         """Run the command line interface."""
         args = self.parse_arguments()
         
+        if args.worker_serve or args.worker_status or args.worker_stop:
+            self.run_worker_command(args)
+            return
+        
+        if args.queue_status or args.run_queue:
+            from utils.job_queue import JobQueue
+            job_queue = JobQueue()
+            if args.queue_status:
+                self.print_queue_status(job_queue)
+                return
+            start_time = time.time()
+            success = self.run_queue(job_queue, profile=args.profile, capture_cprofile=args.profile_cprofile)
+            total_time = time.time() - start_time
+            if success:
+                self.status_update(f"Queue processing completed successfully in {total_time:.2f}s")
+            else:
+                self.status_update(f"Queue processing completed with failed jobs after {total_time:.2f}s")
+            return
+        
+        if args.regenerate_reports:
+            start_time = time.time()
+            profiler = create_profiler(enabled=args.profile or args.profile_cprofile,
+                                       capture_cprofile=args.profile_cprofile)
+            success = self.regenerate_reports(args, profiler)
+            total_time = time.time() - start_time
+            if success:
+                self.status_update(f"Reports regenerated successfully in {total_time:.2f}s")
+            else:
+                self.handle_error(f"Report regeneration failed after {total_time:.2f}s")
+            return
+        
+        if not args.idf_file:
+            self.handle_error("Error: an input IDF file is required")
+        
+        if args.enqueue:
+            from utils.job_queue import JobQueue, KIND_CLI
+            job_queue = JobQueue()
+            job_id = job_queue.enqueue(KIND_CLI, os.path.abspath(args.idf_file), os.path.abspath(args.output),
+                                       {'idd': args.idd, 'rebuild_reports': args.rebuild_reports,
+                                        'export_excel': args.export_excel},
+                                       priority=args.priority)
+            self.status_update(f"Job #{job_id} added to {job_queue.db_path}; run it with --run-queue")
+            return
+        
+        if args.worker and args.climate_sweep is None and not args.variants and self.run_on_worker(args):
+            return
+        
         idf_file_path = args.idf_file
         idd_file_path = args.idd
         output_dir_path = args.output
@@ -127,10 +600,35 @@ class CliInterface:
         start_time = time.time()
         
         try:
+            profiler = create_profiler(
+                enabled=args.profile or args.profile_cprofile,
+                capture_cprofile=args.profile_cprofile
+            )
+            if args.climate_sweep is not None:
+                success = self.run_climate_sweep(args, profiler)
+                total_time = time.time() - start_time
+                if success:
+                    self.status_update(f"Climate sweep completed successfully in {total_time:.2f}s")
+                else:
+                    self.status_update(f"Climate sweep completed with failed zones after {total_time:.2f}s")
+                return
+            if args.variants:
+                success = self.run_variants(args, profiler)
+                total_time = time.time() - start_time
+                if success:
+                    self.status_update(f"Variant run completed successfully in {total_time:.2f}s")
+                else:
+                    self.status_update(f"Variant run completed with failed variants after {total_time:.2f}s")
+                return
+            
+            from processing_manager import ProcessingManager
             self.processor = ProcessingManager(
                 status_callback=self.status_update,
-                progress_callback=self.progress_update
+                progress_callback=self.progress_update,
+                profiler=profiler
             )
+            self.processor.reuse_unchanged_reports = not args.rebuild_reports
+            self.processor.export_excel = self.excel_export_enabled(args.export_excel)
             
             success = self.processor.process_idf(
                 input_file=idf_file_path,
@@ -1,12 +1,11 @@
 """
 Main application entry point for the IDF Reader.
 """
+import multiprocessing
 import sys
-import flet as ft
 from utils.sentry_config import initialize_sentry, capture_exception_with_context, add_breadcrumb
 from utils.logging_config import get_logger
 from app.cli import run_cli
-from modern_gui import ModernIDFProcessorGUI
 
 logger = get_logger(__name__)
 
@@ -23,6 +22,10 @@ class GuiApplication:
         logger.info("Starting GUI mode...")
         
         try:
+            # Imported here so CLI runs (and warm worker clients) do not load Flet and the GUI
+            import flet as ft
+            from modern_gui import ModernIDFProcessorGUI
+            
             def main(page: ft.Page):
                 from utils.license_dialog import show_startup_license_check
                 
@@ -69,6 +72,9 @@ class GuiApplication:
 
 def main():
     """Main entry point for the application."""
+    # Lets process pool workers (parametric variants) start from the frozen executable
+    multiprocessing.freeze_support()
+    
     # Initialize Sentry for error monitoring
     sentry_initialized = initialize_sentry()
     if sentry_initialized:
@@ -0,0 +1,243 @@
+"""
+Multi-climate sweep.
+Simulates one model against every climate zone's weather file concurrently, each
+run in its own directory, and rates all runs with a single parsed model. Writes a
+climate-sweep.json/.csv and a PDF comparing the energy rating per zone.
+"""
+import concurrent.futures
+import csv
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from utils.data_loader import DataLoader
+from utils.energyplus_runner import SimulationResult, prepare_simulation_input, run_energyplus
+from utils.logging_config import get_logger
+from utils.path_utils import get_data_file_path
+from utils.profiler import NullProfiler
+from parsers.materials_parser import MaterialsParser
+from parsers.area_parser import AreaParser
+from parsers.energy_rating_parser import EnergyRatingParser
+from generators.energy_rating_report_generator import calculate_energy_rating_score
+from generators.climate_sweep_report_generator import generate_climate_sweep_report
+
+logger = get_logger(__name__)
+
+# Climate zones with a weather file in data/: letters for the 2017/office
+# models (a.epw ... d.epw), numeric area codes for 2023 (1.epw ... 8.epw)
+LETTER_CLIMATE_ZONES = ("A", "B", "C", "D")
+NUMERIC_CLIMATE_ZONES = ("1", "2", "3", "4", "5", "6", "7", "8")
+
+SWEEP_RESULTS_FILENAME = "climate-sweep.json"
+SWEEP_CSV_FILENAME = "climate-sweep.csv"
+SWEEP_REPORT_FILENAME = "climate-sweep.pdf"
+SWEEP_CSV_FIELDS = ("zone", "epw", "score", "grade", "simulation_s", "error")
+
+
+def derive_model_year(iso_type: str):
+    """Map an ISO type (e.g. "RESIDNTIAL 2023") to the energy rating model year (2017, 2023 or "office")."""
+    iso_type = iso_type or ''
+    if "2017" in iso_type:
+        return 2017
+    if "2023" in iso_type:
+        return 2023
+    if "OFFICE" in iso_type.upper():
+        return "office"
+    return None
+
+
+def get_climate_zones(model_year) -> tuple:
+    """Return every climate zone the given model year can be rated in."""
+    return NUMERIC_CLIMATE_ZONES if model_year == 2023 else LETTER_CLIMATE_ZONES
+
+
+def get_epw_filename(zone: str) -> str:
+    """Return the weather file name in data/ for a climate zone."""
+    return f"{zone.lower()}.epw"
+
+
+class ClimateSweep:
+    """
+    Runs one model through EnergyPlus for several climate zones and compares the ratings.
+
+    Simulations run concurrently on a thread pool (each is an EnergyPlus
+    subprocess). The model is loaded once, while the simulations run, and each
+    zone is rated on the calling thread as its simulation finishes.
+    """
+
+    def __init__(self, input_file: str, output_dir: str, energyplus_dir: str, iso_type: str,
+                 zones: Optional[Sequence[str]] = None, max_workers: Optional[int] = None,
+                 status_callback: Optional[Callable[[str], None]] = None,
+                 profiler=None, run_id: Optional[str] = None, project_name: Optional[str] = None,
+                 lean_simulation: bool = False, sqlite_output: bool = False):
+        """
+        Initialize the sweep.
+
+        Args:
+            input_file: IDF or EPJSON model
+            output_dir: Base output directory; the sweep writes into its own subfolder
+            energyplus_dir: EnergyPlus installation directory
+            iso_type: ISO type the model is rated against (e.g. "RESIDNTIAL 2023")
+            zones: Climate zones to simulate; all zones of the model year when None
+            max_workers: Concurrent simulations; defaults to one per zone, capped at the CPU count
+            status_callback: Called with status messages
+            profiler: Optional RunProfiler
+            run_id: Optional pre-generated run ID
+            project_name: Name used for the output folder; defaults to the input file name
+            lean_simulation: Simulate with the lean output profile (see utils.lean_simulation)
+            sqlite_output: Request Output:SQLite and read the results from eplusout.sql
+
+        Raises:
+            ValueError: If the ISO type has no energy rating model or a zone is unknown
+        """
+        self.input_file = input_file
+        self.output_dir = output_dir
+        self.energyplus_dir = energyplus_dir
+        self.iso_type = iso_type
+        self.model_year = derive_model_year(iso_type)
+        if self.model_year is None:
+            raise ValueError(f"ISO type '{iso_type}' has no energy rating model")
+
+        available_zones = get_climate_zones(self.model_year)
+        self.zones = [str(zone).upper() for zone in zones] if zones else list(available_zones)
+        unknown_zones = [zone for zone in self.zones if zone not in available_zones]
+        if unknown_zones:
+            raise ValueError(f"Unknown climate zones for {iso_type}: {', '.join(unknown_zones)} "
+                             f"(expected {', '.join(available_zones)})")
+
+        self.max_workers = max_workers or min(len(self.zones), os.cpu_count() or 1)
+        self.status_callback = status_callback
+        self.profiler = profiler or NullProfiler()
+        self.run_id = run_id or datetime.now().strftime('%d-%m-%Y-%H-%M-%S')
+        self.project_name = (project_name or '').strip() or Path(input_file).stem
+        self.lean_simulation = lean_simulation
+        self.sqlite_output = sqlite_output
+        safe_project_name = "".join(c for c in self.project_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_project_name = safe_project_name.replace(' ', '-') or "unknown-project"
+        self.sweep_dir = os.path.join(self.output_dir, f"{safe_project_name}-climate-sweep-{self.run_id}")
+        self.is_cancelled = False
+
+    def update_status(self, message: str) -> None:
+        """Updates the status via callback if provided."""
+        if self.status_callback:
+            self.status_callback(message)
+
+    def cancel(self) -> None:
+        """Signals that the sweep should stop; simulations that have not started are dropped."""
+        self.is_cancelled = True
+        self.update_status("בקשה לביטול התקבלה.")
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Run the sweep.
+
+        Returns:
+            One result dict per requested zone, in zone order, with 'zone', 'epw',
+            'score', 'grade', 'simulation_s', 'output_dir' and 'error' keys.
+        """
+        prepared_input = prepare_simulation_input(
+            self.input_file, os.path.join(self.sweep_dir, "input", os.path.basename(self.input_file)),
+            lean=self.lean_simulation, sqlite_output=self.sqlite_output)
+
+        self.update_status(f"מריץ {len(self.zones)} סימולציות אזורי אקלים ({self.max_workers} במקביל)...")
+        results = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                   thread_name_prefix="climate-sweep") as executor:
+            futures = {executor.submit(self._simulate_zone, zone, prepared_input): zone for zone in self.zones}
+
+            # Parse the model once while the simulations run
+            self.update_status("טוען את המודל בזמן שהסימולציות רצות...")
+            with self.profiler.stage("load", "load"):
+                data_loader = DataLoader(energyplus_path=self.energyplus_dir, profiler=self.profiler,
+                                         release_raw_sections=True, selective_load=True)
+                data_loader.load_file(self.input_file, energyplus_path=self.energyplus_dir)
+
+            for future in concurrent.futures.as_completed(futures):
+                if self.is_cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                zone = futures[future]
+                try:
+                    simulation = future.result()
+                except Exception as e:
+                    logger.error(f"Climate zone {zone} simulation raised: {e}", exc_info=True)
+                    simulation = SimulationResult(output_dir=os.path.join(self.sweep_dir, f"zone-{zone}", "simulation"),
+                                                  error=f"{type(e).__name__}: {e}")
+                with self.profiler.stage(f"rate:{zone}", "parser"):
+                    results[zone] = self._rate_zone(data_loader, zone, simulation)
+                score_text = results[zone]['grade'] or results[zone]['error']
+                self.update_status(f"אזור אקלים {zone}: {score_text}")
+
+        ordered_results = [results[zone] for zone in self.zones if zone in results]
+        if not self.is_cancelled:
+            with self.profiler.stage("report:Climate Sweep", "report"):
+                self._write_outputs(ordered_results)
+        return ordered_results
+
+    def _simulate_zone(self, zone: str, prepared_input: str) -> SimulationResult:
+        """Runs EnergyPlus for one climate zone in its own folder (worker thread)."""
+        simulation_dir = os.path.join(self.sweep_dir, f"zone-{zone}", "simulation")
+        if self.is_cancelled:
+            return SimulationResult(output_dir=simulation_dir, error="Cancelled")
+        try:
+            epw_file = get_data_file_path(get_epw_filename(zone))
+        except FileNotFoundError as e:
+            return SimulationResult(output_dir=simulation_dir, error=str(e))
+        with self.profiler.stage(f"energyplus:{zone}", "simulation"):
+            return run_energyplus(self.energyplus_dir, prepared_input, epw_file, simulation_dir)
+
+    def _rate_zone(self, data_loader: DataLoader, zone: str, simulation: SimulationResult) -> Dict[str, Any]:
+        """Rates one zone's simulation with the shared DataLoader (calling thread only)."""
+        result = {
+            'zone': zone,
+            'epw': get_epw_filename(zone),
+            'score': None,
+            'grade': None,
+            'simulation_s': simulation.elapsed_s,
+            'output_dir': os.path.dirname(simulation.output_dir),
+            'error': simulation.error,
+        }
+        if not simulation.success:
+            return result
+
+        try:
+            # HVAC zone flags come from each run's eplustbl.csv
+            data_loader.refresh_simulation_outputs(result['output_dir'])
+            materials_parser = MaterialsParser(data_loader)
+            area_parser = AreaParser(data_loader, materials_parser, simulation.output_csv)
+            energy_rating_parser = EnergyRatingParser(data_loader, area_parser)
+            energy_rating_parser.process_output(simulation.output_csv)
+            result['score'], result['grade'] = calculate_energy_rating_score(
+                energy_rating_parser, self.model_year, zone)
+            if result['score'] is None:
+                result['error'] = "No energy rating data"
+        except Exception as e:
+            logger.error(f"Failed to rate climate zone {zone}: {e}", exc_info=True)
+            result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    def _write_outputs(self, results: List[Dict[str, Any]]) -> None:
+        """Writes climate-sweep.json, climate-sweep.csv and the comparison PDF into the sweep folder."""
+        summary = {
+            'input_file': os.path.abspath(self.input_file),
+            'iso_type': self.iso_type,
+            'model_year': self.model_year,
+            'run_id': self.run_id,
+            'max_workers': self.max_workers,
+            'results': results,
+        }
+        with open(os.path.join(self.sweep_dir, SWEEP_RESULTS_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        with open(os.path.join(self.sweep_dir, SWEEP_CSV_FILENAME), 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SWEEP_CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(results)
+
+        report_path = os.path.join(self.sweep_dir, SWEEP_REPORT_FILENAME)
+        if generate_climate_sweep_report(results, report_path, self.project_name, self.run_id, self.iso_type):
+            self.update_status(f"דוח השוואת אזורי אקלים נוצר בהצלחה ב-{report_path}")
+        else:
+            self.update_status("יצירת דוח השוואת אזורי אקלים נכשלה (בדוק את הקונסול).")
@@ -559,6 +559,27 @@ def _create_glazing_table(glazing_data, table_title, page_width):
     
     return elements
 
+def _get_report_materials_parser(areas_data, data_loader, report_label: str):
+    """
+    Get the MaterialsParser used for element types and wall mass in zone reports.
+
+    Run snapshots (utils.run_snapshot) carry a stand-in with the recorded wall masses;
+    otherwise a MaterialsParser is built from the DataLoader.
+    """
+    recorded = getattr(areas_data, 'report_materials_parser', None)
+    if recorded is not None:
+        return recorded
+    if not data_loader:
+        return None
+    from parsers.materials_parser import MaterialsParser
+    try:
+        materials_parser = MaterialsParser(data_loader)
+        materials_parser.process_idf(None)
+        return materials_parser
+    except Exception as e:
+        logger.warning(f"Could not initialize or process MaterialsParser for {report_label}: {e}", exc_info=True)
+        return None
+
 def generate_area_reports(areas_data, output_dir: str = "output/areas",
                           project_name: str = "-", run_id: str = "-",
                           city_name: str = "-", area_name: str = "-", 
@@ -594,9 +615,6 @@ def generate_area_reports(areas_data, output_dir: str = "output/areas",
             logger.error(error_message)
             return False
 
-        from parsers.materials_parser import MaterialsParser
-
-        materials_parser = None
         data_loader = None
         glazing_data_from_csv = None
 
@@ -605,13 +623,7 @@ def generate_area_reports(areas_data, output_dir: str = "output/areas",
             if hasattr(areas_data, 'glazing_data_from_csv'):
                 glazing_data_from_csv = areas_data.glazing_data_from_csv
 
-        if data_loader:
-            try:
-                materials_parser = MaterialsParser(data_loader)
-                materials_parser.process_idf(None)
-            except Exception as e:
-                logger.warning(f"Could not initialize or process MaterialsParser for area reports: {e}", exc_info=True)
-                materials_parser = None
+        materials_parser = _get_report_materials_parser(areas_data, data_loader, "area reports")
 
         surfaces = {}
         zones = {}
@@ -964,21 +976,12 @@ def generate_area_reports_by_base_zone(areas_data, output_dir: str = "output/are
             logger.error(error_message)
             return False
 
-        from parsers.materials_parser import MaterialsParser
-
-        materials_parser = None
         data_loader = None
 
         if hasattr(areas_data, 'data_loader'):
             data_loader = areas_data.data_loader
 
-        if data_loader:
-            try:
-                materials_parser = MaterialsParser(data_loader)
-                materials_parser.process_idf(None)
-            except Exception as e:
-                logger.warning(f"Could not initialize or process MaterialsParser for base zone area reports: {e}", exc_info=True)
-                materials_parser = None
+        materials_parser = _get_report_materials_parser(areas_data, data_loader, "base zone area reports")
 
         zones = {}
         if data_loader:
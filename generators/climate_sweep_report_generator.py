@@ -0,0 +1,92 @@
+"""
+Climate Sweep Report Generator
+Generates a one-page PDF comparing the energy rating of one model across climate zones.
+"""
+from typing import Any, Dict, List
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from generators.shared_design_system import (
+    COLORS, create_cell_style, create_standard_table_style, create_title_style,
+    create_standardized_header, wrap_text
+)
+from utils.logging_config import get_logger
+import os
+
+logger = get_logger(__name__)
+
+HEADERS = ["Climate Zone", "Weather File", "Score", "Grade", "Simulation (s)", "Status"]
+COLUMN_WIDTHS = [2.5 * cm, 3 * cm, 2 * cm, 2 * cm, 3 * cm, 5.5 * cm]
+
+
+def _format_score(score) -> str:
+    return "-" if score is None else str(score)
+
+
+def generate_climate_sweep_report(sweep_results: List[Dict[str, Any]],
+                                  output_path: str,
+                                  project_name: str,
+                                  run_id: str,
+                                  iso_type: str = "") -> bool:
+    """
+    Generate a PDF table of energy rating scores per climate zone.
+
+    Args:
+        sweep_results: One dict per climate zone with 'zone', 'epw', 'score', 'grade',
+                       'simulation_s' and 'error' keys (see ClimateSweep.run)
+        output_path: Path where the PDF report will be saved
+        project_name: Name of the project
+        run_id: Unique identifier for this run
+        iso_type: ISO type the model was rated against
+
+    Returns:
+        bool: True if the report was generated successfully
+    """
+    try:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        doc = SimpleDocTemplate(output_path, pagesize=A4,
+                                leftMargin=1 * cm, rightMargin=1 * cm,
+                                topMargin=1 * cm, bottomMargin=1 * cm)
+        styles = getSampleStyleSheet()
+        header_style = create_cell_style(styles, is_header=True)
+        cell_style = create_cell_style(styles, center_align=True)
+
+        story = create_standardized_header(
+            doc=doc,
+            project_name=project_name,
+            run_id=run_id,
+            city_name="-",
+            area_name="All",
+            report_title="Climate Zone Comparison"
+        )
+        story.append(Paragraph("Energy Rating by Climate Zone", create_title_style(styles)))
+        if iso_type:
+            story.append(Paragraph(f"ISO type: {iso_type}", styles['Normal']))
+        story.append(Spacer(1, 0.5 * cm))
+
+        table_data = [[wrap_text(header, header_style) for header in HEADERS]]
+        for result in sweep_results:
+            row = [
+                result.get('zone', '-'),
+                result.get('epw', '-'),
+                _format_score(result.get('score')),
+                result.get('grade') or '-',
+                f"{result.get('simulation_s', 0.0):.1f}",
+                result.get('error') or 'OK',
+            ]
+            table_data.append([wrap_text(str(value), cell_style) for value in row])
+
+        table = Table(table_data, colWidths=COLUMN_WIDTHS, repeatRows=1)
+        style = create_standard_table_style()
+        for row_index, result in enumerate(sweep_results, start=1):
+            if result.get('error'):
+                style.add('TEXTCOLOR', (0, row_index), (-1, row_index), COLORS['medium_gray'])
+        table.setStyle(style)
+        story.append(table)
+
+        doc.build(story)
+        return True
+    except Exception as e:
+        logger.error(f"Error generating climate sweep report: {e}", exc_info=True)
+        return False
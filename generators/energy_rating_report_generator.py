@@ -480,6 +480,18 @@ def _calculate_total_energy_rating(raw_table_data, model_year, model_area_defini
     logger.warning("_calculate_total_energy_rating: total_raw_area_sum_denominator is 0 or less. Cannot calculate average.")
     return None, None
 
+def calculate_energy_rating_score(energy_rating_parser, model_year, model_area_definition):
+    """
+    Calculate the total energy rating of a processed EnergyRatingParser.
+
+    Returns a tuple containing (numeric_score, letter_grade); both are None when
+    there is no energy data to rate.
+    """
+    if not energy_rating_parser.processed:
+        return None, None
+    raw_table_data = energy_rating_parser.get_energy_rating_table_data(model_year, model_area_definition)
+    return _calculate_total_energy_rating(raw_table_data, model_year, model_area_definition)
+
 def _get_letter_grade_for_score(score):
     """Map a numeric score to its corresponding letter grade"""
     if score is None:
@@ -0,0 +1,213 @@
+"""
+Excel Export Generator
+Writes every extracted table to one XLSX workbook, one sheet per report.
+
+The workbook is written with openpyxl in write-only mode: rows are produced lazily
+from the parser data and streamed to disk, so memory stays flat regardless of the
+number of surfaces. Nested values are flattened into dotted column names
+(e.g. 'loads.lights.watts_per_area').
+"""
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Excel limits sheet names to 31 characters without []:*?/\
+MAX_SHEET_NAME_LENGTH = 31
+# Excel limits a cell to 32767 characters
+MAX_CELL_LENGTH = 32767
+
+AREA_SURFACE_COLUMNS = [
+    "zone", "floor_id", "base_zone_id", "zone_floor_area", "multiplier", "construction",
+    "surface_name", "element_type", "area", "original_area", "u_value", "area_u_value",
+]
+
+RowSource = Callable[[], Iterable[Dict[str, Any]]]
+
+
+def _cell_value(value: Any) -> Any:
+    """Convert a flattened value to something openpyxl can write."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value[:MAX_CELL_LENGTH]
+    if isinstance(value, (list, tuple, set)):
+        try:
+            text = json.dumps(list(value), ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            text = str(value)
+        return text[:MAX_CELL_LENGTH]
+    return str(value)[:MAX_CELL_LENGTH]
+
+
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested dicts into dotted keys; parser object references are dropped."""
+    flat = {}
+    for key, value in record.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{column}."))
+        elif value is None or isinstance(value, (str, bool, int, float, list, tuple, set)):
+            flat[column] = value
+    return flat
+
+
+def _keyed_rows(data: Any, key_column: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one flat row per record of a parser payload.
+
+    Lists of dicts give one row per item. Dicts keyed by zone/construction give one
+    row per value, or per list item, with the key in key_column.
+    """
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                yield _flatten(item)
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            items = value if isinstance(value, list) else [value]
+            for item in items:
+                if isinstance(item, dict):
+                    yield {key_column: key, **_flatten(item)}
+
+
+def _settings_rows(settings: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield the settings as category/setting/value rows."""
+    for category, values in (settings or {}).items():
+        flat = _flatten(values) if isinstance(values, dict) else {"": values}
+        for setting, value in flat.items():
+            yield {"category": category, "setting": setting, "value": value}
+
+
+def _area_surface_rows(areas_by_zone: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield one row per surface of every zone and construction."""
+    for zone_id, zone_data in (areas_by_zone or {}).items():
+        zone_fields = {
+            "zone": zone_id,
+            "floor_id": zone_data.get("floor_id"),
+            "base_zone_id": zone_data.get("base_zone_id"),
+            "zone_floor_area": zone_data.get("floor_area"),
+            "multiplier": zone_data.get("multiplier"),
+        }
+        for construction_name, construction_data in zone_data.get("constructions", {}).items():
+            for element in construction_data.get("elements", []):
+                yield {
+                    **zone_fields,
+                    "construction": construction_name,
+                    "surface_name": element.get("surface_name"),
+                    "element_type": element.get("element_type"),
+                    "area": element.get("area"),
+                    "original_area": element.get("original_area"),
+                    "u_value": element.get("u_value"),
+                    "area_u_value": element.get("area_u_value"),
+                }
+
+
+def _collect_columns(rows: Iterable[Dict[str, Any]]) -> List[str]:
+    """Union of row keys in first-seen order."""
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def _sheet_title(title: str, used: set) -> str:
+    cleaned = "".join("_" if char in '[]:*?/\\' else char for char in title)[:MAX_SHEET_NAME_LENGTH]
+    candidate, counter = cleaned, 2
+    while candidate.lower() in used:
+        suffix = f" ({counter})"
+        candidate = cleaned[:MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+        counter += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def build_export_sheets(extracted_data: Dict[str, Any], areas_by_zone: Optional[Dict[str, Any]] = None,
+                        energy_rating_rows: Optional[List[Dict[str, Any]]] = None,
+                        natural_ventilation_data: Optional[Dict[str, Any]] = None
+                        ) -> List[Tuple[str, Optional[List[str]], RowSource]]:
+    """
+    Describe the sheets of the export.
+
+    Returns:
+        [(sheet title, fixed columns or None to collect them, callable returning the rows)]
+    """
+    return [
+        ("Settings", ["category", "setting", "value"], lambda: _settings_rows(extracted_data.get("settings"))),
+        ("Areas by Zone", AREA_SURFACE_COLUMNS, lambda: _area_surface_rows(areas_by_zone)),
+        ("Materials", None, lambda: _keyed_rows(extracted_data.get("materials"), "element")),
+        ("Loads", None, lambda: _keyed_rows(extracted_data.get("loads"), "zone")),
+        ("Glazing", None, lambda: _keyed_rows(extracted_data.get("glazing"), "construction")),
+        ("Lighting", None, lambda: _keyed_rows(extracted_data.get("lighting"), "table")),
+        ("Schedules", None, lambda: _keyed_rows(extracted_data.get("schedules"), "schedule")),
+        ("Natural Ventilation", None, lambda: _keyed_rows(natural_ventilation_data, "zone")),
+        ("Energy Rating", None, lambda: _keyed_rows(energy_rating_rows, "zone")),
+        ("Validation", None, lambda: _keyed_rows(extracted_data.get("automatic_error_detection"), "item")),
+    ]
+
+
+def generate_excel_export(extracted_data: Dict[str, Any], output_path: str,
+                          areas_by_zone: Optional[Dict[str, Any]] = None,
+                          energy_rating_rows: Optional[List[Dict[str, Any]]] = None,
+                          natural_ventilation_data: Optional[Dict[str, Any]] = None,
+                          project_name: str = "-", run_id: str = "-") -> bool:
+    """
+    Write the extracted data of a run to an XLSX workbook.
+
+    Args:
+        extracted_data: Output of ProcessingManager._extract_data_from_parsers
+        output_path: Path of the .xlsx file
+        areas_by_zone: AreaParser.areas_by_zone, exported one row per surface
+        energy_rating_rows: EnergyRatingParser.get_energy_rating_table_data() rows
+        natural_ventilation_data: DataLoader.get_natural_ventilation_data()
+        project_name: Name of the project (workbook title)
+        run_id: Identifier for the current run
+
+    Returns:
+        bool: True if the workbook was written, False otherwise
+    """
+    temp_path = f"{output_path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        workbook = Workbook(write_only=True)
+        workbook.properties.title = f"{project_name} ({run_id})"
+        used_titles = set()
+        header_font = Font(bold=True)
+
+        for title, columns, row_source in build_export_sheets(extracted_data, areas_by_zone,
+                                                             energy_rating_rows, natural_ventilation_data):
+            # Rows are generated twice (columns, then values) rather than held in memory
+            columns = columns or _collect_columns(row_source())
+            sheet = workbook.create_sheet(_sheet_title(title, used_titles))
+            if not columns:
+                continue
+            header = []
+            for column in columns:
+                cell = WriteOnlyCell(sheet, value=column)
+                cell.font = header_font
+                header.append(cell)
+            sheet.append(header)
+            row_count = 0
+            for row in row_source():
+                sheet.append([_cell_value(row.get(column)) for column in columns])
+                row_count += 1
+            logger.debug(f"Excel export sheet '{title}': {row_count} rows, {len(columns)} columns")
+
+        workbook.save(temp_path)
+        os.replace(temp_path, output_path)
+        logger.info(f"Successfully generated Excel export: {output_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error generating Excel export {output_path}: {e}", exc_info=True)
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except OSError:
+            pass
+        return False
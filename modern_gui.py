@@ -1,4 +1,5 @@
 import flet as ft
+import concurrent.futures
 import json
 import os
 import threading
@@ -7,13 +8,17 @@ import platform
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from utils.logging_config import get_logger
+from utils.logging_config import get_logger, start_job_logging, stop_job_logging
 from utils.sentry_config import capture_exception_with_context, add_breadcrumb, set_user_context
 from utils.path_utils import (
-    get_data_file_path,contains_non_ascii, create_safe_path_for_energyplus,
+    get_data_file_path,contains_non_ascii, create_safe_path_for_energyplus, StagingStats,
 )
 from processing_manager import ProcessingManager
+from utils.profiler import create_profiler
+from utils.job_queue import JobQueue, KIND_GUI, STATUS_PENDING
 from utils.update_manager import UpdateManager
+from utils.ui_dispatcher import UIDispatcher
+from utils.city_search import CitySearchIndex
 from utils.license_manager import license_manager
 from utils.license_dialog import LicenseDialog
 from version import get_version
@@ -51,6 +56,24 @@ class ModernIDFProcessorGUI:
         self.project_gush = ""
         self.project_helka = ""
         
+        # Run profiling (writes timings.json next to the reports)
+        self.profile_mode = False
+        
+        # Pipelined runs parse the model and build simulation-independent reports while EnergyPlus runs
+        self.pipeline_mode = False
+        
+        # Climate sweep: simulate the model in every climate zone and compare energy ratings
+        self.climate_sweep_mode = False
+        
+        # Lean simulation: simulate a copy of the model that only requests the outputs the reports read
+        self.lean_simulation_mode = False
+        
+        # SQLite output: request Output:SQLite and read the simulation results from eplusout.sql
+        self.sqlite_output_mode = False
+        
+        # Excel export: write every extracted table to extracted-data.xlsx (licensed feature)
+        self.export_excel_mode = False
+        
         # Update manager
         self.update_manager = UpdateManager(status_callback=self.show_status)
         self.update_dialog = None
@@ -61,8 +84,10 @@ class ModernIDFProcessorGUI:
         self.license_status = None
         self.daily_usage_count = 0
         
-        # Load city data
+        # Load city data; the autocomplete search index is built in the background
         self.city_data = self.load_cities_from_csv()
+        self.city_index = None
+        threading.Thread(target=self._build_city_index, name="city-index", daemon=True).start()
         self.iso_types = [
             "מגורים 2023", "מגורים 2017", "מלון (בקרוב)",
             "חינוך (בקרוב)", "משרדים", "מעטפת ומבנה (בקרוב)"
@@ -89,14 +114,16 @@ class ModernIDFProcessorGUI:
         self.energyplus_progress = None
         self.reports_progress = None
         
-        # Animation control
-        self.animation_timer = None
+        # Page updates from all threads are coalesced and flushed by one dispatcher thread
+        self.ui_dispatcher = UIDispatcher(self._flush_page_update)
+        
+        # Animation control (the animation runs as a frame callback of the dispatcher)
         self.is_animating_energyplus = False
         self.is_animating_reports = False
-        self.animation_step = 0
         self.animation_start_time = 0
         
-        # Queue system
+        # Queue system: jobs persist in a SQLite file shared with the CLI; job_queue mirrors the GUI jobs
+        self.job_store = JobQueue()
         self.job_queue = []  # List of job dictionaries
         self.current_job_index = -1  # Index of currently running job (-1 if none)
         self.max_queue_size = 10
@@ -121,7 +148,7 @@ class ModernIDFProcessorGUI:
         cities_data = {}
         try:
             csv_path = get_data_file_path('countries-selection.csv')
-            with open(csv_path, 'r', encoding='utf-8') as f:
+            with open(csv_path, 'r', encoding='utf-8-sig') as f:
                 first_line = f.readline().strip()
                 if not any(char in first_line for char in 'אבגדהוזחטיכלמנסעפצקרשת'):
                     pass  # Has header
@@ -137,6 +164,17 @@ class ModernIDFProcessorGUI:
             logger.error(f"Error loading city data: {e}")
         return cities_data
 
+    def _build_city_index(self):
+        """Build the city autocomplete index (runs once, off the UI thread)."""
+        try:
+            import time
+            started = time.perf_counter()
+            self.city_index = CitySearchIndex(self.city_data.keys())
+            logger.debug(f"City search index built for {len(self.city_data)} cities in "
+                         f"{(time.perf_counter() - started) * 1000:.0f} ms")
+        except Exception as e:
+            logger.error(f"Error building city search index: {e}")
+
     def _get_default_input_file(self):
         """Get default input file path."""
         # Try to find a test file in the project
@@ -183,29 +221,43 @@ class ModernIDFProcessorGUI:
         except Exception:
             return os.getcwd()
 
+    def _refresh_job_queue(self):
+        """Reload the GUI jobs from the persistent queue."""
+        def format_time(timestamp):
+            return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S") if timestamp else None
+        
+        jobs = self.job_store.list_jobs(kinds=[KIND_GUI])
+        for job in jobs:
+            job['created_time'] = format_time(job['created_at'])
+            job['start_time'] = format_time(job['started_at'])
+            job['end_time'] = format_time(job['finished_at'])
+        self.job_queue = jobs
+    
     def add_job_to_queue(self, job_data):
         """Add a new job to the processing queue."""
         if len(self.job_queue) >= self.max_queue_size:
             self.show_status(f"תור עבודות מלא! מקסימום {self.max_queue_size} עבודות בתור", "warning")
             return False
         
-        job = {
-            'id': len(self.job_queue) + 1,
-            'input_file': job_data['input_file'],
-            'output_dir': job_data['output_dir'],
+        options = {
             'project_name': job_data.get('project_name', ''),
             'city': job_data['city'],
+            'city_area_name': self.city_area_name,
+            'city_area_code': self.city_area_code,
             'iso_type': job_data['iso_type'],
             'consultant_data': job_data.get('consultant_data', {}),
             'project_data': job_data.get('project_data', {}),
-            'status': 'pending',  # pending, running, completed, failed
-            'created_time': datetime.now().strftime("%H:%M:%S"),
-            'start_time': None,
-            'end_time': None,
-            'error_message': None
+            'profile': job_data.get('profile', False),
+            'pipeline': job_data.get('pipeline', False),
+            'climate_sweep': job_data.get('climate_sweep', False),
+            'lean_simulation': job_data.get('lean_simulation', False),
+            'sqlite_output': job_data.get('sqlite_output', False),
+            'export_excel': job_data.get('export_excel', False)
         }
+        self.job_store.enqueue(KIND_GUI, job_data['input_file'], job_data['output_dir'], options,
+                               priority=job_data.get('priority', 0))
         
-        self.job_queue.append(job)
+        self._refresh_job_queue()
         self.update_queue_display()
         self.update_form_validation()  # Update button text
         
@@ -217,28 +269,29 @@ class ModernIDFProcessorGUI:
     
     def remove_job_from_queue(self, job_id):
         """Remove a job from the queue (only if not running)."""
-        for i, job in enumerate(self.job_queue):
+        for job in self.job_queue:
             if job['id'] == job_id:
                 if job['status'] == 'running':
                     self.show_status("לא ניתן להסיר עבודה שרצה כעת", "warning")
                     return False
                 
-                self.job_queue.pop(i)
-                # Adjust current_job_index if needed
-                if i <= self.current_job_index:
-                    self.current_job_index -= 1
-                
+                self.job_store.remove(job_id)
+                self._refresh_job_queue()
                 self.update_queue_display()
                 self.update_form_validation()  # Update button text
                 return True
         return False
     
+    def move_job_to_front(self, job_id):
+        """Give a pending job the highest priority so it runs next."""
+        self.job_store.move_to_front(job_id)
+        self._refresh_job_queue()
+        self.update_queue_display()
+    
     def clear_completed_jobs(self):
         """Remove all completed and failed jobs from the queue."""
-        self.job_queue = [job for job in self.job_queue if job['status'] in ['pending', 'running']]
-        # Reset current_job_index if queue was cleared
-        running_jobs = [i for i, job in enumerate(self.job_queue) if job['status'] == 'running']
-        self.current_job_index = running_jobs[0] if running_jobs else -1
+        self.job_store.clear_finished(kinds=[KIND_GUI])
+        self._refresh_job_queue()
         self.update_queue_display()
         self.update_form_validation()  # Update button text
     
@@ -252,7 +305,23 @@ class ModernIDFProcessorGUI:
         completed = sum(1 for job in self.job_queue if job['status'] == 'completed')
         failed = sum(1 for job in self.job_queue if job['status'] == 'failed')
         
-        return f"ממתין: {pending} | רץ: {running} | הושלם: {completed} | נכשל: {failed}"
+        status = f"ממתין: {pending} | רץ: {running} | הושלם: {completed} | נכשל: {failed}"
+        jobs_per_hour = self.job_store.get_stats(kinds=[KIND_GUI])['jobs_per_hour']
+        if jobs_per_hour:
+            status += f" | {jobs_per_hour} עבודות לשעה"
+        return status
+    
+    def resume_persisted_jobs(self):
+        """Pick up jobs left pending or interrupted by a previous session."""
+        recovered = self.job_store.recover_interrupted()
+        self._refresh_job_queue()
+        pending = sum(1 for job in self.job_queue if job['status'] == STATUS_PENDING)
+        if pending:
+            message = f"נמצאו {pending} עבודות ממתינות מהפעלה קודמת"
+            if recovered:
+                message += f" ({recovered} נקטעו ויחודשו משלב שלא הושלם)"
+            self.show_status(message)
+            self.start_queue_processing()
     
     def start_queue_processing(self):
         """Start processing jobs in the queue sequentially."""
@@ -270,7 +339,14 @@ class ModernIDFProcessorGUI:
             self.processing_manager.is_cancelled = True
     
     def _safe_page_update(self):
-        """Safely update the page from any thread."""
+        """Safely update the page from any thread; updates are coalesced into the next frame."""
+        if self.ui_dispatcher.is_running:
+            self.ui_dispatcher.request_update()
+        else:
+            self._flush_page_update()
+    
+    def _flush_page_update(self):
+        """Send pending control changes to the page."""
         try:
             if self.page and hasattr(self.page, '_session_id'):
                 self.page.update()
@@ -292,6 +368,9 @@ class ModernIDFProcessorGUI:
             if hasattr(self, 'stop_progress_animation'):
                 self.stop_progress_animation()
             
+            # Flush what is pending and stop the UI dispatcher thread
+            self.ui_dispatcher.stop()
+            
             # Cancel any ongoing processing
             if self.processing_manager:
                 self.processing_manager.is_cancelled = True
@@ -303,14 +382,12 @@ class ModernIDFProcessorGUI:
     def _process_queue_worker(self):
         """Worker thread that processes jobs in the queue sequentially."""
         while not self.stop_queue_processing:
-            # Find next pending job
-            next_job_index = -1
-            for i, job in enumerate(self.job_queue):
-                if job['status'] == 'pending':
-                    next_job_index = i
-                    break
+            # Claim the next pending job (highest priority first), including jobs abandoned by a crashed session
+            self.job_store.recover_interrupted()
+            job = self.job_store.claim_next(kinds=[KIND_GUI])
+            self._refresh_job_queue()
             
-            if next_job_index == -1:
+            if job is None:
                 # No more pending jobs
                 self.current_job_index = -1
                 self.is_processing = False
@@ -321,12 +398,9 @@ class ModernIDFProcessorGUI:
                 break
             
             # Process the next job
-            self.current_job_index = next_job_index
-            job = self.job_queue[next_job_index]
+            self.current_job_index = next((i for i, queued in enumerate(self.job_queue) if queued['id'] == job['id']), -1)
             
             try:
-                job['status'] = 'running'
-                job['start_time'] = datetime.now().strftime("%H:%M:%S")
                 self.update_queue_display()
                 
                 # Set GUI form values for this job
@@ -334,28 +408,32 @@ class ModernIDFProcessorGUI:
                 self.output_dir = job['output_dir']
                 self.selected_city = job['city']
                 self.selected_iso = job['iso_type']
+                if job.get('city_area_code'):
+                    self.city_area_name = job.get('city_area_name')
+                    self.city_area_code = job['city_area_code']
                 
                 # Process the job using existing process_files logic
-                success = self._process_single_job(job)
+                with self.job_store.lease(job['id']):
+                    success = self._process_single_job(job)
                 
                 if success:
-                    job['status'] = 'completed'
-                    job['end_time'] = datetime.now().strftime("%H:%M:%S")
+                    self.job_store.finish(job['id'], True, actual_output_dir=job.get('actual_output_dir'))
                     self.show_status(f"עבודה #{job['id']} הושלמה בהצלחה", "success")
+                elif self.stop_queue_processing:
+                    # Stopped or closed mid-job: keep it for the next session, finished stages are kept
+                    self.job_store.release(job['id'])
+                    self.show_status(f"עבודה #{job['id']} הוחזרה לתור", "warning")
                 else:
-                    job['status'] = 'failed'
-                    job['end_time'] = datetime.now().strftime("%H:%M:%S")
-                    job['error_message'] = "שגיאה בעיבוד"
+                    self.job_store.finish(job['id'], False, "שגיאה בעיבוד", actual_output_dir=job.get('actual_output_dir'))
                     self.show_status(f"עבודה #{job['id']} נכשלה", "error")
                 
             except Exception as e:
-                job['status'] = 'failed'
-                job['end_time'] = datetime.now().strftime("%H:%M:%S")
-                job['error_message'] = str(e)
+                self.job_store.finish(job['id'], False, str(e))
                 logger.error(f"Error processing job {job['id']}: {e}", exc_info=True)
                 self.show_status(f"עבודה #{job['id']} נכשלה: {str(e)}", "error")
             
             finally:
+                self._refresh_job_queue()
                 self.update_queue_display()
                 # Small delay between jobs
                 import time
@@ -366,12 +444,20 @@ class ModernIDFProcessorGUI:
     
     def _process_single_job(self, job):
         """Process a single job from the queue."""
+        simulation_future = None
         try:
             self.is_processing = True
             
             # Generate run ID
             run_id = datetime.now().strftime('%d-%m-%Y-%H-%M-%S')
             
+            # A resumed job reuses the simulation its interrupted run already finished
+            completed_simulation = self.job_store.get_completed_stage(job['id'], 'simulation')
+            if completed_simulation and not os.path.exists(completed_simulation.get('output_csv') or ''):
+                completed_simulation = None
+            if completed_simulation:
+                run_id = completed_simulation['run_id']
+            
             # Get project name for folder naming - use consultant data to match processing manager
             from pathlib import Path
             # First try to get project name from job data, then fall back to file name
@@ -397,13 +483,18 @@ class ModernIDFProcessorGUI:
             
             logger.info(f"GUI FOLDER DEBUG - final safe_project_name: '{safe_project_name}'")
             
+            if job.get('climate_sweep', False):
+                return self._run_climate_sweep_job(job, run_id, project_name)
+            
             reports_dir = os.path.join(job['output_dir'], f"{safe_project_name}-{run_id}")
             simulation_dir = os.path.join(reports_dir, "simulation")
             
             # Store the actual output folder path in the job for later use
             job['actual_output_dir'] = reports_dir
+            self.job_store.set_output_dir(job['id'], reports_dir)
             
             os.makedirs(simulation_dir, exist_ok=True)
+            start_job_logging(job['id'], reports_dir)
             self.show_status(f"מעבד עבודה #{job['id']}: {os.path.basename(job['input_file'])}")
             
             # Determine EPW file
@@ -412,16 +503,43 @@ class ModernIDFProcessorGUI:
                 self.show_status(f"עבודה #{job['id']}: קביעת קובץ EPW נכשלה", "error")
                 return False
             
-            # Run EnergyPlus simulation
-            simulation_output_csv = self.run_energyplus_simulation(epw_file, simulation_dir)
-            if not simulation_output_csv:
-                self.show_status(f"עבודה #{job['id']}: סימולציה נכשלה, ממשיך בלי נתוני סימולציה", "warning")
+            profiler = create_profiler(job.get('profile', False))
+            # Files linked versus copied for this job, by the simulation and the run folder setup
+            staging_stats = StagingStats()
+            
+            simulation_output_csv = None
+            if completed_simulation:
+                simulation_output_csv = completed_simulation['output_csv']
+                self.show_status(f"עבודה #{job['id']}: משתמש בסימולציה שהושלמה בהפעלה הקודמת")
+            elif job.get('pipeline', False):
+                self.show_status(f"עבודה #{job['id']}: מעבד את המודל במקביל לסימולציה")
+                self.job_store.start_stage(job['id'], 'simulation')
+                simulation_future = self._start_pipelined_simulation(epw_file, simulation_dir, profiler,
+                                                                     lean=job.get('lean_simulation', False),
+                                                                     sqlite_output=job.get('sqlite_output', False),
+                                                                     staging_stats=staging_stats)
+                simulation_future.add_done_callback(
+                    lambda future: self._record_simulation_stage(
+                        job['id'], run_id, None if future.exception() else future.result()))
+            else:
+                # Run EnergyPlus simulation
+                self.job_store.start_stage(job['id'], 'simulation')
+                with profiler.stage("energyplus", "simulation"):
+                    simulation_output_csv = self.run_energyplus_simulation(epw_file, simulation_dir,
+                                                                           lean=job.get('lean_simulation', False),
+                                                                           sqlite_output=job.get('sqlite_output', False),
+                                                                           staging_stats=staging_stats)
+                self._record_simulation_stage(job['id'], run_id, simulation_output_csv)
+                if not simulation_output_csv:
+                    self.show_status(f"עבודה #{job['id']}: סימולציה נכשלה, ממשיך בלי נתוני סימולציה", "warning")
             
             # Initialize ProcessingManager
             self.processing_manager = ProcessingManager(
                 status_callback=self.show_status,
                 progress_callback=self.update_progress,
-                simulation_output_csv=simulation_output_csv
+                simulation_output_csv=simulation_output_csv,
+                profiler=profiler,
+                staging_stats=staging_stats
             )
             
             # Set consultant data to ensure same project name is used
@@ -451,21 +569,28 @@ class ModernIDFProcessorGUI:
                 'project_helka': job.get('project_data', {}).get('project_helka', ''),
                 'iso_type': job['iso_type']
             }
+            self.processing_manager.export_excel = (job.get('export_excel', False) and
+                                                    license_manager.is_feature_enabled("export_excel"))
             
             # Process IDF and generate reports
             self.show_status(f"עבודה #{job['id']}: מתחיל עיבוד IDF ויצירת דוחות...")
-            self.start_progress_animation("reports")
+            if simulation_future is None:
+                # In pipelined mode the EnergyPlus animation is still running
+                self.start_progress_animation("reports")
             
             english_iso = self.iso_map.get(job['iso_type'], job['iso_type'])
             self.processing_manager.city_info['iso_type'] = english_iso
             
+            self.job_store.start_stage(job['id'], 'reports')
             success = self.processing_manager.process_idf(
                 job['input_file'],
                 os.path.join(self.energyplus_dir, "Energy+.idd"),
                 job['output_dir'],
                 run_id,
-                self.energyplus_dir
+                self.energyplus_dir,
+                simulation_future=simulation_future
             )
+            self.job_store.finish_stage(job['id'], 'reports', success)
             
             if success:
                 self.show_status(f"עבודה #{job['id']} הושלמה בהצלחה!", "success")
@@ -480,14 +605,68 @@ class ModernIDFProcessorGUI:
             return False
         
         finally:
+            if simulation_future is not None:
+                # Never let the next job start while this job's simulation is still running
+                concurrent.futures.wait([simulation_future])
+            stop_job_logging(job['id'])
             self.stop_progress_animation()
             self.is_processing = False
     
+    def _record_simulation_stage(self, job_id, run_id, simulation_output_csv):
+        """Record the job's simulation outcome so a resumed job can skip a finished simulation."""
+        self.job_store.finish_stage(job_id, 'simulation', bool(simulation_output_csv),
+                                    {'run_id': run_id, 'output_csv': simulation_output_csv})
+    
+    def _run_climate_sweep_job(self, job, run_id, project_name):
+        """Run a queued job as a climate sweep: one simulation per climate zone and a rating comparison."""
+        from climate_sweep import ClimateSweep
+        
+        english_iso = self.iso_map.get(job['iso_type'], job['iso_type'])
+        try:
+            sweep = ClimateSweep(
+                input_file=job['input_file'],
+                output_dir=job['output_dir'],
+                energyplus_dir=self.energyplus_dir,
+                iso_type=english_iso,
+                status_callback=self.show_status,
+                profiler=create_profiler(job.get('profile', False)),
+                run_id=run_id,
+                project_name=project_name,
+                lean_simulation=job.get('lean_simulation', False),
+                sqlite_output=job.get('sqlite_output', False)
+            )
+        except ValueError as e:
+            self.show_status(f"עבודה #{job['id']}: {e}", "error")
+            return False
+        
+        start_job_logging(job['id'], sweep.sweep_dir)
+        self.show_status(f"עבודה #{job['id']}: מריץ השוואת אזורי אקלים ({', '.join(sweep.zones)})")
+        self.start_progress_animation("energyplus")
+        self.job_store.start_stage(job['id'], 'climate_sweep')
+        results = sweep.run()
+        self.job_store.finish_stage(job['id'], 'climate_sweep', any(result['score'] is not None for result in results))
+        job['actual_output_dir'] = sweep.sweep_dir
+        if sweep.profiler.enabled:
+            sweep.profiler.write_report(sweep.sweep_dir, input_file=job['input_file'], run_id=run_id, iso_type=english_iso)
+        sweep.profiler.write_trace(sweep.sweep_dir, input_file=job['input_file'], run_id=run_id, iso_type=english_iso)
+        
+        rated_zones = [result for result in results if result['score'] is not None]
+        if not rated_zones:
+            self.show_status(f"עבודה #{job['id']}: אף אזור אקלים לא דורג", "error")
+            return False
+        self.show_status(f"עבודה #{job['id']}: דורגו {len(rated_zones)} מתוך {len(results)} אזורי אקלים", "success")
+        return True
+    
     def update_queue_display(self):
-        """Update the queue display UI."""
+        """Update the queue display UI (redraws requested within one frame are drawn once)."""
         if not self.queue_container or not self.page:
             return
-        
+        if self.ui_dispatcher.is_running:
+            self.ui_dispatcher.post(self._draw_queue_display, key="queue_display")
+        else:
+            self._draw_queue_display()
+    
+    def _draw_queue_display(self):
         # Clear existing queue items
         self.queue_container.content.controls.clear()
         
@@ -548,8 +727,17 @@ class ModernIDFProcessorGUI:
         # Create action buttons
         action_buttons = []
         
-        # Remove button (only for pending jobs)
+        # Move to front and remove buttons (only for pending jobs)
         if job['status'] == 'pending':
+            action_buttons.append(
+                ft.IconButton(
+                    icon=ft.Icons.VERTICAL_ALIGN_TOP,
+                    icon_color=ft.Colors.BLUE_400,
+                    icon_size=16,
+                    tooltip="הקדם לראש התור",
+                    on_click=lambda e, job_id=job['id']: self.move_job_to_front(job_id)
+                )
+            )
             action_buttons.append(
                 ft.IconButton(
                     icon=ft.Icons.DELETE,
@@ -683,6 +871,13 @@ class ModernIDFProcessorGUI:
                 self.project_gush = project_data.get('project_gush', '')
                 self.project_helka = project_data.get('project_helka', '')
                 
+                self.profile_mode = settings.get('profile_mode', False)
+                self.pipeline_mode = settings.get('pipeline_mode', False)
+                self.climate_sweep_mode = settings.get('climate_sweep_mode', False)
+                self.lean_simulation_mode = settings.get('lean_simulation_mode', False)
+                self.sqlite_output_mode = settings.get('sqlite_output_mode', False)
+                self.export_excel_mode = settings.get('export_excel_mode', False)
+                
                 # Load window settings
                 self.window_settings = settings.get('window', {
                     'width': 1400,  # Default width
@@ -748,6 +943,12 @@ class ModernIDFProcessorGUI:
                     'project_gush': self.project_gush,
                     'project_helka': self.project_helka
                 },
+                'profile_mode': self.profile_mode,
+                'pipeline_mode': self.pipeline_mode,
+                'climate_sweep_mode': self.climate_sweep_mode,
+                'lean_simulation_mode': self.lean_simulation_mode,
+                'sqlite_output_mode': self.sqlite_output_mode,
+                'export_excel_mode': self.export_excel_mode,
                 'window': window_settings
             }
             with open(self.settings_file, 'w', encoding='utf-8') as f:
@@ -813,24 +1014,14 @@ class ModernIDFProcessorGUI:
 
         color = color_map.get(level, ft.Colors.BLUE_700)
         
-        # Add message to status display
+        # Add message to status display; messages posted between two frames are added in one update
         if hasattr(self.status_text, 'controls'):
-            self.status_text.controls.append(
-                ft.Container(
-                    content=ft.Row([
-                        ft.Text(timestamp, size=12, color=ft.Colors.GREY_600),
-                        ft.Text(message, size=12, color=color, expand=True)
-                    ]),
-                    padding=ft.padding.symmetric(vertical=2)
-                )
-            )
-            # Keep only last 50 messages
-            if len(self.status_text.controls) > 50:
-                self.status_text.controls = self.status_text.controls[-50:]
-            
-            # Scroll to bottom
-            if self.page:
-                self._safe_page_update()
+            if self.ui_dispatcher.is_running:
+                self.ui_dispatcher.post(lambda: self._append_status_line(timestamp, message, color))
+            else:
+                self._append_status_line(timestamp, message, color)
+                if self.page:
+                    self._safe_page_update()
 
         # Log message
         if level == "error":
@@ -840,6 +1031,20 @@ class ModernIDFProcessorGUI:
         else:
             logger.info(f"GUI: {message}")
     
+    def _append_status_line(self, timestamp, message, color):
+        self.status_text.controls.append(
+            ft.Container(
+                content=ft.Row([
+                    ft.Text(timestamp, size=12, color=ft.Colors.GREY_600),
+                    ft.Text(message, size=12, color=color, expand=True)
+                ]),
+                padding=ft.padding.symmetric(vertical=2)
+            )
+        )
+        # Keep only last 50 messages
+        if len(self.status_text.controls) > 50:
+            self.status_text.controls = self.status_text.controls[-50:]
+    
     def show_status_safe(self, message, level="info"):
         """Thread-safe version of show_status for background threads."""
         try:
@@ -897,16 +1102,15 @@ class ModernIDFProcessorGUI:
         else:
             self.is_animating_reports = True
             
-        self.animation_step = 0
         import time
         self.animation_start_time = time.time()
-        self._animate_progress_bar(progress_bar_type)
+        # One frame per dispatcher frame instead of a new timer thread every 50 ms
+        self.ui_dispatcher.set_frame_callback("progress_animation",
+                                              lambda now: self._animate_progress_bar(progress_bar_type))
     
     def stop_progress_animation(self):
         """Stop the progress bar animation."""
-        if self.animation_timer:
-            self.animation_timer.cancel()
-            self.animation_timer = None
+        self.ui_dispatcher.remove_frame_callback("progress_animation")
         self.is_animating_energyplus = False
         self.is_animating_reports = False
         
@@ -920,7 +1124,7 @@ class ModernIDFProcessorGUI:
             pass  # Ignore if color reset fails
     
     def _animate_progress_bar(self, progress_bar_type):
-        """Internal method to create modern indeterminate loading animation."""
+        """Internal method to create modern indeterminate loading animation (one frame, on the UI dispatcher thread)."""
         import math
         import time
         
@@ -970,17 +1174,9 @@ class ModernIDFProcessorGUI:
                         target_progress_bar.color = ft.Colors.with_opacity(color_intensity, ft.Colors.PRIMARY)
                 except:
                     pass  # Fallback to basic animation if color animation fails
-                
-            if self.page:
-                self._safe_page_update()
+            # The dispatcher flushes the page after every frame callback
         except Exception as e:
             logger.error(f"Error updating progress animation: {e}")
-        
-        # Schedule next animation frame with higher frequency for smoothness
-        if (progress_bar_type == "energyplus" and self.is_animating_energyplus) or \
-           (progress_bar_type == "reports" and self.is_animating_reports):
-            self.animation_timer = threading.Timer(0.05, lambda: self._animate_progress_bar(progress_bar_type))
-            self.animation_timer.start()
 
     def create_file_picker_field(self, label, file_type="file", on_result=None):
         """Create a modern file picker field."""
@@ -1152,22 +1348,21 @@ class ModernIDFProcessorGUI:
         self.suggestions_list.controls.clear()
         
         if search_text and len(search_text) >= 1:
-            # Filter cities that contain the search text (case-insensitive)
-            matches = []
-            search_lower = search_text.lower()
-            
-            for city in self.city_data.keys():
-                if search_lower in city.lower():
-                    matches.append(city)
-            
-            # Sort matches so that cities starting with the search text come first
-            matches.sort(key=lambda city: (
-                not city.lower().startswith(search_lower),  # Starts with search text first
-                city.lower()  # Then alphabetical
-            ))
-            
             # Limit to 8 items to fit nicely in the dropdown
-            matches = matches[:8]
+            if self.city_index:
+                # Ranked lookup tolerant to spelling variants, typos and Latin transliteration
+                matches = self.city_index.search(search_text, limit=8)
+            else:
+                # Index still building: filter cities that contain the search text (case-insensitive)
+                search_lower = search_text.lower()
+                matches = [city for city in self.city_data.keys() if search_lower in city.lower()]
+                
+                # Sort matches so that cities starting with the search text come first
+                matches.sort(key=lambda city: (
+                    not city.lower().startswith(search_lower),  # Starts with search text first
+                    city.lower()  # Then alphabetical
+                ))
+                matches = matches[:8]
             
             if matches:
                 for city in matches:
@@ -1478,6 +1673,98 @@ class ModernIDFProcessorGUI:
         
         return dropdown
 
+    def create_profile_switch(self):
+        """Create the run profiling toggle (timings.json per job)."""
+        
+        def on_profile_change(e):
+            self.profile_mode = bool(e.control.value)
+            if self.profile_mode:
+                self.show_status("מצב פרופיילינג הופעל - קובץ timings.json יישמר ליד הדוחות")
+            self._debounced_save_settings()
+        
+        return ft.Switch(
+            label="מדידת ביצועים (timings.json)",
+            value=self.profile_mode,
+            on_change=on_profile_change
+        )
+
+    def create_climate_sweep_switch(self):
+        """Create the climate sweep toggle (rate the model in every climate zone)."""
+        
+        def on_climate_sweep_change(e):
+            self.climate_sweep_mode = bool(e.control.value)
+            if self.climate_sweep_mode:
+                self.show_status("מצב השוואת אזורי אקלים הופעל - המודל ידורג בכל אזורי האקלים במקביל")
+            self._debounced_save_settings()
+        
+        return ft.Switch(
+            label="השוואת כל אזורי האקלים",
+            value=self.climate_sweep_mode,
+            on_change=on_climate_sweep_change
+        )
+
+    def create_lean_simulation_switch(self):
+        """Create the lean simulation toggle (strip outputs the reports do not read)."""
+        
+        def on_lean_simulation_change(e):
+            self.lean_simulation_mode = bool(e.control.value)
+            if self.lean_simulation_mode:
+                self.show_status("סימולציה רזה הופעלה - פלטים שהדוחות לא קוראים יוסרו מעותק הסימולציה")
+            self._debounced_save_settings()
+        
+        return ft.Switch(
+            label="סימולציה רזה (פלטים נדרשים בלבד)",
+            value=self.lean_simulation_mode,
+            on_change=on_lean_simulation_change
+        )
+
+    def create_export_excel_switch(self):
+        """Create the Excel export toggle (extracted tables to extracted-data.xlsx)."""
+        
+        def on_export_excel_change(e):
+            self.export_excel_mode = bool(e.control.value)
+            if self.export_excel_mode:
+                self.show_status("ייצוא Excel הופעל - כל הטבלאות שחולצו ייכתבו ל-extracted-data.xlsx")
+            self._debounced_save_settings()
+        
+        is_enabled = license_manager.is_feature_enabled("export_excel")
+        return ft.Switch(
+            label="ייצוא נתונים ל-Excel" if is_enabled else "ייצוא נתונים ל-Excel (דורש רישיון מקצועי)",
+            value=self.export_excel_mode and is_enabled,
+            disabled=not is_enabled,
+            on_change=on_export_excel_change
+        )
+
+    def create_sqlite_output_switch(self):
+        """Create the SQLite output toggle (read simulation results from eplusout.sql)."""
+        
+        def on_sqlite_output_change(e):
+            self.sqlite_output_mode = bool(e.control.value)
+            if self.sqlite_output_mode:
+                self.show_status("פלט SQLite הופעל - תוצאות הסימולציה ייקראו מ-eplusout.sql")
+            self._debounced_save_settings()
+        
+        return ft.Switch(
+            label="קריאת תוצאות סימולציה מ-SQLite",
+            value=self.sqlite_output_mode,
+            on_change=on_sqlite_output_change
+        )
+
+    def create_pipeline_switch(self):
+        """Create the pipelined processing toggle (parse while EnergyPlus runs)."""
+        
+        def on_pipeline_change(e):
+            self.pipeline_mode = bool(e.control.value)
+            if self.pipeline_mode:
+                self.show_status("מצב עיבוד במקביל הופעל - המודל יעובד בזמן שהסימולציה רצה")
+            self._debounced_save_settings()
+        
+        return ft.Switch(
+            label="עיבוד במקביל לסימולציה",
+            value=self.pipeline_mode,
+            on_change=on_pipeline_change
+        )
+
     def update_form_validation(self):
         """Update form validation and button state."""
         if not self.process_button:
@@ -1846,7 +2133,13 @@ class ModernIDFProcessorGUI:
                 'project_name': self.project_name,
                 'project_gush': self.project_gush,
                 'project_helka': self.project_helka,
-            }
+            },
+            'profile': self.profile_mode,
+            'pipeline': self.pipeline_mode,
+            'climate_sweep': self.climate_sweep_mode,
+            'lean_simulation': self.lean_simulation_mode,
+            'sqlite_output': self.sqlite_output_mode,
+            'export_excel': self.export_excel_mode
         }
         
         # Add job to queue
@@ -1859,6 +2152,7 @@ class ModernIDFProcessorGUI:
 
     def process_files(self):
         """Process files in background thread."""
+        simulation_future = None
         try:
             # Generate run ID
             run_id = datetime.now().strftime('%d-%m-%Y-%H-%M-%S')
@@ -1895,26 +2189,44 @@ class ModernIDFProcessorGUI:
             if os.path.exists(simulation_dir):
                 logger.info(f"SIMULATION DEBUG - Directory contents before simulation: {os.listdir(simulation_dir)}")
             
-            # Run EnergyPlus simulation
-            simulation_output_csv = self.run_energyplus_simulation(epw_file, simulation_dir)
-            
-            # Debug: Check simulation directory after running EnergyPlus
-            if os.path.exists(simulation_dir):
-                logger.info(f"SIMULATION DEBUG - Directory contents after simulation: {os.listdir(simulation_dir)}")
-                logger.info(f"SIMULATION DEBUG - CSV file path returned: {simulation_output_csv}")
-                if simulation_output_csv and os.path.exists(simulation_output_csv):
-                    logger.info(f"SIMULATION DEBUG - CSV file exists and size: {os.path.getsize(simulation_output_csv)} bytes")
-                else:
-                    logger.warning(f"SIMULATION DEBUG - CSV file does not exist at returned path: {simulation_output_csv}")
-            
-            if not simulation_output_csv:
-                self.show_status("סימולציית EnergyPlus נכשלה או שקבצי הפלט לא נמצאו. הדוחות יופקו בלי נתוני סימולציה.", "warning")
+            profiler = create_profiler(self.profile_mode)
+            # Files linked versus copied for this run, by the simulation and the run folder setup
+            staging_stats = StagingStats()
+            
+            simulation_output_csv = None
+            if self.pipeline_mode:
+                self.show_status("מעבד את המודל במקביל לסימולציית EnergyPlus...")
+                simulation_future = self._start_pipelined_simulation(epw_file, simulation_dir, profiler,
+                                                                     lean=self.lean_simulation_mode,
+                                                                     sqlite_output=self.sqlite_output_mode,
+                                                                     staging_stats=staging_stats)
+            else:
+                # Run EnergyPlus simulation
+                with profiler.stage("energyplus", "simulation"):
+                    simulation_output_csv = self.run_energyplus_simulation(epw_file, simulation_dir,
+                                                                           lean=self.lean_simulation_mode,
+                                                                           sqlite_output=self.sqlite_output_mode,
+                                                                           staging_stats=staging_stats)
+                
+                # Debug: Check simulation directory after running EnergyPlus
+                if os.path.exists(simulation_dir):
+                    logger.info(f"SIMULATION DEBUG - Directory contents after simulation: {os.listdir(simulation_dir)}")
+                    logger.info(f"SIMULATION DEBUG - CSV file path returned: {simulation_output_csv}")
+                    if simulation_output_csv and os.path.exists(simulation_output_csv):
+                        logger.info(f"SIMULATION DEBUG - CSV file exists and size: {os.path.getsize(simulation_output_csv)} bytes")
+                    else:
+                        logger.warning(f"SIMULATION DEBUG - CSV file does not exist at returned path: {simulation_output_csv}")
+                
+                if not simulation_output_csv:
+                    self.show_status("סימולציית EnergyPlus נכשלה או שקבצי הפלט לא נמצאו. הדוחות יופקו בלי נתוני סימולציה.", "warning")
             
             # Initialize ProcessingManager
             self.processing_manager = ProcessingManager(
                 status_callback=self.show_status,
                 progress_callback=self.update_progress,
-                simulation_output_csv=simulation_output_csv
+                simulation_output_csv=simulation_output_csv,
+                profiler=profiler,
+                staging_stats=staging_stats
             )
             
             # Set city info
@@ -1939,11 +2251,14 @@ class ModernIDFProcessorGUI:
                 'project_helka': self.project_helka,
                 'iso_type': self.selected_iso
             }
+            self.processing_manager.export_excel = (self.export_excel_mode and
+                                                    license_manager.is_feature_enabled("export_excel"))
             
             # Process IDF and generate reports
             self.show_status("מתחיל עיבוד IDF ויצירת דוחות...")
-            # Start loading animation for reports progress
-            self.start_progress_animation("reports")
+            # Start loading animation for reports progress (pipelined runs keep the EnergyPlus one)
+            if simulation_future is None:
+                self.start_progress_animation("reports")
             
             # Convert Hebrew ISO selection back to English for processing
             english_iso = self.iso_map.get(self.selected_iso, self.selected_iso)
@@ -1954,7 +2269,8 @@ class ModernIDFProcessorGUI:
                 os.path.join(self.energyplus_dir, "Energy+.idd"),
                 self.output_dir,
                 run_id,
-                self.energyplus_dir
+                self.energyplus_dir,
+                simulation_future=simulation_future
             )
             
             if success:
@@ -1980,6 +2296,8 @@ class ModernIDFProcessorGUI:
                                          input_file=self.input_file, 
                                          output_dir=self.output_dir)
         finally:
+            if simulation_future is not None:
+                concurrent.futures.wait([simulation_future])
             self.reset_gui_state()
 
     def determine_epw_file(self):
@@ -2066,8 +2384,42 @@ OUTPUT:VARIABLE,
             logger.error(f"Error in _ensure_idf_output_variables: {e}", exc_info=True)
             return False  # Indicate failure
 
-    def run_energyplus_simulation(self, epw_file, simulation_dir):
-        """Run EnergyPlus simulation using the same logic as original GUI."""
+    def _start_pipelined_simulation(self, epw_file, simulation_dir, profiler, lean=False, sqlite_output=False,
+                                    staging_stats=None):
+        """
+        Start the EnergyPlus simulation on a background thread for a pipelined run.
+
+        Returns once the output variables were injected into the input IDF, so
+        the model is never parsed while that file is being rewritten.
+
+        Returns:
+            concurrent.futures.Future resolving to the eplustbl.csv path, or None if the simulation failed
+        """
+        input_ready = threading.Event()
+
+        def simulate():
+            with profiler.stage("energyplus", "simulation"):
+                return self.run_energyplus_simulation(epw_file, simulation_dir, input_ready=input_ready,
+                                                      lean=lean, sqlite_output=sqlite_output,
+                                                      staging_stats=staging_stats)
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="energyplus")
+        simulation_future = executor.submit(simulate)
+        executor.shutdown(wait=False)
+        input_ready.wait()
+        return simulation_future
+
+    def run_energyplus_simulation(self, epw_file, simulation_dir, input_ready=None, lean=False, sqlite_output=False,
+                                  staging_stats=None):
+        """
+        Run EnergyPlus simulation using the same logic as original GUI.
+
+        Args:
+            input_ready: Optional threading.Event set once the input IDF is no longer being modified
+            lean: Simulate a lean copy of the model in simulation_dir (see utils.lean_simulation)
+            sqlite_output: Simulate a copy that requests Output:SQLite, so the results are read from eplusout.sql
+            staging_stats: Optional StagingStats counting the files staged for Unicode paths
+        """
         import os  # Explicit import to avoid scope issues
         self.show_status("מתחיל סימולציית EnergyPlus...")
         
@@ -2093,6 +2445,16 @@ OUTPUT:VARIABLE,
             # Inject OUTPUT:VARIABLE entries directly into user's IDF file
             self.show_status("מזריק משתני פלט נדרשים ל-IDF לפני סימולציה...")
             self._inject_output_variables_to_user_idf()
+            if input_ready is not None:
+                input_ready.set()
+            
+            if lean or sqlite_output:
+                from utils.lean_simulation import write_simulation_copy
+                copy_prefix = "lean" if lean else "sqlite"
+                safe_idf_path = os.path.join(simulation_dir, f"{copy_prefix}-{os.path.basename(self.input_file)}")
+                lean_stats = write_simulation_copy(self.input_file, safe_idf_path, lean=lean, sqlite_output=sqlite_output)
+                if lean_stats:
+                    self.show_status(f"סימולציה רזה: הוסרו {lean_stats.total_removed} אובייקטי פלט ו-{len(lean_stats.removed_reports)} דוחות טבלאיים")
             
             if self.energyplus_progress:
                 self.energyplus_progress.value = 0.2
@@ -2100,9 +2462,9 @@ OUTPUT:VARIABLE,
                     self._safe_page_update()
 
             # Check if paths contain Hebrew/Unicode characters and create safe copies if needed
-            if contains_non_ascii(self.input_file):
+            if contains_non_ascii(safe_idf_path):
                 self.show_status("נתיב IDF מכיל תווי Unicode/עברית, יוצר עותק ASCII בטוח עבור EnergyPlus...")
-                safe_idf_path, idf_cleanup = create_safe_path_for_energyplus(self.input_file)
+                safe_idf_path, idf_cleanup = create_safe_path_for_energyplus(safe_idf_path, stats=staging_stats)
                 self.show_status(f"משתמש בנתיב IDF בטוח: {safe_idf_path}")
             
             if contains_non_ascii(simulation_dir):
@@ -2187,7 +2549,7 @@ OUTPUT:VARIABLE,
                         self.show_status("מעביר קבצי פלט של סימולציה בחזרה לתיקיית Unicode המקורית...")
                         logger.info(f"ENERGYPLUS DEBUG - Moving files from {safe_output_dir} to {simulation_dir}")
                         from utils.path_utils import move_simulation_files_back
-                        if move_simulation_files_back(safe_output_dir, simulation_dir):
+                        if move_simulation_files_back(safe_output_dir, simulation_dir, staging_stats):
                             self.show_status("העברת קבצי סימולציה לתיקייה המקורית הושלמה בהצלחה")
                             logger.info(f"ENERGYPLUS DEBUG - Successfully moved files to final directory")
                             # Check what files are now in the final directory
@@ -2241,6 +2603,9 @@ OUTPUT:VARIABLE,
             self.show_status(f"שגיאה לא צפויה במהלך הסימולציה: {type(sim_e).__name__} - {str(sim_e)}", "error")
             logger.error(f"Unexpected error in run_energyplus_simulation: {sim_e}", exc_info=True)
         finally:
+            if input_ready is not None:
+                input_ready.set()
+            
             # Always stop the progress animation
             self.stop_progress_animation()
             
@@ -2280,6 +2645,7 @@ OUTPUT:VARIABLE,
     def build_ui(self, page: ft.Page):
         """Build the modern UI."""
         self.page = page
+        self.ui_dispatcher.start()
         page.title = "מחולל דוחות IDF"
         page.theme_mode = ft.ThemeMode.SYSTEM
         page.rtl = True  # Enable RTL layout for the entire page
@@ -2487,6 +2853,12 @@ OUTPUT:VARIABLE,
                     ft.Text("הגדרת ניתוח", size=20, weight=ft.FontWeight.BOLD, rtl=True, text_align=ft.TextAlign.RIGHT),
                     city_autocomplete_container,
                     self.iso_dropdown,
+                    self.create_profile_switch(),
+                    self.create_pipeline_switch(),
+                    self.create_climate_sweep_switch(),
+                    self.create_lean_simulation_switch(),
+                    self.create_sqlite_output_switch(),
+                    self.create_export_excel_switch(),
                     ft.Container(height=50)  # Better spacing
                 ], spacing=15, scroll=ft.ScrollMode.AUTO),
                 padding=20,
@@ -2680,7 +3052,8 @@ OUTPUT:VARIABLE,
         self.update_form_validation()
         self.show_status(f"ברוכים הבאים! גרסה {self.current_version} - הגדירו את כל השדות כדי להתחיל בעיבוד.")
         
-        # Initialize queue display
+        # Initialize queue display and continue jobs left by a previous session
+        self.resume_persisted_jobs()
         self.update_queue_display()
         
         # Check for updates automatically and show website popup if available
@@ -0,0 +1,341 @@
+"""
+Parametric variant runner.
+Applies small patches to the loaded epJSON (swap a construction, change a glazing
+U-factor, change a schedule, ...), simulates every variant on a process pool and
+ranks the variants by energy rating. The base model is loaded once; each variant's
+DataLoader shares the caches its patches do not touch.
+
+Variants file format:
+    {
+      "variants": [
+        {"name": "low-e-glazing", "patches": [
+          {"object_type": "WindowMaterial:SimpleGlazingSystem", "name": "Glazing",
+           "fields": {"u_factor": 1.8}}]},
+        {"name": "insulated-walls", "patches": [
+          {"object_type": "BuildingSurface:Detailed", "name": "*",
+           "where": {"construction_name": "ExtWall"},
+           "fields": {"construction_name": "ExtWall-Insulated"}}]}
+      ]
+    }
+
+"name": "*" patches every object of the type matching the optional "where" fields;
+"create": true adds the object when it does not exist (e.g. a new Construction).
+"""
+import concurrent.futures
+import copy
+import csv
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from utils.data_loader import DataLoader
+from utils.energyplus_runner import SimulationResult, run_energyplus
+from utils.epjson_handler import EPJSONHandler
+from utils.lean_simulation import add_sqlite_output_epjson, make_lean_epjson
+from utils.logging_config import get_logger
+from utils.path_utils import get_data_file_path
+from utils.profiler import NullProfiler
+from parsers.materials_parser import MaterialsParser
+from parsers.area_parser import AreaParser
+from parsers.energy_rating_parser import EnergyRatingParser
+from generators.energy_rating_report_generator import calculate_energy_rating_score
+from climate_sweep import derive_model_year, get_climate_zones, get_epw_filename
+
+logger = get_logger(__name__)
+
+BASELINE_VARIANT_NAME = "baseline"
+
+VARIANTS_RESULTS_FILENAME = "variants.json"
+VARIANTS_CSV_FILENAME = "variants.csv"
+VARIANTS_CSV_FIELDS = ("rank", "name", "score", "grade", "simulation_s", "patched_types", "error")
+
+
+def load_variants(variants_file: str) -> List[Dict[str, Any]]:
+    """
+    Read and validate a variants JSON file.
+
+    Returns:
+        The variant definitions, each with 'name' and 'patches'
+
+    Raises:
+        ValueError: If the file is malformed or variant names are missing or repeated
+    """
+    with open(variants_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    variants = data.get('variants') if isinstance(data, dict) else data
+    if not isinstance(variants, list) or not variants:
+        raise ValueError(f"{variants_file} must contain a non-empty 'variants' list")
+
+    names = set()
+    for index, variant in enumerate(variants, start=1):
+        name = str(variant.get('name', '')).strip() if isinstance(variant, dict) else ''
+        if not name:
+            raise ValueError(f"Variant {index} has no name")
+        if name in names or name == BASELINE_VARIANT_NAME:
+            raise ValueError(f"Variant name '{name}' is used more than once or is reserved")
+        if not isinstance(variant.get('patches'), list) or not variant['patches']:
+            raise ValueError(f"Variant '{name}' has no patches")
+        names.add(name)
+    return variants
+
+
+def apply_patches(epjson_data: Dict[str, Any], patches: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, Any], Set[str]]:
+    """
+    Apply patches to a copy of an epJSON model.
+
+    Only the patched object types are deep-copied; every other section is shared
+    with epjson_data, which is left unchanged.
+
+    Returns:
+        (variant epJSON, set of patched object types)
+
+    Raises:
+        ValueError: If a patch is malformed or matches no object
+    """
+    variant = dict(epjson_data)
+    changed_object_types = set()
+    for index, patch in enumerate(patches, start=1):
+        object_type = patch.get('object_type')
+        name = patch.get('name')
+        fields = patch.get('fields')
+        if not object_type or not name or not isinstance(fields, dict) or not fields:
+            raise ValueError(f"Patch {index}: 'object_type', 'name' and 'fields' are required")
+
+        if object_type not in changed_object_types:
+            variant[object_type] = copy.deepcopy(epjson_data.get(object_type, {}))
+            changed_object_types.add(object_type)
+        section = variant[object_type]
+
+        if name == '*':
+            where = patch.get('where') or {}
+            targets = [obj for obj in section.values()
+                       if all(obj.get(field) == value for field, value in where.items())]
+        elif name in section:
+            targets = [section[name]]
+        elif patch.get('create'):
+            section[name] = {}
+            targets = [section[name]]
+        else:
+            targets = []
+        if not targets:
+            raise ValueError(f"Patch {index}: no {object_type} object matches '{name}'")
+
+        for obj in targets:
+            obj.update(copy.deepcopy(fields))
+    return variant, changed_object_types
+
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort variant results best score first (unrated last) and number them."""
+    ranked = sorted(results, key=lambda result: (result['score'] is None, -(result['score'] or 0)))
+    for rank, result in enumerate(ranked, start=1):
+        result['rank'] = rank if result['score'] is not None else None
+    return ranked
+
+
+class ParametricRun:
+    """
+    Simulates patched variants of one model and ranks them by energy rating.
+
+    Variant models are built in memory from the base epJSON and written to their
+    own folders. EnergyPlus runs are supervised by a process pool; each variant is
+    rated on the calling thread as its simulation finishes, with a DataLoader
+    derived from the base model (see DataLoader.derive_variant).
+    """
+
+    def __init__(self, input_file: str, variants: List[Dict[str, Any]], output_dir: str,
+                 energyplus_dir: str, iso_type: str, zone: str,
+                 max_workers: Optional[int] = None,
+                 status_callback: Optional[Callable[[str], None]] = None,
+                 profiler=None, run_id: Optional[str] = None, project_name: Optional[str] = None,
+                 lean_simulation: bool = False, sqlite_output: bool = False):
+        """
+        Initialize the run.
+
+        Args:
+            input_file: IDF or EPJSON model
+            variants: Variant definitions (see load_variants); the unpatched model is added as 'baseline'
+            output_dir: Base output directory; the run writes into its own subfolder
+            energyplus_dir: EnergyPlus installation directory
+            iso_type: ISO type the variants are rated against (e.g. "RESIDNTIAL 2023")
+            zone: Climate zone whose weather file is simulated
+            max_workers: Concurrent simulations; defaults to one per variant, capped at the CPU count
+            status_callback: Called with status messages
+            profiler: Optional RunProfiler
+            run_id: Optional pre-generated run ID
+            project_name: Name used for the output folder; defaults to the input file name
+            lean_simulation: Simulate with the lean output profile (see utils.lean_simulation)
+            sqlite_output: Request Output:SQLite and read the results from eplusout.sql
+
+        Raises:
+            ValueError: If the ISO type has no energy rating model or the zone is unknown
+        """
+        self.input_file = input_file
+        self.variants = [{'name': BASELINE_VARIANT_NAME, 'patches': []}] + list(variants)
+        self.output_dir = output_dir
+        self.energyplus_dir = energyplus_dir
+        self.iso_type = iso_type
+        self.model_year = derive_model_year(iso_type)
+        if self.model_year is None:
+            raise ValueError(f"ISO type '{iso_type}' has no energy rating model")
+
+        available_zones = get_climate_zones(self.model_year)
+        self.zone = str(zone or '').upper()
+        if self.zone not in available_zones:
+            raise ValueError(f"Unknown climate zone '{zone}' for {iso_type} "
+                             f"(expected {', '.join(available_zones)})")
+
+        self.max_workers = max_workers or min(len(self.variants), os.cpu_count() or 1)
+        self.status_callback = status_callback
+        self.profiler = profiler or NullProfiler()
+        self.run_id = run_id or datetime.now().strftime('%d-%m-%Y-%H-%M-%S')
+        self.project_name = (project_name or '').strip() or Path(input_file).stem
+        self.lean_simulation = lean_simulation
+        self.sqlite_output = sqlite_output
+        self.run_dir = None
+        self.is_cancelled = False
+
+    def update_status(self, message: str) -> None:
+        """Updates the status via callback if provided."""
+        if self.status_callback:
+            self.status_callback(message)
+
+    def cancel(self) -> None:
+        """Signals that the run should stop; simulations that have not started are dropped."""
+        self.is_cancelled = True
+        self.update_status("בקשה לביטול התקבלה.")
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Run every variant.
+
+        Returns:
+            One result dict per variant, best first, with 'rank', 'name', 'score',
+            'grade', 'simulation_s', 'patched_types', 'output_dir' and 'error' keys.
+
+        Raises:
+            ValueError: If a variant's patches do not apply to the model
+        """
+        safe_project_name = "".join(c for c in self.project_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_project_name = safe_project_name.replace(' ', '-') or "unknown-project"
+        self.run_dir = os.path.join(self.output_dir, f"{safe_project_name}-variants-{self.run_id}")
+        epw_file = get_data_file_path(get_epw_filename(self.zone))
+
+        # The raw sections stay loaded: they are the base every variant is patched from
+        self.update_status("טוען את מודל הבסיס...")
+        with self.profiler.stage("load", "load"):
+            base_loader = DataLoader(energyplus_path=self.energyplus_dir, profiler=self.profiler)
+            base_loader.load_file(self.input_file, energyplus_path=self.energyplus_dir)
+        base_epjson = base_loader.get_epjson_data()
+
+        variant_models = {}
+        with self.profiler.stage("build_variants", "load"):
+            handler = EPJSONHandler(self.energyplus_dir)
+            for variant in self.variants:
+                try:
+                    epjson_data, changed_object_types = apply_patches(base_epjson, variant['patches'])
+                except ValueError as e:
+                    raise ValueError(f"Variant '{variant['name']}': {e}") from e
+                simulation_epjson = epjson_data
+                if self.lean_simulation:
+                    simulation_epjson, lean_stats = make_lean_epjson(epjson_data)
+                    logger.info(f"Variant '{variant['name']}': {lean_stats.summary()}")
+                if self.sqlite_output:
+                    simulation_epjson = add_sqlite_output_epjson(simulation_epjson)
+                variant_dir = self._get_variant_dir(variant['name'])
+                input_path = os.path.join(variant_dir, "input", f"{Path(self.input_file).stem}.epJSON")
+                os.makedirs(os.path.dirname(input_path), exist_ok=True)
+                handler.save_epjson(simulation_epjson, input_path)
+                variant_models[variant['name']] = (epjson_data, changed_object_types, input_path)
+
+        self.update_status(f"מריץ {len(self.variants)} סימולציות וריאנטים ({self.max_workers} במקביל)...")
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(run_energyplus, self.energyplus_dir, input_path, epw_file,
+                                os.path.join(self._get_variant_dir(name), "simulation")): name
+                for name, (_, _, input_path) in variant_models.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                if self.is_cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                name = futures[future]
+                try:
+                    simulation = future.result()
+                except Exception as e:
+                    logger.error(f"Variant '{name}' simulation raised: {e}", exc_info=True)
+                    simulation = SimulationResult(output_dir=os.path.join(self._get_variant_dir(name), "simulation"),
+                                                  error=f"{type(e).__name__}: {e}")
+                epjson_data, changed_object_types, _ = variant_models.pop(name)
+                with self.profiler.stage(f"rate:{name}", "parser"):
+                    result = self._rate_variant(base_loader, name, epjson_data, changed_object_types, simulation)
+                results.append(result)
+                self.update_status(f"וריאנט {name}: {result['grade'] or result['error']}")
+
+        ranked_results = rank_results(results)
+        if not self.is_cancelled:
+            with self.profiler.stage("report:Variants", "report"):
+                self._write_outputs(ranked_results)
+        return ranked_results
+
+    def _get_variant_dir(self, name: str) -> str:
+        safe_name = "".join(c if c.isalnum() or c in ('-', '_') else '-' for c in name)
+        return os.path.join(self.run_dir, f"variant-{safe_name}")
+
+    def _rate_variant(self, base_loader: DataLoader, name: str, epjson_data: Dict[str, Any],
+                      changed_object_types: Set[str], simulation: SimulationResult) -> Dict[str, Any]:
+        """Rates one variant's simulation with a DataLoader derived from the base model."""
+        result = {
+            'rank': None,
+            'name': name,
+            'score': None,
+            'grade': None,
+            'simulation_s': simulation.elapsed_s,
+            'patched_types': ", ".join(sorted(changed_object_types)),
+            'output_dir': os.path.dirname(simulation.output_dir),
+            'error': simulation.error,
+        }
+        if not simulation.success:
+            return result
+
+        try:
+            data_loader = base_loader.derive_variant(epjson_data, changed_object_types,
+                                                     simulation_output_dir=result['output_dir'])
+            # HVAC zone flags come from each run's eplustbl.csv
+            data_loader.refresh_simulation_outputs()
+            materials_parser = MaterialsParser(data_loader)
+            area_parser = AreaParser(data_loader, materials_parser, simulation.output_csv)
+            energy_rating_parser = EnergyRatingParser(data_loader, area_parser)
+            energy_rating_parser.process_output(simulation.output_csv)
+            result['score'], result['grade'] = calculate_energy_rating_score(
+                energy_rating_parser, self.model_year, self.zone)
+            if result['score'] is None:
+                result['error'] = "No energy rating data"
+        except Exception as e:
+            logger.error(f"Failed to rate variant '{name}': {e}", exc_info=True)
+            result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    def _write_outputs(self, results: List[Dict[str, Any]]) -> None:
+        """Writes variants.json and variants.csv into the run folder."""
+        summary = {
+            'input_file': os.path.abspath(self.input_file),
+            'iso_type': self.iso_type,
+            'model_year': self.model_year,
+            'zone': self.zone,
+            'run_id': self.run_id,
+            'max_workers': self.max_workers,
+            'variants': self.variants,
+            'results': results,
+        }
+        with open(os.path.join(self.run_dir, VARIANTS_RESULTS_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        with open(os.path.join(self.run_dir, VARIANTS_CSV_FILENAME), 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=VARIANTS_CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(results)
+        self.update_status(f"דירוג הווריאנטים נשמר ב-{self.run_dir}")
@@ -889,10 +889,8 @@ class AreaParser(SurfaceDataParser):
 
                     for construction_name, construction_data in constructions_in_zone.items():
                         try:
-                            # Filter surfaces to only include those from current zone for accurate element type detection
-                            zone_surfaces = {k: v for k, v in surfaces.items() 
-                                           if v.get('zone_name', '').lower() == zone_id.lower()}
-                            determined_element_types, dont_use = parser_to_use._get_element_type(construction_name, zone_surfaces)
+                            # Element types of the construction within the current zone only
+                            determined_element_types, dont_use = parser_to_use.get_element_types(construction_name, zone_id, surfaces)
                             if dont_use or not determined_element_types:
                                 continue
 
@@ -1025,10 +1023,8 @@ class AreaParser(SurfaceDataParser):
 
                     for construction_name, construction_data in constructions_in_zone.items():
                         try:
-                            # Filter surfaces to only include those from current zone for accurate element type detection
-                            zone_surfaces = {k: v for k, v in surfaces.items() 
-                                           if v.get('zone_name', '').lower() == zone_id.lower()}
-                            determined_element_types, dont_use = parser_to_use._get_element_type(construction_name, zone_surfaces)
+                            # Element types of the construction within the current zone only
+                            determined_element_types, dont_use = parser_to_use.get_element_types(construction_name, zone_id, surfaces)
                             if dont_use or not determined_element_types:
                                 continue
 
@@ -1410,10 +1406,8 @@ class AreaParser(SurfaceDataParser):
 
                     for construction_name, construction_data in constructions_in_zone.items():
                         try:
-                            # Filter surfaces to only include those from current zone for accurate element type detection
-                            zone_surfaces = {k: v for k, v in surfaces.items() 
-                                           if v.get('zone_name', '').lower() == zone_id.lower()}
-                            determined_element_types, dont_use = parser_to_use._get_element_type(construction_name, zone_surfaces)
+                            # Element types of the construction within the current zone only
+                            determined_element_types, dont_use = parser_to_use.get_element_types(construction_name, zone_id, surfaces)
                             if dont_use or not determined_element_types:
                                 continue
 
@@ -1752,10 +1746,8 @@ class AreaParser(SurfaceDataParser):
 
                     for construction_name, construction_data in constructions_in_zone.items():
                         try:
-                            # Filter surfaces to only include those from current zone for accurate element type detection
-                            zone_surfaces = {k: v for k, v in surfaces.items() 
-                                           if v.get('zone_name', '').lower() == zone_id.lower()}
-                            determined_element_types, dont_use = parser_to_use._get_element_type(construction_name, zone_surfaces)
+                            # Element types of the construction within the current zone only
+                            determined_element_types, dont_use = parser_to_use.get_element_types(construction_name, zone_id, surfaces)
                             if dont_use or not determined_element_types:
                                 continue
 
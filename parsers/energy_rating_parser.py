@@ -8,6 +8,9 @@ import logging
 from parsers.area_parser import AreaParser
 from .utils import safe_float
 from .base_parser import CSVOutputParser
+from .eplussql_reader import read_run_period_values_from_sql
+from .output_header_index import OutputColumnIndex
+from utils.lean_simulation import REQUIRED_OUTPUT_VARIABLES
 
 logger = logging.getLogger(__name__)
 
@@ -103,7 +106,11 @@ class EnergyRatingParser(CSVOutputParser):
                 else:
                     self.logger.warning(f"eplustbl.csv provided, but eplusout.csv not found in the same directory ({os.path.dirname(final_output_file_path)}).")
 
-            if not final_output_file_path or not os.path.exists(final_output_file_path):
+            # Prefer the RunPeriod values in eplusout.sql when the simulation wrote one
+            sql_values = read_run_period_values_from_sql(final_output_file_path or output_file_path,
+                                                         REQUIRED_OUTPUT_VARIABLES)
+
+            if sql_values is None and (not final_output_file_path or not os.path.exists(final_output_file_path)):
                 self.logger.error(f"PROCESS_OUTPUT DEBUG - EnergyPlus output file (eplusout.csv) not found. Tried path: {final_output_file_path if final_output_file_path else 'auto-detection failed'}.")
                 # Log all candidate paths that were tried
                 if 'candidate_paths' in locals():
@@ -121,27 +128,30 @@ class EnergyRatingParser(CSVOutputParser):
             else:
                 pass
 
-            with open(final_output_file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                headers = next(reader, None)
-                if headers is None:
-                    self.logger.error(f"CSV file '{final_output_file_path}' is empty or has no headers.")
-                    self.processed = False
-                    return
-
-                # Log a sample of headers to see what we're working with
-                sample_headers = headers[:5] + (['...'] if len(headers) > 5 else [])
-
-                last_row = None
-                for row in reader:
-                    last_row = row
-
-                if not last_row:
-                    self.logger.error(f"No data rows found in EnergyPlus output file '{final_output_file_path}'.")
-                    self.processed = False
-                    return
-
-                self._process_headers_and_values(headers, last_row)
+            if sql_values is not None:
+                self._process_headers_and_values(*sql_values)
+            else:
+                with open(final_output_file_path, 'r', encoding='utf-8') as csvfile:
+                    reader = csv.reader(csvfile)
+                    headers = next(reader, None)
+                    if headers is None:
+                        self.logger.error(f"CSV file '{final_output_file_path}' is empty or has no headers.")
+                        self.processed = False
+                        return
+
+                    # Log a sample of headers to see what we're working with
+                    sample_headers = headers[:5] + (['...'] if len(headers) > 5 else [])
+
+                    last_row = None
+                    for row in reader:
+                        last_row = row
+
+                    if not last_row:
+                        self.logger.error(f"No data rows found in EnergyPlus output file '{final_output_file_path}'.")
+                        self.processed = False
+                        return
+
+                    self._process_headers_and_values(headers, last_row)
             self._calculate_totals()
             self.processed = True
 
@@ -181,7 +191,10 @@ class EnergyRatingParser(CSVOutputParser):
         skipped_headers = []
         # No pattern validation needed for containment-based approach
 
-        all_zones_data_from_loader = self.data_loader.get_zones()
+        zones = self.data_loader.get_zones() if hasattr(self.data_loader, 'get_zones') else {}
+        all_zones_data_from_loader = zones
+        # Attribute every header to the longest zone name it contains, in one pass per header
+        column_index = OutputColumnIndex(headers, zones.keys())
         
         # Track processing stats for debugging
         total_headers_with_X = 0
@@ -199,21 +212,9 @@ class EnergyRatingParser(CSVOutputParser):
                 if i <= 20:
                     self.logger.debug(f"HEADER DEBUG [{i}]: '{header}'")
                 
-                # Simple containment check - zone_id + energy type
-                zones = self.data_loader.get_zones() if hasattr(self.data_loader, 'get_zones') else {}
-                matched_zone_key = None
-                
-                # Find the longest/most specific zone match in the header
+                # The longest/most specific zone name in the header
                 # This prevents partial matches like '06XCR' matching '06XCRIN' headers
-                matched_zone_key = None
-                longest_match_length = 0
-                
-                for zone_name in zones.keys():
-                    if zone_name in header:
-                        # Only use this match if it's longer (more specific) than previous matches
-                        if len(zone_name) > longest_match_length:
-                            matched_zone_key = zone_name
-                            longest_match_length = len(zone_name)
+                matched_zone_key = column_index.zone_at(i)
                 
                 if matched_zone_key:
                     found_zones.add(matched_zone_key)
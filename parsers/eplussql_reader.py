@@ -0,0 +1,183 @@
+"""
+Utility to read EnergyPlus eplusout.sql output files.
+
+When a simulation runs with Output:SQLite (see utils.lean_simulation.add_sqlite_output_idf),
+EnergyPlus writes every tabular report and reported variable to eplusout.sql next to
+eplustbl.csv. This module reads the same data the CSV readers scan for:
+
+1. Tabular report tables (TabularData/Strings, the tables behind the TabularDataWithStrings
+   view), looked up by report and table name instead of scanning eplustbl.csv
+2. RunPeriod variable values (ReportData/ReportDataDictionary), returned in the
+   eplusout.csv header/last-row shape the energy rating parser reads
+
+Every function returns None when there is no eplusout.sql or it cannot be read, so
+callers fall back to the CSV readers.
+"""
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SQL_OUTPUT_FILENAME = "eplusout.sql"
+ENTIRE_FACILITY = "Entire Facility"
+RUN_PERIOD_FREQUENCY = "Run Period"
+
+# Created once per database; EnergyPlus itself only indexes the primary keys
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idf_reader_tabular_report_table ON TabularData (ReportNameIndex, TableNameIndex)",
+    "CREATE INDEX IF NOT EXISTS idf_reader_strings_value ON Strings (Value)",
+    "CREATE INDEX IF NOT EXISTS idf_reader_report_data_dictionary ON ReportData (ReportDataDictionaryIndex)",
+)
+
+_TABLE_QUERY = """
+    SELECT td.RowId, row_name.Value, column_name.Value, units.Value, td.Value
+    FROM TabularData td
+    JOIN Strings row_name ON row_name.StringIndex = td.RowNameIndex
+    JOIN Strings column_name ON column_name.StringIndex = td.ColumnNameIndex
+    LEFT JOIN Strings units ON units.StringIndex = td.UnitsIndex
+    WHERE td.ReportNameIndex IN (SELECT StringIndex FROM Strings WHERE Value = ?)
+      AND td.TableNameIndex IN (SELECT StringIndex FROM Strings WHERE Value = ?)
+      AND td.ReportForStringIndex IN (SELECT StringIndex FROM Strings WHERE Value = ?)
+    ORDER BY td.RowId, td.ColumnId
+"""
+
+_RUN_PERIOD_QUERY = """
+    SELECT d.KeyValue, d.Name, d.Units, r.Value
+    FROM ReportDataDictionary d
+    JOIN ReportData r ON r.ReportDataDictionaryIndex = d.ReportDataDictionaryIndex
+    WHERE d.ReportingFrequency = ? AND d.Name IN ({placeholders})
+    ORDER BY d.ReportDataDictionaryIndex, r.TimeIndex
+"""
+
+
+def find_sql_output(output_path: Optional[str]) -> Optional[str]:
+    """
+    Return the eplusout.sql written next to an EnergyPlus output file.
+
+    Args:
+        output_path: eplustbl.csv/eplusout.csv path or the simulation output directory
+
+    Returns:
+        Path of eplusout.sql, or None if the simulation did not write one
+    """
+    if not output_path:
+        return None
+    directory = output_path if os.path.isdir(output_path) else os.path.dirname(output_path)
+    sql_path = os.path.join(directory, SQL_OUTPUT_FILENAME)
+    if os.path.exists(sql_path) and os.path.getsize(sql_path) > 0:
+        return sql_path
+    return None
+
+
+class SimulationSQLReader:
+    """Indexed queries against one eplusout.sql file."""
+
+    def __init__(self, sql_path: str):
+        self.sql_path = sql_path
+        self._connection = sqlite3.connect(sql_path)
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        try:
+            for statement in _INDEXES:
+                self._connection.execute(statement)
+            self._connection.commit()
+        except sqlite3.OperationalError as e:
+            # Read-only or locked database: the queries still work, just without the indexes
+            logger.debug(f"Could not index {self.sql_path}: {e}")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read_table(self, report_name: str, table_name: str,
+                   report_for: str = ENTIRE_FACILITY) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Read one tabular report table.
+
+        Column keys are lowercase and carry the units the way eplustbl.csv headers do
+        (e.g. 'area [m2]', 'conditioned (y/n)').
+
+        Returns:
+            [(row name, {column key: value})] in report row order
+        """
+        rows = {}
+        for row_id, row_name, column_name, units, value in self._connection.execute(
+                _TABLE_QUERY, (report_name, table_name, report_for)):
+            column_key = f"{column_name} [{units}]" if units else column_name
+            rows.setdefault(row_id, (row_name, {}))[1][column_key.strip().lower()] = (value or '').strip()
+        return list(rows.values())
+
+    def read_run_period_values(self, variable_names: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Read the RunPeriod values of the given output variables.
+
+        Returns:
+            (headers, values) shaped like the eplusout.csv header row and last row:
+            'KEY:Variable Name [Units](RunPeriod)' with a leading Date/Time column
+        """
+        variable_names = list(variable_names)
+        query = _RUN_PERIOD_QUERY.format(placeholders=", ".join("?" * len(variable_names)))
+        latest = {}
+        for key_value, name, units, value in self._connection.execute(
+                query, (RUN_PERIOD_FREQUENCY, *variable_names)):
+            header = f"{key_value}:{name} [{units}](RunPeriod)" if key_value else f"{name} [{units}](RunPeriod)"
+            latest[header] = value
+        headers = ["Date/Time", *latest.keys()]
+        values = ["", *(str(value) for value in latest.values())]
+        return headers, values
+
+
+def read_table_from_sql(output_path: Optional[str], report_name: str, table_name: str,
+                        report_for: str = ENTIRE_FACILITY) -> Optional[List[Tuple[str, Dict[str, str]]]]:
+    """
+    Read a tabular report table from the eplusout.sql next to output_path.
+
+    Returns:
+        Rows as returned by SimulationSQLReader.read_table, or None if there is no
+        usable eplusout.sql or the table is missing from it
+    """
+    sql_path = find_sql_output(output_path)
+    if not sql_path:
+        return None
+    try:
+        with SimulationSQLReader(sql_path) as reader:
+            rows = reader.read_table(report_name, table_name, report_for)
+    except sqlite3.Error as e:
+        logger.warning(f"Error reading {report_name}/{table_name} from {sql_path}: {e}. Falling back to CSV")
+        return None
+    if not rows:
+        logger.info(f"{report_name}/{table_name} not found in {sql_path}. Falling back to CSV")
+        return None
+    return rows
+
+
+def read_run_period_values_from_sql(output_path: Optional[str],
+                                    variable_names: Iterable[str]) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Read RunPeriod variable values from the eplusout.sql next to output_path.
+
+    Returns:
+        (headers, values) as returned by SimulationSQLReader.read_run_period_values,
+        or None if there is no usable eplusout.sql or none of the variables were reported
+    """
+    sql_path = find_sql_output(output_path)
+    if not sql_path:
+        return None
+    try:
+        with SimulationSQLReader(sql_path) as reader:
+            headers, values = reader.read_run_period_values(variable_names)
+    except sqlite3.Error as e:
+        logger.warning(f"Error reading RunPeriod variables from {sql_path}: {e}. Falling back to CSV")
+        return None
+    if len(headers) <= 1:
+        logger.info(f"No RunPeriod variables found in {sql_path}. Falling back to CSV")
+        return None
+    return headers, values
@@ -9,6 +9,10 @@ generated by EnergyPlus simulations. Currently it extracts:
 
 These values are used in area reports to provide more accurate glazing information
 based on the simulation results rather than the IDF input file values.
+
+When the simulation also wrote eplusout.sql (Output:SQLite), the same tables are
+read from it through indexed queries (see eplussql_reader) and the CSV is only
+scanned as a fallback.
 """
 import csv
 import os
@@ -18,6 +22,10 @@ from utils.logging_config import get_logger
 logger = get_logger(__name__)
 
 from .utils import safe_float
+from .eplussql_reader import read_table_from_sql
+
+# Summary rows EnergyPlus appends to the Zone Summary table
+_ZONE_SUMMARY_TOTAL_ROWS = {"total", "conditioned total", "unconditioned total", "not part of total"}
 
 def _find_csv_path(csv_path: Optional[str]) -> Optional[str]:
     # Check provided path first
@@ -81,8 +89,6 @@ def _parse_exterior_fenestration_table(reader) -> Dict[str, Dict[str, Any]]:
                     headers_found = True
                 continue
             else:
-                suffixes_to_check = ["_WALL", "_ROOF", "_FLOOR", "_WIN", "_DOOR"]
-
                 is_total_row = row[0].strip().lower().endswith("total or average")
                 is_blank_data_row = not row[0].strip() and (len(row) < 2 or not row[1].strip())
                 if is_total_row or is_blank_data_row:
@@ -108,28 +114,44 @@ def _parse_exterior_fenestration_table(reader) -> Dict[str, Dict[str, Any]]:
                     area = safe_float(row[col_indices["area of multiplied openings [m2]"]])
                     u_value = safe_float(row[col_indices["glass u-factor [w/m2-k]"]])
 
-                    derived_zone_name = fenestration_surface_name
-                    found_suffix = False
-                    for suffix in suffixes_to_check:
-                        if suffix in fenestration_surface_name:
-                            derived_zone_name = fenestration_surface_name.split(suffix)[0]
-                            found_suffix = True
-                            break
-                    if not found_suffix and '_' in fenestration_surface_name:
-                        parts = fenestration_surface_name.split('_', 1)
-                        if ':' in parts[0]:
-                            derived_zone_name = parts[0]
-
                     if fenestration_surface_name and construction_name:
                         result[fenestration_surface_name.upper()] = {
                             'Construction': construction_name,
                             'Area': area,
                             'U-Value': u_value,
-                            'DerivedZone': derived_zone_name,
+                            'DerivedZone': _derive_fenestration_zone(fenestration_surface_name),
                             'CardinalDirection': row[col_indices["cardinal direction"]].strip() if "cardinal direction" in col_indices else "Unknown"
                         }
     return result
 
+def _derive_fenestration_zone(fenestration_surface_name: str) -> str:
+    """Derive the zone name from a fenestration surface name (e.g. '00:01XLIVING_WIN1' -> '00:01XLIVING')."""
+    for suffix in ["_WALL", "_ROOF", "_FLOOR", "_WIN", "_DOOR"]:
+        if suffix in fenestration_surface_name:
+            return fenestration_surface_name.split(suffix)[0]
+    if '_' in fenestration_surface_name:
+        parts = fenestration_surface_name.split('_', 1)
+        if ':' in parts[0]:
+            return parts[0]
+    return fenestration_surface_name
+
+def _exterior_fenestration_from_sql(rows) -> Dict[str, Dict[str, Any]]:
+    """Build the _parse_exterior_fenestration_table result from eplusout.sql rows."""
+    result = {}
+    for surface_name, columns in rows:
+        surface_name = surface_name.strip()
+        construction_name = columns.get("construction", "")
+        if not surface_name or surface_name.lower().endswith("total or average") or not construction_name:
+            continue
+        result[surface_name.upper()] = {
+            'Construction': construction_name,
+            'Area': safe_float(columns.get("area of multiplied openings [m2]")),
+            'U-Value': safe_float(columns.get("glass u-factor [w/m2-k]")),
+            'DerivedZone': _derive_fenestration_zone(surface_name),
+            'CardinalDirection': columns.get("cardinal direction", "Unknown")
+        }
+    return result
+
 def _parse_opaque_construction_table(reader, table_name: str) -> Dict[str, Dict[str, Any]]:
     """Parse opaque construction tables (Opaque Exterior or Opaque Interior)"""
     header_map = {
@@ -194,6 +216,38 @@ def _parse_opaque_construction_table(reader, table_name: str) -> Dict[str, Dict[
                         result[construction_name.upper()] = surface_data
     return result
 
+def _opaque_construction_from_sql(rows, table_name: str) -> Dict[str, Dict[str, Any]]:
+    """Build the _parse_opaque_construction_table result from eplusout.sql rows."""
+    result = {}
+    for surface_name, columns in rows:
+        surface_name = surface_name.strip()
+        if not surface_name or surface_name.lower().endswith("total or average"):
+            continue
+        construction_name = columns.get("construction", "")
+        u_factor = columns.get("u-factor with film [w/m2-k]", columns.get("u-factor no film [w/m2-k]"))
+        surface_data = {
+            'Construction': construction_name,
+            'Area': safe_float(columns.get("gross area [m2]")),
+            'U-Factor': safe_float(u_factor),
+            'Type': table_name,
+            'SurfaceName': surface_name
+        }
+        result[surface_name.upper()] = surface_data
+        if construction_name:
+            result[construction_name.upper()] = surface_data
+    return result
+
+def _read_construction_areas_from_sql(csv_path: Optional[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    fenestration_rows = read_table_from_sql(csv_path, "EnvelopeSummary", "Exterior Fenestration")
+    opaque_exterior_rows = read_table_from_sql(csv_path, "EnvelopeSummary", "Opaque Exterior")
+    if fenestration_rows is None and opaque_exterior_rows is None:
+        return None
+    result = _exterior_fenestration_from_sql(fenestration_rows or [])
+    result.update(_opaque_construction_from_sql(opaque_exterior_rows or [], "Opaque Exterior"))
+    opaque_interior_rows = read_table_from_sql(csv_path, "EnvelopeSummary", "Opaque Interior")
+    result.update(_opaque_construction_from_sql(opaque_interior_rows or [], "Opaque Interior"))
+    return result
+
 def read_construction_areas_from_csv(csv_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
     """
     Read both glazing and opaque construction area data from eplustbl.csv.
@@ -204,6 +258,11 @@ def read_construction_areas_from_csv(csv_path: Optional[str] = None) -> Dict[str
     if not resolved_path:
         logger.warning("eplustbl.csv not found - construction areas will use calculated values")
         return result
+    
+    sql_result = _read_construction_areas_from_sql(resolved_path)
+    if sql_result is not None:
+        logger.info(f"Read construction areas for {len(sql_result)} items from eplusout.sql")
+        return sql_result
         
     try:
         with open(resolved_path, 'r', encoding='utf-8', errors='ignore') as csvfile:
@@ -341,10 +400,38 @@ def _parse_zone_summary_table(reader) -> Dict[str, Dict[str, Any]]:
     
     return result
 
+def _zone_summary_from_sql(rows) -> Dict[str, Dict[str, Any]]:
+    """Build the _parse_zone_summary_table result from eplusout.sql rows."""
+    result = {}
+    for zone_name, columns in rows:
+        zone_name = zone_name.strip()
+        if not zone_name or zone_name.lower() in _ZONE_SUMMARY_TOTAL_ROWS:
+            continue
+        area = safe_float(columns.get('area [m2]'), 0.0)
+        multiplier = 1
+        has_hvac = False
+        include_in_energy = False
+        for header, value in columns.items():
+            if 'multiplier' in header:
+                multiplier = int(safe_float(value, 1.0))
+            elif 'conditioned' in header and '(y/n)' in header:
+                has_hvac = value.upper() in ('YES', 'Y')
+            elif 'part of total' in header and '(y/n)' in header:
+                include_in_energy = value.upper() in ('YES', 'Y')
+        if area > 0:
+            result[zone_name] = {
+                'area': area,
+                'multiplier': multiplier,
+                'has_hvac': has_hvac,
+                'include_in_energy': include_in_energy
+            }
+    return result
+
 def read_zone_areas_from_csv(csv_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
     """
     Read zone area data from the eplustbl.csv file Zone Summary table.
     Returns a dictionary mapping zone names to their area data.
+    Reads the table from eplusout.sql instead when the simulation wrote one.
     """
     result = {}
     logger.info(f"CSV PARSE DEBUG: read_zone_areas_from_csv called with path: {csv_path}")
@@ -353,6 +440,12 @@ def read_zone_areas_from_csv(csv_path: Optional[str] = None) -> Dict[str, Dict[s
     if not resolved_path:
         logger.warning("eplustbl.csv not found - zone areas will use calculated values")
         return result
+    
+    sql_rows = read_table_from_sql(resolved_path, "InputVerificationandResultsSummary", "Zone Summary")
+    if sql_rows is not None:
+        result = _zone_summary_from_sql(sql_rows)
+        logger.info(f"Read zone areas for {len(result)} zones from eplusout.sql")
+        return result
         
     try:
         logger.info(f"CSV PARSE DEBUG: Opening CSV file: {resolved_path}")
@@ -384,6 +477,9 @@ def read_glazing_data_from_csv(csv_path: Optional[str] = None) -> Dict[str, Dict
     resolved_path = _find_csv_path(csv_path)
     if not resolved_path:
         raise FileNotFoundError("eplustbl.csv not found in provided path or simulation_output directory.")
+    sql_rows = read_table_from_sql(resolved_path, "EnvelopeSummary", "Exterior Fenestration")
+    if sql_rows is not None:
+        return _exterior_fenestration_from_sql(sql_rows)
     try:
         with open(resolved_path, 'r', encoding='utf-8', errors='ignore') as csvfile:
             reader = csv.reader(csvfile)
@@ -1,12 +1,20 @@
 import csv
 import os
-from typing import Dict, Any
+from collections import deque
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 from .utils import safe_float
+from .eplussql_reader import read_table_from_sql
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+def _is_variant_suffix(suffix: str, leading_digit: str) -> bool:
+    """True for the 4-digit name suffixes pairing base ('1xxx') and shaded ('2xxx') glazing constructions."""
+    return len(suffix) == 4 and suffix.isdigit() and suffix.startswith(leading_digit)
+
+
 class GlazingParser:
     """
     Parses glazing-related data from IDF caches and simulation output.
@@ -33,6 +41,7 @@ class GlazingParser:
         self._simulation_output_csv = simulation_output_csv
         self._sim_properties = {}
         self._idf = idf_objects
+        self._resolved_layers = {}
         self.parsed_glazing_data = {}
 
     def _parse_simulation_output_csv(self):
@@ -41,6 +50,20 @@ class GlazingParser:
             return
 
         self._sim_properties = {}
+        sql_rows = read_table_from_sql(self._simulation_output_csv, "EnvelopeSummary", "Exterior Fenestration")
+        if sql_rows is not None:
+            for surface_name, columns in sql_rows:
+                construction_name = columns.get("construction", "")
+                if (construction_name and construction_name not in self._sim_properties and
+                        not surface_name.strip().lower().endswith("total or average")):
+                    self._sim_properties[construction_name] = {
+                        'U-Value': safe_float(columns.get("glass u-factor [w/m2-k]")),
+                        'SHGC': safe_float(columns.get("glass shgc")),
+                        'VT': safe_float(columns.get("glass visible transmittance")),
+                        'Area': safe_float(columns.get("area of multiplied openings [m2]"))
+                    }
+            return
+
         try:
             with open(self._simulation_output_csv, 'r', encoding='utf-8', errors='ignore') as csvfile:
                 reader = csv.reader(csvfile)
@@ -128,112 +151,129 @@ class GlazingParser:
         transfers shading layers to the base, and removes the shaded version.
         Example pairs: 'xxx - 1001' (base) and 'xxx - 2001' (shaded)
                        'yyy - 4444' (base) and 'yyy - 6666' (shaded)
+
+        Shaded constructions are grouped by their ' - ' prefix first, so each base is
+        paired with the first unclaimed shaded construction of its prefix in one lookup.
         """
 
         try:
-            constructions_with_shades = {
-                cid: data for cid, data in processed_data.items() if data.get('shading_layers')
-            }
-            constructions_without_shades = {
-                cid: data for cid, data in processed_data.items() if not data.get('shading_layers')
-            }
+            shaded_by_prefix: Dict[str, deque] = {}
+            for shade_id, shade_data in processed_data.items():
+                if not shade_data.get('shading_layers'):
+                    continue
+                try:
+                    shade_prefix, shade_suffix = shade_id.rsplit(' - ', 1)
+                except ValueError:
+                    continue
+                if _is_variant_suffix(shade_suffix, '2'):
+                    shaded_by_prefix.setdefault(shade_prefix, deque()).append(shade_id)
 
             keys_to_remove = set()
 
-            for base_id, base_data in constructions_without_shades.items():
+            for base_id, base_data in processed_data.items():
+                if base_data.get('shading_layers'):
+                    continue
                 try:
                     base_prefix, base_suffix = base_id.rsplit(' - ', 1)
                 except ValueError:
                     continue
 
-                for shade_id, shade_data in constructions_with_shades.items():
-                    if shade_id in keys_to_remove or shade_id == base_id:
-                        continue
-
-                    try:
-                        shade_prefix, shade_suffix = shade_id.rsplit(' - ', 1)
-                    except ValueError:
-                        continue
-
-                    if base_prefix == shade_prefix:
-                        try:
-                            is_base_pattern = base_suffix.startswith('1') and len(base_suffix) == 4 and base_suffix.isdigit()
-                            is_shade_pattern = shade_suffix.startswith('2') and len(shade_suffix) == 4 and shade_suffix.isdigit()
-
-                            if is_base_pattern and is_shade_pattern:
-                                pass
-                            else:
-                                continue
-
-                        except Exception as suffix_check_error:
-                            continue
-
-                        shades_to_transfer = shade_data.get('shading_layers', [])
-                        if shades_to_transfer:
-                            if 'shading_layers' not in base_data:
-                                 base_data['shading_layers'] = []
-
-                            existing_base_shades = {s['Name'] for s in base_data['shading_layers']}
-                            added_count = 0
-                            for shade_info in shades_to_transfer:
-                                 if shade_info['Name'] not in existing_base_shades:
-                                     base_data['shading_layers'].append(shade_info)
-                                     added_count += 1
-
-                            if added_count > 0:
-                                keys_to_remove.add(shade_id)
-                                break
-                        else:
-                             pass
+                candidates = shaded_by_prefix.get(base_prefix)
+                if not candidates or not _is_variant_suffix(base_suffix, '1'):
+                    continue
 
-            final_data = processed_data.copy()
-            removed_count = 0
-            for key in keys_to_remove:
-                if key in final_data:
-                    del final_data[key]
-                    removed_count += 1
+                shade_id = candidates.popleft()
+                base_shading_layers = base_data.setdefault('shading_layers', [])
+                existing_base_shades = {s['Name'] for s in base_shading_layers}
+                for shade_info in processed_data[shade_id]['shading_layers']:
+                    if shade_info['Name'] not in existing_base_shades:
+                        base_shading_layers.append(shade_info)
+                keys_to_remove.add(shade_id)
 
-            return final_data
+            return {key: data for key, data in processed_data.items() if key not in keys_to_remove}
 
         except Exception as e_transfer:
             raise RuntimeError(f"Error transferring shades based on naming: {e_transfer}")
 
+    def _resolve_layer(self, layer_name: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Classify a construction layer as 'glazing', 'gas' or 'shade' and build its detail row.
+
+        Each material is resolved once per parse and shared by all constructions using it,
+        so callers copy the row before storing it. Unknown layers resolve to (None, None).
+        """
+        resolved = self._resolved_layers.get(layer_name)
+        if resolved is not None:
+            return resolved
+
+        if layer_name in self._window_glazing_cache:
+            glazing = self._window_glazing_cache[layer_name]
+            resolved = ('glazing', {
+                'Name': layer_name, 'Type': 'Glazing', 'Thickness': safe_float(glazing.get('thickness')),
+                'Conductivity': safe_float(glazing.get('conductivity')),
+                'VT': safe_float(glazing.get('visible_transmittance')),
+                'ST': safe_float(glazing.get('solar_transmittance'))
+            })
+        elif layer_name in self._window_gas_cache:
+            gas = self._window_gas_cache[layer_name]
+            resolved = ('gas', {
+                'Name': layer_name, 'Type': f'Gas ({gas.get("gas_type", "Unknown")})',
+                'Thickness': safe_float(gas.get('thickness')), 'Conductivity': None, 'VT': None, 'ST': None
+            })
+        elif layer_name in self._window_shade_cache:
+            shade = self._window_shade_cache[layer_name]
+            resolved = ('shade', {
+                'Name': layer_name, 'Thickness': safe_float(shade.get('thickness')),
+                'Conductivity': safe_float(shade.get('conductivity')),
+                'Transmittance': safe_float(shade.get('solar_transmittance')),
+                'Reflectivity': safe_float(shade.get('solar_reflectance'))
+            })
+        else:
+            logger.info(f"GLAZING DEBUG: Layer '{layer_name}' not found in any cache (glazing, gas, or shade)")
+            resolved = (None, None)
+
+        self._resolved_layers[layer_name] = resolved
+        return resolved
+
+    def _get_sim_properties(self, construction_id: str) -> Dict[str, Any]:
+        """Simulation U-Value/SHGC/VT/Area of a construction, matched case-insensitively as a fallback."""
+        return self._sim_properties.get(construction_id) or self._sim_properties_lower.get(construction_id.lower(), {})
+
     def parse_glazing_data(self) -> Dict[str, Dict[str, Any]]:
         """
         Processes the cached glazing constructions to extract detailed data,
         incorporating properties from the simulation output CSV if available.
         Populates self.parsed_glazing_data.
+
+        Every construction is resolved in a single pass over the constructions:
+        simple glazing, detailed glazing (layers plus simulation properties) or a
+        shade-only construction whose shades are attached to its base afterwards.
         """
         logger.info(f"GLAZING DEBUG: Starting parse_glazing_data")
         logger.info(f"GLAZING DEBUG: Total constructions_glazing_cache: {len(self._constructions_glazing_cache)}")
         logger.info(f"GLAZING DEBUG: Total window_shade_cache: {len(self._window_shade_cache)}")
         logger.info(f"GLAZING DEBUG: Total window_shading_control_cache: {len(self._window_shading_control_cache)}")
-        logger.info(f"GLAZING DEBUG: Available constructions in cache: {list(self._constructions_glazing_cache.keys())}")
-        
-        if self._window_shade_cache:
-            logger.info(f"GLAZING DEBUG: Available shade materials: {list(self._window_shade_cache.keys())}")
-        
-        if self._window_shading_control_cache:
-            logger.info(f"GLAZING DEBUG: Available shading controls: {list(self._window_shading_control_cache.keys())}")
         
         self._parse_simulation_output_csv()
         self._sim_properties_lower = {k.lower(): v for k, v in self._sim_properties.items()}
+        self._resolved_layers = {}
 
-        processed_data = {}
+        simple_data = {}
+        detailed_data = {}
+        # (first non-shade layer, shading layers) of constructions without glazing or gas layers
+        shade_only_constructions = []
 
         for construction_id, construction_data in self._constructions_glazing_cache.items():
             material_layers = construction_data.get('material_layers', [])
-            logger.info(f"GLAZING DEBUG: First loop - checking construction '{construction_id}' with layers: {material_layers}")
             if not material_layers:
-                logger.info(f"GLAZING DEBUG: First loop - skipping '{construction_id}' (no material layers)")
+                logger.info(f"GLAZING DEBUG: Skipping '{construction_id}' (no material layers)")
                 continue
 
             first_layer_name = material_layers[0]
             # Only treat as Simple if it has exactly 1 layer and that layer is in simple glazing cache
             if len(material_layers) == 1 and first_layer_name in self._window_simple_glazing_cache:
-                logger.info(f"GLAZING DEBUG: First loop - processing '{construction_id}' as Simple glazing (first layer: '{first_layer_name}')")
-                simple_data = self._window_simple_glazing_cache[first_layer_name]
-                processed_data[construction_id] = {
+                simple = self._window_simple_glazing_cache[first_layer_name]
+                simple_data[construction_id] = {
                     'id': construction_id,
                     'name': construction_id,
                     'type': 'Simple',
@@ -241,77 +281,36 @@ class GlazingParser:
                         'Name': construction_id,
                         'Type': 'Simple Glazing',
                         'Thickness': None,
-                        'U-Value': simple_data.get('u_factor'),
-                        'VT': simple_data.get('visible_transmittance'),
-                        'SHGC': simple_data.get('shgc'),
-                        'Area': self._sim_properties.get(construction_id, self._sim_properties_lower.get(construction_id.lower(), {})).get('Area')
+                        'U-Value': simple.get('u_factor'),
+                        'VT': simple.get('visible_transmittance'),
+                        'SHGC': simple.get('shgc'),
+                        'Area': self._get_sim_properties(construction_id).get('Area')
                     },
                     'glazing_layers': [],
                     'shading_layers': [],
                     'raw_object': construction_data.get('raw_object')
                 }
-            else:
-                logger.info(f"GLAZING DEBUG: First loop - NOT processing '{construction_id}' as Simple (layers={len(material_layers)}, first_layer_in_simple_cache={first_layer_name in self._window_simple_glazing_cache})")
-
-        logger.info(f"GLAZING DEBUG: Second loop - starting detailed processing. Already processed: {list(processed_data.keys())}")
-        for construction_id, construction_data in self._constructions_glazing_cache.items():
-            if construction_id in processed_data:
-                logger.info(f"GLAZING DEBUG: Second loop - skipping '{construction_id}' (already processed as Simple)")
                 continue
 
-            material_layers = construction_data.get('material_layers', [])
             glazing_layers_details = []
             shading_layers_details = []
             total_thickness = 0.0
-            has_glazing_or_gas = False
+            potential_base_layer = None
 
-            logger.info(f"GLAZING DEBUG: Processing construction '{construction_id}' with {len(material_layers)} layers: {material_layers}")
-            
             for layer_name in material_layers:
-                if layer_name in self._window_glazing_cache:
-                    glazing = self._window_glazing_cache[layer_name]
-                    thickness = safe_float(glazing.get('thickness'))
-                    total_thickness += thickness
-                    glazing_layers_details.append({
-                        'Name': layer_name, 'Type': 'Glazing', 'Thickness': thickness,
-                        'Conductivity': safe_float(glazing.get('conductivity')),
-                        'VT': safe_float(glazing.get('visible_transmittance')),
-                        'ST': safe_float(glazing.get('solar_transmittance'))
-                    })
-                    has_glazing_or_gas = True
-                elif layer_name in self._window_gas_cache:
-                    gas = self._window_gas_cache[layer_name]
-                    thickness = safe_float(gas.get('thickness'))
-                    total_thickness += thickness
-                    glazing_layers_details.append({
-                        'Name': layer_name, 'Type': f'Gas ({gas.get("gas_type", "Unknown")})',
-                        'Thickness': thickness, 'Conductivity': None, 'VT': None, 'ST': None
-                    })
-                    has_glazing_or_gas = True
-                elif layer_name in self._window_shade_cache:
-                    logger.info(f"GLAZING DEBUG: Found shading layer '{layer_name}' in construction '{construction_id}'")
-                    shade = self._window_shade_cache[layer_name]
-                    thickness = safe_float(shade.get('thickness'))
-                    shading_layers_details.append({
-                        'Name': layer_name, 'Thickness': thickness,
-                        'Conductivity': safe_float(shade.get('conductivity')),
-                        'Transmittance': safe_float(shade.get('solar_transmittance')),
-                        'Reflectivity': safe_float(shade.get('solar_reflectance'))
-                    })
-                    logger.info(f"GLAZING DEBUG: Added shading layer - Name: {layer_name}, Thickness: {thickness}")
-                else:
-                    logger.info(f"GLAZING DEBUG: Layer '{layer_name}' not found in any cache (glazing, gas, or shade) for construction '{construction_id}'")
-
-            if has_glazing_or_gas:
-                sim_props = self._sim_properties.get(construction_id)
-                if not sim_props:
-                    sim_props = self._sim_properties_lower.get(construction_id.lower(), {})
-
-                u_value_sim = sim_props.get('U-Value')
-                shgc_sim = sim_props.get('SHGC')
-                vt_sim = sim_props.get('VT')
-
-                processed_data[construction_id] = {
+                kind, details = self._resolve_layer(layer_name)
+                if kind == 'shade':
+                    shading_layers_details.append(dict(details))
+                    continue
+                if kind is not None:
+                    total_thickness += details['Thickness']
+                    glazing_layers_details.append(dict(details))
+                elif not potential_base_layer:
+                    potential_base_layer = layer_name
+
+            if glazing_layers_details:
+                sim_props = self._get_sim_properties(construction_id)
+                detailed_data[construction_id] = {
                     'id': construction_id,
                     'name': construction_id,
                     'type': 'Detailed',
@@ -319,57 +318,36 @@ class GlazingParser:
                         'Name': construction_id,
                         'Type': 'Detailed Glazing',
                         'Thickness': total_thickness if total_thickness > 0 else None,
-                        'U-Value': u_value_sim,
-                        'VT': vt_sim,
-                        'SHGC': shgc_sim,
+                        'U-Value': sim_props.get('U-Value'),
+                        'VT': sim_props.get('VT'),
+                        'SHGC': sim_props.get('SHGC'),
                         'Area': sim_props.get('Area')
                     },
                     'glazing_layers': glazing_layers_details,
                     'shading_layers': shading_layers_details,
                     'raw_object': construction_data.get('raw_object')
                 }
-                logger.info(f"GLAZING DEBUG: Processed construction '{construction_id}': {len(shading_layers_details)} shading layers found")
+            elif shading_layers_details and potential_base_layer:
+                shade_only_constructions.append((potential_base_layer, shading_layers_details))
 
-        for construction_id, construction_data in self._constructions_glazing_cache.items():
-            if construction_id in processed_data:
-                continue
+        # Simple constructions are listed before detailed ones
+        processed_data = {**simple_data, **detailed_data}
+        logger.info(f"GLAZING DEBUG: Resolved {len(simple_data)} simple and {len(detailed_data)} detailed constructions "
+                    f"from {len(self._resolved_layers)} distinct layers")
 
-            current_shades_info = []
+        for potential_base_layer, current_shades_info in shade_only_constructions:
             base_construction_id = None
-            material_layers = construction_data.get('material_layers', [])
-            potential_base_layer = None
-
-            for layer_name in material_layers:
-                if layer_name in self._window_shade_cache:
-                    shade = self._window_shade_cache[layer_name]
-                    current_shades_info.append({
-                        'Name': layer_name,
-                        'Thickness': safe_float(shade.get('thickness')),
-                        'Conductivity': safe_float(shade.get('conductivity')),
-                        'Transmittance': safe_float(shade.get('solar_transmittance')),
-                        'Reflectivity': safe_float(shade.get('solar_reflectance'))
-                    })
-                elif not potential_base_layer:
-                    potential_base_layer = layer_name
-
-            if potential_base_layer:
-                if potential_base_layer in processed_data:
-                    base_construction_id = potential_base_layer
-                else:
-                    potential_base_id_derived = None
-                    if potential_base_layer.startswith("Simple "):
-                         potential_base_id_derived = potential_base_layer[len("Simple "):]
-                    if potential_base_id_derived and potential_base_id_derived in processed_data:
-                        base_construction_id = potential_base_id_derived
-
-            if base_construction_id and current_shades_info:
-                if base_construction_id in processed_data:
-                    if 'shading_layers' not in processed_data[base_construction_id]:
-                        processed_data[base_construction_id]['shading_layers'] = []
-                    existing_shades = {s['Name'] for s in processed_data[base_construction_id]['shading_layers']}
-                    for shade_info in current_shades_info:
-                        if shade_info['Name'] not in existing_shades:
-                            processed_data[base_construction_id]['shading_layers'].append(shade_info)
+            if potential_base_layer in processed_data:
+                base_construction_id = potential_base_layer
+            elif potential_base_layer.startswith("Simple ") and potential_base_layer[len("Simple "):] in processed_data:
+                base_construction_id = potential_base_layer[len("Simple "):]
+
+            if base_construction_id:
+                base_shading_layers = processed_data[base_construction_id].setdefault('shading_layers', [])
+                existing_shades = {s['Name'] for s in base_shading_layers}
+                for shade_info in current_shades_info:
+                    if shade_info['Name'] not in existing_shades:
+                        base_shading_layers.append(shade_info)
 
         try:
             processed_data = self._transfer_shades_based_on_naming(processed_data)
@@ -405,7 +383,7 @@ class GlazingParser:
                     base_construction_id = window_construction_name
                     try:
                         prefix, suffix = window_construction_name.rsplit(' - ', 1)
-                        if suffix.startswith('2') and len(suffix) == 4 and suffix.isdigit():
+                        if _is_variant_suffix(suffix, '2'):
                             base_suffix = '1' + suffix[1:]
                             potential_base_id = f"{prefix} - {base_suffix}"
                             if potential_base_id in processed_data:
@@ -444,13 +422,18 @@ class GlazingParser:
             if construction_id in final_filtered_data:
                  del final_filtered_data[construction_id]
 
+        # Windows by construction name, in windows cache order
+        windows_by_construction: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for window_order, window_data in enumerate(self._windows_cache.values()):
+            windows_by_construction.setdefault(window_data.get('construction_name'), []).append((window_order, window_data))
+
         for construction_id, data in final_filtered_data.items():
             data['frame_details'] = None
 
             potential_shaded_id = None
             try:
                 prefix, suffix = construction_id.rsplit(' - ', 1)
-                if suffix.startswith('1') and len(suffix) == 4 and suffix.isdigit():
+                if _is_variant_suffix(suffix, '1'):
                     shaded_suffix = '2' + suffix[1:]
                     potential_shaded_id = f"{prefix} - {shaded_suffix}"
                     if potential_shaded_id not in self._constructions_glazing_cache:
@@ -458,27 +441,27 @@ class GlazingParser:
             except ValueError:
                 pass
 
-            for window_id, window_data in self._windows_cache.items():
-                window_construction_name = window_data.get('construction_name')
-
-                if window_construction_name == construction_id or \
-                   (potential_shaded_id and window_construction_name == potential_shaded_id):
-
-                    window_obj = window_data.get('raw_object')
-                    if not window_obj: continue
-
-                    # Try multiple field name variations for EPJSON compatibility
-                    frame_divider_name = getattr(window_obj, 'Frame_and_Divider_Name', None)
-                    if not frame_divider_name:
-                        frame_divider_name = getattr(window_obj, 'frame_and_divider_name', None)
-                    if frame_divider_name and frame_divider_name in self._frame_divider_cache:
-                        frame_data = self._frame_divider_cache[frame_divider_name]
-                        data['frame_details'] = {
-                            'id': frame_divider_name,
-                            'frame_width': frame_data.get('frame_width'),
-                            'frame_conductance': frame_data.get('frame_conductance')
-                        }
-                        break
+            construction_windows = windows_by_construction.get(construction_id, [])
+            if potential_shaded_id and potential_shaded_id in windows_by_construction:
+                construction_windows = sorted(construction_windows + windows_by_construction[potential_shaded_id],
+                                              key=itemgetter(0))
+
+            for _, window_data in construction_windows:
+                window_obj = window_data.get('raw_object')
+                if not window_obj: continue
+
+                # Try multiple field name variations for EPJSON compatibility
+                frame_divider_name = getattr(window_obj, 'Frame_and_Divider_Name', None)
+                if not frame_divider_name:
+                    frame_divider_name = getattr(window_obj, 'frame_and_divider_name', None)
+                if frame_divider_name and frame_divider_name in self._frame_divider_cache:
+                    frame_data = self._frame_divider_cache[frame_divider_name]
+                    data['frame_details'] = {
+                        'id': frame_divider_name,
+                        'frame_width': frame_data.get('frame_width'),
+                        'frame_conductance': frame_data.get('frame_conductance')
+                    }
+                    break
 
         logger.info(f"GLAZING DEBUG: Final processing complete - {len(final_filtered_data)} constructions processed")
         
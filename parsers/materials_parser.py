@@ -32,6 +32,10 @@ class MaterialsParser(BaseParser):
         self.element_data = []
         self.materials = {}
         self.constructions = {}
+        # (construction, zone) -> (element types, dont_use), built by _classify_element_types
+        self._element_type_index: Dict[Tuple[str, Optional[str]], Tuple[List[str], bool]] = {}
+        self._element_type_index_key = None
+        self._element_type_index_surfaces = None
 
     def process_idf(self, idf) -> None:
         """
@@ -45,6 +49,8 @@ class MaterialsParser(BaseParser):
             self.materials.clear()
             self.constructions.clear()
             self.element_data.clear()
+            self._element_type_index = {}
+            self._element_type_index_key = None
             
             # Process materials
             material_cache = self.data_loader.get_materials()
@@ -388,10 +394,70 @@ class MaterialsParser(BaseParser):
         
         return '', ''
 
+    def get_element_types(self, construction_id: str, zone_id: Optional[str] = None,
+                          surfaces: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[List[str], bool]:
+        """
+        Element types of a construction and whether it should not be used (only non-HVAC surfaces).
+
+        Same result as _get_element_type on the surfaces of zone_id (all zones if None),
+        looked up in the classification built once per set of surfaces.
+        """
+        index = self._classify_element_types(surfaces)
+        key = (construction_id, zone_id.lower() if zone_id is not None else None)
+        element_types, dont_use = index.get(key, ([], False))
+        return list(element_types), dont_use
+
+    def _classify_element_types(self, surfaces: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[Tuple[str, Optional[str]], Tuple[List[str], bool]]:
+        """
+        Classify every (construction, zone) pair in one sweep over the surfaces.
+
+        Keys are (construction name, lower-case zone name), plus (construction name, None)
+        for all zones together. The index is rebuilt when the surfaces or HVAC zones change.
+        """
+        if surfaces is None:
+            surfaces = self.data_loader.get_surfaces()
+        hvac_zones = self.data_loader.get_hvac_zones() or []
+        index_key = (id(surfaces), len(surfaces), len(hvac_zones))
+        if self._element_type_index_key == index_key:
+            return self._element_type_index
+
+        hvac_zones_lower = {zone.lower() for zone in hvac_zones}
+        # key -> [element types (insertion ordered), surfaces with HVAC zones, surfaces without]
+        accumulated: Dict[Tuple[str, Optional[str]], list] = {}
+        for surface in surfaces.values():
+            construction_id = surface.get('construction_name')
+            if surface.get('is_glazing', False):
+                element_type, with_hvac, without_hvac = "Glazing", 0, 0
+            else:
+                surface_has_hvac, is_zone_interior = self._check_surface_hvac_zones(surface, hvac_zones_lower)
+                if surface_has_hvac:
+                    element_type = self._determine_surface_element_type(surface, is_zone_interior)
+                    with_hvac, without_hvac = 1, 0
+                else:
+                    element_type, with_hvac, without_hvac = None, 0, 1
+            for key in ((construction_id, None), (construction_id, surface.get('zone_name', '').lower())):
+                entry = accumulated.setdefault(key, [{}, 0, 0])
+                if element_type:
+                    entry[0].setdefault(element_type, None)
+                entry[1] += with_hvac
+                entry[2] += without_hvac
+
+        self._element_type_index = {
+            key: (list(element_types), with_hvac == 0 and without_hvac > 0)
+            for key, (element_types, with_hvac, without_hvac) in accumulated.items()
+        }
+        # Keep the classified surfaces alive so their id is not reused by another dict
+        self._element_type_index_surfaces = surfaces
+        self._element_type_index_key = index_key
+        return self._element_type_index
+
     def _get_element_type(self, construction_id: str, surfaces: Dict[str, Dict[str, Any]], construction_mapping: Dict[str, str] = None) -> Tuple[List[str], bool]:
         """
         Determine element type based on construction usage - simplified version.
         """
+        if not construction_mapping:
+            return self.get_element_types(construction_id, surfaces=surfaces)
+
         construction_surfaces = self._find_construction_surfaces(construction_id, surfaces, construction_mapping)
         
         if not construction_surfaces:
@@ -399,6 +465,7 @@ class MaterialsParser(BaseParser):
 
         element_types = set()
         hvac_zones = self.data_loader.get_hvac_zones()
+        hvac_zones_lower = {zone.lower() for zone in hvac_zones} if hvac_zones else set()
         
         surfaces_with_hvac_zones = 0
         surfaces_without_hvac_zones = 0
@@ -408,7 +475,7 @@ class MaterialsParser(BaseParser):
                 element_types.add("Glazing")
                 continue
             
-            surface_has_hvac, is_zone_interior = self._check_surface_hvac_zones(surface, hvac_zones)
+            surface_has_hvac, is_zone_interior = self._check_surface_hvac_zones(surface, hvac_zones_lower)
             
             if surface_has_hvac:
                 surfaces_with_hvac_zones += 1
@@ -438,13 +505,10 @@ class MaterialsParser(BaseParser):
         
         return construction_surfaces
     
-    def _check_surface_hvac_zones(self, surface: Dict[str, Any], hvac_zones: List[str]) -> Tuple[bool, bool]:
-        """Check if surface connects HVAC zones and if it's zone interior."""
+    def _check_surface_hvac_zones(self, surface: Dict[str, Any], hvac_zones_lower: set) -> Tuple[bool, bool]:
+        """Check if surface connects HVAC zones and if it's zone interior (hvac_zones_lower: lower-case names)."""
         boundary = surface.get('boundary_condition', '').lower()
         
-        # Convert hvac_zones to lowercase for case-insensitive comparison
-        hvac_zones_lower = [zone.lower() for zone in hvac_zones] if hvac_zones else []
-        
         if boundary != "surface":
             # Use the surface's zone_name directly instead of parsing from surface ID
             zone_name = surface.get('zone_name', '').lower()
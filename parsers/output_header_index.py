@@ -0,0 +1,151 @@
+"""
+Column index for EnergyPlus eplusout.csv header rows.
+
+Each 'KEY:Variable Name [Units](Frequency)' header is split into its parts once, and
+the zone it belongs to is found with an Aho-Corasick automaton over the zone names:
+one pass over the header finds the longest zone name it contains, however many zones
+the model has. The resulting index maps zone -> variable -> column positions, so
+values of a row can be gathered per zone without scanning the headers again.
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+_HEADER_PATTERN = re.compile(
+    r"^(?:(?P<key>.*):)?(?P<variable>[^:\[]*?)\s*(?:\[(?P<unit>[^\]]*)\])?\s*(?:\((?P<frequency>[^)]*)\))?\s*$"
+)
+
+
+class OutputHeader(NamedTuple):
+    """One eplusout.csv column header split into its parts."""
+    position: int
+    header: str
+    key: str
+    variable: str
+    unit: str
+    frequency: str
+
+
+def parse_output_header(header: str, position: int = 0) -> OutputHeader:
+    """
+    Split 'KEY:Variable Name [Units](Frequency)' into its parts.
+
+    The key is everything before the last ':' of the name, since zone names may
+    themselves contain ':' (e.g. '00X01:01XLIVING IDEAL LOADS AIR'). Parts missing
+    from the header are empty strings.
+    """
+    match = _HEADER_PATTERN.match(header.strip())
+    if not match:
+        return OutputHeader(position, header, "", header.strip(), "", "")
+    return OutputHeader(position, header, match.group("key") or "", match.group("variable"),
+                        match.group("unit") or "", match.group("frequency") or "")
+
+
+class ZoneNameMatcher:
+    """
+    Aho-Corasick automaton over zone names.
+
+    longest_match(text) returns the longest zone name occurring anywhere in text,
+    the same result as testing 'zone in text' for every zone and keeping the
+    longest (the first zone given wins between equally long matches), in time
+    linear in the length of text.
+    """
+
+    def __init__(self, zone_names: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Longest zone name ending at each node, as (length, order, name)
+        self._output: List[Optional[Tuple[int, int, str]]] = [None]
+        for order, name in enumerate(zone_names):
+            if name:
+                self._add(name, order)
+        self._build_failure_links()
+
+    def _add(self, name: str, order: int) -> None:
+        node = 0
+        for char in name:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+        if self._output[node] is None:
+            self._output[node] = (len(name), order, name)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                # A node's own name is longer than any name reached through its failure link
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+                queue.append(child)
+
+    def longest_match(self, text: str) -> Optional[str]:
+        best = None
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            found = output[node]
+            if found and (best is None or found[0] > best[0] or (found[0] == best[0] and found[1] < best[1])):
+                best = found
+        return best[2] if best else None
+
+
+class OutputColumnIndex:
+    """
+    Structured index of an eplusout.csv header row.
+
+    Args:
+        headers: The header row; position 0 (Date/Time) is not indexed
+        zone_names: Zone names to attribute the columns to
+    """
+
+    def __init__(self, headers: Sequence[str], zone_names: Iterable[str]):
+        matcher = ZoneNameMatcher(zone_names)
+        self.columns: List[OutputHeader] = [parse_output_header(header, position)
+                                            for position, header in enumerate(headers)]
+        self._zone_at: List[Optional[str]] = [None] * len(headers)
+        self.by_zone: Dict[str, Dict[str, List[int]]] = {}
+        for column in self.columns[1:]:
+            zone = matcher.longest_match(column.header)
+            if zone is None:
+                continue
+            self._zone_at[column.position] = zone
+            self.by_zone.setdefault(zone, {}).setdefault(column.variable, []).append(column.position)
+
+    def zone_at(self, position: int) -> Optional[str]:
+        """Zone whose name the header at position contains (the longest one), or None."""
+        return self._zone_at[position] if 0 <= position < len(self._zone_at) else None
+
+    def positions(self, zone: str, variable: str) -> List[int]:
+        """Column positions of a zone's variable (one per reporting key and frequency)."""
+        return self.by_zone.get(zone, {}).get(variable, [])
+
+    def gather(self, values: Sequence, zone: str, variable: str, frequency: Optional[str] = None):
+        """
+        Gather a zone variable's values of one row as a NumPy array.
+
+        Args:
+            values: Row values aligned with the headers; pass an ndarray to gather
+                    several variables of the same row without converting it again
+            zone: Zone name
+            variable: Variable name, e.g. 'Lights Electricity Energy'
+            frequency: Only columns of this reporting frequency (e.g. 'RunPeriod')
+        """
+        import numpy as np
+        positions = [position for position in self.positions(zone, variable)
+                     if frequency is None or self.columns[position].frequency == frequency]
+        row = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=object)
+        return np.asarray(row[positions], dtype=float) if positions else np.empty(0)
@@ -1,6 +1,6 @@
 import re
 from typing import Dict, Any
-from utils.data_loader import DataLoader
+from utils.data_loader import DataLoader, SETTINGS_PARSER_OBJECT_TYPES
 from utils.logging_config import get_logger
 from .utils import safe_float
 
@@ -322,18 +322,7 @@ class SettingsParser:
 
         try:
             # Process each object type from EPJSON
-            object_types_to_process = [
-                'Version', 'Building', 'Site:Location', 'SizingPeriod:DesignDay',
-                'Site:GroundTemperature:BuildingSurface', 'SimulationControl',
-                'RunPeriod', 'Timestep', 'Site:GroundTemperature:Deep',
-                'Site:GroundTemperature:Shallow', 'Site:GroundTemperature:FCfactorMethod',
-                'Site:GroundReflectance', 'Site:GroundReflectance:SnowModifier',
-                'ConvergenceLimits', 'ShadowCalculation',
-                'SurfaceConvectionAlgorithm:Inside', 'SurfaceConvectionAlgorithm:Outside',
-                'HeatBalanceAlgorithm'
-            ]
-
-            for obj_type in object_types_to_process:
+            for obj_type in SETTINGS_PARSER_OBJECT_TYPES:
                 if obj_type in epjson_data:
                     for obj_name, obj_data in epjson_data[obj_type].items():
                         # Create a compatibility wrapper that mimics eppy object behavior
@@ -0,0 +1,425 @@
+"""
+Declarative validation rules for the automatic error detection report.
+
+Every check is a ValidationRule: the row section and attribute it reads, the
+recommended value and how a mismatch is reported. ValidationEngine evaluates a
+rule set in one pass over a ZoneAttributeTable (one row per zone and section):
+numeric rules compare a whole attribute column at once with NumPy, and schedule
+rules compare against hourly profiles compiled once per schedule.
+
+Rule sets are keyed by ISO type and climate zone in ZONE_RULE_SETS; supporting a
+new ISO year means adding its rules there.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from parsers.schedule_parser import _parse_compact_rule_blocks
+
+# ((month, day) the period runs through, 24 hourly values)
+HourlyProfile = Tuple[Tuple[Tuple[int, int], Tuple[float, ...]], ...]
+
+HOURS_PER_DAY = 24
+# Schedule texts longer than this are shortened in findings
+MAX_SCHEDULE_TEXT = 100
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+
+
+@dataclass(frozen=True)
+class SettingsRule:
+    """
+    A model-wide setting compared with its recommended value.
+
+    The setting is skipped when it is missing, and also when it is empty
+    (None, '' or 0) unless skip_empty is False.
+    """
+    category: str
+    path: Tuple[str, ...]
+    recommended: str
+    remark: str = 'Not supported value'
+    warn_if_missing: bool = False
+    skip_empty: bool = True
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """
+    One check of a zone attribute.
+
+    Kinds:
+        'numeric'   - reported when |value - recommended| > tolerance
+        'near'      - reported when value is within tolerance of any recommended value
+        'schedule'  - the schedule named by the attribute must match the recommended
+                      hourly profile ('DD/MM -> DD/MM: 24 values; ...' or 24 values)
+        'min_count' - reported when the attribute holds fewer than recommended items
+    """
+    rule_id: str
+    section: str
+    attribute: str
+    category: str
+    recommended: Any
+    kind: str = 'numeric'
+    tolerance: float = 0.001
+    remark: str = 'Not supported value'
+    report_missing: bool = False
+    round_digits: Optional[int] = None
+    value_format: str = '{}'
+    recommended_format: str = '{}'
+    on_off: bool = False
+    when: Tuple[Tuple[str, Any], ...] = ()
+
+
+# Settings (all ISO types)
+SETTINGS_RULES: List[SettingsRule] = [
+    SettingsRule('EnergyPlus Version', ('version', 'energyplus'), '9.4.0.2',
+                 'Version should be between 9.4.0.0 and 9.4.0.1', warn_if_missing=True),
+    SettingsRule('Terrain', ('site', 'terrain'), 'City', 'Need to change', warn_if_missing=True),
+    SettingsRule('Surface Convection Algorithm (Inside)', ('algorithms', 'surface_convection_inside'), 'TARP'),
+    SettingsRule('Surface Convection Algorithm (Outside)', ('algorithms', 'surface_convection_outside'), 'DOE-2'),
+    SettingsRule('Heat Balance Algorithm', ('algorithms', 'heat_balance'), 'ConductionTransferFunction'),
+    SettingsRule('Time Step', ('simulation', 'time_step'), '6'),
+] + [
+    SettingsRule(f'Ground Temperature {month}', ('site', 'ground_temperature', month), '18.0', 'Need to change',
+                 skip_empty=False)
+    for month in MONTHS
+] + [
+    SettingsRule(f'Ground Reflectance {month}', ('site', 'ground_reflectance', month), '0.2', 'Need to change',
+                 skip_empty=False)
+    for month in MONTHS
+]
+
+ALL_ON = ' '.join(['1'] * HOURS_PER_DAY)
+
+LOAD_RULES_2017: List[ValidationRule] = [
+    ValidationRule('occupancy.people_per_area', 'Occupancy', 'people_per_area',
+                   'Occupancy - People per Area', 0.04, report_missing=True),
+    ValidationRule('occupancy.activity', 'Occupancy', 'activity',
+                   'Occupancy - Activity Schedule', 125.0, tolerance=0.1),
+    ValidationRule('occupancy.schedule', 'Occupancy', 'schedule', 'Occupancy - Schedule Rule',
+                   '0.64 0.64 0.64 0.64 0.64 0.64 0.64 0.64 0 0 0 0 0 0 0 0 1 1 1 1 1 1 1 1', kind='schedule'),
+    ValidationRule('lighting.power_density', 'Lighting', 'watts_per_area',
+                   'Lighting - Power Density', 5.0, report_missing=True),
+    ValidationRule('lighting.schedule', 'Lighting', 'schedule', 'Lighting - Schedule Rule',
+                   '0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 1 1 1 1 1 1 1', kind='schedule'),
+    # Equipment limits depend on the floor area (<= 150 m2 or larger) of the zone's floor
+    ValidationRule('equipment.non_fixed.power_density.small', 'Equipment', 'non_fixed_watts',
+                   'Non-Fixed Equipment - Power Density', 8.0, report_missing=True,
+                   when=(('edge_case', False), ('large_floor', False))),
+    ValidationRule('equipment.non_fixed.power_density.large', 'Equipment', 'non_fixed_watts',
+                   'Non-Fixed Equipment - Power Density', 6.0, report_missing=True,
+                   when=(('edge_case', False), ('large_floor', True))),
+    ValidationRule('equipment.non_fixed.schedule', 'Equipment', 'non_fixed_schedule',
+                   'Non-Fixed Equipment - Schedule Rule',
+                   '0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 1 1 1 1 1 1 1 1', kind='schedule',
+                   when=(('edge_case', False),)),
+    ValidationRule('equipment.fixed.power_density.small', 'Equipment', 'fixed_watts',
+                   'Fixed Equipment - Power Density', 1.0, report_missing=True,
+                   when=(('edge_case', False), ('large_floor', False))),
+    ValidationRule('equipment.fixed.power_density.large', 'Equipment', 'fixed_watts',
+                   'Fixed Equipment - Power Density', 0.74, report_missing=True,
+                   when=(('edge_case', False), ('large_floor', True))),
+    ValidationRule('equipment.fixed.schedule', 'Equipment', 'fixed_schedule',
+                   'Fixed Equipment - Schedule Rule', ALL_ON, kind='schedule',
+                   when=(('edge_case', False),)),
+    # Edge case: one of the equipment schedules is all zeros, the combined load is checked instead
+    ValidationRule('equipment.combined.power_density.small', 'Equipment', 'combined_watts',
+                   'Equipment - Combined Power Density (Edge Case)', 9.0, report_missing=True,
+                   when=(('edge_case', True), ('large_floor', False))),
+    ValidationRule('equipment.combined.power_density.large', 'Equipment', 'combined_watts',
+                   'Equipment - Combined Power Density (Edge Case)', 7.0, report_missing=True,
+                   when=(('edge_case', True), ('large_floor', True))),
+    ValidationRule('equipment.combined.schedule.small', 'Equipment', 'active_schedule',
+                   'Equipment - Combined Schedule Rule (Edge Case)',
+                   '0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 0.11 1 1 1 1 1 1 1',
+                   kind='schedule', when=(('edge_case', True), ('large_floor', False))),
+    ValidationRule('equipment.combined.schedule.large', 'Equipment', 'active_schedule',
+                   'Equipment - Combined Schedule Rule (Edge Case)',
+                   '0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 0.14 1 1 1 1 1 1 1',
+                   kind='schedule', when=(('edge_case', True), ('large_floor', True))),
+]
+
+
+def _seasonal_profile(heating_until: str, cooling_until: str, summer_day: str, winter_day: str) -> str:
+    """Profile text with a winter / summer / winter split of the year."""
+    return (f"01/01 -> {heating_until}: {winter_day}; {heating_until} -> {cooling_until}: {summer_day}; "
+            f"{cooling_until} -> 31/12: {winter_day}")
+
+
+def _hvac_rules_2017(heating_until: str, cooling_until: str, natural_ventilation_day: str) -> List[ValidationRule]:
+    """2017 HVAC rules of one climate zone, given its heating season and night ventilation hours."""
+    all_off = ' '.join(['0'] * HOURS_PER_DAY)
+    schedule_remark = 'Schedule rule does not match standard for {schedule}'
+    return [
+        ValidationRule('hvac.heating.setpoint', 'Heating', 'setpoint', 'Heating Setpoint (Climate {climate})',
+                       20.0, tolerance=0.5, value_format='{}°C', recommended_format='{}°C'),
+        ValidationRule('hvac.heating.schedule', 'Heating', 'schedule', 'Heating Schedule Rule (Climate {climate})',
+                       _seasonal_profile(heating_until, cooling_until, all_off, ALL_ON),
+                       kind='schedule', on_off=True, remark=schedule_remark),
+        ValidationRule('hvac.cooling.setpoint', 'Cooling', 'setpoint', 'Cooling Setpoint (Climate {climate})',
+                       24.0, tolerance=0.5, value_format='{}°C', recommended_format='{}°C'),
+        # Setpoints raised for ceiling fans are not allowed
+        ValidationRule('hvac.cooling.ceiling_fan', 'Cooling', 'setpoint',
+                       'Cooling Setpoint - Ceiling Fan Error (Climate {climate})', (24.5, 25.0), kind='near',
+                       tolerance=0.1, value_format='{}°C', recommended_format='24.0°C', remark='Ceiling fan error'),
+        ValidationRule('hvac.cooling.schedule', 'Cooling', 'schedule', 'Cooling Schedule Rule (Climate {climate})',
+                       _seasonal_profile(heating_until, cooling_until, ALL_ON, all_off),
+                       kind='schedule', on_off=True, remark=schedule_remark),
+        ValidationRule('hvac.infiltration.rate', 'Infiltration', 'rate_ach', 'Infiltration Rate (Climate {climate})',
+                       1.0, tolerance=0.1, round_digits=1, remark='Need to change'),
+        ValidationRule('hvac.infiltration.schedule', 'Infiltration', 'schedule',
+                       'Infiltration Schedule Rule (Climate {climate})', ALL_ON, kind='schedule',
+                       remark=schedule_remark),
+        ValidationRule('hvac.natural_ventilation.rate', 'Natural Ventilation', 'rate_ach',
+                       'Natural Ventilation Rate (Climate {climate})', 2.0, tolerance=0.1, round_digits=1,
+                       value_format='{:.2f} ACH', recommended_format='{} ACH',
+                       remark='Natural ventilation rate does not match standard'),
+        ValidationRule('hvac.natural_ventilation.schedule', 'Natural Ventilation', 'schedule',
+                       'Natural Ventilation Schedule Rule (Climate {climate})',
+                       _seasonal_profile(heating_until, cooling_until, natural_ventilation_day, all_off),
+                       kind='schedule', remark=schedule_remark),
+        ValidationRule('hvac.natural_ventilation.window_directions', 'Area', 'window_directions',
+                       'Natural Ventilation Windows (Climate {climate})', 2, kind='min_count',
+                       recommended_format='{} different directions required',
+                       remark='Area missing {shortfall} window directions'),
+    ]
+
+
+# Night ventilation: windows open until 07:00 (zones A/B) or 06:00 (zones C/D) and again from 20:00 / 19:00
+_NIGHT_VENTILATION_AB = '1 1 1 1 1 1 1 0 0 0 0 0 0 0 0 0 0 0 0 0 1 1 1 1'
+_NIGHT_VENTILATION_CD = '1 1 1 1 1 1 0 0 0 0 0 0 0 0 0 0 0 0 0 1 1 1 1 1'
+
+# Climate zone -> 2017 rules. Not registered in ZONE_RULE_SETS yet: the 2017 load and HVAC
+# checks never ran before they moved here, and enabling them changes the 2017 reports
+ZONE_RULES_2017: Dict[str, List[ValidationRule]] = {
+    'A': LOAD_RULES_2017 + _hvac_rules_2017('31/03', '30/11', _NIGHT_VENTILATION_AB),
+    'B': LOAD_RULES_2017 + _hvac_rules_2017('31/03', '30/11', _NIGHT_VENTILATION_AB),
+    'C': LOAD_RULES_2017 + _hvac_rules_2017('30/04', '31/10', _NIGHT_VENTILATION_CD),
+    'D': LOAD_RULES_2017 + _hvac_rules_2017('28/02', '30/11', _NIGHT_VENTILATION_CD),
+}
+
+# ISO type -> climate zone -> rules
+ZONE_RULE_SETS: Dict[str, Dict[str, List[ValidationRule]]] = {
+    'Office': {},
+    '2017': {},
+    '2023': {},
+}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_day_month(text: str) -> Optional[Tuple[int, int]]:
+    """'31/03' -> (3, 31)."""
+    try:
+        day, month = (int(part) for part in text.strip().split('/'))
+    except ValueError:
+        return None
+    return (month, day) if 1 <= month <= 12 and 1 <= day <= 31 else None
+
+
+def compile_profile_text(text: str) -> Optional[HourlyProfile]:
+    """Compile 'DD/MM -> DD/MM: 24 values; ...' (or just 24 values) into an hourly profile."""
+    periods = []
+    for part in str(text).split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        through = (12, 31)
+        values_text = part
+        if ':' in part:
+            dates, values_text = part.rsplit(':', 1)
+            through = _parse_day_month(dates.split('->')[-1])
+        values = tuple(_to_float(value) for value in values_text.split())
+        if through is None or len(values) != HOURS_PER_DAY or None in values:
+            return None
+        periods.append((through, values))
+    return tuple(periods) or None
+
+
+def compile_schedule_rules(rule_fields: Iterable[Any], on_off: bool = False) -> Optional[HourlyProfile]:
+    """
+    Compile Schedule:Compact fields into an hourly profile per 'Through:' period.
+
+    With on_off, temperature setpoints become 1 (system available) or 0 for the
+    -50 / >= 100 values models use to switch heating or cooling off.
+    """
+    periods = []
+    for block in _parse_compact_rule_blocks([str(field) for field in rule_fields]):
+        through = _parse_day_month(block.get('through', ''))
+        values = tuple(_to_float(value) for value in block.get('hourly_values', [])[:HOURS_PER_DAY])
+        if through is None or len(values) != HOURS_PER_DAY or None in values:
+            return None
+        if on_off:
+            values = tuple(0.0 if value == -50 or value >= 100 else 1.0 for value in values)
+        periods.append((through, values))
+    return tuple(periods) or None
+
+
+def _values_through(profile: HourlyProfile, date: Tuple[int, int]) -> Optional[Tuple[float, ...]]:
+    for through, values in profile:
+        if through >= date:
+            return values
+    return None
+
+
+def profiles_match(current: HourlyProfile, recommended: HourlyProfile, tolerance: float = 1e-6) -> bool:
+    """True if both profiles give the same hourly values on every day of the year."""
+    for date in sorted({through for through, _ in current} | {through for through, _ in recommended}):
+        current_values = _values_through(current, date)
+        recommended_values = _values_through(recommended, date)
+        if current_values is None or recommended_values is None:
+            if current_values is not recommended_values:
+                return False
+            continue
+        if any(abs(a - b) > tolerance for a, b in zip(current_values, recommended_values)):
+            return False
+    return True
+
+
+def profile_is_all_zeros(profile: Optional[HourlyProfile]) -> bool:
+    return profile is None or all(value == 0 for _, values in profile for value in values)
+
+
+def _shorten(text: str) -> str:
+    return text[:MAX_SCHEDULE_TEXT] + '...' if len(text) > MAX_SCHEDULE_TEXT else text
+
+
+def format_profile(profile: HourlyProfile) -> str:
+    """Format a profile the way the recommended values are written."""
+    def hours(values):
+        return ' '.join(f"{value:g}" for value in values)
+
+    if len(profile) == 1 and profile[0][0] == (12, 31):
+        return hours(profile[0][1])
+    parts = []
+    start = (1, 1)
+    for through, values in profile:
+        parts.append(f"{start[1]:02d}/{start[0]:02d} -> {through[1]:02d}/{through[0]:02d}: {hours(values)}")
+        start = through
+    return '; '.join(parts)
+
+
+class ZoneAttributeTable:
+    """Rows of (label, section, attributes), e.g. ('00:01XLIVING', 'Lighting', {'watts_per_area': 5.0})."""
+
+    def __init__(self):
+        self.rows: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._rows_by_section: Dict[str, List[int]] = {}
+
+    def add(self, label: str, section: str, **attributes) -> None:
+        self._rows_by_section.setdefault(section, []).append(len(self.rows))
+        self.rows.append((label, section, attributes))
+
+    def section_rows(self, section: str) -> List[int]:
+        return self._rows_by_section.get(section, [])
+
+
+class ValidationEngine:
+    """
+    Evaluates a rule set over a ZoneAttributeTable.
+
+    Args:
+        rules: Rules to evaluate, in report order within a row
+        climate_zone: Substituted for '{climate}' in categories
+        schedule_rules: Returns the Schedule:Compact fields of a schedule name (or None)
+    """
+
+    def __init__(self, rules: List[ValidationRule], climate_zone: str,
+                 schedule_rules: Callable[[str], Optional[List[Any]]]):
+        self.rules = rules
+        self.climate_zone = climate_zone
+        self._schedule_rules = schedule_rules
+        self._schedule_profiles: Dict[Tuple[str, bool], Optional[HourlyProfile]] = {}
+        self._recommended_profiles: Dict[str, Optional[HourlyProfile]] = {}
+        # rule_id -> seconds spent evaluating the rule
+        self.rule_timings: Dict[str, float] = {}
+
+    def schedule_profile(self, schedule_name: Optional[str], on_off: bool = False) -> Optional[HourlyProfile]:
+        """Hourly profile of a schedule, compiled on first use."""
+        if not schedule_name:
+            return None
+        key = (schedule_name, on_off)
+        if key not in self._schedule_profiles:
+            rule_fields = self._schedule_rules(schedule_name)
+            self._schedule_profiles[key] = compile_schedule_rules(rule_fields, on_off) if rule_fields else None
+        return self._schedule_profiles[key]
+
+    def evaluate(self, table: ZoneAttributeTable) -> List[Dict[str, Any]]:
+        """Evaluate every rule; findings are ordered by table row, then by rule."""
+        findings = []
+        for order, rule in enumerate(self.rules):
+            started = time.perf_counter()
+            rows = [index for index in table.section_rows(rule.section)
+                    if all(table.rows[index][2].get(key) == value for key, value in rule.when)]
+            if rows:
+                evaluate = {
+                    'numeric': self._evaluate_numeric,
+                    'near': self._evaluate_numeric,
+                    'schedule': self._evaluate_schedule,
+                    'min_count': self._evaluate_min_count,
+                }[rule.kind]
+                findings.extend((index, order, finding) for index, finding in evaluate(rule, table, rows))
+            self.rule_timings[rule.rule_id] = self.rule_timings.get(rule.rule_id, 0.0) + time.perf_counter() - started
+        findings.sort(key=lambda finding: (finding[0], finding[1]))
+        return [finding for _, _, finding in findings]
+
+    def _finding(self, rule: ValidationRule, label: str, current: str, recommended: str, **remark_fields) -> Dict[str, Any]:
+        return {
+            'zone_name': label,
+            'category': rule.category.format(climate=self.climate_zone),
+            'current_model_value': current,
+            'recommended_standard_value': recommended,
+            'remark': rule.remark.format(**remark_fields) if remark_fields else rule.remark,
+        }
+
+    def _evaluate_numeric(self, rule: ValidationRule, table: ZoneAttributeTable, rows: List[int]):
+        import numpy as np
+        values = np.array([_to_float(table.rows[index][2].get(rule.attribute)) for index in rows], dtype=float)
+        missing = np.isnan(values)
+        if rule.kind == 'near':
+            targets = np.asarray(rule.recommended, dtype=float)
+            flagged = (np.abs(values[:, None] - targets[None, :]) < rule.tolerance).any(axis=1) & ~missing
+            recommended_text = rule.recommended_format.format(rule.recommended)
+        else:
+            compared = np.where(missing, 0.0, values) if rule.report_missing else values
+            target = float(rule.recommended)
+            if rule.round_digits is not None:
+                compared = np.round(compared, rule.round_digits)
+                target = round(target, rule.round_digits)
+            with np.errstate(invalid='ignore'):
+                flagged = np.abs(compared - target) > rule.tolerance
+            if not rule.report_missing:
+                flagged &= ~missing
+            recommended_text = rule.recommended_format.format(float(rule.recommended))
+        for position in np.flatnonzero(flagged):
+            index = rows[position]
+            current = "-" if missing[position] else rule.value_format.format(float(values[position]))
+            yield index, self._finding(rule, table.rows[index][0], current, recommended_text)
+
+    def _evaluate_schedule(self, rule: ValidationRule, table: ZoneAttributeTable, rows: List[int]):
+        if rule.recommended not in self._recommended_profiles:
+            self._recommended_profiles[rule.recommended] = compile_profile_text(rule.recommended)
+        recommended = self._recommended_profiles[rule.recommended]
+        if recommended is None:
+            return
+        for index in rows:
+            schedule_name = table.rows[index][2].get(rule.attribute)
+            profile = self.schedule_profile(schedule_name, rule.on_off)
+            if profile is None or profiles_match(profile, recommended):
+                continue
+            yield index, self._finding(rule, table.rows[index][0], _shorten(format_profile(profile)),
+                                       _shorten(rule.recommended), schedule=schedule_name)
+
+    def _evaluate_min_count(self, rule: ValidationRule, table: ZoneAttributeTable, rows: List[int]):
+        required = int(rule.recommended)
+        for index in rows:
+            items = table.rows[index][2].get(rule.attribute) or []
+            if len(items) < required:
+                yield index, self._finding(rule, table.rows[index][0], f"{len(items)} directions: {list(items)}",
+                                           rule.recommended_format.format(required),
+                                           shortfall=required - len(items))
@@ -1,9 +1,18 @@
+import concurrent.futures
+import gc
 import os
 from utils.logging_config import get_logger
 from utils.sentry_config import capture_exception_with_context, add_breadcrumb, start_transaction
 from pathlib import Path
 from datetime import datetime
 from utils.data_loader import DataLoader
+from utils.profiler import NullProfiler
+from utils.path_utils import StagingStats, stage_file
+from utils.report_cache import ReportCache, fingerprint_report_inputs
+from utils.run_snapshot import (
+    REPORT_NAMES, AreaParserSnapshot, DataLoaderSnapshot, EnergyRatingParserSnapshot, LoadParserSnapshot,
+    build_run_snapshot, read_run_snapshot, write_run_snapshot
+)
 from generators.settings_report_generator import generate_settings_report_pdf
 from generators.schedule_report_generator import generate_schedules_report_pdf
 from generators.load_report_generator import generate_loads_report_pdf
@@ -14,6 +23,7 @@ from generators.lighting_report_generator import LightingReportGenerator
 from generators.area_loss_report_generator import generate_area_loss_report_pdf
 from generators.natural_ventilation_report_generator import generate_natural_ventilation_report
 from generators.automatic_error_detection_report_generator import generate_automatic_error_detection_report
+from generators.excel_export_generator import generate_excel_export
 from parsers.area_loss_parser import AreaLossParser
 from parsers.automatic_error_detection_parser import AutomaticErrorDetectionParser
 from generators.energy_rating_report_generator import EnergyRatingReportGenerator
@@ -33,13 +43,25 @@ from utils.report_data_validator import (
 
 logger = get_logger(__name__)
 
+# Parsers whose results are fully captured by _extract_data_from_parsers
+RELEASABLE_PARSERS = ("settings", "schedule", "glazing", "lighting", "area_loss", "automatic_error_detection")
+
+# Parsers and report steps that never read EnergyPlus output. Pipelined runs
+# process them while the simulation is still running.
+SIMULATION_INDEPENDENT_PARSERS = ("settings", "schedule", "lighting")
+SIMULATION_INDEPENDENT_REPORT_STEPS = 4  # Settings, Schedules, Lighting, Natural Ventilation
+
+# How often a pipelined run re-checks for cancellation while waiting on the simulation
+SIMULATION_WAIT_POLL_SECONDS = 0.5
+
 
 class ProcessingManager:
     """
     Manages the processing of IDF files, including parsing, data extraction,
     and report generation.
     """
-    def __init__(self, status_callback=None, progress_callback=None, simulation_output_csv=None):
+    def __init__(self, status_callback=None, progress_callback=None, simulation_output_csv=None, profiler=None,
+                 staging_stats=None, loader_cache=None):
         """
         Initializes the ProcessingManager.
 
@@ -47,13 +69,32 @@ class ProcessingManager:
             status_callback: Optional callback function for status updates.
             progress_callback: Optional callback function for progress updates.
             simulation_output_csv: Optional path to the simulation output CSV file.
+            profiler: Optional RunProfiler; when enabled, per-stage timings are
+                      written to timings.json in the run folder.
+            staging_stats: Optional StagingStats of the job (e.g. shared with its
+                           simulation); counts files linked versus copied.
+            loader_cache: Optional DataLoaderCache; models already loaded by an earlier
+                          run in this process are taken from it instead of being reloaded.
         """
         self.status_callback = status_callback
         self.progress_callback = progress_callback
         self.is_cancelled = False
         self.simulation_output_csv = simulation_output_csv
+        self.profiler = profiler or NullProfiler()
+        self.staging_stats = staging_stats or StagingStats()
+        self.loader_cache = loader_cache
+        self.epjson_load_stats = None
         self.city_info = {}
         self.consultant_data = {}
+        # Copy PDFs whose inputs did not change from an earlier run of the same project
+        self.reuse_unchanged_reports = True
+        self.report_cache = None
+        # Write run-snapshot.bin so the reports can be regenerated without the model
+        self.save_run_snapshot = True
+        # Report keys (see REPORT_NAMES) to generate; None generates all of them
+        self.selected_reports = None
+        # Write extracted-data.xlsx alongside the PDFs (licensed feature, checked by the callers)
+        self.export_excel = False
 
     def update_status(self, message: str) -> None:
         """Sends a status update message via the callback."""
@@ -119,7 +160,32 @@ class ProcessingManager:
             from datetime import datetime
             timestamp = datetime.now().strftime('%d-%m-%Y-%H-%M-%S')
             base_output = os.path.join(output_dir, f"{safe_project_name}-{timestamp}")
-        paths = {
+        paths = self._get_report_paths(base_output)
+        # Create each distinct folder once (several reports share a folder)
+        directories = dict.fromkeys(path_value if path_key.endswith("_dir") else os.path.dirname(path_value)
+                                    for path_key, path_value in paths.items())
+        for directory in directories:
+            self._ensure_directory_exists(os.path.join(directory, "dummy.txt"))  # Only the folder is created
+        
+        # Copy the input IDF file to the simulation folder for traceability. This stays a real copy:
+        # a hard link would change with in-place edits of the input (e.g. output variable injection)
+        if input_file and os.path.exists(input_file):
+            try:
+                from pathlib import Path
+                input_filename = Path(input_file).name
+                simulation_folder = os.path.join(base_output, "simulation")
+                destination_path = os.path.join(simulation_folder, f"input-{input_filename}")
+                stage_file(input_file, destination_path, self.staging_stats, link=False)
+                logger.info(f"Copied input file '{input_file}' to simulation folder: '{destination_path}'")
+            except Exception as e:
+                logger.warning(f"Failed to copy input file to simulation folder: {e}")
+        
+        return paths
+
+    @staticmethod
+    def _get_report_paths(base_output: str) -> dict:
+        """Returns the report output paths inside a run folder."""
+        return {
             "settings": os.path.join(base_output, "settings.pdf"),
             "schedules": os.path.join(base_output, "schedules.pdf"),
             "loads": os.path.join(base_output, "loads.pdf"),
@@ -130,27 +196,10 @@ class ProcessingManager:
             "energy_rating": os.path.join(base_output, "energy-rating.pdf"),
             "natural_ventilation": os.path.join(base_output, "natural-ventilation.pdf"),
             "automatic_error_detection": os.path.join(base_output, "automatic-validation.pdf"),
+            "excel": os.path.join(base_output, "extracted-data.xlsx"),
             "zones_dir": os.path.join(base_output, "zones"),
             "simulation_dir": os.path.join(base_output, "simulation")
         }
-        for path_key, path_value in paths.items():
-            dir_to_check = path_value if path_key.endswith("_dir") else os.path.dirname(path_value)
-            self._ensure_directory_exists(os.path.join(dir_to_check, "dummy.txt")) # Create dir with a dummy file
-        
-        # Copy the input IDF file to the simulation folder for traceability
-        if input_file and os.path.exists(input_file):
-            try:
-                import shutil
-                from pathlib import Path
-                input_filename = Path(input_file).name
-                simulation_folder = os.path.join(base_output, "simulation")
-                destination_path = os.path.join(simulation_folder, f"input-{input_filename}")
-                shutil.copy2(input_file, destination_path)
-                logger.info(f"Copied input file '{input_file}' to simulation folder: '{destination_path}'")
-            except Exception as e:
-                logger.warning(f"Failed to copy input file to simulation folder: {e}")
-        
-        return paths
 
     def _initialize_core_components(self, input_file: str, idd_path: str = None, energyplus_path: str = None, simulation_output_dir: str = None):
         """
@@ -166,8 +215,16 @@ class ProcessingManager:
             DataLoader instance
         """
         self.update_status("טוען קובץ IDF...")
-        data_loader = DataLoader(energyplus_path=energyplus_path, simulation_output_dir=simulation_output_dir)
-        data_loader.load_file(input_file, energyplus_path=energyplus_path)
+        with self.profiler.stage("load", "load"):
+            if self.loader_cache is not None:
+                data_loader = self.loader_cache.get(input_file, energyplus_path=energyplus_path,
+                                                    simulation_output_dir=simulation_output_dir, profiler=self.profiler,
+                                                    release_raw_sections=True, selective_load=True)
+            else:
+                data_loader = DataLoader(energyplus_path=energyplus_path, simulation_output_dir=simulation_output_dir,
+                                         profiler=self.profiler, release_raw_sections=True, selective_load=True)
+                data_loader.load_file(input_file, energyplus_path=energyplus_path)
+        self.epjson_load_stats = data_loader.get_load_stats()
         return data_loader
 
     def _get_climate_zone_from_city_info(self) -> str:
@@ -190,7 +247,24 @@ class ProcessingManager:
         
         return climate_zone
     
-    def _initialize_parsers(self, data_loader: DataLoader, area_parser_for_loss: 'AreaParser', city_area_name: str) -> dict:
+    def _initialize_simulation_independent_parsers(self, data_loader: DataLoader) -> dict:
+        """
+        Initializes the parsers that do not read simulation output.
+
+        Args:
+            data_loader: Initialized DataLoader instance.
+
+        Returns:
+            A dictionary of the parsers named in SIMULATION_INDEPENDENT_PARSERS.
+        """
+        return {
+            "settings": SettingsParser(data_loader),
+            "schedule": ScheduleParser(data_loader),
+            "lighting": LightingParser(data_loader),
+        }
+
+    def _initialize_parsers(self, data_loader: DataLoader, area_parser_for_loss: 'AreaParser', city_area_name: str,
+                            independent_parsers: dict = None) -> dict:
         """
         Initializes all required parsers.
 
@@ -198,14 +272,15 @@ class ProcessingManager:
             data_loader: Initialized DataLoader instance.
             area_parser_for_loss: Initialized AreaParser, needed for AreaLossParser.
             city_area_name: The city area name for thermal loss calculations.
+            independent_parsers: Simulation-independent parsers that already ran
+                                 (pipelined mode); created fresh when None.
 
         Returns:
             A dictionary of initialized parser instances.
         """
         self.update_status("מאתחל מנתחים...")
-        parsers = {
-            "settings": SettingsParser(data_loader),
-            "schedule": ScheduleParser(data_loader),
+        parsers = dict(independent_parsers or self._initialize_simulation_independent_parsers(data_loader))
+        parsers.update({
             "load": LoadParser(data_loader),
             "materials": MaterialsParser(data_loader),
             "glazing": GlazingParser(
@@ -220,43 +295,64 @@ class ProcessingManager:
                 frame_divider_cache=data_loader._frame_divider_cache
             ),
             "area": area_parser_for_loss,
-            "lighting": LightingParser(data_loader),
             "area_loss": AreaLossParser(area_parser_for_loss, city_area_name),
             "energy_rating": EnergyRatingParser(data_loader, area_parser_for_loss),
             "automatic_error_detection": AutomaticErrorDetectionParser(data_loader, self._get_climate_zone_from_city_info(), area_parser_for_loss)
-        }
+        })
         return parsers
 
-    def _process_data_sources(self, parsers: dict, data_loader: DataLoader, simulation_output_csv: str):
+    def _process_simulation_independent_sources(self, parsers: dict, data_loader: DataLoader):
         """
-        Processes data using the initialized parsers.
+        Processes the data sources that do not read simulation output.
         """
         self.update_status("מעבד הגדרות...")
-        parsers["settings"].process_idf()
+        with self.profiler.stage("parse:settings", "parser"):
+            parsers["settings"].process_idf()
         if self.is_cancelled: return
 
         self.update_status("מעבד לוחות זמנים...")
-        for schedule_obj in data_loader.get_schedule_objects():
-            parsers["schedule"].process_schedule_object(schedule_obj)
+        with self.profiler.stage("parse:schedules", "parser"):
+            for schedule_obj in data_loader.get_schedule_objects():
+                parsers["schedule"].process_schedule_object(schedule_obj)
         if self.is_cancelled: return
 
+        with self.profiler.stage("parse:lighting", "parser"):
+            parsers["lighting"].process_idf(data_loader.get_idf())
+
+    def _process_data_sources(self, parsers: dict, data_loader: DataLoader, simulation_output_csv: str,
+                              simulation_independent_done: bool = False):
+        """
+        Processes data using the initialized parsers.
+
+        Args:
+            simulation_independent_done: Skip the settings, schedule and lighting
+                                         parsers because a pipelined run already ran them.
+        """
+        if not simulation_independent_done:
+            self._process_simulation_independent_sources(parsers, data_loader)
+            if self.is_cancelled: return
+
         self.update_status("מעבד נתונים נוספים (עומסים, חומרים, אזורים)...")
-        parsers["load"].process_idf(data_loader.get_idf())
-        parsers["materials"].process_idf(data_loader.get_idf())
-        parsers["area"].process_idf(data_loader.get_idf())
-        parsers["lighting"].process_idf(data_loader.get_idf())
-        parsers["glazing"].parse_glazing_data()
+        with self.profiler.stage("parse:loads", "parser"):
+            parsers["load"].process_idf(data_loader.get_idf())
+        with self.profiler.stage("parse:materials", "parser"):
+            parsers["materials"].process_idf(data_loader.get_idf())
+        with self.profiler.stage("parse:area", "parser"):
+            parsers["area"].process_idf(data_loader.get_idf())
+        with self.profiler.stage("parse:glazing", "parser"):
+            parsers["glazing"].parse_glazing_data()
 
         if self.is_cancelled: return
 
         self.update_status("מעבד נתוני דירוג אנרגיה...")
         energy_rating_parser = parsers["energy_rating"]
-        if simulation_output_csv:
-            energy_rating_parser.process_output(simulation_output_csv)
-        else:
-            # This case might be problematic if simulation_output_csv is essential
-            self.update_status("אזהרה: לא סופק קובץ CSV של תוצאות סימולציה לדירוג אנרגיה. התוצאות עלולות להיות חלקיות.")
-            energy_rating_parser.process_output() # Or handle this case differently
+        with self.profiler.stage("parse:energy_rating", "parser"):
+            if simulation_output_csv:
+                energy_rating_parser.process_output(simulation_output_csv)
+            else:
+                # This case might be problematic if simulation_output_csv is essential
+                self.update_status("אזהרה: לא סופק קובץ CSV של תוצאות סימולציה לדירוג אנרגיה. התוצאות עלולות להיות חלקיות.")
+                energy_rating_parser.process_output() # Or handle this case differently
 
         self.update_status("מעבד נתוני בדיקה אוטומטית...")
         try:
@@ -269,7 +365,8 @@ class ProcessingManager:
                 current_iso_type = "2023"
             else:
                 current_iso_type = "Office"
-            parsers["automatic_error_detection"].process_idf(data_loader.get_idf(), current_iso_type)
+            with self.profiler.stage("parse:automatic_error_detection", "parser"):
+                parsers["automatic_error_detection"].process_idf(data_loader.get_idf(), current_iso_type)
             self.update_status("נתוני בדיקה אוטומטית עובדו בהצלחה")
         except Exception as e:
             error_message = f"Failed processing automatic validation data: {type(e).__name__} - {str(e)}"
@@ -277,21 +374,100 @@ class ProcessingManager:
             logger.error(f"Exception in automatic error detection processing: {e}", exc_info=True)
         if self.is_cancelled: return
 
-    def _extract_data_from_parsers(self, parsers: dict) -> dict:
+    def _extract_simulation_independent_data(self, parsers: dict) -> dict:
         """
-        Extracts processed data from parsers.
+        Extracts processed data from the parsers that do not read simulation output.
         """
-        self.update_status("מחלץ נתונים מעובדים...")
         return {
             "settings": parsers["settings"].get_settings(),
             "schedules": parsers["schedule"].get_parsed_unique_schedules(),
+            "lighting": parsers["lighting"].get_parsed_data(), # Ensure this returns data
+        }
+
+    def _extract_data_from_parsers(self, parsers: dict) -> dict:
+        """
+        Extracts processed data from parsers.
+        """
+        self.update_status("מחלץ נתונים מעובדים...")
+        extracted_data = self._extract_simulation_independent_data(parsers)
+        extracted_data.update({
             "loads": parsers["load"].get_parsed_zone_loads(),
             "materials": parsers["materials"].get_element_data(),
             "glazing": parsers["glazing"].parsed_glazing_data,
-            "lighting": parsers["lighting"].get_parsed_data(), # Ensure this returns data
             "area_loss": parsers["area_loss"].parse(), # Ensure this returns data
             "automatic_error_detection": parsers["automatic_error_detection"].get_error_detection_data(),
-        }
+        })
+        return extracted_data
+
+    def _run_simulation_independent_stages(self, data_loader: DataLoader, report_paths: dict,
+                                           project_name: str, run_id: str, city_area_name_selection: str) -> dict:
+        """
+        Parses and reports everything that does not read simulation output.
+
+        Called by pipelined runs while EnergyPlus is still running, so the
+        settings, schedules, lighting and natural ventilation work is off the
+        critical path.
+
+        Returns:
+            The simulation-independent parsers, to be reused by _initialize_parsers.
+        """
+        self.update_status("מעבד נתונים שאינם תלויים בסימולציה בזמן שהסימולציה רצה...")
+        parsers = self._initialize_simulation_independent_parsers(data_loader)
+        with self.profiler.stage("parse:simulation_independent", "pipeline"):
+            self._process_simulation_independent_sources(parsers, data_loader)
+        if self.is_cancelled:
+            return parsers
+
+        with self.profiler.stage("reports:simulation_independent", "pipeline"):
+            self._generate_simulation_independent_reports(
+                self._extract_simulation_independent_data(parsers), report_paths, project_name, run_id,
+                city_area_name_selection, data_loader
+            )
+        return parsers
+
+    def _await_simulation(self, simulation_future: 'concurrent.futures.Future', data_loader: DataLoader,
+                          simulation_output_dir: str) -> None:
+        """
+        Waits for the background EnergyPlus run and refreshes the simulation-dependent caches.
+
+        Args:
+            simulation_future: Future resolving to the eplustbl.csv path, or None if the simulation failed.
+            data_loader: DataLoader whose HVAC zones are re-detected from the simulation CSV.
+            simulation_output_dir: Run folder holding the simulation/ subfolder.
+        """
+        self.update_status("ממתין לסיום סימולציית EnergyPlus...")
+        simulation_output_csv = None
+        with self.profiler.stage("wait:simulation", "simulation"):
+            while not self.is_cancelled:
+                done, _ = concurrent.futures.wait([simulation_future], timeout=SIMULATION_WAIT_POLL_SECONDS)
+                if done:
+                    try:
+                        simulation_output_csv = simulation_future.result()
+                    except Exception as e:
+                        logger.error(f"Background EnergyPlus simulation failed: {e}", exc_info=True)
+                    break
+        if self.is_cancelled:
+            return
+
+        self.simulation_output_csv = simulation_output_csv
+        if not simulation_output_csv:
+            self.update_status("אזהרה: הסימולציה לא הפיקה קובץ CSV. ממשיך בלי נתוני סימולציה.")
+        with self.profiler.stage("refresh_simulation_outputs", "cache"):
+            data_loader.refresh_simulation_outputs(simulation_output_dir)
+
+    def _release_parser_intermediates(self, parsers: dict, data_loader: DataLoader) -> None:
+        """
+        Frees parsing state that report generation no longer needs.
+
+        Drops the parsers whose results were already extracted (report generation
+        only uses the area, energy rating and load parsers), the remaining raw
+        EPJSON data, and compacts the DataLoader caches.
+        """
+        for parser_name in RELEASABLE_PARSERS:
+            parsers.pop(parser_name, None)
+        data_loader.release_raw_data()
+        data_loader.compact()
+        gc.collect()
 
     def _generate_report_item(self, report_name: str, generation_function,
                               data, output_path: str, project_name: str, run_id: str,
@@ -299,8 +475,39 @@ class ProcessingManager:
                               is_generator_class: bool = False, **kwargs) -> bool:
         """
         Helper to generate a single report item.
+
+        When an earlier run of the project rendered this report from the same inputs,
+        its PDF is reused instead.
         """
+        if not self._is_report_selected(report_name):
+            return False
+
+        fingerprint = None
+        if self.report_cache is not None:
+            fingerprint = fingerprint_report_inputs(
+                report_name, data,
+                {"project_name": project_name, "city_name": city_name, "area_name": area_name, **kwargs})
+            if self.report_cache.try_reuse(report_name, fingerprint, output_path):
+                self.update_status(f"דוח {report_name} לא השתנה - נלקח מריצה קודמת")
+                return True
+            self.report_cache.detach(output_path)
+
         self.update_status(f"יוצר דוח {report_name}...")
+        with self.profiler.stage(f"report:{report_name}", "report"):
+            success = self._run_report_generation(report_name, generation_function, data, output_path,
+                                                  project_name, run_id, city_name, area_name,
+                                                  is_generator_class, **kwargs)
+        if success and self.report_cache is not None:
+            self.report_cache.record(report_name, fingerprint, output_path)
+        return success
+
+    def _run_report_generation(self, report_name: str, generation_function,
+                               data, output_path: str, project_name: str, run_id: str,
+                               city_name: str, area_name: str,
+                               is_generator_class: bool, **kwargs) -> bool:
+        """
+        Runs a single report generator and reports the outcome via status updates.
+        """
         success = False
         try:
             if is_generator_class:
@@ -333,24 +540,44 @@ class ProcessingManager:
                                          output_path=output_path)
             return False
 
-    def _generate_all_reports(self, extracted_data: dict, report_paths: dict,
-                              project_name: str, run_id: str,
-                              area_parser_instance: 'AreaParser',
-                              energy_rating_parser_instance: 'EnergyRatingParser',
-                              base_output_dir_for_reports: str,
-                              iso_type_selection: str,
-                              city_area_name_selection: str,
-                              data_loader: 'DataLoader',  # Add data_loader parameter
-                              load_parser_instance: 'LoadParser' = None  # Add load parser parameter
-                              ) -> None:
+    def _is_report_selected(self, report_name: str) -> bool:
+        """Checks a report name against selected_reports."""
+        if self.selected_reports is None:
+            return True
+        return any(REPORT_NAMES.get(key) == report_name for key in self.selected_reports)
+
+    def _get_energy_rating_model(self, iso_type_selection: str, city_area_name_selection: str) -> tuple:
         """
-        Generates all PDF reports.
+        Resolves the model year and area definition the energy rating is computed against.
+
+        For 2023 models the area definition is the numeric area code; for 2017 and office
+        models the Hebrew area name is mapped to a Latin letter (for model calculations only).
+
+        Returns:
+            Tuple of (model_year, model_area_definition); either may be None.
         """
-        self.update_status("יוצר דוחות...")
-        progress_step = 0.7 # Initial progress after parsing
-        num_reports = 10 # Updated number of main report generation steps (added automatic error detection)
-        progress_increment = (1.0 - progress_step) / num_reports
+        derived_model_year = None
+        if "2017" in iso_type_selection:
+            derived_model_year = 2017
+        elif "2023" in iso_type_selection: # Assuming "RESIDNTIAL 2023" implies 2023
+            derived_model_year = 2023
+        elif "OFFICE" in iso_type_selection.upper():
+            derived_model_year = "office"  # Special case for office buildings
 
+        if derived_model_year == 2023:
+            derived_model_area_definition = self.city_info.get('area_code', '') if hasattr(self, 'city_info') and self.city_info else ''
+        else:
+            area_name_map_to_letter = {"א": "A", "ב": "B", "ג": "C", "ד": "D"}
+            derived_model_area_definition = area_name_map_to_letter.get(city_area_name_selection)
+        return derived_model_year, derived_model_area_definition
+
+    def _get_report_labels(self, city_area_name_selection: str) -> tuple:
+        """
+        Resolves the city name, model year and area name shown in report metadata.
+
+        Returns:
+            Tuple of (city_name_hebrew, derived_model_year, area_name_for_reports).
+        """
         city_name_hebrew = self.city_info.get('city', 'N/A') if hasattr(self, 'city_info') and self.city_info else 'N/A'
         
         # Determine the correct area name for display based on model year
@@ -372,20 +599,98 @@ class ProcessingManager:
             # For 2017/office models, use Hebrew area name directly
             area_name_for_reports = city_area_name_selection if city_area_name_selection else 'N/A'
 
+        return city_name_hebrew, derived_model_year, area_name_for_reports
+
+    def _generate_simulation_independent_reports(self, extracted_data: dict, report_paths: dict,
+                                                 project_name: str, run_id: str,
+                                                 city_area_name_selection: str,
+                                                 data_loader: 'DataLoader',
+                                                 progress_step: float = None,
+                                                 progress_increment: float = 0.0) -> float:
+        """
+        Generates the settings, schedules, lighting and natural ventilation reports,
+        none of which depend on simulation output.
+
+        Args:
+            progress_step: Current progress value; progress is only reported when given.
+            progress_increment: Progress added per report step.
+
+        Returns:
+            The progress value after these SIMULATION_INDEPENDENT_REPORT_STEPS steps.
+        """
+        city_name_hebrew, _, area_name_for_reports = self._get_report_labels(city_area_name_selection)
+
+        def advance_progress():
+            nonlocal progress_step
+            if progress_step is not None:
+                progress_step += progress_increment
+                self.update_progress(progress_step)
+
         # Settings
         if validate_settings_data(extracted_data["settings"]):
             self._generate_report_item("Settings", generate_settings_report_pdf, extracted_data["settings"], report_paths["settings"], project_name, run_id, city_name_hebrew, area_name_for_reports)
         else:
             self.update_status("דוח הגדרות דולג - אין נתוני הגדרות מספיקים")
-        progress_step += progress_increment; self.update_progress(progress_step)
-        if self.is_cancelled: return
+        advance_progress()
+        if self.is_cancelled: return progress_step
 
         # Schedules
         if validate_schedule_data(extracted_data["schedules"]):
             self._generate_report_item("Schedules", generate_schedules_report_pdf, extracted_data["schedules"], report_paths["schedules"], project_name, run_id, city_name_hebrew, area_name_for_reports)
         else:
             self.update_status("דוח לוחות זמנים דולג - אין נתוני לוחות זמנים מספיקים")
-        progress_step += progress_increment; self.update_progress(progress_step)
+        advance_progress()
+        if self.is_cancelled: return progress_step
+
+        # Lighting
+        if validate_lighting_data(extracted_data["lighting"]):
+            self._generate_report_item("Lighting", LightingReportGenerator, extracted_data["lighting"], report_paths["lighting"], project_name, run_id, city_name_hebrew, area_name_for_reports, is_generator_class=True)
+        else:
+            self.update_status("דוח תאורה דולג - אין נתוני תאורה מספיקים")
+        advance_progress()
+        if self.is_cancelled: return progress_step
+
+        # Natural Ventilation
+        ventilation_data = data_loader.get_natural_ventilation_data()
+        if validate_natural_ventilation_data(ventilation_data):
+            self._generate_report_item("Natural Ventilation", generate_natural_ventilation_report, ventilation_data, report_paths["natural_ventilation"], project_name, run_id, city_name_hebrew, area_name_for_reports)
+        else:
+            self.update_status("דוח אוורור טבעי דולג - אין נתוני אוורור טבעי מספיקים")
+        advance_progress()
+        return progress_step
+
+    def _generate_all_reports(self, extracted_data: dict, report_paths: dict,
+                              project_name: str, run_id: str,
+                              area_parser_instance: 'AreaParser',
+                              energy_rating_parser_instance: 'EnergyRatingParser',
+                              base_output_dir_for_reports: str,
+                              iso_type_selection: str,
+                              city_area_name_selection: str,
+                              data_loader: 'DataLoader',  # Add data_loader parameter
+                              load_parser_instance: 'LoadParser' = None,  # Add load parser parameter
+                              simulation_independent_done: bool = False
+                              ) -> None:
+        """
+        Generates all PDF reports.
+
+        When simulation_independent_done is set, a pipelined run already generated
+        the reports that do not depend on simulation output.
+        """
+        self.update_status("יוצר דוחות...")
+        progress_step = 0.7 # Initial progress after parsing
+        num_reports = 10 # Updated number of main report generation steps (added automatic error detection)
+        progress_increment = (1.0 - progress_step) / num_reports
+
+        city_name_hebrew, derived_model_year, area_name_for_reports = self._get_report_labels(city_area_name_selection)
+
+        if simulation_independent_done:
+            progress_step += SIMULATION_INDEPENDENT_REPORT_STEPS * progress_increment
+            self.update_progress(progress_step)
+        else:
+            progress_step = self._generate_simulation_independent_reports(
+                extracted_data, report_paths, project_name, run_id, city_area_name_selection, data_loader,
+                progress_step=progress_step, progress_increment=progress_increment
+            )
         if self.is_cancelled: return
 
         # Loads
@@ -410,7 +715,9 @@ class ProcessingManager:
         is_office_iso = isinstance(derived_model_year, str) and 'office' in derived_model_year.lower()
         
         # Check if area parser has data before generating reports
-        if area_parser_instance and area_parser_instance.processed:
+        if not self._is_report_selected("Area (Zones)"):
+            logger.info("Skipping area reports - not selected")
+        elif area_parser_instance and area_parser_instance.processed:
             # Check if area parser has any processed areas
             has_area_data = (hasattr(area_parser_instance, 'areas_by_zone') and 
                            area_parser_instance.areas_by_zone and 
@@ -431,7 +738,8 @@ class ProcessingManager:
                     self.update_status("יוצר דוחות אזורים אינדיבידואליים (Office ISO - ללא קיבוץ)...")
                     try:
                         from generators.area_report_generator import generate_area_reports
-                        generate_area_reports(area_parser_instance, output_dir=report_paths["zones_dir"], project_name=project_name, run_id=run_id, city_name=city_name_hebrew, area_name=area_name_for_reports, is_office_iso=True)
+                        with self.profiler.stage("report:Area (Zones)", "report"):
+                            generate_area_reports(area_parser_instance, output_dir=report_paths["zones_dir"], project_name=project_name, run_id=run_id, city_name=city_name_hebrew, area_name=area_name_for_reports, is_office_iso=True)
                         self.update_status("ניסה ליצור דוחות אזורים אינדיבידואליים.")
                     except Exception as e:
                         error_message = f"Error generating individual Area (Zones) reports for Office ISO: {type(e).__name__} - {str(e)}"
@@ -441,7 +749,8 @@ class ProcessingManager:
                     self.update_status("יוצר דוחות אזורים (איזורים) עם קיבוץ אזור בסיס...")
                     try:
                         from generators.area_report_generator import generate_area_reports_by_base_zone
-                        generate_area_reports_by_base_zone(area_parser_instance, output_dir=report_paths["zones_dir"], project_name=project_name, run_id=run_id, city_name=city_name_hebrew, area_name=area_name_for_reports)
+                        with self.profiler.stage("report:Area (Zones)", "report"):
+                            generate_area_reports_by_base_zone(area_parser_instance, output_dir=report_paths["zones_dir"], project_name=project_name, run_id=run_id, city_name=city_name_hebrew, area_name=area_name_for_reports)
                         self.update_status("ניסה ליצור דוחות אזורים עם קיבוץ אזור בסיס.")
                     except Exception as e:
                         error_message = f"Error generating Area (Zones) reports with base zone grouping: {type(e).__name__} - {str(e)}"
@@ -464,28 +773,11 @@ class ProcessingManager:
         progress_step += progress_increment; self.update_progress(progress_step)
         if self.is_cancelled: return
 
-        # Lighting
-        if validate_lighting_data(extracted_data["lighting"]):
-            self._generate_report_item("Lighting", LightingReportGenerator, extracted_data["lighting"], report_paths["lighting"], project_name, run_id, city_name_hebrew, area_name_for_reports, is_generator_class=True)
-        else:
-            self.update_status("דוח תאורה דולג - אין נתוני תאורה מספיקים")
-        progress_step += progress_increment; self.update_progress(progress_step)
-        if self.is_cancelled: return
-        
         # Area Loss - temporarily disabled
         # self._generate_report_item("Area Loss", generate_area_loss_report_pdf, extracted_data["area_loss"], report_paths["area_loss"], project_name, run_id, city_name_hebrew, area_name_for_reports)
         progress_step += progress_increment; self.update_progress(progress_step)
         if self.is_cancelled: return
 
-        # Natural Ventilation
-        ventilation_data = data_loader.get_natural_ventilation_data()
-        if validate_natural_ventilation_data(ventilation_data):
-            self._generate_report_item("Natural Ventilation", generate_natural_ventilation_report, ventilation_data, report_paths["natural_ventilation"], project_name, run_id, city_name_hebrew, area_name_for_reports)
-        else:
-            self.update_status("דוח אוורור טבעי דולג - אין נתוני אוורור טבעי מספיקים")
-        progress_step += progress_increment; self.update_progress(progress_step)
-        if self.is_cancelled: return
-
         # Automatic Validation
         if validate_automatic_error_detection_data(extracted_data["automatic_error_detection"]):
             self._generate_report_item("Automatic Validation", generate_automatic_error_detection_report, extracted_data["automatic_error_detection"], report_paths["automatic_error_detection"], project_name, run_id, city_name_hebrew, area_name_for_reports)
@@ -497,32 +789,19 @@ class ProcessingManager:
         # Energy Rating
         # Check if energy rating parser has sufficient data
         energy_rating_data = energy_rating_parser_instance.get_energy_rating_table_data() if energy_rating_parser_instance.processed else []
-        if not energy_rating_data or len(energy_rating_data) == 0:
+        if not self._is_report_selected("Energy Rating"):
+            logger.info("Skipping energy rating report - not selected")
+        elif not energy_rating_data or len(energy_rating_data) == 0:
             self.update_status("דוח דירוג אנרגיה דולג - אין נתוני אנרגיה מספיקים")
             logger.info("Skipping energy rating report - no energy data available")
         else:
             self.update_status("יוצר דוח דירוג אנרגיה (PDF)...")
             try:
-                derived_model_year = None
-                derived_model_area_definition = None
-
-                if "2017" in iso_type_selection:
-                    derived_model_year = 2017
-                elif "2023" in iso_type_selection: # Assuming "RESIDNTIAL 2023" implies 2023
-                    derived_model_year = 2023
-                elif "OFFICE" in iso_type_selection.upper():
-                    derived_model_year = "office"  # Special case for office buildings
-                
-                # For 2023, use numeric area code; for others, use Latin letters (for model calculations)
+                derived_model_year, derived_model_area_definition = self._get_energy_rating_model(
+                    iso_type_selection, city_area_name_selection)
                 if derived_model_year == 2023:
-                    # For 2023 models, use the numeric area code directly
-                    area_code = self.city_info.get('area_code', '') if hasattr(self, 'city_info') and self.city_info else ''
-                    derived_model_area_definition = area_code
-                    self.update_status(f"דירוג אנרגיה: משתמש בקוד אזור מספרי '{area_code}' למודל 2023")
+                    self.update_status(f"דירוג אנרגיה: משתמש בקוד אזור מספרי '{derived_model_area_definition}' למודל 2023")
                 else:
-                    # For 2017 and office models, map Hebrew area name to Latin letter (for model calculations only)
-                    area_name_map_to_letter = {"א": "A", "ב": "B", "ג": "C", "ד": "D"}
-                    derived_model_area_definition = area_name_map_to_letter.get(city_area_name_selection)
                     self.update_status(f"דירוג אנרגיה: משתמש באות אזור לטינית '{derived_model_area_definition}' למודל {derived_model_year}")
 
                 if derived_model_year and derived_model_area_definition:
@@ -543,7 +822,8 @@ class ProcessingManager:
                         load_parser=load_parser_instance  # Add load parser for ventilation bonus calculation
                     )
                     # The output_filename is relative to output_dir in the generator
-                    success_er = energy_rating_gen.generate_report(output_filename=os.path.basename(report_paths["energy_rating"]))
+                    with self.profiler.stage("report:Energy Rating", "report"):
+                        success_er = energy_rating_gen.generate_report(output_filename=os.path.basename(report_paths["energy_rating"]))
                     if success_er:
                         self.update_status(f"דוח דירוג אנרגיה נוצר בהצלחה ב-{report_paths['energy_rating']}")
                     else:
@@ -551,7 +831,8 @@ class ProcessingManager:
 
                     # Generate total energy rating report
                     try:
-                        total_rating_path = energy_rating_gen.generate_total_energy_rating_report(output_filename="total-energy-rating.pdf")
+                        with self.profiler.stage("report:Total Energy Rating", "report"):
+                            total_rating_path = energy_rating_gen.generate_total_energy_rating_report(output_filename="total-energy-rating.pdf")
                         if total_rating_path:
                             self.update_status(f"דוח דירוג אנרגיה כולל נוצר בהצלחה ב-{total_rating_path}")
                         else:
@@ -583,7 +864,8 @@ class ProcessingManager:
         }
         return area_name_to_hebrew.get(str(area_name), area_name)
 
-    def process_idf(self, input_file: str, idd_path: str, output_dir: str, run_id: str = None, energyplus_path: str = None) -> bool:
+    def process_idf(self, input_file: str, idd_path: str, output_dir: str, run_id: str = None, energyplus_path: str = None,
+                    simulation_future: 'concurrent.futures.Future' = None) -> bool:
         """
         Main method to process an IDF file and generate all reports.
         
@@ -593,9 +875,16 @@ class ProcessingManager:
             output_dir: Base output directory
             run_id: Optional pre-generated run ID. If None, will generate one.
             energyplus_path: Path to EnergyPlus installation directory
+            simulation_future: Pipelined mode. Future for an EnergyPlus run that is still
+                               in progress, resolving to the eplustbl.csv path (or None).
+                               Loading, simulation-independent parsers and their reports
+                               run before waiting on it; simulation_output_csv is ignored.
         """
         # Start Sentry transaction for performance monitoring
-        transaction = start_transaction(name="process_idf", op="idf_processing")
+        transaction = start_transaction(name="process_idf", op="idf_processing", tracer=self.profiler.tracer)
+        base_reports_dir = None
+        self.report_cache = None
+        excel_export = None
         
         try:
             # Use project name from consultant data if provided, otherwise default to IDF filename
@@ -614,7 +903,8 @@ class ProcessingManager:
             self.update_progress(0.0)
             self.update_status("מאתחל...")
 
-            report_paths = self._setup_output_paths(output_dir, run_id, project_name, input_file)
+            with self.profiler.stage("setup_output_paths", "pipeline"):
+                report_paths = self._setup_output_paths(output_dir, run_id, project_name, input_file)
             # Create base reports directory name matching the new naming convention
             safe_project_name = "unknown-project"
             
@@ -629,11 +919,17 @@ class ProcessingManager:
             safe_project_name = "".join(c for c in safe_project_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
             safe_project_name = safe_project_name.replace(' ', '-')
             base_reports_dir = os.path.join(output_dir, f"{safe_project_name}-{run_id}") # Used by EnergyRatingGenerator
+            self.report_cache = (ReportCache(base_reports_dir, f"{safe_project_name}-")
+                                 if self.reuse_unchanged_reports else None)
 
             if self.is_cancelled: return False
             self.update_progress(0.1)
 
-            data_loader = self._initialize_core_components(input_file, idd_path, energyplus_path, base_reports_dir)
+            # While the simulation is running its output folder may hold a partially written
+            # eplustbl.csv, so pipelined runs detect HVAC zones from the CSV only after waiting
+            pipelined = simulation_future is not None
+            data_loader = self._initialize_core_components(input_file, idd_path, energyplus_path,
+                                                           None if pipelined else base_reports_dir)
             
             # Set ISO type in DataLoader for zone grouping decisions
             # Extract ISO type from the run_id or determine from other sources
@@ -652,27 +948,43 @@ class ProcessingManager:
             if self.city_info and 'area_name' in self.city_info:
                 city_area_name_for_loss = self.city_info.get('area_name', "א")
                 self.update_status(f"משתמש באזור עיר '{city_area_name_for_loss}' לחישובי אובדני חום.")
+
+            independent_parsers = None
+            if pipelined:
+                independent_parsers = self._run_simulation_independent_stages(
+                    data_loader, report_paths, project_name, run_id, self.city_info.get('area_name', ''))
+                if self.is_cancelled: return False
+                self._await_simulation(simulation_future, data_loader, base_reports_dir)
+                if self.is_cancelled: return False
             
             # Initialize parsers that depend on each other or simulation output
-            temp_materials_parser = MaterialsParser(data_loader) # Needed by AreaParser
-            # AreaParser might need simulation_output_csv if it uses it for something
-            temp_area_parser = AreaParser(data_loader, temp_materials_parser, self.simulation_output_csv)
+            with self.profiler.stage("initialize_parsers", "pipeline"):
+                temp_materials_parser = MaterialsParser(data_loader) # Needed by AreaParser
+                # AreaParser might need simulation_output_csv if it uses it for something
+                temp_area_parser = AreaParser(data_loader, temp_materials_parser, self.simulation_output_csv)
 
-            parsers = self._initialize_parsers(data_loader, temp_area_parser, city_area_name_for_loss)
-            # Ensure the already initialized parsers are used
-            parsers["materials"] = temp_materials_parser
-            parsers["area"] = temp_area_parser
+                parsers = self._initialize_parsers(data_loader, temp_area_parser, city_area_name_for_loss,
+                                                   independent_parsers)
+                # Ensure the already initialized parsers are used
+                parsers["materials"] = temp_materials_parser
+                parsers["area"] = temp_area_parser
 
 
             if self.is_cancelled: return False
             self.update_progress(0.3)
 
-            self._process_data_sources(parsers, data_loader, self.simulation_output_csv)
+            with self.profiler.stage("parse", "pipeline"):
+                self._process_data_sources(parsers, data_loader, self.simulation_output_csv,
+                                           simulation_independent_done=pipelined)
 
             if self.is_cancelled: return False
             self.update_progress(0.6) # Progress after parsing
 
-            extracted_data = self._extract_data_from_parsers(parsers)
+            with self.profiler.stage("extract_data", "pipeline"):
+                extracted_data = self._extract_data_from_parsers(parsers)
+
+            with self.profiler.stage("release_intermediates", "pipeline"):
+                self._release_parser_intermediates(parsers, data_loader)
 
             if self.is_cancelled: return False
             self.update_progress(0.7) # Progress before report generation
@@ -681,24 +993,40 @@ class ProcessingManager:
             current_iso_type = self.city_info.get('iso_type', '')
             current_city_area_name = self.city_info.get('area_name', '') # This is "א", "ב", etc.
 
-            self._generate_all_reports(
-                extracted_data,
-                report_paths,
-                project_name,
-                run_id,
-                parsers["area"], # Pass the AreaParser instance
-                parsers["energy_rating"], # Pass the EnergyRatingParser instance
-                base_reports_dir,
-                iso_type_selection=current_iso_type,
-                city_area_name_selection=current_city_area_name,
-                data_loader=data_loader,  # Pass data_loader to _generate_all_reports
-                load_parser_instance=parsers["load"]  # Pass load parser for ventilation bonus calculation
-            )
+            if self.export_excel:
+                excel_export = self._start_excel_export(
+                    extracted_data, parsers["area"], parsers["energy_rating"], data_loader,
+                    report_paths["excel"], project_name, run_id)
+
+            with self.profiler.stage("reports", "pipeline"):
+                self._generate_all_reports(
+                    extracted_data,
+                    report_paths,
+                    project_name,
+                    run_id,
+                    parsers["area"], # Pass the AreaParser instance
+                    parsers["energy_rating"], # Pass the EnergyRatingParser instance
+                    base_reports_dir,
+                    iso_type_selection=current_iso_type,
+                    city_area_name_selection=current_city_area_name,
+                    data_loader=data_loader,  # Pass data_loader to _generate_all_reports
+                    load_parser_instance=parsers["load"],  # Pass load parser for ventilation bonus calculation
+                    simulation_independent_done=pipelined
+                )
+
+            if excel_export is not None:
+                self._finish_excel_export(excel_export, report_paths["excel"])
+                excel_export = None
 
             if self.is_cancelled:
                 self.update_status("העיבוד בוטל במהלך יצירת הדוחות.")
                 return False
 
+            if self.save_run_snapshot:
+                with self.profiler.stage("write_snapshot", "pipeline"):
+                    self._write_run_snapshot(extracted_data, parsers, data_loader, base_reports_dir,
+                                             project_name, safe_project_name, run_id, input_file)
+
             self.update_status("העיבוד הושלם בהצלחה!")
             add_breadcrumb("IDF processing completed successfully", category="processing", level="info")
             transaction.set_status("ok")
@@ -727,7 +1055,204 @@ class ProcessingManager:
             return False
         finally:
             # Always finish the transaction
+            self.profiler.tracer.forward_to(None)
             transaction.finish()
+            if excel_export is not None:
+                # Report generation failed or was cancelled; let the export finish writing
+                excel_export[0].shutdown(wait=True)
+            self._write_report_fingerprints()
+            logger.info(f"File staging for run {run_id}: {self.staging_stats}")
+            if self.profiler.enabled and base_reports_dir:
+                self._write_run_timings(base_reports_dir, input_file, run_id)
+            if base_reports_dir:
+                self.profiler.write_trace(base_reports_dir, input_file=input_file, run_id=run_id)
+
+    def _start_excel_export(self, extracted_data: dict, area_parser, energy_rating_parser,
+                            data_loader, output_path: str, project_name: str, run_id: str) -> tuple:
+        """
+        Starts writing extracted-data.xlsx on a background thread, parallel to PDF generation.
+
+        The parser queries run here, on the calling thread; the export thread only
+        reads the resulting data. Some generators sort their input lists in place
+        (e.g. lighting), so the export gets its own copies of the top-level lists.
+
+        Returns:
+            Tuple of (executor, future); pass it to _finish_excel_export.
+        """
+        energy_rating_rows = []
+        if energy_rating_parser.processed:
+            try:
+                model_year, model_area_definition = self._get_energy_rating_model(
+                    self.city_info.get('iso_type', ''), self.city_info.get('area_name', ''))
+                energy_rating_rows = (energy_rating_parser.get_energy_rating_table_data(model_year, model_area_definition)
+                                      if model_year and model_area_definition
+                                      else energy_rating_parser.get_energy_rating_table_data())
+            except Exception as e:
+                logger.warning(f"Energy rating rows not available for the Excel export: {e}")
+
+        try:
+            natural_ventilation_data = data_loader.get_natural_ventilation_data()
+        except Exception as e:
+            natural_ventilation_data = {}
+            logger.warning(f"Natural ventilation data not available for the Excel export: {e}")
+
+        export_data = {
+            key: ({name: list(item) if isinstance(item, list) else item for name, item in value.items()}
+                  if isinstance(value, dict) else list(value) if isinstance(value, list) else value)
+            for key, value in extracted_data.items()
+        }
+
+        def export():
+            with self.profiler.stage("report:Excel Export", "report"):
+                return generate_excel_export(
+                    export_data, output_path,
+                    areas_by_zone=area_parser.areas_by_zone if area_parser.processed else {},
+                    energy_rating_rows=energy_rating_rows,
+                    natural_ventilation_data=natural_ventilation_data,
+                    project_name=project_name, run_id=run_id)
+
+        self.update_status("מייצא נתונים לקובץ Excel ברקע...")
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-export")
+        return executor, executor.submit(export)
+
+    def _finish_excel_export(self, excel_export: tuple, output_path: str) -> None:
+        """Waits for the background Excel export and reports its result."""
+        executor, future = excel_export
+        try:
+            with self.profiler.stage("wait:excel_export", "report"):
+                success = future.result()
+        except Exception as e:
+            logger.error(f"Excel export failed: {e}", exc_info=True)
+            success = False
+        finally:
+            executor.shutdown(wait=True)
+        if success:
+            self.update_status(f"קובץ Excel נוצר בהצלחה ב-{output_path}")
+        else:
+            self.update_status("יצירת קובץ Excel נכשלה (בדוק את הקונסול לפרטים).")
+
+    def _write_run_snapshot(self, extracted_data: dict, parsers: dict, data_loader: DataLoader,
+                            base_reports_dir: str, project_name: str, safe_project_name: str,
+                            run_id: str, input_file: str) -> None:
+        """Writes run-snapshot.bin, from which regenerate_reports rebuilds the reports."""
+        try:
+            snapshot = build_run_snapshot(
+                extracted_data,
+                area_parser=parsers["area"],
+                energy_rating_parser=parsers["energy_rating"],
+                load_parser=parsers["load"],
+                materials_parser=parsers["materials"],
+                natural_ventilation_data=data_loader.get_natural_ventilation_data(),
+                energy_rating_model=self._get_energy_rating_model(
+                    self.city_info.get('iso_type', ''), self.city_info.get('area_name', '')),
+                run_info={
+                    "project_name": project_name,
+                    "safe_project_name": safe_project_name,
+                    "run_id": run_id,
+                    "input_file": input_file,
+                    "city_info": dict(self.city_info),
+                    "consultant_data": dict(self.consultant_data),
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Could not build run snapshot: {e}", exc_info=True)
+            return
+        write_run_snapshot(base_reports_dir, snapshot)
+
+    def regenerate_reports(self, run_dir: str, project_name: str = None) -> bool:
+        """
+        Rebuilds the reports of an earlier run from its run-snapshot.bin, without
+        loading the model or the simulation output.
+
+        The city, ISO type and consultant data recorded with the run are used unless
+        city_info/consultant_data already hold values, which take precedence. Only
+        the reports in selected_reports are rebuilt when it is set.
+
+        Args:
+            run_dir: Run folder holding run-snapshot.bin; the reports are rewritten there
+            project_name: Project name for the report headers (default: the recorded one)
+
+        Returns:
+            True if the snapshot was read and the reports were generated
+        """
+        try:
+            snapshot = read_run_snapshot(run_dir)
+        except Exception as e:
+            self.update_status(f"לא ניתן לטעון את תמונת הריצה: {e}")
+            logger.error(f"Error reading run snapshot from {run_dir}: {e}")
+            return False
+
+        run_info = snapshot["run"]
+        self.city_info = {**run_info.get("city_info", {}), **self.city_info}
+        self.consultant_data = {**run_info.get("consultant_data", {}), **self.consultant_data}
+        project_name = project_name or run_info.get("project_name", "")
+        run_id = run_info.get("run_id", "")
+        report_paths = self._get_report_paths(run_dir)
+        os.makedirs(report_paths["zones_dir"], exist_ok=True)
+
+        self.report_cache = (ReportCache(run_dir, f"{run_info.get('safe_project_name', '')}-")
+                             if self.reuse_unchanged_reports else None)
+        self.update_progress(0.7)
+        area_parser = AreaParserSnapshot(snapshot["area"])
+        energy_rating_parser = EnergyRatingParserSnapshot(snapshot["energy_rating"])
+        data_loader = DataLoaderSnapshot(snapshot["natural_ventilation"])
+        excel_export = None
+        try:
+            if self.export_excel:
+                excel_export = self._start_excel_export(
+                    snapshot["extracted_data"], area_parser, energy_rating_parser, data_loader,
+                    report_paths["excel"], project_name, run_id)
+            with self.profiler.stage("reports", "pipeline"):
+                self._generate_all_reports(
+                    snapshot["extracted_data"],
+                    report_paths,
+                    project_name,
+                    run_id,
+                    area_parser,
+                    energy_rating_parser,
+                    run_dir,
+                    iso_type_selection=self.city_info.get('iso_type', ''),
+                    city_area_name_selection=self.city_info.get('area_name', ''),
+                    data_loader=data_loader,
+                    load_parser_instance=LoadParserSnapshot(snapshot["loads_by_zone"])
+                )
+        finally:
+            if excel_export is not None:
+                self._finish_excel_export(excel_export, report_paths["excel"])
+            self._write_report_fingerprints()
+            if self.profiler.enabled:
+                self._write_run_timings(run_dir, run_info.get("input_file", ""), run_id)
+            self.profiler.write_trace(run_dir, input_file=run_info.get("input_file", ""), run_id=run_id)
+
+        if self.is_cancelled:
+            self.update_status("יצירת הדוחות בוטלה.")
+            return False
+        self.update_status("הדוחות נוצרו מחדש בהצלחה!")
+        return True
+
+    def _write_report_fingerprints(self) -> None:
+        """Writes report-fingerprints.json and lists the reports reused from earlier runs."""
+        if self.report_cache is None:
+            return
+        self.report_cache.write_manifest()
+        if self.report_cache.reused:
+            reused = ", ".join(f"{name} ({run})" for name, run in self.report_cache.reused.items())
+            self.update_status(f"דוחות ללא שינוי שנלקחו מריצות קודמות: {reused}")
+
+    def _write_run_timings(self, base_reports_dir: str, input_file: str, run_id: str) -> None:
+        """Writes the profiler's timings.json into the run folder."""
+        timings_path = self.profiler.write_report(
+            base_reports_dir,
+            input_file=input_file,
+            run_id=run_id,
+            iso_type=self.city_info.get('iso_type', '') if self.city_info else '',
+            simulation_output_csv=self.simulation_output_csv,
+            epjson_load=self.epjson_load_stats,
+            reused_reports=dict(self.report_cache.reused) if self.report_cache else {},
+            staging=self.staging_stats.as_dict(),
+        )
+        if timings_path:
+            self.update_status(f"דוח זמני ריצה נשמר ב-{timings_path}")
 
     def cancel(self):
         """Signals that the current processing should be cancelled."""
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the selective EPJSON loader against json.load.
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.epjson_stream import load_epjson_sections
+
+WANTED = ["Building", "Zone", "Material"]
+
+
+def _write_and_load(text, object_types):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "model.epJSON")
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        data, stats = load_epjson_sections(path, object_types)
+    return data, stats
+
+
+def _expected(text, object_types):
+    full = json.loads(text)
+    return {key: value for key, value in full.items() if key in object_types}
+
+
+def test_one_line_sections_in_indented_file():
+    """One-line {} / [] sections must not be matched with the closing line of a later section."""
+    text = (
+        '{\n'
+        '    "Building": {\n'
+        '        "B": {\n'
+        '            "north_axis": 0\n'
+        '        }\n'
+        '    },\n'
+        '    "Output:Variable": {},\n'
+        '    "Version": [1, 2],\n'
+        '    "Compact:Thing": {"x": {"y": 1}},\n'
+        '    "Zone": {\n'
+        '        "Z1": {\n'
+        '            "multiplier": 1\n'
+        '        }\n'
+        '    },\n'
+        '    "Output:Meter": [],\n'
+        '    "Material": {\n'
+        '        "M1": {\n'
+        '            "thickness": 0.1\n'
+        '        }\n'
+        '    }\n'
+        '}\n'
+    )
+    for newline in ('\n', '\r\n'):
+        source = text.replace('\n', newline)
+        data, stats = _write_and_load(source, WANTED)
+        assert data == _expected(source, WANTED), data
+        assert stats['sections_skipped'] == 4
+
+
+def test_compact_file():
+    """Files without indentation are tokenized section by section."""
+    text = json.dumps({"Zone": {"Z1": {"multiplier": 1}}, "Output:Variable": {}, "Material": {"M1": {"name": "a}"}}})
+    data, _ = _write_and_load(text, WANTED)
+    assert data == _expected(text, WANTED), data
+
+
+if __name__ == "__main__":
+    test_one_line_sections_in_indented_file()
+    test_compact_file()
+    print("All EPJSON stream tests passed")
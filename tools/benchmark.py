@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+"""
+Regression Benchmark Tool for IDF Reader
+Times DataLoader.load_file, every parser and every report generator on the
+sample models in tests/ and on synthetic scaled buildings, stores the results
+as a JSON baseline and compares later runs against it.
+
+Examples:
+    python tools/benchmark.py run -o benchmarks/baseline.json
+    python tools/benchmark.py run --synthetic-zones 1000 10000 --repeat 3 -o current.json
+    python tools/benchmark.py compare benchmarks/baseline.json current.json --threshold 0.15
+    python tools/benchmark.py synth tests/in.epJSON --zones 10000 -o big.epJSON
+    python tools/benchmark.py lean tests/in.idf --energyplus "C:/EnergyPlusV9-4-0" --epw data/a.epw
+"""
+
+import sys
+import os
+import argparse
+import copy
+import glob
+import json
+import math
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+DEFAULT_SAMPLES_DIR = os.path.join(PROJECT_ROOT, 'tests')
+DEFAULT_SYNTHETIC_SOURCE = os.path.join(DEFAULT_SAMPLES_DIR, 'in.epJSON')
+DEFAULT_FLOOR_HEIGHT = 3.0
+RESULTS_FORMAT_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Synthetic scaled buildings
+# ---------------------------------------------------------------------------
+
+def _collect_strings(value, found):
+    """Collect every string found in an epJSON field value (nested lists/dicts included)."""
+    if isinstance(value, str):
+        found.add(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_strings(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_strings(item, found)
+
+
+def _rename_references(value, rename_map, z_offset):
+    """Return a copy of an epJSON field value with references renamed and z coordinates shifted."""
+    if isinstance(value, str):
+        return rename_map.get(value, value)
+    if isinstance(value, dict):
+        renamed = {}
+        for key, item in value.items():
+            if z_offset and key.endswith('z_coordinate') and isinstance(item, (int, float)):
+                renamed[key] = item + z_offset
+            elif z_offset and key == 'z_origin' and isinstance(item, (int, float)):
+                renamed[key] = item + z_offset
+            else:
+                renamed[key] = _rename_references(item, rename_map, z_offset)
+        return renamed
+    if isinstance(value, list):
+        return [_rename_references(item, rename_map, z_offset) for item in value]
+    return value
+
+
+def _find_replicated_types(epjson_data):
+    """
+    Find the object types that belong to a floor and must be copied per floor.
+
+    Starts from Zone and repeatedly adds every object type with at least one
+    object referencing an already replicated object (surfaces reference zones,
+    windows reference surfaces, loads reference zones...). Shared definitions
+    such as constructions, materials and schedules are left untouched.
+    """
+    replicated_types = {'Zone'}
+    replicated_names = set(epjson_data.get('Zone', {}).keys())
+
+    changed = True
+    while changed:
+        changed = False
+        for obj_type, objects in epjson_data.items():
+            if obj_type in replicated_types or not isinstance(objects, dict):
+                continue
+            for fields in objects.values():
+                referenced = set()
+                _collect_strings(fields, referenced)
+                if referenced & replicated_names:
+                    replicated_types.add(obj_type)
+                    replicated_names.update(objects.keys())
+                    changed = True
+                    break
+    return replicated_types
+
+
+def _get_floor_height(epjson_data):
+    """Estimate the building height from surface vertices, used as the vertical offset per copy."""
+    z_values = []
+    for surface in epjson_data.get('BuildingSurface:Detailed', {}).values():
+        for vertex in surface.get('vertices', []):
+            z = vertex.get('vertex_z_coordinate')
+            if isinstance(z, (int, float)):
+                z_values.append(z)
+    if not z_values:
+        return DEFAULT_FLOOR_HEIGHT
+    height = max(z_values) - min(z_values)
+    return height if height > 0 else DEFAULT_FLOOR_HEIGHT
+
+
+def build_synthetic_epjson(source_data, target_zones=None, copies=None):
+    """
+    Build a scaled building by stacking copies of a sample model's floors.
+
+    Every zone-related object (zones, surfaces, windows, loads, HVAC...) is
+    copied with a "_F<n>" name suffix and raised by the source building height,
+    while shared definitions are kept once. No EnergyPlus is needed.
+
+    Args:
+        source_data: Loaded epJSON dictionary of the sample model
+        target_zones: Minimum number of zones the result should have
+        copies: Explicit number of copies (overrides target_zones)
+
+    Returns:
+        Tuple of (synthetic epJSON dictionary, number of copies)
+    """
+    base_zones = len(source_data.get('Zone', {}))
+    if base_zones == 0:
+        raise ValueError("Source model has no Zone objects to replicate")
+    if copies is None:
+        copies = max(1, math.ceil((target_zones or base_zones) / base_zones))
+
+    replicated_types = _find_replicated_types(source_data)
+    floor_height = _get_floor_height(source_data)
+    synthetic = {
+        obj_type: {} if obj_type in replicated_types else copy.deepcopy(objects)
+        for obj_type, objects in source_data.items()
+    }
+
+    replicated_names = set()
+    for obj_type in replicated_types:
+        replicated_names.update(source_data[obj_type].keys())
+
+    for floor in range(copies):
+        suffix = f"_F{floor + 1}"
+        rename_map = {name: name + suffix for name in replicated_names}
+        z_offset = floor * floor_height
+        for obj_type in replicated_types:
+            target = synthetic[obj_type]
+            for name, fields in source_data[obj_type].items():
+                target[name + suffix] = _rename_references(fields, rename_map, z_offset)
+
+    return synthetic, copies
+
+
+def write_synthetic_model(source_path, target_zones, output_path):
+    """
+    Write a synthetic scaled epJSON model to disk.
+
+    Args:
+        source_path: Sample epJSON to replicate
+        target_zones: Minimum number of zones in the synthetic model
+        output_path: Where to write the synthetic epJSON
+
+    Returns:
+        Dictionary with the model's zone and surface counts
+    """
+    with open(source_path, 'r', encoding='utf-8') as f:
+        source_data = json.load(f)
+
+    synthetic, copies = build_synthetic_epjson(source_data, target_zones=target_zones)
+    # Indented like the EPJSON files EnergyPlus writes
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(synthetic, f, indent=4)
+
+    return {
+        'source': os.path.relpath(source_path, PROJECT_ROOT),
+        'copies': copies,
+        'zones': len(synthetic.get('Zone', {})),
+        'surfaces': len(synthetic.get('BuildingSurface:Detailed', {})),
+        'fenestration_surfaces': len(synthetic.get('FenestrationSurface:Detailed', {})),
+        'file_size_bytes': os.path.getsize(output_path),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Running the pipeline
+# ---------------------------------------------------------------------------
+
+def _silent_status(message):
+    pass
+
+
+def _silent_progress(value):
+    pass
+
+
+def run_pipeline_once(model_path, energyplus_path=None, simulation_output_csv=None, iso_type="RESIDNTIAL 2023",
+                      area_name="א", track_memory=False):
+    """
+    Run the full processing pipeline once and return the per-stage timings.
+
+    The ProcessingManager profiler stages cover DataLoader.load_file (and each
+    DataLoader cache step), every parser and every report generator.
+
+    Args:
+        model_path: IDF/epJSON file to process
+        energyplus_path: EnergyPlus installation (needed to convert IDF files)
+        simulation_output_csv: Optional eplusout.csv for the energy rating parser
+        iso_type: ISO type passed to the pipeline, as selected in the GUI
+        area_name: Climate area (א/ב/ג/ד)
+        track_memory: Also record peak traced memory per stage (slower)
+
+    Returns:
+        Dictionary with success flag, total wall time and profiler stage records
+    """
+    from processing_manager import ProcessingManager
+    from utils.profiler import RunProfiler
+
+    profiler = RunProfiler(track_memory=track_memory)
+    output_dir = tempfile.mkdtemp(prefix="idf_reader_bench_")
+    try:
+        manager = ProcessingManager(
+            status_callback=_silent_status,
+            progress_callback=_silent_progress,
+            simulation_output_csv=simulation_output_csv,
+            profiler=profiler
+        )
+        manager.city_info = {'city': '', 'area_name': area_name, 'area_code': '', 'iso_type': iso_type}
+
+        start = time.perf_counter()
+        success = manager.process_idf(
+            input_file=model_path,
+            idd_path=None,
+            output_dir=output_dir,
+            run_id="benchmark",
+            energyplus_path=energyplus_path
+        )
+        total = time.perf_counter() - start
+        profiler.finish()
+        return {'success': bool(success), 'wall_s': total, 'records': profiler.get_records()}
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def _aggregate_runs(runs):
+    """Summarize repeated runs of one model into per-stage min/median wall and CPU time."""
+    stage_walls = {}
+    stage_cpus = {}
+    stage_peaks = {}
+    stage_meta = {}
+    for run in runs:
+        per_run_wall = {}
+        per_run_cpu = {}
+        for record in run['records']:
+            name = record['name']
+            stage_meta.setdefault(name, {'category': record['category'], 'parent': record['parent']})
+            # Some stages (e.g. "report:Area (Zones)") can run more than once per pipeline run
+            per_run_wall[name] = per_run_wall.get(name, 0.0) + record['wall_s']
+            per_run_cpu[name] = per_run_cpu.get(name, 0.0) + record['cpu_s']
+            if 'peak_mem_bytes' in record:
+                stage_peaks[name] = max(stage_peaks.get(name, 0), record['peak_mem_bytes'])
+        for name, wall in per_run_wall.items():
+            stage_walls.setdefault(name, []).append(wall)
+            stage_cpus.setdefault(name, []).append(per_run_cpu[name])
+
+    stages = {}
+    for name, walls in stage_walls.items():
+        stage = {
+            'category': stage_meta[name]['category'],
+            'parent': stage_meta[name]['parent'],
+            'runs': len(walls),
+            'median_s': round(statistics.median(walls), 6),
+            'min_s': round(min(walls), 6),
+            'max_s': round(max(walls), 6),
+            'cpu_median_s': round(statistics.median(stage_cpus[name]), 6),
+        }
+        if name in stage_peaks:
+            stage['peak_mem_bytes'] = stage_peaks[name]
+        stages[name] = stage
+
+    totals = [run['wall_s'] for run in runs]
+    return {
+        'success': all(run['success'] for run in runs),
+        'total': {
+            'runs': len(totals),
+            'median_s': round(statistics.median(totals), 6),
+            'min_s': round(min(totals), 6),
+            'max_s': round(max(totals), 6),
+        },
+        'stages': stages,
+    }
+
+
+def benchmark_model(model_path, repeat, warmup, **pipeline_kwargs):
+    """
+    Benchmark one model: run warmup passes, then `repeat` measured passes.
+
+    Returns:
+        Aggregated results dictionary for the model
+    """
+    for _ in range(warmup):
+        run_pipeline_once(model_path, **pipeline_kwargs)
+
+    runs = [run_pipeline_once(model_path, **pipeline_kwargs) for _ in range(repeat)]
+    result = _aggregate_runs(runs)
+    result['path'] = os.path.relpath(model_path, PROJECT_ROOT)
+    result['file_size_bytes'] = os.path.getsize(model_path)
+    return result
+
+
+def _discover_sample_models(samples_dir, include_idf):
+    """Find the sample models under tests/ (epJSON always, IDF only when EnergyPlus is available)."""
+    models = sorted(glob.glob(os.path.join(samples_dir, '*.epJSON')))
+    skipped = []
+    for idf_path in sorted(glob.glob(os.path.join(samples_dir, '*.idf'))):
+        if include_idf:
+            models.append(idf_path)
+        else:
+            skipped.append(idf_path)
+    return models, skipped
+
+
+def run_command(args):
+    """Run the benchmark suite and write the JSON results."""
+    pipeline_kwargs = {
+        'energyplus_path': args.energyplus,
+        'simulation_output_csv': args.simulation_csv,
+        'iso_type': args.iso_type,
+        'area_name': args.area,
+        'track_memory': args.memory,
+    }
+
+    if args.models:
+        models, skipped = list(args.models), []
+    elif args.no_samples:
+        models, skipped = [], []
+    else:
+        models, skipped = _discover_sample_models(args.samples_dir, include_idf=bool(args.energyplus))
+
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'label': args.label,
+        'system': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        'settings': {
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'iso_type': args.iso_type,
+            'area_name': args.area,
+            'memory_tracking': args.memory,
+        },
+        'skipped': [
+            {'path': os.path.relpath(path, PROJECT_ROOT), 'reason': 'IDF conversion requires --energyplus'}
+            for path in skipped
+        ],
+        'models': {},
+    }
+
+    for model_path in models:
+        name = os.path.basename(model_path)
+        print(f"Benchmarking {name}...")
+        try:
+            results['models'][name] = benchmark_model(model_path, args.repeat, args.warmup, **pipeline_kwargs)
+            print(f"  total median: {results['models'][name]['total']['median_s']:.3f}s")
+        except Exception as e:
+            print(f"  failed: {type(e).__name__}: {e}")
+            results['models'][name] = {'path': os.path.relpath(model_path, PROJECT_ROOT), 'error': str(e)}
+
+    synthetic_zones = [] if args.no_synthetic else args.synthetic_zones
+    if synthetic_zones:
+        synthetic_dir = tempfile.mkdtemp(prefix="idf_reader_synth_")
+        try:
+            for target_zones in synthetic_zones:
+                name = f"synthetic-{target_zones}-zones"
+                synthetic_path = os.path.join(synthetic_dir, f"{name}.epJSON")
+                print(f"Benchmarking {name} (from {os.path.basename(args.synthetic_source)})...")
+                try:
+                    model_info = write_synthetic_model(args.synthetic_source, target_zones, synthetic_path)
+                    result = benchmark_model(synthetic_path, args.repeat, args.warmup, **pipeline_kwargs)
+                    result['path'] = None
+                    result['synthetic'] = model_info
+                    results['models'][name] = result
+                    print(f"  {model_info['zones']} zones, {model_info['surfaces']} surfaces, "
+                          f"total median: {result['total']['median_s']:.3f}s")
+                except Exception as e:
+                    print(f"  failed: {type(e).__name__}: {e}")
+                    results['models'][name] = {'path': None, 'error': str(e)}
+                finally:
+                    if os.path.exists(synthetic_path):
+                        os.remove(synthetic_path)
+        finally:
+            shutil.rmtree(synthetic_dir, ignore_errors=True)
+
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
+
+
+# ---------------------------------------------------------------------------
+# Comparing results
+# ---------------------------------------------------------------------------
+
+def compare_results(baseline, current, threshold, min_seconds):
+    """
+    Compare two benchmark result files.
+
+    A stage is a regression when its median time grew by more than `threshold`
+    (e.g. 0.15 = 15%). Stages faster than `min_seconds` in the baseline are
+    ignored because their timings are dominated by noise.
+
+    Returns:
+        Tuple of (rows, regressions) where each row is
+        (model, stage, baseline_s, current_s, change_ratio, is_regression)
+    """
+    rows = []
+    regressions = []
+    for model_name, base_model in baseline.get('models', {}).items():
+        cur_model = current.get('models', {}).get(model_name)
+        if not cur_model or 'error' in base_model or 'error' in cur_model:
+            continue
+
+        entries = [('TOTAL', base_model['total'], cur_model['total'])]
+        for stage_name, base_stage in base_model.get('stages', {}).items():
+            cur_stage = cur_model.get('stages', {}).get(stage_name)
+            if cur_stage:
+                entries.append((stage_name, base_stage, cur_stage))
+
+        for stage_name, base_stage, cur_stage in entries:
+            base_s = base_stage['median_s']
+            cur_s = cur_stage['median_s']
+            if base_s < min_seconds:
+                continue
+            change = (cur_s - base_s) / base_s if base_s > 0 else 0.0
+            is_regression = change > threshold
+            row = (model_name, stage_name, base_s, cur_s, change, is_regression)
+            rows.append(row)
+            if is_regression:
+                regressions.append(row)
+    return rows, regressions
+
+
+def compare_command(args):
+    """Compare current results against a baseline and exit non-zero on regressions."""
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    rows, regressions = compare_results(baseline, current, args.threshold, args.min_seconds)
+
+    missing = sorted(set(baseline.get('models', {})) - set(current.get('models', {})))
+    for model_name in missing:
+        print(f"WARNING: model '{model_name}' is in the baseline but not in the current results")
+    for model_name, model in current.get('models', {}).items():
+        if 'error' in model:
+            print(f"WARNING: model '{model_name}' failed in the current run: {model['error']}")
+
+    shown = rows if args.all else regressions
+    if shown:
+        print(f"{'Model':<32} {'Stage':<44} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+        print("-" * 108)
+        for model_name, stage_name, base_s, cur_s, change, is_regression in shown:
+            marker = " <-- SLOWER" if is_regression else ""
+            print(f"{model_name[:32]:<32} {stage_name[:44]:<44} {base_s:>9.3f}s {cur_s:>9.3f}s "
+                  f"{change * 100:>+7.1f}%{marker}")
+
+    print(f"Compared {len(rows)} stage timings, {len(regressions)} slower than "
+          f"{args.threshold * 100:.0f}% threshold")
+    sys.exit(1 if regressions else 0)
+
+
+# ---------------------------------------------------------------------------
+# Lean simulation profile
+# ---------------------------------------------------------------------------
+
+def _directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def _parse_simulation_outputs(model_path, run_dir, energyplus_path):
+    """
+    Time reading the simulation outputs the parsers consume.
+
+    Returns:
+        Tuple of (parse seconds, parsed outputs used to check both profiles agree)
+    """
+    from utils.data_loader import DataLoader
+    from parsers.eplustbl_reader import read_construction_areas_from_csv, read_zone_areas_from_csv
+    from parsers.materials_parser import MaterialsParser
+    from parsers.area_parser import AreaParser
+    from parsers.energy_rating_parser import EnergyRatingParser
+
+    table_csv = os.path.join(run_dir, 'simulation', 'eplustbl.csv')
+    data_loader = DataLoader(energyplus_path=energyplus_path, simulation_output_dir=run_dir)
+    data_loader.load_file(model_path, energyplus_path=energyplus_path)
+
+    start = time.perf_counter()
+    zone_areas = read_zone_areas_from_csv(table_csv)
+    construction_areas = read_construction_areas_from_csv(table_csv)
+    energy_rating_parser = EnergyRatingParser(data_loader, AreaParser(data_loader, MaterialsParser(data_loader), table_csv))
+    energy_rating_parser.process_output(table_csv)
+    parse_s = time.perf_counter() - start
+    return parse_s, (zone_areas, construction_areas, energy_rating_parser.energy_data_by_area)
+
+
+def benchmark_lean_profile(model_path, energyplus_path, epw_path, repeat):
+    """
+    Simulate a model with the full and the lean output profile and time both.
+
+    Returns:
+        Dictionary with per-profile simulation/parse medians, output sizes,
+        what the lean profile removed and whether both profiles parse the same
+    """
+    from utils.energyplus_runner import prepare_simulation_input, run_energyplus
+
+    work_dir = tempfile.mkdtemp(prefix="idf_reader_lean_")
+    profiles = {}
+    parsed = {}
+    try:
+        for profile in ('full', 'lean'):
+            simulation_times = []
+            parse_times = []
+            for run in range(repeat):
+                run_dir = os.path.join(work_dir, f"{profile}-{run + 1}")
+                input_path = prepare_simulation_input(
+                    model_path, os.path.join(run_dir, 'input', os.path.basename(model_path)), lean=profile == 'lean')
+                result = run_energyplus(energyplus_path, input_path, epw_path, os.path.join(run_dir, 'simulation'))
+                if not result.success:
+                    raise RuntimeError(f"{profile} simulation failed: {result.error}")
+                simulation_times.append(result.elapsed_s)
+                parse_s, parsed[profile] = _parse_simulation_outputs(model_path, run_dir, energyplus_path)
+                parse_times.append(parse_s)
+
+            simulation_dir = os.path.join(run_dir, 'simulation')
+            profiles[profile] = {
+                'simulation_median_s': round(statistics.median(simulation_times), 3),
+                'parse_median_s': round(statistics.median(parse_times), 3),
+                'eplusout_csv_bytes': os.path.getsize(os.path.join(simulation_dir, 'eplusout.csv')),
+                'eplustbl_csv_bytes': os.path.getsize(os.path.join(simulation_dir, 'eplustbl.csv')),
+                'output_dir_bytes': _directory_size(simulation_dir),
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if model_path.lower().endswith('.epjson'):
+        from utils.lean_simulation import make_lean_epjson
+        with open(model_path, 'r', encoding='utf-8') as f:
+            _, stats = make_lean_epjson(json.load(f))
+    else:
+        from utils.lean_simulation import make_lean_idf
+        with open(model_path, 'r', encoding='utf-8') as f:
+            _, stats = make_lean_idf(f.read())
+
+    full, lean = profiles['full'], profiles['lean']
+    return {
+        'path': os.path.relpath(model_path, PROJECT_ROOT),
+        'repeat': repeat,
+        'profiles': profiles,
+        'simulation_speedup': round(full['simulation_median_s'] / lean['simulation_median_s'], 2)
+        if lean['simulation_median_s'] else None,
+        'parse_speedup': round(full['parse_median_s'] / lean['parse_median_s'], 2)
+        if lean['parse_median_s'] else None,
+        'removed': stats.removed,
+        'removed_reports': stats.removed_reports,
+        'outputs_match': parsed['full'] == parsed['lean'],
+    }
+
+
+def lean_command(args):
+    """Compare simulation and parse time of the full and lean simulation profiles."""
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'label': args.label,
+        'models': {},
+    }
+    for model_path in args.models:
+        name = os.path.basename(model_path)
+        print(f"Simulating {name} with the full and lean profiles...")
+        try:
+            result = benchmark_lean_profile(model_path, args.energyplus, args.epw, args.repeat)
+        except Exception as e:
+            print(f"  failed: {type(e).__name__}: {e}")
+            results['models'][name] = {'path': os.path.relpath(model_path, PROJECT_ROOT), 'error': str(e)}
+            continue
+        results['models'][name] = result
+        for profile, timings in result['profiles'].items():
+            print(f"  {profile:<5} simulation {timings['simulation_median_s']:>8.2f}s  "
+                  f"parse {timings['parse_median_s']:>7.3f}s  "
+                  f"eplusout.csv {timings['eplusout_csv_bytes'] / 1024:>9.0f} KB")
+        print(f"  speedup: simulation x{result['simulation_speedup']}, parse x{result['parse_speedup']}; "
+              f"removed {sum(result['removed'].values())} output objects; "
+              f"parsed outputs {'match' if result['outputs_match'] else 'DIFFER'}")
+
+    if args.output:
+        output_dir = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(output_dir, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Results written to {args.output}")
+
+
+def synth_command(args):
+    """Write a synthetic scaled model to disk for manual runs."""
+    info = write_synthetic_model(args.source, args.zones, args.output)
+    print(f"Wrote {args.output}: {info['zones']} zones, {info['surfaces']} surfaces, "
+          f"{info['fenestration_surfaces']} windows ({info['copies']} copies of {info['source']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='IDF Reader Regression Benchmark Tool')
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+
+    # Run benchmarks command
+    run_parser = subparsers.add_parser('run', help='Run the benchmark suite and store JSON results')
+    run_parser.add_argument('-o', '--output', default='benchmark-results.json', help='Results JSON file')
+    run_parser.add_argument('--label', default='', help='Free-text label stored with the results')
+    run_parser.add_argument('--models', nargs='+', help='Benchmark these models instead of the samples in tests/')
+    run_parser.add_argument('--samples-dir', default=DEFAULT_SAMPLES_DIR, help='Directory with sample models')
+    run_parser.add_argument('--no-samples', action='store_true', help='Only run the synthetic models')
+    run_parser.add_argument('--energyplus', help='EnergyPlus installation, required to benchmark IDF samples')
+    run_parser.add_argument('--simulation-csv', help='eplusout.csv passed to the energy rating parser')
+    run_parser.add_argument('--synthetic-source', default=DEFAULT_SYNTHETIC_SOURCE,
+                            help='epJSON model replicated to build synthetic buildings')
+    run_parser.add_argument('--synthetic-zones', type=int, nargs='+', default=[1000, 10000],
+                            help='Zone counts of the synthetic buildings (default: 1000 10000)')
+    run_parser.add_argument('--no-synthetic', action='store_true', help='Skip the synthetic buildings')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Measured runs per model (median is reported)')
+    run_parser.add_argument('--warmup', type=int, default=1, help='Unmeasured warmup runs per model')
+    run_parser.add_argument('--iso-type', default='RESIDNTIAL 2023', help='ISO type used for the runs')
+    run_parser.add_argument('--area', default='א', help='Climate area used for the runs (א/ב/ג/ד)')
+    run_parser.add_argument('--memory', action='store_true', help='Also record peak memory per stage (slower)')
+
+    # Compare results command
+    compare_parser = subparsers.add_parser('compare', help='Compare results against a baseline')
+    compare_parser.add_argument('baseline', help='Baseline results JSON')
+    compare_parser.add_argument('current', help='Current results JSON')
+    compare_parser.add_argument('--threshold', type=float, default=0.15,
+                                help='Relative slowdown that counts as a regression (default: 0.15 = 15%%)')
+    compare_parser.add_argument('--min-seconds', type=float, default=0.01,
+                                help='Ignore stages faster than this in the baseline (default: 0.01)')
+    compare_parser.add_argument('--all', action='store_true', help='Show every compared stage, not only regressions')
+
+    # Synthetic model command
+    synth_parser = subparsers.add_parser('synth', help='Write a synthetic scaled epJSON model')
+    synth_parser.add_argument('source', nargs='?', default=DEFAULT_SYNTHETIC_SOURCE, help='epJSON model to replicate')
+    synth_parser.add_argument('--zones', type=int, required=True, help='Minimum number of zones')
+    synth_parser.add_argument('-o', '--output', required=True, help='Output epJSON file')
+
+    # Lean simulation profile command
+    lean_parser = subparsers.add_parser('lean', help='Compare full and lean simulation profiles (needs EnergyPlus)')
+    lean_parser.add_argument('models', nargs='+', help='IDF/epJSON models to simulate')
+    lean_parser.add_argument('--energyplus', required=True, help='EnergyPlus installation directory')
+    lean_parser.add_argument('--epw', required=True, help='Weather file used for both profiles')
+    lean_parser.add_argument('--repeat', type=int, default=1, help='Simulations per profile (median is reported)')
+    lean_parser.add_argument('--label', default='', help='Free-text label stored with the results')
+    lean_parser.add_argument('-o', '--output', help='Optional results JSON file')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run_command(args)
+    elif args.command == 'compare':
+        compare_command(args)
+    elif args.command == 'synth':
+        synth_command(args)
+    elif args.command == 'lean':
+        lean_command(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Search index for the city autocomplete.
+
+City names are normalized once (niqqud and punctuation removed, final letters
+folded to their regular forms) and split into 1-3 character n-grams with
+posting lists, so a lookup only visits the names sharing the query's n-grams
+instead of scanning every city. Every name also gets a consonant skeleton
+shared by Hebrew and Latin spellings ('חיפה', 'חיפא' and 'haifa' all become
+'HP'), which matches plene/defective spellings and transliterated queries;
+CITY_ALIASES adds English names that transliteration does not reach.
+
+Results are ranked: exact match, prefix, word prefix, substring, skeleton
+match, then typo-tolerant trigram similarity.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LIMIT = 8
+NGRAM_SIZE = 3
+# Minimum trigram similarity (Dice coefficient) of a fuzzy match
+MIN_SIMILARITY = 0.4
+
+# English names of cities whose transliteration does not match their skeleton
+CITY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'ירושלים': ('jerusalem',),
+    'עכו': ('acre', 'akko', 'acco'),
+    'צפת': ('safed',),
+    'באר שבע': ('beersheba', 'beer sheva'),
+    'תל אביב - יפו': ('tel aviv', 'jaffa'),
+}
+
+# Match tiers, best first
+_EXACT, _PREFIX, _WORD_PREFIX, _SUBSTRING, _SKELETON, _FUZZY = 5, 4, 3, 2, 1, 0
+
+_NIQQUD = re.compile('[\u0591-\u05bd\u05bf-\u05c7]')  # points and cantillation, not the maqaf
+_QUOTES = re.compile('["\'`\u05f3\u05f4\u2018\u2019\u201c\u201d]')
+_SEPARATORS = re.compile(r'[\s\-\u05be(),./]+')
+_FINAL_FORMS = str.maketrans('ךםןףץ', 'כמנפצ')
+_HEBREW = re.compile('[\u05d0-\u05ea]')
+
+# Consonant classes shared by Hebrew letters and Latin transliterations; unmapped letters
+# (vowels, and א ו י ע which mostly write vowels) are dropped. ז and צ share a class since
+# 'z' is written for both ('herzliya')
+_HEBREW_SKELETON = {
+    'ב': 'B', 'ג': 'G', 'ד': 'D', 'ה': 'H', 'ז': 'Z', 'ח': 'H', 'ט': 'T', 'כ': 'K', 'ל': 'L', 'מ': 'M',
+    'נ': 'N', 'ס': 'S', 'פ': 'P', 'צ': 'Z', 'ק': 'K', 'ר': 'R', 'ש': 'S', 'ת': 'T',
+}
+_LATIN_SKELETON = {
+    'sh': 'S', 'ch': 'H', 'kh': 'H', 'tz': 'Z', 'ts': 'Z', 'ph': 'P', 'th': 'T',
+    'b': 'B', 'v': 'B', 'g': 'G', 'j': 'G', 'd': 'D', 'h': 'H', 'z': 'Z', 't': 'T', 'k': 'K', 'c': 'K',
+    'q': 'K', 'l': 'L', 'm': 'M', 'n': 'N', 's': 'S', 'p': 'P', 'f': 'P', 'r': 'R', 'x': 'KS',
+}
+
+
+def normalize_city_name(text: str) -> str:
+    """Lowercase, without niqqud, quotes and punctuation, with final letters folded."""
+    text = _NIQQUD.sub('', text.replace('\ufeff', '').casefold())
+    text = _QUOTES.sub('', text).translate(_FINAL_FORMS)
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def city_name_skeleton(normalized: str) -> str:
+    """Consonant skeleton of a normalized Hebrew or Latin name, e.g. 'גבעת שמואל' -> 'GBT SML'."""
+    words = []
+    for word in normalized.split():
+        if _HEBREW.search(word):
+            # A final ה is a vowel ('חיפה'), elsewhere it is a consonant ('הרצליה')
+            letters = [_HEBREW_SKELETON.get(char, '') for char in (word[:-1] if word.endswith('ה') else word)]
+        else:
+            letters = []
+            position = 0
+            while position < len(word):
+                # Digraphs ('sh', 'tz', ...) first
+                token = word[position:position + 2] if word[position:position + 2] in _LATIN_SKELETON else word[position]
+                letters.append(_LATIN_SKELETON.get(token, ''))
+                position += len(token)
+        skeleton = ''
+        for letter in ''.join(letters):
+            if not skeleton or skeleton[-1] != letter:  # 'akko' and 'עכו' are both 'K'
+                skeleton += letter
+        if skeleton:
+            words.append(skeleton)
+    return ' '.join(words)
+
+
+def _ngrams(text: str, size: int) -> List[str]:
+    return list({text[i:i + size] for i in range(len(text) - size + 1)})
+
+
+class _NGramIndex:
+    """Posting lists of the 1-3 character n-grams of a set of texts."""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.owners: List[int] = []
+        self._trigram_counts: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def add(self, text: str, owner: int) -> None:
+        if not text:
+            return
+        key = len(self.texts)
+        self.texts.append(text)
+        self.owners.append(owner)
+        self._trigram_counts.append(len(_ngrams(text, NGRAM_SIZE)))
+        for size in range(1, NGRAM_SIZE + 1):
+            for gram in _ngrams(text, size):
+                self._postings.setdefault(gram, []).append(key)
+
+    def search(self, query: str, exact_tiers: bool) -> Dict[int, Tuple[int, float]]:
+        """(tier, similarity) of the best match per owner."""
+        size = min(NGRAM_SIZE, len(query))
+        grams = _ngrams(query, size)
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._postings.get(gram, ()))
+        best: Dict[int, Tuple[int, float]] = {}
+        for key, shared in hits.items():
+            text = self.texts[key]
+            if shared == len(grams) and query in text:
+                if not exact_tiers:
+                    if text == query or text.startswith(f'{query} '):
+                        rank = (_SKELETON, 1.0)
+                    else:
+                        rank = (_SKELETON, 0.75 if text.startswith(query) else 0.5)
+                elif text == query:
+                    rank = (_EXACT, 1.0)
+                elif text.startswith(query):
+                    rank = (_PREFIX, 1.0)
+                elif f' {query}' in text:
+                    rank = (_WORD_PREFIX, 1.0)
+                else:
+                    rank = (_SUBSTRING, 1.0)
+            elif size == NGRAM_SIZE:
+                similarity = 2.0 * shared / (len(grams) + self._trigram_counts[key])
+                if similarity < MIN_SIMILARITY:
+                    continue
+                rank = (_FUZZY, similarity)
+            else:
+                continue
+            owner = self.owners[key]
+            if rank > best.get(owner, (-1, 0.0)):
+                best[owner] = rank
+        return best
+
+
+class CitySearchIndex:
+    """
+    Ranked city lookup.
+
+    Args:
+        city_names: City names as they appear in countries-selection.csv
+        aliases: Extra (e.g. English) names per city
+    """
+
+    def __init__(self, city_names: Iterable[str], aliases: Optional[Dict[str, Iterable[str]]] = None):
+        aliases = CITY_ALIASES if aliases is None else aliases
+        self.city_names: List[str] = list(city_names)
+        self._sort_keys = [normalize_city_name(name) for name in self.city_names]
+        self._names = _NGramIndex()
+        self._skeletons = _NGramIndex()
+        for owner, name in enumerate(self.city_names):
+            normalized = self._sort_keys[owner]
+            spellings = [normalized] + [normalize_city_name(alias) for alias in aliases.get(name, ())]
+            for spelling in spellings:
+                self._names.add(spelling, owner)
+                self._skeletons.add(city_name_skeleton(spelling), owner)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        """Up to limit city names matching query, best first."""
+        normalized = normalize_city_name(query)
+        if not normalized:
+            return []
+        ranks = self._names.search(normalized, exact_tiers=True)
+        skeleton = city_name_skeleton(normalized)
+        if len(skeleton.replace(' ', '')) >= 2:
+            for owner, rank in self._skeletons.search(skeleton, exact_tiers=False).items():
+                if rank > ranks.get(owner, (-1, 0.0)):
+                    ranks[owner] = rank
+        ordered = sorted(ranks.items(), key=lambda item: (-item[1][0], -item[1][1], self._sort_keys[item[0]]))
+        return [self.city_names[owner] for owner, _ in ordered[:limit]]
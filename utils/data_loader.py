@@ -4,14 +4,19 @@ Provides simplified data loading and retrieval functionality using EPJSON format
 Includes support for Hebrew/Unicode characters in file paths.
 Replaces the eppy-based implementation with native JSON handling.
 """
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Iterable
 from pathlib import Path
+from collections import OrderedDict
+import copy
+import os
+import threading
 from utils.epjson_handler import EPJSONHandler
 from utils.path_utils import (
     get_data_file_path
 )
 import re
 from utils.logging_config import get_logger
+from utils.profiler import NullProfiler
 import pandas as pd
 from parsers.eplustbl_reader import read_zone_areas_from_csv
 
@@ -132,6 +137,65 @@ def get_energy_consumption(iso_type_input: str, area_location_input: str, area_d
 logger = get_logger(__name__)
 
 
+# Map EPJSON snake_case to eppy PascalCase field names for compatibility with existing parsers
+EPPY_FIELD_MAPPINGS = {
+    # Surface fields
+    'outside_boundary_condition_object': 'Outside_Boundary_Condition_Object',
+    'outside_boundary_condition': 'Outside_Boundary_Condition',
+    'construction_name': 'Construction_Name',
+    'surface_type': 'Surface_Type',
+    'zone_name': 'Zone_Name',
+    'building_surface_name': 'Building_Surface_Name',
+    
+    # Window/Frame fields  
+    'frame_and_divider_name': 'Frame_and_Divider_Name',
+    
+    # Schedule fields
+    'schedule_name': 'Schedule_Name',
+    'availability_schedule_name': 'Availability_Schedule_Name',
+    
+    # Lighting fields
+    'zone_or_space_name': 'Zone_Name',
+    'lighting_control_type': 'Lighting_Control_Type',
+    'number_of_stepped_control_steps': 'Number_of_Stepped_Control_Steps',
+    'minimum_input_power_fraction_for_continuous_or_continuousoff_dimming_control': 'Minimum_Input_Power_Fraction_for_Continuous_or_ContinuousOff_Dimming_Control',
+    'minimum_light_output_fraction_for_continuous_or_continuousoff_dimming_control': 'Minimum_Light_Output_Fraction_for_Continuous_or_ContinuousOff_Dimming_Control',
+    'x_coordinate_of_reference_point': 'XCoordinate_of_Reference_Point',
+    'y_coordinate_of_reference_point': 'YCoordinate_of_Reference_Point',
+    'z_coordinate_of_reference_point': 'ZCoordinate_of_Reference_Point',
+    'xcoordinate_of_reference_point': 'XCoordinate_of_Reference_Point',
+    'ycoordinate_of_reference_point': 'YCoordinate_of_Reference_Point',
+    'zcoordinate_of_reference_point': 'ZCoordinate_of_Reference_Point',
+    
+    # Load fields
+    'design_flow_rate': 'Design_Flow_Rate',
+    
+    # Settings/Version fields
+    'version_identifier': 'Version_Identifier',
+    'begin_month': 'Begin_Month',
+    'begin_day_of_month': 'Begin_Day_of_Month',
+    'end_month': 'End_Month',
+    'end_day_of_month': 'End_Day_of_Month',
+    'use_weather_file_holidays_and_special_days': 'Use_Weather_File_Holidays_and_Special_Days',
+    'use_weather_file_rain_indicators': 'Use_Weather_File_Rain_Indicators',
+    'use_weather_file_snow_indicators': 'Use_Weather_File_Snow_Indicators',
+    'treat_weather_as_actual': 'Treat_Weather_as_Actual',
+    'do_zone_sizing_calculation': 'Do_Zone_Sizing_Calculation',
+    'do_system_sizing_calculation': 'Do_System_Sizing_Calculation',
+    'do_plant_sizing_calculation': 'Do_Plant_Sizing_Calculation',
+    'run_simulation_for_sizing_periods': 'Run_Simulation_for_Sizing_Periods',
+    'run_simulation_for_weather_file_run_periods': 'Run_Simulation_for_Weather_File_Run_Periods',
+    'ground_reflected_solar_modifier': 'Ground_Reflected_Solar_Modifier',
+    'daylighting_ground_reflected_solar_modifier': 'Daylighting_Ground_Reflected_Solar_Modifier',
+    'minimum_system_timestep': 'Minimum_System_Timestep',
+    'maximum_hvac_iterations': 'Maximum_HVAC_Iterations',
+    'month': 'Month',
+    'day_of_month': 'Day_of_Month',
+    'maximum_dry_bulb_temperature': 'Maximum_Dry_Bulb_Temperature',
+    'humidity_condition_day_schedule_name': 'Humidity_Condition_Day_Schedule_Name'
+}
+
+
 class IDFObjectCompatibilityWrapper:
     """
     General compatibility wrapper to make EPJSON data compatible with eppy-based parsers.
@@ -153,65 +217,7 @@ class IDFObjectCompatibilityWrapper:
     
     def _add_eppy_field_mappings(self):
         """Add eppy-style field names for compatibility with existing parsers."""
-        # Map EPJSON snake_case to eppy PascalCase field names
-        field_mappings = {
-            # Surface fields
-            'outside_boundary_condition_object': 'Outside_Boundary_Condition_Object',
-            'outside_boundary_condition': 'Outside_Boundary_Condition',
-            'construction_name': 'Construction_Name',
-            'surface_type': 'Surface_Type',
-            'zone_name': 'Zone_Name',
-            'building_surface_name': 'Building_Surface_Name',
-            
-            # Window/Frame fields  
-            'frame_and_divider_name': 'Frame_and_Divider_Name',
-            
-            # Schedule fields
-            'schedule_name': 'Schedule_Name',
-            'availability_schedule_name': 'Availability_Schedule_Name',
-            
-            # Lighting fields
-            'zone_or_space_name': 'Zone_Name',
-            'lighting_control_type': 'Lighting_Control_Type',
-            'number_of_stepped_control_steps': 'Number_of_Stepped_Control_Steps',
-            'minimum_input_power_fraction_for_continuous_or_continuousoff_dimming_control': 'Minimum_Input_Power_Fraction_for_Continuous_or_ContinuousOff_Dimming_Control',
-            'minimum_light_output_fraction_for_continuous_or_continuousoff_dimming_control': 'Minimum_Light_Output_Fraction_for_Continuous_or_ContinuousOff_Dimming_Control',
-            'x_coordinate_of_reference_point': 'XCoordinate_of_Reference_Point',
-            'y_coordinate_of_reference_point': 'YCoordinate_of_Reference_Point',
-            'z_coordinate_of_reference_point': 'ZCoordinate_of_Reference_Point',
-            'xcoordinate_of_reference_point': 'XCoordinate_of_Reference_Point',
-            'ycoordinate_of_reference_point': 'YCoordinate_of_Reference_Point',
-            'zcoordinate_of_reference_point': 'ZCoordinate_of_Reference_Point',
-            
-            # Load fields
-            'design_flow_rate': 'Design_Flow_Rate',
-            
-            # Settings/Version fields
-            'version_identifier': 'Version_Identifier',
-            'begin_month': 'Begin_Month',
-            'begin_day_of_month': 'Begin_Day_of_Month',
-            'end_month': 'End_Month',
-            'end_day_of_month': 'End_Day_of_Month',
-            'use_weather_file_holidays_and_special_days': 'Use_Weather_File_Holidays_and_Special_Days',
-            'use_weather_file_rain_indicators': 'Use_Weather_File_Rain_Indicators',
-            'use_weather_file_snow_indicators': 'Use_Weather_File_Snow_Indicators',
-            'treat_weather_as_actual': 'Treat_Weather_as_Actual',
-            'do_zone_sizing_calculation': 'Do_Zone_Sizing_Calculation',
-            'do_system_sizing_calculation': 'Do_System_Sizing_Calculation',
-            'do_plant_sizing_calculation': 'Do_Plant_Sizing_Calculation',
-            'run_simulation_for_sizing_periods': 'Run_Simulation_for_Sizing_Periods',
-            'run_simulation_for_weather_file_run_periods': 'Run_Simulation_for_Weather_File_Run_Periods',
-            'ground_reflected_solar_modifier': 'Ground_Reflected_Solar_Modifier',
-            'daylighting_ground_reflected_solar_modifier': 'Daylighting_Ground_Reflected_Solar_Modifier',
-            'minimum_system_timestep': 'Minimum_System_Timestep',
-            'maximum_hvac_iterations': 'Maximum_HVAC_Iterations',
-            'month': 'Month',
-            'day_of_month': 'Day_of_Month',
-            'maximum_dry_bulb_temperature': 'Maximum_Dry_Bulb_Temperature',
-            'humidity_condition_day_schedule_name': 'Humidity_Condition_Day_Schedule_Name'
-        }
-        
-        for epjson_field, eppy_field in field_mappings.items():
+        for epjson_field, eppy_field in EPPY_FIELD_MAPPINGS.items():
             if hasattr(self, epjson_field):
                 setattr(self, eppy_field, getattr(self, epjson_field))
 
@@ -263,6 +269,50 @@ class ScheduleCompatibilityWrapper(IDFObjectCompatibilityWrapper):
         return fieldvalues
 
 
+# eppy field name -> EPJSON fields it can come from, in the precedence used by
+# IDFObjectCompatibilityWrapper (later mappings override earlier ones)
+_EPPY_FIELD_SOURCES: Dict[str, List[str]] = {}
+for _epjson_field, _eppy_field in EPPY_FIELD_MAPPINGS.items():
+    _EPPY_FIELD_SOURCES.setdefault(_eppy_field, []).insert(0, _epjson_field)
+
+
+class CompactObjectRecord:
+    """
+    Slotted, read-only replacement for IDFObjectCompatibilityWrapper used after DataLoader.compact().
+    Resolves EPJSON and eppy-style attributes from the underlying object data on access
+    instead of copying every field into a per-instance attribute dictionary.
+    """
+    __slots__ = ('Name', 'object_data')
+
+    def __init__(self, object_id: str, object_data: Dict[str, Any]):
+        self.Name = object_id
+        self.object_data = object_data
+
+    @property
+    def name(self) -> str:
+        return self.Name
+
+    @property
+    def object_id(self) -> str:
+        return self.Name
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr == 'object_data':
+            raise AttributeError(attr)
+        data = self.object_data
+        for epjson_field in _EPPY_FIELD_SOURCES.get(attr, ()):
+            if epjson_field in data:
+                return data[epjson_field]
+        if attr in data:
+            return data[attr]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+
+    def __dir__(self):
+        eppy_fields = [eppy for eppy, sources in _EPPY_FIELD_SOURCES.items()
+                       if any(source in self.object_data for source in sources)]
+        return sorted(set(super().__dir__()) | set(self.object_data) | set(eppy_fields))
+
+
 AREA_ID_REGEX = re.compile(r"^\d{2}")
 
 SETTINGS_OBJECT_TYPES = [
@@ -280,6 +330,88 @@ SETTINGS_OBJECT_TYPES = [
     "Site:GroundReflectance:SnowModifier"
 ]
 
+# Object types read by SettingsParser.process_idf
+SETTINGS_PARSER_OBJECT_TYPES = [
+    'Version', 'Building', 'Site:Location', 'SizingPeriod:DesignDay',
+    'Site:GroundTemperature:BuildingSurface', 'SimulationControl',
+    'RunPeriod', 'Timestep', 'Site:GroundTemperature:Deep',
+    'Site:GroundTemperature:Shallow', 'Site:GroundTemperature:FCfactorMethod',
+    'Site:GroundReflectance', 'Site:GroundReflectance:SnowModifier',
+    'ConvergenceLimits', 'ShadowCalculation',
+    'SurfaceConvectionAlgorithm:Inside', 'SurfaceConvectionAlgorithm:Outside',
+    'HeatBalanceAlgorithm'
+]
+
+# Raw EPJSON sections that are fully represented by the caches built in load_file
+# and are not read again afterwards. Schedule:Compact and the settings sections
+# stay until release_raw_data() because parsers still read them directly.
+CACHED_RAW_SECTIONS = (
+    "Zone",
+    "ZoneHVAC:EquipmentConnections",
+    "BuildingSurface:Detailed",
+    "FenestrationSurface:Detailed",
+    "Material",
+    "Material:NoMass",
+    "Material:InfraredTransparent",
+    "WindowMaterial:Glazing",
+    "WindowMaterial:Gas",
+    "WindowMaterial:Shade",
+    "WindowMaterial:Blind",
+    "WindowMaterial:SimpleGlazingSystem",
+    "Construction",
+    "People",
+    "Lights",
+    "ElectricEquipment",
+    "OtherEquipment",
+    "ZoneInfiltration:DesignFlowRate",
+    "ZoneVentilation:DesignFlowRate",
+    "Exterior:Lights",
+    "WindowShadingControl",
+    "WindowProperty:FrameAndDivider",
+    "Daylighting:Controls",
+    "Daylighting:ReferencePoint",
+    "DesignSpecification:OutdoorAir",
+    "ZoneHVAC:IdealLoadsAirSystem",
+)
+
+# Every object type the DataLoader caches and the parsers read. With selective
+# loading, all other object types are skipped without being parsed.
+REQUIRED_OBJECT_TYPES = sorted(
+    set(CACHED_RAW_SECTIONS) | {"Schedule:Compact"} | set(SETTINGS_OBJECT_TYPES) | set(SETTINGS_PARSER_OBJECT_TYPES)
+)
+
+# The cache steps of load_file in dependency order: (method, raw sections it reads, earlier
+# steps whose caches it reads or modifies, cache attributes it rebuilds). Used by
+# derive_variant to rebuild only the caches a patched model affects. Zones depend
+# on surfaces because _calculate_zone_areas_and_volumes fills zone entries in place.
+CACHE_STEP_DEPENDENCIES = (
+    ("_cache_schedules", ("Schedule:Compact",), (),
+     ("_schedules_cache", "_schedule_rules_cache")),
+    ("_cache_surfaces", ("BuildingSurface:Detailed", "FenestrationSurface:Detailed"), (),
+     ("_surfaces_cache", "_windows_cache")),
+    ("_cache_zones", ("Zone", "ZoneHVAC:EquipmentConnections"), ("_cache_schedules", "_cache_surfaces"),
+     ("_zones_cache", "_hvac_zones_cache", "_hvac_equipment_zones")),
+    ("_calculate_zone_areas_and_volumes", (), ("_cache_zones",), ()),
+    ("_cache_materials", ("Material", "Material:NoMass", "Material:InfraredTransparent",
+                          "WindowMaterial:Glazing", "WindowMaterial:Gas", "WindowMaterial:Shade",
+                          "WindowMaterial:Blind", "WindowMaterial:SimpleGlazingSystem"), (),
+     ("_materials_cache", "_window_glazing_cache", "_window_gas_cache", "_window_shade_cache",
+      "_window_simple_glazing_cache")),
+    ("_build_all_materials_cache", (), ("_cache_materials",), ("_all_materials_cache_complete",)),
+    ("_cache_constructions", ("Construction",), ("_cache_materials",),
+     ("_constructions_cache", "_constructions_glazing_cache")),
+    ("_cache_loads", ("People", "Lights", "ElectricEquipment", "OtherEquipment", "Exterior:Lights",
+                      "ZoneInfiltration:DesignFlowRate", "ZoneVentilation:DesignFlowRate"), ("_cache_zones",),
+     ("_people_cache", "_lights_cache", "_exterior_lights_cache", "_equipment_cache",
+      "_infiltration_cache", "_ventilation_cache")),
+    ("_cache_window_shading_controls", ("WindowShadingControl",), (), ("_window_shading_control_cache",)),
+    ("_cache_frame_dividers", ("WindowProperty:FrameAndDivider",), (), ("_frame_divider_cache",)),
+    ("_cache_daylighting", ("Daylighting:Controls", "Daylighting:ReferencePoint"), (),
+     ("_daylighting_controls_cache", "_daylighting_reference_point_cache")),
+    ("_cache_outdoor_air_specifications", ("DesignSpecification:OutdoorAir",), (), ("_outdoor_air_spec_cache",)),
+    ("_cache_ideal_loads", ("ZoneHVAC:IdealLoadsAirSystem",), ("_cache_zones",), ("_ideal_loads_cache",)),
+)
+
 def safe_float(value: Any, default: float = 0.0) -> float:
     """Safely convert a value to float, returning a default if conversion fails."""
     if value is None or value == '':
@@ -293,15 +425,34 @@ def safe_float(value: Any, default: float = 0.0) -> float:
 
 class DataLoader:
     """DataLoader for caching and retrieving EPJSON data."""
-    def __init__(self, energyplus_path: Optional[str] = None, simulation_output_dir: Optional[str] = None):
+    def __init__(self, energyplus_path: Optional[str] = None, simulation_output_dir: Optional[str] = None,
+                 profiler=None, release_raw_sections: bool = False, selective_load: bool = False):
+        """
+        Args:
+            energyplus_path: Path to EnergyPlus installation directory
+            simulation_output_dir: Directory with the simulation output CSV files
+            profiler: Optional RunProfiler used to time loading and caching stages
+            release_raw_sections: Drop raw EPJSON sections once their caches are built
+                                  (see CACHED_RAW_SECTIONS). Leave off when the loaded
+                                  EPJSON is saved back to disk.
+            selective_load: Only parse the object types in REQUIRED_OBJECT_TYPES; all
+                            other sections are skipped while reading the file.
+        """
         self._epjson_data = None
         self._epjson_handler = None
         self._file_path = None
         self._energyplus_path = energyplus_path
         self._simulation_output_dir = simulation_output_dir
+        self._profiler = profiler or NullProfiler()
+        self._release_raw_sections = release_raw_sections
+        self._selective_load = selective_load
+        self._load_stats = None
+        self._released_sections = set()
+        self._compacted = False
         self._loaded_sections = set()
         self._zones_cache = {}
         self._hvac_zones_cache = []
+        self._hvac_equipment_zones = set()
         self._surfaces_cache = {}
         self._materials_cache = {}
         self._constructions_cache = {}
@@ -449,10 +600,14 @@ class DataLoader:
             self.load_file(file_path, energyplus_path)
 
         if self._epjson_data:
-            self._epjson_handler.ensure_output_variables(self._epjson_data)
+            epjson_data = self._epjson_data
+            if self._released_sections:
+                # Raw sections were dropped after caching; re-read the file so the saved EPJSON stays complete
+                epjson_data = self._epjson_handler.load_epjson(self._file_path)
+            self._epjson_handler.ensure_output_variables(epjson_data)
             # Save the updated EPJSON
             if self._file_path.endswith('.epJSON'):
-                self._epjson_handler.save_epjson(self._epjson_data, self._file_path)
+                self._epjson_handler.save_epjson(epjson_data, self._file_path)
             return True
         return False
 
@@ -477,27 +632,44 @@ class DataLoader:
                 self._epjson_handler = EPJSONHandler(energyplus_path or self._energyplus_path)
             
             # Load or convert file to EPJSON
-            self._epjson_data, actual_path = self._epjson_handler.load_or_convert_file(file_path)
+            object_types = REQUIRED_OBJECT_TYPES if self._selective_load else None
+            with self._profiler.stage("load:epjson", "load"):
+                self._epjson_data, actual_path = self._epjson_handler.load_or_convert_file(
+                    file_path, object_types=object_types)
             self._file_path = actual_path
+            self._load_stats = self._epjson_handler.last_load_stats
+            # Sections skipped by the selective loader count as released, so a later
+            # save re-reads the full file instead of writing a partial EPJSON
+            self._released_sections = set(self._load_stats['skipped_sections']) if self._load_stats else set()
+            self._compacted = False
             self._loaded_sections = {'zones', 'surfaces', 'materials', 'constructions', 'schedules'}
 
             # Ensure output variables
             self._epjson_handler.ensure_output_variables(self._epjson_data)
             
-            # Cache all data
-            self._cache_schedules()
-            self._cache_zones()
-            self._cache_surfaces()
-            self._calculate_zone_areas_and_volumes()  # Calculate after surfaces are cached
-            self._cache_materials()
-            self._build_all_materials_cache()
-            self._cache_constructions()
-            self._cache_loads()  # Cache loads after zone areas are calculated
-            self._cache_window_shading_controls()
-            self._cache_frame_dividers()
-            self._cache_daylighting()
-            self._cache_outdoor_air_specifications()
-            self._cache_ideal_loads()
+            # Cache all data. Order matters: zone areas are calculated after surfaces
+            # are cached, and loads are cached after zone areas are calculated.
+            cache_steps = (
+                self._cache_schedules,
+                self._cache_zones,
+                self._cache_surfaces,
+                self._calculate_zone_areas_and_volumes,
+                self._cache_materials,
+                self._build_all_materials_cache,
+                self._cache_constructions,
+                self._cache_loads,
+                self._cache_window_shading_controls,
+                self._cache_frame_dividers,
+                self._cache_daylighting,
+                self._cache_outdoor_air_specifications,
+                self._cache_ideal_loads,
+            )
+            for cache_step in cache_steps:
+                with self._profiler.stage(cache_step.__name__, "cache"):
+                    cache_step()
+
+            if self._release_raw_sections:
+                self.release_cached_sections()
             
             # Successfully loaded file
 
@@ -520,9 +692,45 @@ class DataLoader:
             return
         
         self._zones_cache.clear()
-        self._hvac_zones_cache.clear()
         
         zones = self._epjson_data.get('Zone', {})
+        # Kept so HVAC detection can be re-run from caches after the raw sections are released
+        hvac_equipment = self._epjson_data.get('ZoneHVAC:EquipmentConnections', {})
+        self._hvac_equipment_zones = {equip_data.get('zone_name') for equip_data in hvac_equipment.values()}
+        
+        for zone_id, zone_data in zones.items():
+            
+            # Extract area_id using legacy method for backward compatibility
+            area_id = self._extract_area_id(zone_id)
+            
+            # Also get the new group key for debugging
+            group_key = self.get_zone_group_key(zone_id)
+            
+            
+            # Get floor area directly from Zone object if available
+            zone_floor_area = safe_float(zone_data.get("floor_area", 0.0), 0.0)
+            zone_volume = safe_float(zone_data.get("volume", 0.0), 0.0)
+            
+            
+            self._zones_cache[zone_id] = {
+                'id': zone_id,
+                'name': zone_id,
+                'area_id': area_id,
+                'floor_area': zone_floor_area,  # Use direct zone floor area
+                'volume': zone_volume,          # Use direct zone volume
+                'multiplier': int(safe_float(zone_data.get("multiplier", 1))),
+                'raw_object': IDFObjectCompatibilityWrapper(zone_id, zone_data)
+            }
+
+        self._detect_hvac_zones()
+
+    def _detect_hvac_zones(self) -> None:
+        """
+        Flag HVAC zones, using the simulation CSV's HVAC flag when available and
+        falling back to HVAC schedules and ZoneHVAC:EquipmentConnections otherwise.
+        """
+        logger = get_logger(__name__)
+        self._hvac_zones_cache.clear()
         
         # Load CSV data once for HVAC detection
         csv_path = self._get_csv_path()
@@ -533,7 +741,7 @@ class DataLoader:
             except Exception as e:
                 logger.warning(f"Failed to read CSV for HVAC detection: {e}")
         
-        for zone_id, zone_data in zones.items():
+        for zone_id in self._zones_cache:
             
             # Check if this is an HVAC zone using CSV flag first
             hvac_found = False
@@ -557,36 +765,74 @@ class DataLoader:
                         break
                         
                 # Alternative: Check for direct HVAC equipment references
-                if not hvac_found:
-                    hvac_equipment = self._epjson_data.get('ZoneHVAC:EquipmentConnections', {})
-                    for equip_id, equip_data in hvac_equipment.items():
-                        if equip_data.get('zone_name') == zone_id:
-                            self._hvac_zones_cache.append(zone_id)
-                            hvac_found = True
-                            break
-            
-            # Extract area_id using legacy method for backward compatibility
-            area_id = self._extract_area_id(zone_id)
-            
-            # Also get the new group key for debugging
-            group_key = self.get_zone_group_key(zone_id)
-            
-            
-            # Get floor area directly from Zone object if available
-            zone_floor_area = safe_float(zone_data.get("floor_area", 0.0), 0.0)
-            zone_volume = safe_float(zone_data.get("volume", 0.0), 0.0)
-            
-            
-            self._zones_cache[zone_id] = {
-                'id': zone_id,
-                'name': zone_id,
-                'area_id': area_id,
-                'floor_area': zone_floor_area,  # Use direct zone floor area
-                'volume': zone_volume,          # Use direct zone volume
-                'multiplier': int(safe_float(zone_data.get("multiplier", 1))),
-                'raw_object': IDFObjectCompatibilityWrapper(zone_id, zone_data)
-            }
-            
+                if not hvac_found and zone_id in self._hvac_equipment_zones:
+                    self._hvac_zones_cache.append(zone_id)
+
+    def refresh_simulation_outputs(self, simulation_output_dir: Optional[str] = None) -> List[str]:
+        """
+        Re-run the simulation-dependent caching once EnergyPlus output exists.
+
+        Pipelined runs load the model while the simulation is still running, so
+        HVAC zones are first detected without the CSV flags. This re-detects them
+        from the cached zones and schedules; the raw EPJSON is not needed.
+
+        Args:
+            simulation_output_dir: Run folder whose simulation/ subfolder holds eplustbl.csv
+
+        Returns:
+            The refreshed list of HVAC zone names
+        """
+        if simulation_output_dir is not None:
+            self._simulation_output_dir = simulation_output_dir
+        self._detect_hvac_zones()
+        return self._hvac_zones_cache
+
+    def derive_variant(self, epjson_data: Dict[str, Any], changed_object_types: Iterable[str],
+                       simulation_output_dir: Optional[str] = None) -> 'DataLoader':
+        """
+        Create a DataLoader for a patched copy of the loaded model without reloading it.
+
+        Caches whose raw sections (and upstream caches) are unchanged are shared with
+        this loader; only the cache steps affected by changed_object_types are re-run
+        on the variant's EPJSON (see CACHE_STEP_DEPENDENCIES). Shared cache entries
+        must be treated as read-only, so do not compact() either loader afterwards.
+
+        Args:
+            epjson_data: Complete EPJSON of the variant
+            changed_object_types: Object types that differ from the loaded model
+            simulation_output_dir: Directory with the variant's simulation output
+
+        Returns:
+            The variant DataLoader
+        """
+        changed_object_types = set(changed_object_types)
+        dirty_steps = set()
+        for method_name, sources, upstream_steps, _ in CACHE_STEP_DEPENDENCIES:
+            if changed_object_types.intersection(sources) or dirty_steps.intersection(upstream_steps):
+                dirty_steps.add(method_name)
+
+        variant = copy.copy(self)
+        variant._epjson_data = dict(epjson_data)
+        variant._simulation_output_dir = simulation_output_dir
+        variant._released_sections = set(self._released_sections)
+        variant._last_detailed_log = {}
+        # HVAC zones come from each variant's own simulation output
+        variant._hvac_zones_cache = list(self._hvac_zones_cache)
+
+        for method_name, _, _, cache_attributes in CACHE_STEP_DEPENDENCIES:
+            if method_name not in dirty_steps:
+                continue
+            # Fresh containers, as the cache steps clear() the ones shared with this loader
+            for attribute in cache_attributes:
+                setattr(variant, attribute, type(getattr(self, attribute))())
+            with self._profiler.stage(f"variant:{method_name}", "cache"):
+                getattr(variant, method_name)()
+
+        if self._release_raw_sections:
+            variant.release_cached_sections()
+        logger.debug(f"Derived variant loader; rebuilt {len(dirty_steps)} of {len(CACHE_STEP_DEPENDENCIES)} cache steps")
+        return variant
+
 
     def _calculate_zone_areas_and_volumes(self) -> None:
         """Calculate zone floor areas and volumes from surface data for zones that don't have direct values."""
@@ -1549,6 +1795,105 @@ class DataLoader:
             'schedules': bool(self._schedules_cache)
         }
 
+    def release_cached_sections(self) -> int:
+        """
+        Drop the raw EPJSON sections whose contents are already held by the caches.
+        Called at the end of load_file when release_raw_sections is enabled.
+
+        Returns:
+            Number of sections released
+        """
+        if not self._epjson_data:
+            return 0
+
+        released = 0
+        for section in CACHED_RAW_SECTIONS:
+            if self._epjson_data.pop(section, None) is not None:
+                self._released_sections.add(section)
+                released += 1
+        logger.debug(f"Released {released} cached raw EPJSON sections")
+        return released
+
+    def release_raw_data(self) -> int:
+        """
+        Drop all remaining raw EPJSON data. Call once parsing is finished; report
+        generation only uses the caches.
+
+        Returns:
+            Number of sections released
+        """
+        if not self._epjson_data:
+            return 0
+
+        released = len(self._epjson_data)
+        self._released_sections.update(self._epjson_data.keys())
+        self._epjson_data = {}
+        logger.debug(f"Released {released} remaining raw EPJSON sections")
+        return released
+
+    def compact(self) -> int:
+        """
+        Convert the per-entity compatibility wrappers held by the caches ('raw_object')
+        into slotted CompactObjectRecord instances. Attribute access is unchanged, but
+        the per-instance copy of every field is dropped. Cache entries themselves stay
+        dictionaries because parsers and generators use the mapping interface.
+
+        Returns:
+            Number of wrappers converted
+        """
+        if self._compacted:
+            return 0
+
+        # Shared wrappers (e.g. windows held by both the surfaces and windows caches,
+        # materials copied into the combined materials cache) map to a single record
+        converted = {}
+
+        def compact_entry(entry):
+            raw_object = entry.get('raw_object')
+            if isinstance(raw_object, IDFObjectCompatibilityWrapper):
+                record = converted.get(id(raw_object))
+                if record is None:
+                    record = CompactObjectRecord(raw_object.Name, raw_object.object_data)
+                    converted[id(raw_object)] = record
+                entry['raw_object'] = record
+
+        caches = (
+            self._zones_cache, self._surfaces_cache, self._windows_cache, self._materials_cache,
+            self._constructions_cache, self._constructions_glazing_cache, self._schedules_cache,
+            self._people_cache, self._lights_cache, self._exterior_lights_cache, self._equipment_cache,
+            self._infiltration_cache, self._ventilation_cache, self._outdoor_air_spec_cache,
+            self._window_glazing_cache, self._window_gas_cache, self._window_shade_cache,
+            self._window_simple_glazing_cache, self._all_materials_cache_complete,
+            self._window_shading_control_cache, self._frame_divider_cache,
+            self._daylighting_controls_cache, self._daylighting_reference_point_cache,
+            self._ideal_loads_cache,
+        )
+        for cache in caches:
+            entries = cache.values() if isinstance(cache, dict) else cache
+            for entry in entries:
+                if isinstance(entry, dict):
+                    compact_entry(entry)
+                elif isinstance(entry, list):
+                    # Load caches are keyed by zone with a list of load entries
+                    for item in entry:
+                        if isinstance(item, dict):
+                            compact_entry(item)
+
+        self._compacted = True
+        logger.debug(f"Compacted {len(converted)} cached EPJSON object wrappers")
+        return len(converted)
+
+    def get_load_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get statistics from the last selective load (file size, parsed and skipped
+        bytes, skipped object types, elapsed time), or None after a full load.
+        """
+        return self._load_stats
+
+    def get_released_sections(self) -> List[str]:
+        """Get the raw EPJSON sections dropped so far by release_cached_sections/release_raw_data."""
+        return sorted(self._released_sections)
+
     def get_epjson_data(self):
         """
         Get the raw EPJSON data.
@@ -1779,4 +2124,109 @@ class DataLoader:
             'temperature' in schedule_type_lower and
             ('heating' in schedule_name_lower or 'cooling' in schedule_name_lower) and
             'setpoint' not in schedule_type_lower
-        )
\ No newline at end of file
+        )
+
+
+class DataLoaderCache:
+    """
+    LRU of loaded models for processes that handle many runs (the warm worker).
+
+    A model is loaded once per file version (path, size and modification time);
+    every get() returns a DataLoader derived from the cached one with
+    derive_variant, so a run can release its raw sections without affecting
+    later runs. The caches are shared between the derived loaders and must be
+    treated as read-only, as with parametric variants; compact() is therefore a
+    no-op on the derived loaders.
+
+    Files are loaded outside the cache lock, so callers can load different models
+    at the same time; callers asking for a model that is being loaded wait for it.
+    The cached loaders keep no reference to the profiler of the run that loaded them.
+
+    Args:
+        max_entries: Number of models kept loaded
+    """
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[tuple, DataLoader]' = OrderedDict()
+        # key -> event set when the model being loaded for it is cached (or loading failed)
+        self._loading: Dict[tuple, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str, energyplus_path: Optional[str] = None,
+            simulation_output_dir: Optional[str] = None, profiler=None, **loader_options) -> DataLoader:
+        """
+        Get a DataLoader for file_path, loading the file only if this version is not cached.
+
+        Args:
+            file_path: IDF or EPJSON file
+            energyplus_path: Path to EnergyPlus installation directory
+            simulation_output_dir: Directory with the run's simulation output CSV files
+            profiler: Profiler of the run
+            **loader_options: release_raw_sections / selective_load, as for DataLoader
+
+        Returns:
+            A DataLoader owned by the caller
+        """
+        stat = os.stat(file_path)
+        key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns, energyplus_path,
+               tuple(sorted(loader_options.items())))
+        base = None
+        while base is None:
+            with self._lock:
+                base = self._entries.get(key)
+                if base is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    break
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    self.misses += 1
+                    load_here = True
+                else:
+                    load_here = False
+            if not load_here:
+                # Another run is loading this model; take it from the cache once loaded
+                loading.wait()
+                continue
+            try:
+                base = DataLoader(energyplus_path=energyplus_path, simulation_output_dir=simulation_output_dir,
+                                  profiler=profiler, **loader_options)
+                base.load_file(file_path, energyplus_path=energyplus_path)
+                # The loading stages are recorded; the cached model must not keep the run's profiler alive
+                base._profiler = NullProfiler()
+                with self._lock:
+                    self._entries[key] = base
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            finally:
+                with self._lock:
+                    del self._loading[key]
+                loading.set()
+
+        loader = base.derive_variant(base.get_epjson_data() or {}, (), simulation_output_dir)
+        loader._profiler = profiler or NullProfiler()
+        # Compacting would rewrite the shared cache entries under later runs
+        loader._compacted = True
+        if simulation_output_dir != base._simulation_output_dir:
+            # HVAC zones are detected from the run's own simulation output
+            loader.refresh_simulation_outputs()
+        return loader
+
+    def clear(self) -> None:
+        """Drop every cached model."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cached files and hit/miss counts."""
+        with self._lock:
+            return {
+                'max_entries': self.max_entries,
+                'files': [key[0] for key in self._entries],
+                'hits': self.hits,
+                'misses': self.misses,
+            }
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Headless EnergyPlus runner.
+Runs one simulation in its own output directory without touching GUI state, so
+several simulations can run side by side (e.g. a climate sweep). Mirrors the
+GUI's run_energyplus_simulation: ASCII-safe staging for Unicode paths, hidden
+console window on Windows and the eplustbl.csv sanity check.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from utils.lean_simulation import (
+    add_sqlite_output_epjson, add_sqlite_output_idf, make_lean_epjson, make_lean_idf
+)
+from utils.logging_config import get_logger
+from utils.path_utils import (
+    StagingStats, contains_non_ascii, create_safe_path_for_energyplus,
+    create_safe_output_dir_for_energyplus, move_simulation_files_back,
+    normalize_path_for_energyplus
+)
+
+logger = get_logger(__name__)
+
+# Output variables the energy rating needs, appended to IDF inputs before simulating
+ENERGY_RATING_OUTPUT_VARIABLES_IDF = """
+! Required Output:Variable entries for energy rating
+OUTPUT:VARIABLE,
+    *,                        !- Key Value
+    Zone Ideal Loads Supply Air Total Cooling Energy,    !- Variable Name
+    RunPeriod;                !- Reporting Frequency
+
+OUTPUT:VARIABLE,
+    *,                        !- Key Value
+    Zone Ideal Loads Supply Air Total Heating Energy,    !- Variable Name
+    RunPeriod;                !- Reporting Frequency
+
+OUTPUT:VARIABLE,
+    *,                        !- Key Value
+    Lights Electricity Energy,    !- Variable Name
+    RunPeriod;                !- Reporting Frequency
+"""
+
+# eplustbl.csv files smaller than this are treated as a failed simulation
+MIN_OUTPUT_CSV_BYTES = 100
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of a single EnergyPlus run."""
+    output_dir: str
+    output_csv: Optional[str] = None
+    elapsed_s: float = 0.0
+    error: Optional[str] = None
+    # Files/bytes staged for Unicode paths by linking or renaming vs copying (see StagingStats)
+    staging: Optional[Dict[str, int]] = None
+
+    @property
+    def success(self) -> bool:
+        return self.output_csv is not None
+
+
+def get_energyplus_executable(energyplus_dir: str) -> str:
+    """Return the EnergyPlus executable in energyplus_dir (energyplus.exe on Windows)."""
+    for name in ("energyplus.exe", "energyplus"):
+        candidate = os.path.join(energyplus_dir, name)
+        if os.path.exists(candidate):
+            return candidate
+    return os.path.join(energyplus_dir, "energyplus.exe")
+
+
+def prepare_simulation_input(input_file: str, output_path: str, lean: bool = False,
+                             sqlite_output: bool = False) -> str:
+    """
+    Write a copy of the model with the energy rating output variables added.
+
+    Unlike the GUI, which appends the variables to the user's IDF in place, the
+    original file is left untouched.
+
+    Args:
+        input_file: Source IDF or EPJSON file
+        output_path: Where to write the prepared copy
+        lean: Also apply the lean simulation profile (see utils.lean_simulation)
+        sqlite_output: Also request Output:SQLite so the results are read from eplusout.sql
+
+    Returns:
+        output_path
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    if input_file.lower().endswith('.epjson'):
+        from utils.epjson_handler import EPJSONHandler
+        handler = EPJSONHandler()
+        epjson_data = handler.load_epjson(input_file)
+        if lean:
+            epjson_data, stats = make_lean_epjson(epjson_data)
+            logger.info(stats.summary())
+        handler.ensure_output_variables(epjson_data)
+        if sqlite_output:
+            epjson_data = add_sqlite_output_epjson(epjson_data)
+        handler.save_epjson(epjson_data, output_path)
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            content = f.read() + ENERGY_RATING_OUTPUT_VARIABLES_IDF
+        if lean:
+            content, stats = make_lean_idf(content)
+            logger.info(stats.summary())
+        if sqlite_output:
+            content = add_sqlite_output_idf(content)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return output_path
+
+
+def run_energyplus(energyplus_dir: str, input_file: str, epw_file: str, output_dir: str,
+                   timeout: Optional[float] = None) -> SimulationResult:
+    """
+    Run EnergyPlus on input_file with the given weather file.
+
+    Args:
+        energyplus_dir: EnergyPlus installation directory
+        input_file: Prepared IDF/EPJSON model (see prepare_simulation_input)
+        epw_file: Weather file
+        output_dir: Directory for the simulation outputs (created if needed)
+        timeout: Optional timeout in seconds
+
+    Returns:
+        SimulationResult; output_csv is the eplustbl.csv path when the run succeeded
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    result = SimulationResult(output_dir=output_dir)
+
+    staging_stats = StagingStats()
+    safe_input_path, input_cleanup = create_safe_path_for_energyplus(input_file, stats=staging_stats)
+    safe_output_dir, needs_move_back = create_safe_output_dir_for_energyplus(output_dir)
+    safe_epw_path, epw_cleanup = (epw_file, None)
+    if contains_non_ascii(epw_file):
+        safe_epw_path, epw_cleanup = create_safe_path_for_energyplus(epw_file, stats=staging_stats)
+
+    cmd = [
+        get_energyplus_executable(energyplus_dir),
+        "-w", normalize_path_for_energyplus(safe_epw_path),
+        "-r",
+        "-d", normalize_path_for_energyplus(safe_output_dir),
+        normalize_path_for_energyplus(safe_input_path)
+    ]
+    kwargs = {
+        'check': True,
+        'capture_output': True,
+        'text': True,
+        'encoding': 'utf-8',
+        'errors': 'ignore',
+        'timeout': timeout
+    }
+    if sys.platform.startswith('win'):
+        kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+
+    try:
+        logger.info(f"Running EnergyPlus: {' '.join(cmd)}")
+        subprocess.run(cmd, **kwargs)
+
+        temp_output_csv = os.path.join(safe_output_dir, "eplustbl.csv")
+        if not os.path.exists(temp_output_csv) or os.path.getsize(temp_output_csv) <= MIN_OUTPUT_CSV_BYTES:
+            result.error = f"Simulation output {temp_output_csv} is missing or empty"
+        elif needs_move_back and not move_simulation_files_back(safe_output_dir, output_dir, staging_stats):
+            result.error = f"Failed to move simulation outputs to {output_dir}"
+        else:
+            result.output_csv = os.path.join(output_dir, "eplustbl.csv")
+    except subprocess.CalledProcessError as e:
+        stderr_lines = (e.stderr or "").strip().splitlines()
+        fatal_lines = [line.strip() for line in stderr_lines + (e.stdout or "").splitlines()
+                       if "**FATAL**" in line or "**SEVERE**" in line]
+        result.error = fatal_lines[-1] if fatal_lines else (stderr_lines[-1] if stderr_lines else f"EnergyPlus exited with code {e.returncode}")
+    except subprocess.TimeoutExpired:
+        result.error = f"EnergyPlus timed out after {timeout}s"
+    except FileNotFoundError:
+        result.error = f"EnergyPlus executable not found: {cmd[0]}"
+    finally:
+        if input_cleanup:
+            input_cleanup()
+        if epw_cleanup:
+            epw_cleanup()
+        if needs_move_back and not result.success and os.path.exists(safe_output_dir):
+            shutil.rmtree(safe_output_dir, ignore_errors=True)
+
+    result.elapsed_s = round(time.perf_counter() - start, 3)
+    result.staging = staging_stats.as_dict()
+    if staging_stats.files_linked or staging_stats.files_copied:
+        logger.info(f"Staged simulation files for {output_dir}: {staging_stats}")
+    if result.error:
+        logger.error(f"EnergyPlus run in {output_dir} failed: {result.error}")
+    return result
@@ -9,6 +9,7 @@ import subprocess
 from typing import Dict, List, Optional, Any, Tuple
 from utils.logging_config import get_logger
 from utils.idf_version_checker import IDFVersionChecker
+from utils.epjson_stream import load_epjson_sections
 from .path_utils import contains_non_ascii, create_safe_path_for_energyplus
 
 logger = get_logger(__name__)
@@ -25,13 +26,17 @@ class EPJSONHandler:
         """
         self.energyplus_path = energyplus_path
         self.version_checker = IDFVersionChecker(energyplus_path)
+        self.last_load_stats = None
         
-    def load_epjson(self, file_path: str) -> Dict[str, Any]:
+    def load_epjson(self, file_path: str, object_types: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Load EPJSON file into Python dictionary.
         
         Args:
             file_path: Path to the EPJSON file
+            object_types: Optional list of object types to load. When given, the file is
+                          scanned selectively and all other object types are skipped
+                          without being parsed (see utils.epjson_stream).
             
         Returns:
             Dictionary containing the EPJSON data
@@ -44,8 +49,13 @@ class EPJSONHandler:
             raise FileNotFoundError(f"EPJSON file not found at '{file_path}'")
             
         try:
+            if object_types is not None:
+                data, self.last_load_stats = load_epjson_sections(file_path, object_types)
+                return data
+
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            self.last_load_stats = None
                 
             logger.info(f"Successfully loaded EPJSON file: {file_path}")
             logger.info(f"EPJSON data contains {len(data)} object types")
@@ -340,13 +350,15 @@ class EPJSONHandler:
                 var_data['reporting_frequency']
             )
     
-    def load_or_convert_file(self, file_path: str, prefer_epjson: bool = True) -> Tuple[Dict[str, Any], str]:
+    def load_or_convert_file(self, file_path: str, prefer_epjson: bool = True,
+                             object_types: Optional[List[str]] = None) -> Tuple[Dict[str, Any], str]:
         """
         Load a file as EPJSON, converting from IDF if necessary.
         
         Args:
             file_path: Path to the file (can be .idf or .epJSON)
             prefer_epjson: Whether to prefer EPJSON format for output
+            object_types: Optional list of object types to load (selective loading)
             
         Returns:
             Tuple of (epjson_data, actual_file_path_used)
@@ -355,7 +367,7 @@ class EPJSONHandler:
         
         if file_ext == '.epjson':
             # File is already EPJSON - no injection needed
-            epjson_data = self.load_epjson(file_path)
+            epjson_data = self.load_epjson(file_path, object_types)
             return epjson_data, file_path
             
         elif file_ext == '.idf':
@@ -365,7 +377,7 @@ class EPJSONHandler:
             try:
                 # Convert modified IDF to EPJSON with version handling
                 epjson_path = self.convert_idf_to_epjson(temp_idf_path)
-                epjson_data = self.load_epjson(epjson_path)
+                epjson_data = self.load_epjson(epjson_path, object_types)
             finally:
                 # Clean up temporary file
                 if os.path.exists(temp_idf_path):
@@ -0,0 +1,207 @@
+"""
+Selective streaming loader for EPJSON files.
+Scans the top-level object of a memory-mapped EPJSON file and materializes only the
+requested object types; every other section is skipped at the byte level without
+being decoded. Used by DataLoader to avoid parsing large sections that no parser
+reads (Output:*, HVAC templates, shading geometry...).
+"""
+import json
+import mmap
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Skips everything up to the next bracket outside a string in a single C-level match,
+# so the Python loop only runs once per bracket rather than once per string
+_STRUCTURE_TOKEN = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]])', re.DOTALL)
+_SCALAR = re.compile(rb'[^,}\]\s]+')
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+
+class EPJSONStreamError(ValueError):
+    """Raised when the EPJSON file cannot be scanned as a JSON object."""
+
+
+class _SectionScanner:
+    """
+    Locates the byte span of each top-level section value in an EPJSON buffer.
+
+    Pretty-printed files (EnergyPlus writes 4-space, save_epjson 2-space indents)
+    are scanned with a fast path: JSON strings cannot contain raw newlines, so the
+    first line that holds only the top-level indent followed by the closing bracket
+    ends a section whose opening bracket ends its line. Anything that does not fit
+    that layout (including one-line sections such as {} or a compact [...]) falls
+    back to an incremental tokenizer that tracks strings and bracket depth.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.size = len(buffer)
+        self.fast_path_sections = 0
+        self.tokenized_sections = 0
+
+    def skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self.buffer, pos).end()
+
+    def expect(self, pos: int, char: bytes) -> int:
+        pos = self.skip_whitespace(pos)
+        if self.buffer[pos:pos + 1] != char:
+            raise EPJSONStreamError(f"Expected {char!r} at byte {pos}, found {self.buffer[pos:pos + 1]!r}")
+        return pos + 1
+
+    def read_string(self, pos: int) -> Tuple[str, int]:
+        match = _STRING.match(self.buffer, pos)
+        if not match:
+            raise EPJSONStreamError(f"Expected a string at byte {pos}")
+        return json.loads(match.group()), match.end()
+
+    def detect_indent(self, pos: int) -> Optional[bytes]:
+        """Return the indent of the first top-level key when the file is pretty-printed."""
+        line_start = self.buffer.rfind(b'\n', 0, pos)
+        if line_start == -1:
+            return None
+        indent = bytes(self.buffer[line_start + 1:pos])
+        if indent and indent.strip(b' \t') == b'':
+            return indent
+        return None
+
+    def find_value_end(self, start: int, indent: Optional[bytes]) -> int:
+        """Return the byte offset just past the value starting at `start`."""
+        opener = self.buffer[start:start + 1]
+        if opener == b'"':
+            return _STRING.match(self.buffer, start).end()
+        if opener not in (b'{', b'['):
+            match = _SCALAR.match(self.buffer, start)
+            if not match:
+                raise EPJSONStreamError(f"Invalid value at byte {start}")
+            return match.end()
+
+        # A section on one line has no closing line of its own; searching for one would
+        # find the end of a later section
+        if indent is not None and self.buffer[start + 1:start + 2] in (b'\n', b'\r'):
+            closer = b'}' if opener == b'{' else b']'
+            candidate = self.buffer.find(b'\n' + indent + closer, start)
+            if candidate != -1:
+                end = candidate + 1 + len(indent) + 1
+                next_pos = self.skip_whitespace(end)
+                if self.buffer[next_pos:next_pos + 1] in (b',', b'}'):
+                    self.fast_path_sections += 1
+                    return end
+
+        return self._tokenize_to_end(start)
+
+    def _tokenize_to_end(self, start: int) -> int:
+        self.tokenized_sections += 1
+        depth = 0
+        for match in _STRUCTURE_TOKEN.finditer(self.buffer, start):
+            token = match.group(1)
+            if token in (b'{', b'['):
+                depth += 1
+            elif token in (b'}', b']'):
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise EPJSONStreamError(f"Unterminated value starting at byte {start}")
+
+
+def load_epjson_sections(file_path: str, object_types: Iterable[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load only the requested object types from an EPJSON file.
+
+    Args:
+        file_path: Path to the EPJSON file
+        object_types: EPJSON object types to materialize (e.g. "Zone", "Construction")
+
+    Returns:
+        Tuple of (epjson_data, stats). epjson_data has the same layout as json.load
+        but only contains the requested object types present in the file. stats holds
+        the file size, parsed/skipped bytes, skipped sections and elapsed time.
+
+    Raises:
+        FileNotFoundError: If file not found
+        json.JSONDecodeError / EPJSONStreamError: If the file is not a valid EPJSON object
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"EPJSON file not found at '{file_path}'")
+
+    wanted = set(object_types)
+    start_time = time.perf_counter()
+    file_size = os.path.getsize(file_path)
+    data: Dict[str, Any] = {}
+    skipped_sections: Dict[str, int] = {}
+    parsed_bytes = 0
+    parse_seconds = 0.0
+
+    if file_size == 0:
+        raise EPJSONStreamError(f"EPJSON file '{file_path}' is empty")
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        scanner = _SectionScanner(buffer)
+        pos = len(_UTF8_BOM) if buffer[:len(_UTF8_BOM)] == _UTF8_BOM else 0
+        pos = scanner.expect(pos, b'{')
+        pos = scanner.skip_whitespace(pos)
+        indent = scanner.detect_indent(pos)
+
+        if buffer[pos:pos + 1] == b'}':
+            pos += 1
+        else:
+            while True:
+                pos = scanner.skip_whitespace(pos)
+                object_type, pos = scanner.read_string(pos)
+                pos = scanner.expect(pos, b':')
+                value_start = scanner.skip_whitespace(pos)
+                value_end = scanner.find_value_end(value_start, indent)
+
+                if object_type in wanted:
+                    parse_start = time.perf_counter()
+                    raw_value = buffer[value_start:value_end]
+                    try:
+                        data[object_type] = json.loads(raw_value)
+                    except json.JSONDecodeError:
+                        # Fast-path boundary was wrong for this section; re-scan it token by token
+                        value_end = scanner._tokenize_to_end(value_start)
+                        data[object_type] = json.loads(buffer[value_start:value_end])
+                    parsed_bytes += value_end - value_start
+                    parse_seconds += time.perf_counter() - parse_start
+                else:
+                    skipped_sections[object_type] = skipped_sections.get(object_type, 0) + value_end - value_start
+
+                pos = scanner.skip_whitespace(value_end)
+                separator = buffer[pos:pos + 1]
+                pos += 1
+                if separator == b'}':
+                    break
+                if separator != b',':
+                    raise EPJSONStreamError(f"Expected ',' or '}}' at byte {pos - 1}, found {separator!r}")
+
+    elapsed = time.perf_counter() - start_time
+    skipped_bytes = sum(skipped_sections.values())
+    # Skipped sections would have been decoded at roughly the rate measured for the parsed ones
+    estimated_time_saved = (parse_seconds / parsed_bytes * skipped_bytes) if parsed_bytes else 0.0
+    stats = {
+        'file_size_bytes': file_size,
+        'parsed_bytes': parsed_bytes,
+        'skipped_bytes': skipped_bytes,
+        'sections_loaded': len(data),
+        'sections_skipped': len(skipped_sections),
+        'skipped_sections': dict(sorted(skipped_sections.items(), key=lambda item: item[1], reverse=True)),
+        'fast_path_sections': scanner.fast_path_sections,
+        'tokenized_sections': scanner.tokenized_sections,
+        'elapsed_s': round(elapsed, 6),
+        'estimated_time_saved_s': round(estimated_time_saved, 6),
+    }
+
+    skipped_share = (skipped_bytes / file_size * 100) if file_size else 0.0
+    logger.info(
+        f"Selectively loaded EPJSON '{file_path}': {len(data)} object types parsed "
+        f"({parsed_bytes / 1e6:.1f} MB), {len(skipped_sections)} skipped "
+        f"({skipped_bytes / 1e6:.1f} MB, {skipped_share:.0f}% of file) in {elapsed:.2f}s, "
+        f"~{estimated_time_saved:.2f}s saved"
+    )
+    return data, stats
@@ -1,7 +1,14 @@
 """
 Utilities for handling Hebrew text in PDF reports.
+
+Shaped strings are memoized and the Hebrew font is resolved once per process
+(a failed registration is retried by the next report), so table-heavy reports do
+not re-layout the same cell text over and over.
 """
 import html
+import re
+import threading
+from functools import lru_cache
 from utils.logging_config import get_logger
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
@@ -9,6 +16,15 @@ import os
 
 logger = get_logger(__name__)
 
+# Hebrew block (letters, points and punctuation)
+_HEBREW_CHARS = re.compile('[\u0590-\u05FF]')
+
+# Distinct strings kept by the layout memo; report vocabularies are far smaller
+TEXT_LAYOUT_CACHE_SIZE = 4096
+
+_hebrew_font_name = None
+_hebrew_font_lock = threading.Lock()
+
 def register_hebrew_font():
     """
     Register a font that supports Hebrew characters for PDF generation.
@@ -42,6 +58,30 @@ def register_hebrew_font():
         logger.warning(f"Error registering Hebrew font: {e}")
         return 'Helvetica'
 
+@lru_cache(maxsize=TEXT_LAYOUT_CACHE_SIZE)
+def _layout_text(text: str) -> str:
+    """Shape one string for RTL display; memoized since report cells repeat heavily."""
+    normalized_text = text.strip()
+    
+    # For non-Hebrew text, just escape HTML entities
+    if not _HEBREW_CHARS.search(normalized_text):
+        return html.escape(normalized_text, quote=False)
+    
+    # Split by words: Hebrew words are reversed and their order is reversed for RTL
+    # reading; non-Hebrew words follow in their original order
+    hebrew_words = []
+    non_hebrew_words = []
+    for word in normalized_text.split():
+        if _HEBREW_CHARS.search(word):
+            hebrew_words.append(word[::-1])
+        else:
+            non_hebrew_words.append(word)
+    
+    reversed_hebrew = ' '.join(reversed(hebrew_words))
+    if non_hebrew_words:
+        return reversed_hebrew + ' ' + ' '.join(non_hebrew_words)
+    return reversed_hebrew
+
 def encode_hebrew_text(text):
     """
     Properly encode Hebrew text for PDF generation with Unicode support.
@@ -57,49 +97,8 @@ def encode_hebrew_text(text):
         return text
     
     try:
-        # Ensure proper Unicode encoding for Hebrew text
         if isinstance(text, str):
-            # Normalize the text and ensure proper Unicode encoding
-            normalized_text = text.strip()
-            
-            # Check if text contains Hebrew characters
-            contains_hebrew = any('\u0590' <= char <= '\u05FF' for char in normalized_text)
-            
-            if contains_hebrew:
-                # For Hebrew text, reverse the text for proper RTL display
-                try:
-                    # Split by words and reverse the order for RTL display
-                    words = normalized_text.split()
-                    hebrew_words = []
-                    non_hebrew_words = []
-                    
-                    for word in words:
-                        if any('\u0590' <= char <= '\u05FF' for char in word):
-                            # Hebrew word - reverse it
-                            hebrew_words.append(word[::-1])
-                        else:
-                            # Non-Hebrew word - keep as is
-                            non_hebrew_words.append(word)
-                    
-                    # If we have Hebrew words, reverse their order and combine
-                    if hebrew_words:
-                        # Reverse the order of Hebrew words for RTL reading
-                        reversed_hebrew = ' '.join(reversed(hebrew_words))
-                        if non_hebrew_words:
-                            # Combine with non-Hebrew words (non-Hebrew words stay in original order)
-                            encoded_text = reversed_hebrew + ' ' + ' '.join(non_hebrew_words)
-                        else:
-                            encoded_text = reversed_hebrew
-                    else:
-                        encoded_text = normalized_text
-                    
-                    return encoded_text.encode('utf-8').decode('utf-8')
-                except UnicodeError:
-                    # If encoding fails, escape the text
-                    return html.escape(normalized_text, quote=False)
-            else:
-                # For non-Hebrew text, just escape HTML entities
-                return html.escape(normalized_text, quote=False)
+            return _layout_text(text)
         
         return html.escape(str(text), quote=False)
         
@@ -114,19 +113,29 @@ def get_hebrew_font_name():
     """
     Get the name of the registered Hebrew font, registering it if needed.
     
+    Only a registered Hebrew font is cached; the Helvetica fallback is not, so a
+    long-lived process (the warm worker) retries the registration for later reports.
+    
     Returns:
         str: Font name to use for Hebrew text
     """
-    try:
-        # Check if HebrewFont is already registered
-        registered_fonts = pdfmetrics.getRegisteredFontNames()
-        if 'HebrewFont' in registered_fonts:
-            return 'HebrewFont'
-        else:
-            return register_hebrew_font()
-    except Exception as e:
-        logger.warning(f"Error getting Hebrew font: {e}")
-        return 'Helvetica'
+    global _hebrew_font_name
+    if _hebrew_font_name:
+        return _hebrew_font_name
+    
+    with _hebrew_font_lock:
+        if _hebrew_font_name:
+            return _hebrew_font_name
+        try:
+            # Check if HebrewFont is already registered
+            registered_fonts = pdfmetrics.getRegisteredFontNames()
+            font_name = 'HebrewFont' if 'HebrewFont' in registered_fonts else register_hebrew_font()
+            if font_name == 'HebrewFont':
+                _hebrew_font_name = font_name
+            return font_name
+        except Exception as e:
+            logger.warning(f"Error getting Hebrew font: {e}")
+            return 'Helvetica'
 
 def safe_format_header_text(project_name, run_id, timestamp, city_name, area_name, report_title, version="Alpha"):
     """
@@ -0,0 +1,320 @@
+"""
+Persistent job queue.
+Stores queued processing jobs in a local SQLite file shared by the GUI and the
+CLI, so a long batch survives an application restart. Jobs are claimed in
+priority order under a lease that the running worker renews; a job whose lease
+expired (the app crashed or was closed mid-job) goes back to pending. Completed
+stages (e.g. the EnergyPlus simulation) are recorded per job with their result
+and timing, so a resumed job can skip them, and the stage timings feed the
+throughput statistics.
+"""
+import json
+import os
+import platform
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+QUEUE_FILENAME = "job_queue.sqlite"
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+# Job kinds: which front end can run the job
+KIND_GUI = "gui"
+KIND_CLI = "cli"
+
+# A running job whose lease was not renewed for this long is considered interrupted
+LEASE_SECONDS = 120
+LEASE_RENEW_SECONDS = 30
+
+# Completed jobs used for the jobs/hour and stage time statistics
+STATS_WINDOW_JOBS = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    input_file TEXT NOT NULL,
+    output_dir TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    actual_output_dir TEXT,
+    error_message TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_next ON jobs (status, kind, priority DESC, id);
+CREATE TABLE IF NOT EXISTS job_stages (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    duration_s REAL,
+    result TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (job_id, stage)
+);
+"""
+
+
+def get_default_queue_path() -> str:
+    """Return the queue file in the application data directory (same directory as the license)."""
+    if platform.system() == "Windows":
+        app_data_dir = Path(os.getenv("APPDATA", os.path.expanduser("~"))) / "IDF Reader"
+    else:
+        app_data_dir = Path.home() / ".idf-reader"
+    return str(app_data_dir / QUEUE_FILENAME)
+
+
+class JobQueue:
+    """
+    Durable priority queue of processing jobs.
+
+    Every call opens its own short-lived connection, so one instance can be used
+    from the GUI thread, the queue worker and simulation threads, and several
+    processes (GUI and CLI) can share the same file.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or get_default_queue_path()
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = json.loads(row['payload'] or '{}')
+        job.update({key: row[key] for key in row.keys() if key != 'payload'})
+        return job
+
+    def enqueue(self, kind: str, input_file: str, output_dir: str,
+                options: Optional[Dict[str, Any]] = None, priority: int = 0) -> int:
+        """
+        Add a job.
+
+        Args:
+            kind: KIND_GUI or KIND_CLI (the front end that runs it)
+            input_file: IDF/epJSON model
+            output_dir: Base output directory
+            options: JSON-serializable job options, returned merged into the job dict
+            priority: Higher runs first; equal priorities run in insertion order
+
+        Returns:
+            The new job ID
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO jobs (kind, priority, input_file, output_dir, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, priority, input_file, output_dir, json.dumps(options or {}, ensure_ascii=False), time.time()))
+            return cursor.lastrowid
+
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def list_jobs(self, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Return the jobs (optionally of the given kinds) in insertion order."""
+        query = "SELECT * FROM jobs"
+        params = []
+        if kinds:
+            kinds = list(kinds)
+            query += f" WHERE kind IN ({', '.join('?' * len(kinds))})"
+            params = kinds
+        with self._connect() as connection:
+            return [self._to_job(row) for row in connection.execute(query + " ORDER BY id", params)]
+
+    def claim_next(self, kinds: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        Atomically mark the highest-priority pending job of the given kinds as running.
+
+        Returns:
+            The claimed job, or None if nothing is pending
+        """
+        kinds = list(kinds)
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                f"SELECT id FROM jobs WHERE status = ? AND kind IN ({', '.join('?' * len(kinds))}) "
+                "ORDER BY priority DESC, id LIMIT 1", (STATUS_PENDING, *kinds)).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, finished_at = NULL, error_message = NULL, "
+                "attempts = attempts + 1, worker = ?, lease_until = ? WHERE id = ?",
+                (STATUS_RUNNING, now, self.worker_id, now + LEASE_SECONDS, row['id']))
+            job = connection.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+        return self._to_job(job)
+
+    def recover_interrupted(self) -> int:
+        """
+        Return running jobs whose lease expired to pending, keeping their completed stages.
+
+        Returns:
+            Number of recovered jobs
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL "
+                "WHERE status = ? AND (lease_until IS NULL OR lease_until < ? OR worker = ?)",
+                (STATUS_PENDING, STATUS_RUNNING, time.time(), self.worker_id))
+            recovered = cursor.rowcount
+        if recovered:
+            logger.info(f"Recovered {recovered} interrupted jobs in {self.db_path}")
+        return recovered
+
+    @contextmanager
+    def lease(self, job_id: int):
+        """Keep renewing the job's lease on a background thread while the block runs."""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(LEASE_RENEW_SECONDS):
+                try:
+                    with self._connect() as connection:
+                        connection.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ?",
+                                           (time.time() + LEASE_SECONDS, job_id, self.worker_id))
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not renew lease of job {job_id}: {e}")
+
+        renewer = threading.Thread(target=renew, name=f"job-lease-{job_id}", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            stop.set()
+
+    def finish(self, job_id: int, success: bool, error_message: Optional[str] = None,
+               actual_output_dir: Optional[str] = None) -> None:
+        """Mark a running job completed or failed."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error_message = ?, lease_until = NULL, "
+                "actual_output_dir = COALESCE(?, actual_output_dir) WHERE id = ?",
+                (STATUS_COMPLETED if success else STATUS_FAILED, time.time(), error_message,
+                 actual_output_dir, job_id))
+
+    def release(self, job_id: int) -> None:
+        """Return a running job to pending (e.g. the queue was stopped mid-job); completed stages are kept."""
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL WHERE id = ? AND status = ?",
+                               (STATUS_PENDING, job_id, STATUS_RUNNING))
+
+    def set_output_dir(self, job_id: int, actual_output_dir: str) -> None:
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET actual_output_dir = ? WHERE id = ?", (actual_output_dir, job_id))
+
+    def set_priority(self, job_id: int, priority: int) -> None:
+        with self._connect() as connection:
+            connection.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, job_id))
+
+    def move_to_front(self, job_id: int) -> None:
+        """Give a job a priority above every other pending job."""
+        with self._connect() as connection:
+            top = connection.execute("SELECT MAX(priority) FROM jobs WHERE status = ?", (STATUS_PENDING,)).fetchone()[0]
+            connection.execute("UPDATE jobs SET priority = ? WHERE id = ?", ((top or 0) + 1, job_id))
+
+    def remove(self, job_id: int) -> bool:
+        """Delete a job unless it is running."""
+        with self._connect() as connection:
+            cursor = connection.execute("DELETE FROM jobs WHERE id = ? AND status != ?", (job_id, STATUS_RUNNING))
+            return cursor.rowcount > 0
+
+    def clear_finished(self, kinds: Optional[Iterable[str]] = None) -> int:
+        """Delete completed and failed jobs; stage timings of the deleted jobs are dropped as well."""
+        query = "DELETE FROM jobs WHERE status IN (?, ?)"
+        params = list(FINISHED_STATUSES)
+        if kinds:
+            kinds = list(kinds)
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params += kinds
+        with self._connect() as connection:
+            return connection.execute(query, params).rowcount
+
+    def start_stage(self, job_id: int, stage: str) -> None:
+        """Record that a stage started (replacing an earlier, unfinished attempt)."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO job_stages (job_id, stage, status, started_at) VALUES (?, ?, ?, ?)",
+                (job_id, stage, STATUS_RUNNING, time.time()))
+
+    def finish_stage(self, job_id: int, stage: str, success: bool = True,
+                     result: Optional[Dict[str, Any]] = None) -> None:
+        """Record a stage outcome; result is what a resumed job needs to skip the stage."""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE job_stages SET status = ?, finished_at = ?, duration_s = ? - started_at, result = ? "
+                "WHERE job_id = ? AND stage = ?",
+                (STATUS_COMPLETED if success else STATUS_FAILED, now, now,
+                 json.dumps(result or {}, ensure_ascii=False), job_id, stage))
+
+    def get_completed_stage(self, job_id: int, stage: str) -> Optional[Dict[str, Any]]:
+        """Return the result of a completed stage, or None if the stage has to run."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT result FROM job_stages WHERE job_id = ? AND stage = ? AND status = ?",
+                                     (job_id, stage, STATUS_COMPLETED)).fetchone()
+        return json.loads(row['result']) if row else None
+
+    def get_stats(self, kinds: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Queue statistics.
+
+        Returns:
+            Dict with 'counts' per status, 'jobs_per_hour' over the last
+            STATS_WINDOW_JOBS finished jobs (None before two jobs finished) and
+            'average_stage_s' per stage
+        """
+        jobs = self.list_jobs(kinds)
+        counts = {status: 0 for status in (STATUS_PENDING, STATUS_RUNNING, STATUS_COMPLETED, STATUS_FAILED)}
+        for job in jobs:
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+
+        finished = sorted((job for job in jobs if job['status'] == STATUS_COMPLETED and job['finished_at']),
+                          key=lambda job: job['finished_at'])[-STATS_WINDOW_JOBS:]
+        jobs_per_hour = None
+        if len(finished) >= 2:
+            span_s = finished[-1]['finished_at'] - min(job['started_at'] or job['finished_at'] for job in finished)
+            if span_s > 0:
+                jobs_per_hour = round(len(finished) * 3600 / span_s, 2)
+
+        average_stage_s = {}
+        job_ids = [job['id'] for job in finished]
+        if job_ids:
+            with self._connect() as connection:
+                rows = connection.execute(
+                    f"SELECT stage, AVG(duration_s) AS average_s FROM job_stages "
+                    f"WHERE status = ? AND job_id IN ({', '.join('?' * len(job_ids))}) GROUP BY stage",
+                    (STATUS_COMPLETED, *job_ids)).fetchall()
+            average_stage_s = {row['stage']: round(row['average_s'], 1) for row in rows}
+
+        return {'counts': counts, 'jobs_per_hour': jobs_per_hour, 'average_stage_s': average_stage_s}
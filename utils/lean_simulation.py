@@ -0,0 +1,298 @@
+"""
+Lean simulation profile.
+Rewrites the simulation copy of a model so EnergyPlus only produces what the
+parsers read: the Zone Summary and envelope tables in eplustbl.csv and the
+RunPeriod energy rating variables in eplusout.csv. User models often carry
+hundreds of Output:Variable/Output:Meter requests (and repeated injections of
+our own variables), all HTML tables and timestep reports, which slow down the
+simulation and inflate eplusout.csv. The user's model is never modified.
+
+The simulation copy can also request Output:SQLite, so the parsers read the
+tables and variables from eplusout.sql instead of scanning the CSV files (see
+parsers.eplussql_reader).
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Tabular reports the parsers read: Zone Summary (eplustbl_reader) is part of the
+# input verification report; Opaque Exterior/Interior and Exterior Fenestration
+# (construction areas, glazing) are part of the envelope summary
+LEAN_SUMMARY_REPORTS = ("InputVerificationandResultsSummary", "EnvelopeSummary")
+
+# eplustbl.csv only; the HTML copy of the tables is not read
+LEAN_TABLE_COLUMN_SEPARATOR = "Comma"
+
+# The Output:Variable requests the energy rating parser reads from eplusout.csv
+REQUIRED_OUTPUT_VARIABLES = (
+    "Zone Ideal Loads Supply Air Total Cooling Energy",
+    "Zone Ideal Loads Supply Air Total Heating Energy",
+    "Lights Electricity Energy",
+)
+REQUIRED_REPORTING_FREQUENCY = "RunPeriod"
+
+# Tabular reports and variables are written to eplusout.sql as well; eplustbl.csv is
+# still written and stays the fallback
+SQLITE_OPTION_TYPE = "SimpleAndTabular"
+
+# Output objects no parser reads; removed from the simulation copy. Output:SQLite is
+# added back with SQLITE_OPTION_TYPE when SQLite ingestion is enabled
+STRIPPED_OBJECT_TYPES = (
+    "Output:Meter",
+    "Output:Meter:MeterFileOnly",
+    "Output:Meter:Cumulative",
+    "Output:Meter:Cumulative:MeterFileOnly",
+    "Output:Table:Monthly",
+    "Output:Table:Annual",
+    "Output:Table:TimeBins",
+    "Output:IlluminanceMap",
+    "Output:VariableDictionary",
+    "Output:Surfaces:List",
+    "Output:Surfaces:Drawing",
+    "Output:Constructions",
+    "Output:Schedules",
+    "Output:EnergyManagementSystem",
+    "Output:EnvironmentalImpactFactors",
+    "Output:DebuggingData",
+    "Output:SQLite",
+    "Output:JSON",
+)
+
+_STRIPPED_TYPES_BY_KEY = {object_type.lower(): object_type for object_type in STRIPPED_OBJECT_TYPES}
+_REQUIRED_VARIABLE_KEYS = {name.lower() for name in REQUIRED_OUTPUT_VARIABLES}
+
+# Comments, field separators and field text of an IDF file
+_IDF_TOKEN = re.compile(r'!.*|[,;]|[^!,;]+')
+
+
+@dataclass
+class LeanProfileStats:
+    """What the lean profile removed from one simulation input."""
+    removed: Dict[str, int] = field(default_factory=dict)
+    removed_reports: List[str] = field(default_factory=list)
+    original_bytes: int = 0
+    lean_bytes: int = 0
+
+    def count(self, object_type: str, amount: int = 1) -> None:
+        if amount:
+            self.removed[object_type] = self.removed.get(object_type, 0) + amount
+
+    @property
+    def total_removed(self) -> int:
+        return sum(self.removed.values())
+
+    def summary(self) -> str:
+        """One-line description for the log and status bar."""
+        removed = ", ".join(f"{object_type}: {count}" for object_type, count in
+                            sorted(self.removed.items(), key=lambda item: -item[1]))
+        text = f"Lean simulation profile removed {self.total_removed} output objects"
+        if removed:
+            text += f" ({removed})"
+        if self.removed_reports:
+            text += f" and {len(self.removed_reports)} summary reports"
+        if self.original_bytes:
+            text += f"; input {self.original_bytes / 1024:.0f} KB -> {self.lean_bytes / 1024:.0f} KB"
+        return text
+
+
+def _is_required_variable(variable_name: Any, reporting_frequency: Any) -> bool:
+    return (str(variable_name or '').strip().lower() in _REQUIRED_VARIABLE_KEYS and
+            str(reporting_frequency or '').strip().lower() == REQUIRED_REPORTING_FREQUENCY.lower())
+
+
+def _split_idf_objects(content: str) -> Tuple[List[Tuple[str, List[str]]], str]:
+    """
+    Split IDF text into objects.
+
+    Returns:
+        ([(raw text including the preceding comments and whitespace, field values)], trailing text)
+    """
+    objects = []
+    fields = []
+    field_parts = []
+    start = 0
+    for match in _IDF_TOKEN.finditer(content):
+        token = match.group()
+        if token[0] == '!':
+            continue
+        if token == ',' or token == ';':
+            fields.append(''.join(field_parts).strip())
+            field_parts = []
+            if token == ';':
+                objects.append((content[start:match.end()], fields))
+                fields = []
+                start = match.end()
+        else:
+            field_parts.append(token)
+    return objects, content[start:]
+
+
+def make_lean_idf(content: str) -> Tuple[str, LeanProfileStats]:
+    """
+    Apply the lean profile to IDF text.
+
+    Keeps one Output:Variable per required variable at RunPeriod frequency, drops
+    the object types in STRIPPED_OBJECT_TYPES and replaces the summary reports and
+    table style. The required variables that were not present are not added; use
+    the regular output variable injection for that.
+
+    Returns:
+        (lean IDF text, stats)
+    """
+    stats = LeanProfileStats(original_bytes=len(content.encode('utf-8')))
+    kept = []
+    seen_variables = set()
+    unit_conversion = ""
+
+    objects, trailing_text = _split_idf_objects(content)
+    for raw_text, fields in objects:
+        object_key = fields[0].lower() if fields else ''
+        if object_key == 'output:variable':
+            key_value = fields[1] if len(fields) > 1 else '*'
+            variable_name = fields[2] if len(fields) > 2 else ''
+            frequency = fields[3] if len(fields) > 3 else ''
+            variable_key = (key_value.lower(), variable_name.lower())
+            if _is_required_variable(variable_name, frequency) and variable_key not in seen_variables:
+                seen_variables.add(variable_key)
+                kept.append(raw_text)
+            else:
+                stats.count("Output:Variable")
+        elif object_key in _STRIPPED_TYPES_BY_KEY:
+            stats.count(_STRIPPED_TYPES_BY_KEY[object_key])
+        elif object_key == 'output:table:summaryreports':
+            stats.removed_reports.extend(report for report in fields[1:]
+                                         if report and report not in LEAN_SUMMARY_REPORTS)
+        elif object_key == 'outputcontrol:table:style':
+            unit_conversion = fields[2] if len(fields) > 2 else ""
+        else:
+            kept.append(raw_text)
+
+    report_lines = [f"    {report}{';' if index == len(LEAN_SUMMARY_REPORTS) else ','}    !- Report {index} Name"
+                    for index, report in enumerate(LEAN_SUMMARY_REPORTS, start=1)]
+    style_lines = [f"    {LEAN_TABLE_COLUMN_SEPARATOR}{',' if unit_conversion else ';'}    !- Column Separator"]
+    if unit_conversion:
+        style_lines.append(f"    {unit_conversion};    !- Unit Conversion")
+    lean_outputs = "\n".join([
+        "",
+        "! Lean simulation profile: only the tables the reports read",
+        "Output:Table:SummaryReports,",
+        *report_lines,
+        "",
+        "OutputControl:Table:Style,",
+        *style_lines,
+        "",
+    ])
+
+    lean_content = ''.join(kept) + trailing_text.rstrip() + "\n" + lean_outputs
+    stats.lean_bytes = len(lean_content.encode('utf-8'))
+    return lean_content, stats
+
+
+def make_lean_epjson(epjson_data: Dict[str, Any]) -> Tuple[Dict[str, Any], LeanProfileStats]:
+    """
+    Apply the lean profile to an epJSON model.
+
+    epjson_data is not modified; the result shares every section it does not change.
+
+    Returns:
+        (lean epJSON, stats)
+    """
+    stats = LeanProfileStats()
+    lean_data = dict(epjson_data)
+
+    for object_type in STRIPPED_OBJECT_TYPES:
+        stats.count(object_type, len(lean_data.pop(object_type, None) or {}))
+
+    variables = {}
+    seen_variables = set()
+    for name, variable in (epjson_data.get('Output:Variable') or {}).items():
+        variable_key = (str(variable.get('key_value', '*')).lower(), str(variable.get('variable_name', '')).lower())
+        if (_is_required_variable(variable.get('variable_name'), variable.get('reporting_frequency')) and
+                variable_key not in seen_variables):
+            seen_variables.add(variable_key)
+            variables[name] = variable
+        else:
+            stats.count("Output:Variable")
+    lean_data['Output:Variable'] = variables
+
+    for summary_reports in (epjson_data.get('Output:Table:SummaryReports') or {}).values():
+        stats.removed_reports.extend(report.get('report_name') for report in summary_reports.get('reports', [])
+                                     if report.get('report_name') not in LEAN_SUMMARY_REPORTS)
+    lean_data['Output:Table:SummaryReports'] = {
+        'Output:Table:SummaryReports 1': {'reports': [{'report_name': report} for report in LEAN_SUMMARY_REPORTS]}
+    }
+
+    table_style = {'column_separator': LEAN_TABLE_COLUMN_SEPARATOR}
+    for style in (epjson_data.get('OutputControl:Table:Style') or {}).values():
+        if style.get('unit_conversion'):
+            table_style['unit_conversion'] = style['unit_conversion']
+    lean_data['OutputControl:Table:Style'] = {'OutputControl:Table:Style 1': table_style}
+    return lean_data, stats
+
+
+def add_sqlite_output_idf(content: str) -> str:
+    """Replace any Output:SQLite object in IDF text with one that also writes the tabular reports."""
+    objects, trailing_text = _split_idf_objects(content)
+    kept = [raw_text for raw_text, fields in objects if not fields or fields[0].lower() != 'output:sqlite']
+    return ''.join(kept) + trailing_text.rstrip() + "\n" + "\n".join([
+        "",
+        "! SQLite output for the simulation result readers",
+        "Output:SQLite,",
+        f"    {SQLITE_OPTION_TYPE};    !- Option Type",
+        "",
+    ])
+
+
+def add_sqlite_output_epjson(epjson_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a shallow copy of an epJSON model that requests Output:SQLite with the tabular reports."""
+    sqlite_data = dict(epjson_data)
+    sqlite_data['Output:SQLite'] = {'Output:SQLite 1': {'option_type': SQLITE_OPTION_TYPE}}
+    return sqlite_data
+
+
+def write_simulation_copy(input_file: str, output_path: str, lean: bool = True,
+                          sqlite_output: bool = False) -> Optional[LeanProfileStats]:
+    """
+    Write the simulation copy of an IDF or epJSON model and log what the lean profile removed.
+
+    Args:
+        input_file: Source model, already carrying the energy rating output variables
+        output_path: Where to write the copy
+        lean: Apply the lean profile
+        sqlite_output: Request Output:SQLite with the tabular reports
+
+    Returns:
+        Stats of the removed outputs, or None without the lean profile
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    stats = None
+    if input_file.lower().endswith('.epjson'):
+        from utils.epjson_handler import EPJSONHandler
+        handler = EPJSONHandler()
+        epjson_data = handler.load_epjson(input_file)
+        if lean:
+            epjson_data, stats = make_lean_epjson(epjson_data)
+            handler.ensure_output_variables(epjson_data)
+        if sqlite_output:
+            epjson_data = add_sqlite_output_epjson(epjson_data)
+        handler.save_epjson(epjson_data, output_path)
+        if stats:
+            stats.original_bytes = os.path.getsize(input_file)
+            stats.lean_bytes = os.path.getsize(output_path)
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if lean:
+            content, stats = make_lean_idf(content)
+        if sqlite_output:
+            content = add_sqlite_output_idf(content)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    if stats:
+        logger.info(f"{stats.summary()} [{os.path.basename(input_file)}]")
+    return stats
@@ -1,48 +1,274 @@
 """
 Centralized logging configuration for the IDF Reader application.
 All modules should import and use this configuration to ensure consistent file-based logging.
+
+Records are not written on the thread that logs them: the root logger only puts
+them on a queue, and a QueueListener thread writes them to a log file of the
+process (logs/idf-reader-<start time>-<pid>.log), which is rotated by size with
+the rotated files gzip-compressed. Every process has its own file since the GUI,
+--run-queue, the warm worker and process pool children run side by side and
+rotation is not safe across processes. While a queued
+job runs (job_logging), its records are also written to a log file in the job's
+output folder. Set IDF_READER_LOG_FORMAT=json for one JSON object per line.
 """
+import atexit
+import copy
+import gzip
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
+LOG_DIR = "logs"
+LOG_FILENAME_PREFIX = "idf-reader-"
+MAX_LOG_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# Log files of earlier processes are deleted after this many days without writes
+LOG_RETENTION_DAYS = 14
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_log_queue = queue.Queue(-1)
+_listener = None
+_job_context = threading.local()
+_active_jobs = {}  # job_id -> handler of the job's log file, while the job runs
+_job_handlers = {}  # job_id -> handler, until the listener has written the job's queued records
+_jobs_lock = threading.Lock()
+_traceback_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'job_id', None) is not None:
+            entry['job_id'] = record.job_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _JobQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that tags records with the job they belong to."""
+
+    def prepare(self, record):
+        # Like QueueHandler.prepare, but the traceback stays apart from the message for the JSON format
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if not hasattr(record, 'job_id'):
+            record.job_id = _current_job_id()
+        return record
+
+
+class _JobRoutingHandler(logging.Handler):
+    """Listener-side handler writing records to the log file of their job."""
+
+    def handle(self, record):
+        closing = getattr(record, 'close_job_handler', None)
+        if closing is not None:
+            with _jobs_lock:
+                if _job_handlers.get(record.closed_job_id) is closing:
+                    del _job_handlers[record.closed_job_id]
+            closing.close()
+            return True
+        with _jobs_lock:
+            handler = _job_handlers.get(getattr(record, 'job_id', None))
+        if handler is not None and record.levelno >= handler.level:
+            handler.handle(record)
+        return True
+
+    def emit(self, record):
+        pass
+
+
+def _is_log_record(record):
+    """Filter out the listener's control records."""
+    return not hasattr(record, 'close_job_handler')
+
+
+def _current_job_id():
+    """Job of the logging thread, or the only running job for threads started by it."""
+    job_id = getattr(_job_context, 'job_id', None)
+    if job_id is not None:
+        return job_id
+    with _jobs_lock:
+        if len(_active_jobs) == 1:
+            return next(iter(_active_jobs))
+    return None
+
+
+def _gzip_namer(name):
+    return name + ".gz"
+
+
+def _gzip_rotator(source, destination):
+    with open(source, 'rb') as source_file, gzip.open(destination, 'wb') as destination_file:
+        shutil.copyfileobj(source_file, destination_file)
+    os.remove(source)
+
+
+def _remove_old_logs(current_log):
+    """Delete log files of earlier processes that were not written for LOG_RETENTION_DAYS."""
+    cutoff = time.time() - LOG_RETENTION_DAYS * 24 * 3600
+    for name in os.listdir(LOG_DIR):
+        path = os.path.join(LOG_DIR, name)
+        if not name.startswith(LOG_FILENAME_PREFIX) or path.startswith(current_log):
+            continue
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _create_formatter():
+    if os.getenv('IDF_READER_LOG_FORMAT', '').lower() == 'json':
+        return JsonFormatter()
+    return logging.Formatter(LOG_FORMAT)
+
+
 def setup_file_logging():
     """
     Sets up file-based logging configuration.
-    Creates logs directory and configures all loggers to write to timestamped log files.
+    Creates logs directory and routes all loggers through a queue to a rotating log file.
     """
+    global _listener
+
     # Create logs directory if it doesn't exist
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-
-    # Create log filename with timestamp
-    log_filename = os.path.join(log_dir, f"debug_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-
-    # Configure root logger to write to file only (no console output)
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename, encoding='utf-8'),
-        ],
-        force=True  # Override any existing configuration
+    if not os.path.exists(LOG_DIR):
+        os.makedirs(LOG_DIR)
+    # One file per process: RotatingFileHandler cannot rotate a file other processes write to
+    log_filename = os.path.join(
+        LOG_DIR, f"{LOG_FILENAME_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}-{os.getpid()}.log")
+    _remove_old_logs(log_filename)
+
+    # Rotated files are named <log file>.1.gz ... <log file>.<LOG_BACKUP_COUNT>.gz
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_filename, maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+    )
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(_create_formatter())
+    file_handler.addFilter(_is_log_record)
+
+    shutdown_logging()
+    _listener = logging.handlers.QueueListener(
+        _log_queue, file_handler, _JobRoutingHandler(), respect_handler_level=True
     )
+    _listener.start()
+
+    # Configure root logger to write to the queue only (no console output)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:  # Override any existing configuration
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_JobQueueHandler(_log_queue))
+    root.setLevel(logging.INFO)
 
     return log_filename
 
+
+def shutdown_logging():
+    """Write the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def start_job_logging(job_id, output_dir, file_name=None):
+    """
+    Also write the records logged during a job to a file in its output folder.
+
+    Records are attributed to the job when they are logged on a thread inside
+    job_logging, or on any thread while it is the only running job.
+
+    Args:
+        job_id: Queue job ID
+        output_dir: The job's output folder
+        file_name: Log file name (default job-<job_id>.log)
+
+    Returns:
+        Path of the job log file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    log_path = os.path.join(output_dir, file_name or f"job-{job_id}.log")
+    handler = logging.FileHandler(log_path, encoding='utf-8', delay=True)
+    handler.setFormatter(_create_formatter())
+    with _jobs_lock:
+        previous = _active_jobs.get(job_id)
+        _active_jobs[job_id] = handler
+        _job_handlers[job_id] = handler
+    if previous is not None:
+        _close_job_handler(job_id, previous)
+    return log_path
+
+
+def stop_job_logging(job_id):
+    """Stop writing to the job's log file once the records already queued are written."""
+    with _jobs_lock:
+        handler = _active_jobs.pop(job_id, None)
+    if handler is not None:
+        _close_job_handler(job_id, handler)
+
+
+def _close_job_handler(job_id, handler):
+    # Closed by the listener thread after the job's queued records, or right away without a listener
+    record = logging.makeLogRecord({'levelno': logging.NOTSET, 'levelname': 'NOTSET', 'msg': '',
+                                    'close_job_handler': handler, 'closed_job_id': job_id, 'job_id': None})
+    if _listener is None:
+        _JobRoutingHandler().handle(record)
+        return
+    _log_queue.put_nowait(record)
+
+
+@contextmanager
+def job_logging(job_id, output_dir, file_name=None):
+    """Context manager for start_job_logging/stop_job_logging on the calling thread."""
+    previous_job = getattr(_job_context, 'job_id', None)
+    log_path = start_job_logging(job_id, output_dir, file_name)
+    _job_context.job_id = job_id
+    try:
+        yield log_path
+    finally:
+        _job_context.job_id = previous_job
+        stop_job_logging(job_id)
+
+
 def get_logger(name):
     """
     Get a logger instance with the specified name.
     The logger will automatically use the file-based configuration.
-    
+
     Args:
         name: Logger name (typically __name__)
-        
+
     Returns:
         Logger instance
     """
     return logging.getLogger(name)
 
 # Initialize file logging on module import
-_log_file = setup_file_logging()
\ No newline at end of file
+_log_file = setup_file_logging()
+atexit.register(shutdown_logging)
@@ -1,11 +1,17 @@
 """
 Utility functions for handling file paths in both development and bundled (PyInstaller) environments.
 Includes support for Unicode/Hebrew characters in paths.
+
+Files are staged for EnergyPlus without copying where possible: inputs are hard-linked
+(or symlinked) to an ASCII-safe path, and outputs are written to an ASCII-safe folder on
+the same filesystem as their destination, so moving them back is a rename. Data is only
+copied across devices; StagingStats counts the bytes copied versus linked per job.
 """
 import os
 import sys
 import tempfile
 import shutil
+import threading
 from utils.logging_config import get_logger
 from pathlib import Path
 
@@ -125,14 +131,137 @@ def contains_non_ascii(path_str):
     except UnicodeEncodeError:
         return True
 
-def create_safe_path_for_energyplus(original_path, temp_dir=None):
+class StagingStats:
+    """Files and bytes a job staged by linking or renaming versus by copying."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files_linked = 0
+        self.bytes_linked = 0
+        self.files_copied = 0
+        self.bytes_copied = 0
+    
+    def record(self, size, linked):
+        with self._lock:
+            if linked:
+                self.files_linked += 1
+                self.bytes_linked += size
+            else:
+                self.files_copied += 1
+                self.bytes_copied += size
+    
+    def as_dict(self):
+        with self._lock:
+            return {
+                'files_linked': self.files_linked,
+                'bytes_linked': self.bytes_linked,
+                'files_copied': self.files_copied,
+                'bytes_copied': self.bytes_copied,
+            }
+    
+    def __str__(self):
+        return (f"{self.files_linked} files linked/renamed ({self.bytes_linked / 1048576:.1f} MB), "
+                f"{self.files_copied} copied ({self.bytes_copied / 1048576:.1f} MB)")
+
+def stage_file(source, destination, stats=None, link=True):
+    """
+    Make source available at destination without copying its data where possible.
+    
+    Tries a hard link (same filesystem), then a symbolic link (may need privileges on
+    Windows), and copies only when neither works. The staged file must be treated as
+    read-only: a hard link shares its data with the source. With link=False the file is
+    always copied, for snapshots that must not follow later in-place edits of the source.
+    
+    Returns:
+        str: 'hardlink', 'symlink' or 'copy'
+    """
+    size = os.path.getsize(source)
+    method = 'copy'
+    if link:
+        for method, make_link in (('hardlink', os.link), ('symlink', os.symlink)):
+            try:
+                make_link(os.path.abspath(source), destination)
+                break
+            except (OSError, NotImplementedError):
+                method = 'copy'
+    if method == 'copy':
+        shutil.copy2(source, destination)
+    if stats is not None:
+        stats.record(size, linked=method != 'copy')
+    logger.debug(f"Staged {source} -> {destination} ({method}, {size} bytes)")
+    return method
+
+def move_file(source, destination, stats=None):
+    """
+    Move a file by renaming it, copying (and deleting the source) only across devices.
+    
+    Returns:
+        bool: True if the file was renamed, False if it had to be copied
+    """
+    size = os.path.getsize(source)
+    try:
+        os.replace(source, destination)
+        renamed = True
+    except OSError:
+        shutil.copy2(source, destination)
+        os.remove(source)
+        renamed = False
+    if stats is not None:
+        stats.record(size, linked=renamed)
+    return renamed
+
+def _existing_ancestor(path):
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def _same_device(path_a, path_b):
+    try:
+        return os.stat(_existing_ancestor(path_a)).st_dev == os.stat(_existing_ancestor(path_b)).st_dev
+    except OSError:
+        return False
+
+def make_staging_dir(near_path, prefix):
+    """
+    Create an ASCII-only temporary directory on the same filesystem as near_path.
+    
+    The system temp directory is used when it is on that filesystem (and ASCII-only);
+    otherwise the nearest ASCII-only existing ancestor of near_path, so files can be
+    linked or renamed between the two. Falls back to the system temp directory.
+    """
+    system_temp = tempfile.gettempdir()
+    if not contains_non_ascii(system_temp) and _same_device(system_temp, near_path):
+        return tempfile.mkdtemp(prefix=prefix)
+    
+    candidate = _existing_ancestor(near_path)
+    if os.path.isfile(candidate):
+        candidate = os.path.dirname(candidate)
+    while contains_non_ascii(candidate):
+        parent = os.path.dirname(candidate)
+        if parent == candidate:
+            break
+        candidate = parent
+    if not contains_non_ascii(candidate):
+        try:
+            return tempfile.mkdtemp(prefix=prefix, dir=candidate)
+        except OSError as e:
+            logger.debug(f"Cannot create staging directory in {candidate}: {e}")
+    return tempfile.mkdtemp(prefix=prefix)
+
+def create_safe_path_for_energyplus(original_path, temp_dir=None, stats=None):
     """
     Create a safe ASCII-only path for EnergyPlus compatibility.
     EnergyPlus has issues with Unicode/Hebrew characters in file paths.
+    The file is staged with stage_file (linked where possible, copied otherwise).
     
     Args:
         original_path: The original path that may contain Unicode characters
         temp_dir: Optional temporary directory to use
+        stats: Optional StagingStats to count the staged bytes in
         
     Returns:
         tuple: (safe_path, cleanup_function)
@@ -143,11 +272,11 @@ def create_safe_path_for_energyplus(original_path, temp_dir=None):
         # Path is already ASCII-safe
         return original_path, None
     
-    logger.info(f"Creating ASCII-safe copy for Unicode path: {original_path}")
+    logger.info(f"Staging ASCII-safe path for Unicode path: {original_path}")
     
-    # Create a temporary ASCII-safe copy
+    # Create a temporary ASCII-safe directory on the source's filesystem so the file can be hard-linked
     if temp_dir is None:
-        temp_dir = tempfile.mkdtemp(prefix="eplus_safe_")
+        temp_dir = make_staging_dir(original_path, "eplus_safe_")
     
     # Create a safe filename using only ASCII characters
     original_name = os.path.basename(original_path)
@@ -157,16 +286,15 @@ def create_safe_path_for_energyplus(original_path, temp_dir=None):
     safe_path = os.path.join(temp_dir, safe_name)
     
     try:
-        # Copy the file to the safe location with proper encoding handling
-        shutil.copy2(original_path, safe_path)
-        logger.info(f"Created ASCII-safe copy at: {safe_path}")
+        method = stage_file(original_path, safe_path, stats)
+        logger.info(f"Staged ASCII-safe {method} at: {safe_path}")
     except (OSError, IOError) as e:
         logger.error(f"Failed to create safe copy of {original_path}: {e}")
         raise
     
     def cleanup():
         try:
-            if os.path.exists(safe_path):
+            if os.path.lexists(safe_path):
                 os.remove(safe_path)
                 logger.debug(f"Cleaned up temporary file: {safe_path}")
             if os.path.exists(temp_dir) and not os.listdir(temp_dir):
@@ -179,7 +307,8 @@ def create_safe_path_for_energyplus(original_path, temp_dir=None):
 
 def create_safe_output_dir_for_energyplus(original_output_dir):
     """
-    Create a safe ASCII-only output directory for EnergyPlus.
+    Create a safe ASCII-only output directory for EnergyPlus, on the same filesystem as
+    the original directory where possible so move_simulation_files_back only renames.
     
     Args:
         original_output_dir: The original output directory that may contain Unicode
@@ -196,18 +325,20 @@ def create_safe_output_dir_for_energyplus(original_output_dir):
     logger.info(f"Creating ASCII-safe output directory for Unicode path: {original_output_dir}")
     
     # Create a temporary ASCII-safe directory
-    temp_dir = tempfile.mkdtemp(prefix="eplus_output_")
+    temp_dir = make_staging_dir(original_output_dir, "eplus_output_")
     logger.info(f"Created temporary ASCII-safe output directory: {temp_dir}")
     
     return temp_dir, True
 
-def move_simulation_files_back(temp_output_dir, original_output_dir):
+def move_simulation_files_back(temp_output_dir, original_output_dir, stats=None):
     """
     Move simulation output files from temporary ASCII directory back to original Unicode directory.
+    Files are renamed; they are copied only if the directories are on different devices.
     
     Args:
         temp_output_dir: Temporary ASCII-safe directory containing simulation outputs
         original_output_dir: Original Unicode directory where files should be moved
+        stats: Optional StagingStats to count the moved bytes in
         
     Returns:
         bool: True if successful, False otherwise
@@ -224,7 +355,7 @@ def move_simulation_files_back(temp_output_dir, original_output_dir):
             src = os.path.join(temp_output_dir, filename)
             dst = os.path.join(original_output_dir, filename)
             if os.path.isfile(src):
-                shutil.move(src, dst)
+                move_file(src, dst, stats)
                 moved_files.append(filename)
                 logger.debug(f"Moved file: {filename}")
         
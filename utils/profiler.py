@@ -0,0 +1,391 @@
+"""
+Per-stage run profiler for the IDF processing pipeline.
+Records wall time, CPU time, peak traced memory and process RSS for each
+named stage (file loading, DataLoader caching, parsers, report generators,
+EnergyPlus) and writes a timings.json summary next to the generated reports.
+tracemalloc has a single process-wide peak, so stages that overlap with a stage
+on another thread (pipelined EnergyPlus, the Excel export, sweep workers) are
+recorded without peak memory and marked with mem_overlapped instead.
+Stages are also spans of the run's Tracer (utils.tracing), with or without
+profiling, which write_trace exports as trace.json.
+"""
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from utils.logging_config import get_logger
+from utils.tracing import Tracer
+
+logger = get_logger(__name__)
+
+TIMINGS_FILENAME = "timings.json"
+CPROFILE_FILENAME = "slowest-stage.prof"
+
+# Stages measuring memory right now, in every profiler of the process
+_memory_lock = threading.Lock()
+_open_memory_frames: List[Dict[str, Any]] = []
+
+
+def get_process_memory() -> Tuple[Optional[int], Optional[int]]:
+    """
+    Get the current and peak resident set size of this process.
+
+    The peak is the process-wide high-water mark, so for a stage it is the
+    highest RSS reached at any point up to the end of that stage.
+
+    Returns:
+        Tuple of (rss_bytes, peak_rss_bytes); either may be None when the
+        platform does not expose it
+    """
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+            get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if get_memory_info(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize, counters.PeakWorkingSetSize
+            return None, None
+
+        if os.path.exists('/proc/self/status'):
+            rss = peak = None
+            with open('/proc/self/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        rss = int(line.split()[1]) * 1024
+                    elif line.startswith('VmHWM:'):
+                        peak = int(line.split()[1]) * 1024
+            return rss, peak
+
+        import resource
+        # ru_maxrss is reported in bytes on macOS
+        return None, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return None, None
+
+
+class NullProfiler:
+    """No-op profiler used when profiling is disabled, so callers never need to branch."""
+
+    enabled = False
+
+    def __init__(self, tracer: Optional[Tracer] = None):
+        self.tracer = tracer or Tracer()
+
+    def stage(self, name: str, category: str = "stage"):
+        """Return a context manager that only records a tracing span."""
+        return self.tracer.span(name, category)
+
+    def start(self) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+    def write_report(self, output_dir: str, **metadata) -> Optional[str]:
+        return None
+
+    def write_trace(self, output_dir: str, **metadata) -> Optional[str]:
+        """Write the run's spans to trace.json in output_dir."""
+        return self.tracer.write(output_dir, **metadata)
+
+
+class RunProfiler:
+    """
+    Collects per-stage timing and memory measurements for a single processing run.
+
+    Stages are opened with the stage() context manager and may be nested
+    (e.g. each DataLoader._cache_* call inside the "load" stage). Nesting is
+    tracked per thread, so stages opened from worker threads are recorded with
+    the correct parent.
+    """
+
+    enabled = True
+
+    def __init__(self, track_memory: bool = True, capture_cprofile: bool = False, tracer: Optional[Tracer] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            track_memory: Record peak traced memory per stage using tracemalloc.
+            capture_cprofile: Run cProfile on every top-level stage and keep the
+                              dump of the slowest one.
+            tracer: Tracer receiving a span per stage (a new one by default)
+        """
+        self.tracer = tracer or Tracer()
+        self.track_memory = track_memory
+        self.capture_cprofile = capture_cprofile
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._run_start_wall = None
+        self._run_start_cpu = None
+        self._run_end_wall = None
+        self._run_end_cpu = None
+        self._started_at = None
+        self._slowest_profile = None
+        self._slowest_profile_stage = None
+        self._slowest_profile_wall = -1.0
+        self._profile_active = False
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        """Get the open-stage stack for the calling thread."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def start(self) -> None:
+        """Start the run clock and memory tracing. Called implicitly by the first stage."""
+        if self._run_start_wall is not None:
+            return
+        self._started_at = datetime.now().isoformat(timespec='seconds')
+        self._run_start_wall = time.perf_counter()
+        self._run_start_cpu = time.process_time()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def finish(self) -> None:
+        """Stop the run clock and memory tracing."""
+        if self._run_start_wall is None or self._run_end_wall is not None:
+            return
+        self._run_end_wall = time.perf_counter()
+        self._run_end_cpu = time.process_time()
+        if self._started_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str, category: str = "stage"):
+        """
+        Measure a named pipeline stage.
+
+        Args:
+            name: Stage name shown in timings.json (e.g. "parse:materials")
+            category: Stage group such as "load", "cache", "parser", "report" or "simulation"
+        """
+        with self.tracer.span(name, category), self._measure(name, category):
+            yield
+
+    @contextmanager
+    def _measure(self, name: str, category: str):
+        """Record the timing and memory of one stage."""
+        self.start()
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        tracing = self.track_memory and tracemalloc.is_tracing()
+
+        frame = {'name': name, 'running_peak': 0, 'thread': threading.get_ident(), 'overlapped': False}
+        if tracing:
+            with _memory_lock:
+                # Resetting the peak below invalidates the peaks of stages open on other threads
+                others = [f for f in _open_memory_frames if f['thread'] != frame['thread']]
+                for other in others:
+                    other['overlapped'] = True
+                frame['overlapped'] = bool(others)
+                current, peak_so_far = tracemalloc.get_traced_memory()
+                if parent is not None:
+                    parent['running_peak'] = max(parent['running_peak'], peak_so_far)
+                tracemalloc.reset_peak()
+                frame['mem_start'] = current
+                _open_memory_frames.append(frame)
+
+        profile = None
+        if self.capture_cprofile and parent is None:
+            # Only one cProfile can be active per process, so concurrent
+            # top-level stages from other threads are timed but not profiled
+            with self._lock:
+                if not self._profile_active:
+                    self._profile_active = True
+                    profile = cProfile.Profile()
+
+        stack.append(frame)
+        status = "ok"
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            stack.pop()
+
+            record = {
+                'name': name,
+                'category': category,
+                'parent': parent['name'] if parent else None,
+                'depth': len(stack),
+                'thread': threading.current_thread().name,
+                'start_offset_s': round(wall_start - self._run_start_wall, 6),
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'status': status,
+            }
+            if tracing:
+                with _memory_lock:
+                    _open_memory_frames.remove(frame)
+                    if frame['overlapped']:
+                        record['mem_overlapped'] = True
+                    elif tracemalloc.is_tracing():
+                        current, peak = tracemalloc.get_traced_memory()
+                        peak = max(peak, frame['running_peak'])
+                        record['peak_mem_bytes'] = peak
+                        record['peak_mem_delta_bytes'] = max(0, peak - frame['mem_start'])
+                        record['mem_retained_bytes'] = current - frame['mem_start']
+                        if parent is not None:
+                            parent['running_peak'] = max(parent['running_peak'], peak)
+            rss, peak_rss = get_process_memory()
+            if rss is not None:
+                record['rss_bytes'] = rss
+            if peak_rss is not None:
+                record['peak_rss_bytes'] = peak_rss
+
+            with self._lock:
+                self._records.append(record)
+                if profile is not None:
+                    self._profile_active = False
+                if profile is not None and wall > self._slowest_profile_wall:
+                    self._slowest_profile = profile
+                    self._slowest_profile_stage = name
+                    self._slowest_profile_wall = wall
+
+    def get_records(self) -> List[Dict[str, Any]]:
+        """Get a copy of all recorded stages in completion order."""
+        with self._lock:
+            return list(self._records)
+
+    def get_summary(self, **metadata) -> Dict[str, Any]:
+        """
+        Build the timings summary.
+
+        Args:
+            **metadata: Extra run fields (input file, run_id, ISO type...) to include
+
+        Returns:
+            Dictionary ready to be serialized as timings.json
+        """
+        records = self.get_records()
+        top_level = [r for r in records if r['depth'] == 0]
+        end_wall = self._run_end_wall if self._run_end_wall is not None else time.perf_counter()
+        end_cpu = self._run_end_cpu if self._run_end_cpu is not None else time.process_time()
+
+        by_category: Dict[str, Dict[str, float]] = {}
+        for record in records:
+            totals = by_category.setdefault(record['category'], {'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            totals['count'] += 1
+            totals['wall_s'] = round(totals['wall_s'] + record['wall_s'], 6)
+            totals['cpu_s'] = round(totals['cpu_s'] + record['cpu_s'], 6)
+
+        slowest = max(top_level, key=lambda r: r['wall_s'], default=None)
+        peaks = [r['peak_mem_bytes'] for r in records if 'peak_mem_bytes' in r]
+        _, peak_rss = get_process_memory()
+
+        return {
+            'metadata': metadata,
+            'started_at': self._started_at,
+            'system': {
+                'platform': platform.platform(),
+                'python': platform.python_version(),
+                'cpu_count': os.cpu_count(),
+            },
+            'memory_tracking': self.track_memory,
+            'total': {
+                'wall_s': round(end_wall - self._run_start_wall, 6) if self._run_start_wall is not None else 0.0,
+                'cpu_s': round(end_cpu - self._run_start_cpu, 6) if self._run_start_cpu is not None else 0.0,
+                'peak_mem_bytes': max(peaks) if peaks else None,
+                'peak_rss_bytes': peak_rss,
+            },
+            'slowest_stage': slowest['name'] if slowest else None,
+            'by_category': by_category,
+            'stages': records,
+        }
+
+    def write_report(self, output_dir: str, **metadata) -> Optional[str]:
+        """
+        Write timings.json (and the cProfile dump, if captured) into output_dir.
+
+        Args:
+            output_dir: Run folder the reports were written to
+            **metadata: Extra run fields to include in the summary
+
+        Returns:
+            Path to timings.json, or None if writing failed
+        """
+        self.finish()
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            summary = self.get_summary(**metadata)
+
+            if self._slowest_profile is not None:
+                dump_path = os.path.join(output_dir, CPROFILE_FILENAME)
+                pstats.Stats(self._slowest_profile).dump_stats(dump_path)
+                summary['cprofile'] = {
+                    'stage': self._slowest_profile_stage,
+                    'dump': CPROFILE_FILENAME,
+                }
+
+            timings_path = os.path.join(output_dir, TIMINGS_FILENAME)
+            with open(timings_path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+            logger.info(f"Run timings written to {timings_path}")
+            return timings_path
+        except Exception as e:
+            logger.error(f"Failed to write run timings to '{output_dir}': {e}", exc_info=True)
+            return None
+
+    def write_trace(self, output_dir: str, **metadata) -> Optional[str]:
+        """Write the run's spans to trace.json in output_dir."""
+        return self.tracer.write(output_dir, **metadata)
+
+
+def create_profiler(enabled: bool, capture_cprofile: bool = False, track_memory: bool = True):
+    """
+    Create a RunProfiler when profiling is enabled, otherwise a NullProfiler.
+
+    Args:
+        enabled: Whether profiling was requested (--profile / GUI toggle)
+        capture_cprofile: Keep a cProfile dump of the slowest top-level stage
+        track_memory: Record peak memory per stage with tracemalloc
+
+    Returns:
+        RunProfiler or NullProfiler instance
+    """
+    if not enabled:
+        return NullProfiler()
+    return RunProfiler(track_memory=track_memory, capture_cprofile=capture_cprofile)
@@ -0,0 +1,246 @@
+"""
+Reuse of unchanged PDF reports between runs of the same project.
+
+Each report generated through ProcessingManager._generate_report_item is
+fingerprinted from its input payload (its slice of extracted_data), the header
+fields printed on it and the report-rendering code. The fingerprints are saved in
+report-fingerprints.json in the run folder. When a later run of the same project
+produces the same fingerprint, the earlier PDF is hard-linked (or copied) into the
+new run folder instead of being rendered again.
+
+The run ID and timestamp in the header are not part of the fingerprint, so a
+reused PDF keeps the header of the run that rendered it.
+"""
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import shutil
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_FINGERPRINTS_FILENAME = "report-fingerprints.json"
+MANIFEST_VERSION = 1
+
+# Sources whose changes alter rendered PDFs even when the input data is the same
+_RENDERER_SOURCES = ("generators", os.path.join("utils", "hebrew_text_utils.py"))
+
+
+def _canonical(value: Any) -> Any:
+    """Convert a report payload into JSON-serialisable data with a stable ordering."""
+    if isinstance(value, dict):
+        return {"__dict__": sorted(([_canonical(k), _canonical(v)] for k, v in value.items()),
+                                   key=lambda item: json.dumps(item[0], sort_keys=True))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted((_canonical(item) for item in value),
+                                  key=lambda item: json.dumps(item, sort_keys=True))}
+    if isinstance(value, float):
+        # repr round-trips exactly; NaN/inf are not valid JSON
+        return {"__float__": repr(value)} if not math.isfinite(value) else value
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__class__": type(value).__name__, "fields": _canonical(dataclasses.asdict(value))}
+    if hasattr(value, "__dict__"):
+        return {"__class__": type(value).__name__, "fields": _canonical(vars(value))}
+    # Unknown types fall back to repr; a repr holding an object address only causes a re-render
+    return {"__repr__": repr(value)}
+
+
+@lru_cache(maxsize=1)
+def _renderer_fingerprint() -> str:
+    """Hash the application version and, when running from source, the report-rendering code."""
+    from version import get_version
+    digest = hashlib.sha256(get_version().encode("utf-8"))
+    root = Path(__file__).resolve().parent.parent
+    for source in _RENDERER_SOURCES:
+        path = root / source
+        files = sorted(path.glob("*.py")) if path.is_dir() else [path]
+        for file_path in files:
+            try:
+                digest.update(file_path.name.encode("utf-8"))
+                digest.update(file_path.read_bytes())
+            except OSError:
+                # Frozen builds ship without sources; the version covers them
+                continue
+    return digest.hexdigest()
+
+
+def fingerprint_report_inputs(report_name: str, data: Any, header: Dict[str, Any]) -> Optional[str]:
+    """
+    Compute the fingerprint of one report's inputs.
+
+    Args:
+        report_name: Report name as passed to _generate_report_item
+        data: The report's input payload
+        header: Header fields printed on the report (project, city, area, ...)
+
+    Returns:
+        Hex SHA-256 digest, or None if the payload cannot be serialised
+    """
+    try:
+        payload = json.dumps(
+            [report_name, _renderer_fingerprint(), _canonical(header), _canonical(data)],
+            sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+        )
+    except (TypeError, ValueError, RecursionError) as e:
+        logger.warning(f"Could not fingerprint inputs of report '{report_name}': {e}")
+        return None
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    """Hard-link source to destination, copying when linking is not possible."""
+    if os.path.exists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+class ReportCache:
+    """
+    Report fingerprints of one run, and lookup of matching PDFs from earlier runs.
+
+    Earlier runs are the sibling folders of run_dir whose names start with the
+    project folder prefix and that hold a report-fingerprints.json.
+    """
+
+    def __init__(self, run_dir: str, project_folder_prefix: str):
+        self.run_dir = run_dir
+        self.project_folder_prefix = project_folder_prefix
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.reused: Dict[str, str] = {}
+        self._previous: Optional[Dict[str, Dict[str, str]]] = None
+
+    def _load_previous(self) -> Dict[str, Dict[str, str]]:
+        """Index the reports of earlier runs by fingerprint, newest run first."""
+        if self._previous is not None:
+            return self._previous
+        self._previous = {}
+        parent = os.path.dirname(os.path.abspath(self.run_dir))
+        run_name = os.path.basename(os.path.abspath(self.run_dir))
+        try:
+            candidates = [entry for entry in os.scandir(parent)
+                          if entry.is_dir() and entry.name != run_name
+                          and entry.name.startswith(self.project_folder_prefix)]
+        except OSError:
+            return self._previous
+        candidates.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in candidates:
+            manifest_path = os.path.join(entry.path, REPORT_FINGERPRINTS_FILENAME)
+            if not os.path.isfile(manifest_path):
+                continue
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable report fingerprints '{manifest_path}': {e}")
+                continue
+            if manifest.get("version") != MANIFEST_VERSION:
+                continue
+            for report in manifest.get("reports", {}).values():
+                fingerprint = report.get("fingerprint")
+                if fingerprint and fingerprint not in self._previous:
+                    self._previous[fingerprint] = {
+                        "path": os.path.join(entry.path, report.get("file", "")),
+                        "sha256": report.get("sha256", ""),
+                        "run": entry.name,
+                    }
+        return self._previous
+
+    def try_reuse(self, report_name: str, fingerprint: Optional[str], output_path: str) -> bool:
+        """
+        Place an earlier run's PDF with the same fingerprint at output_path.
+
+        Returns:
+            True if the report was reused and does not need to be generated
+        """
+        if not fingerprint:
+            return False
+        previous = self._load_previous().get(fingerprint)
+        if not previous or not os.path.isfile(previous["path"]):
+            return False
+        try:
+            # The earlier PDF may have been edited or replaced since it was recorded
+            if _file_sha256(previous["path"]) != previous["sha256"]:
+                return False
+            _link_or_copy(previous["path"], output_path)
+        except OSError as e:
+            logger.warning(f"Could not reuse '{previous['path']}' for report '{report_name}': {e}")
+            return False
+        self.reused[report_name] = previous["run"]
+        self.record(report_name, fingerprint, output_path, reused_from=previous["run"], sha256=previous["sha256"])
+        logger.info(f"Report '{report_name}' unchanged since run '{previous['run']}'; reused {previous['path']}")
+        return True
+
+    def detach(self, output_path: str) -> None:
+        """Remove a hard-linked PDF at output_path so rendering over it cannot alter earlier runs."""
+        try:
+            if os.stat(output_path).st_nlink > 1:
+                os.remove(output_path)
+        except OSError:
+            pass
+
+    def record(self, report_name: str, fingerprint: Optional[str], output_path: str,
+               reused_from: Optional[str] = None, sha256: Optional[str] = None) -> None:
+        """Record a generated (or reused) report for the manifest of this run."""
+        if not fingerprint or not os.path.isfile(output_path):
+            return
+        try:
+            self.entries[report_name] = {
+                "fingerprint": fingerprint,
+                "file": os.path.relpath(output_path, self.run_dir),
+                "sha256": sha256 or _file_sha256(output_path),
+                "reused_from": reused_from,
+            }
+        except (OSError, ValueError) as e:
+            logger.debug(f"Not recording fingerprint of report '{report_name}': {e}")
+
+    def write_manifest(self) -> Optional[str]:
+        """
+        Write report-fingerprints.json into the run folder.
+
+        Entries already in the folder's manifest are kept unless this run replaced
+        them, so regenerating a subset of the reports keeps the other fingerprints.
+        """
+        if not self.entries:
+            return None
+        manifest_path = os.path.join(self.run_dir, REPORT_FINGERPRINTS_FILENAME)
+        reports = {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                reports = manifest.get("reports", {})
+        except (OSError, ValueError):
+            pass
+        reports.update(self.entries)
+        try:
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "reports": reports}, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"Failed to write report fingerprints to '{manifest_path}': {e}")
+            return None
+        return manifest_path
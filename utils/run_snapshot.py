@@ -0,0 +1,317 @@
+"""
+Parsed-run snapshots for regenerating reports without the model or the simulation.
+
+At the end of a run, ProcessingManager writes run-snapshot.bin into the run folder.
+The file holds the extracted parser data plus the area, energy rating and load
+parser outputs that the zone and energy rating reports query. The
+ProcessingManager.regenerate_reports method reads it back and passes the stand-in
+objects below to the same report generation code. These objects answer the parser
+methods the generators call with the recorded results.
+
+File layout: an 8 byte magic, a 2 byte big-endian schema version, then a
+zlib-compressed pickle of plain containers. Loading only accepts builtin container
+and date types, so a snapshot cannot execute code.
+"""
+import copy
+import datetime
+import io
+import os
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_FILENAME = "run-snapshot.bin"
+SNAPSHOT_MAGIC = b"IDFRSNAP"
+SNAPSHOT_SCHEMA_VERSION = 1
+
+# Report keys accepted by ProcessingManager.selected_reports (and --reports), mapped to the report names used in status messages
+REPORT_NAMES = {
+    "settings": "Settings",
+    "schedules": "Schedules",
+    "lighting": "Lighting",
+    "natural_ventilation": "Natural Ventilation",
+    "loads": "Loads",
+    "materials": "Materials",
+    "zones": "Area (Zones)",
+    "glazing": "Glazing",
+    "automatic_validation": "Automatic Validation",
+    "energy_rating": "Energy Rating",
+}
+
+_HEADER = struct.Struct(">8sH")
+_ALLOWED_GLOBALS = {
+    ("builtins", "set"), ("builtins", "frozenset"), ("builtins", "complex"),
+    ("collections", "OrderedDict"),
+    ("datetime", "datetime"), ("datetime", "date"), ("datetime", "time"), ("datetime", "timedelta"),
+}
+
+
+class SnapshotError(Exception):
+    """Raised when a run snapshot is missing, unreadable or has an unsupported schema."""
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if (module, name) in _ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Disallowed type in run snapshot: {module}.{name}")
+
+
+_PLAIN_TYPES = (str, int, float, bool, bytes, type(None), set, frozenset, complex,
+                datetime.datetime, datetime.date, datetime.time, datetime.timedelta)
+
+
+def _plain(value: Any) -> Any:
+    """
+    Convert parser output to plain containers.
+
+    Dict subclasses (e.g. defaultdict with a lambda factory) become dicts. Parser
+    internals kept next to the report fields, such as the raw IDF object wrappers,
+    are not read by the generators and are stored as None.
+    """
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    return None
+
+
+def _loads(payload: bytes) -> Dict[str, Any]:
+    return _RestrictedUnpickler(io.BytesIO(zlib.decompress(payload))).load()
+
+
+def build_run_snapshot(extracted_data: dict, area_parser, energy_rating_parser, load_parser,
+                       materials_parser, natural_ventilation_data: dict, energy_rating_model: Tuple[Any, Any],
+                       run_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Collect everything the report generators read into plain data.
+
+    Args:
+        extracted_data: Output of ProcessingManager._extract_data_from_parsers
+        area_parser: Processed AreaParser
+        energy_rating_parser: EnergyRatingParser after the energy rating report ran
+        load_parser: Processed LoadParser (ventilation rates for the 2023 bonus)
+        materials_parser: Processed MaterialsParser (wall mass of zone reports)
+        natural_ventilation_data: DataLoader.get_natural_ventilation_data()
+        energy_rating_model: (model_year, model_area_definition) the rating was computed for
+        run_info: project_name, run_id, input_file, city_info and consultant_data of the run
+
+    Returns:
+        Snapshot dictionary for write_run_snapshot
+    """
+    return {
+        "run": _plain(run_info),
+        "extracted_data": _plain(extracted_data),
+        "natural_ventilation": _plain(natural_ventilation_data),
+        "area": _snapshot_area_parser(area_parser, materials_parser, run_info.get("city_info", {})),
+        "energy_rating": _snapshot_energy_rating_parser(energy_rating_parser, energy_rating_model),
+        "loads_by_zone": _snapshot_ventilation_loads(load_parser),
+    }
+
+
+def _snapshot_area_parser(area_parser, materials_parser, city_info: dict) -> Dict[str, Any]:
+    if not area_parser or not getattr(area_parser, "processed", False):
+        return {"processed": False}
+    is_office_iso = "OFFICE" in city_info.get("iso_type", "").upper()
+    snapshot = {
+        "processed": True,
+        "areas_by_zone": _plain(area_parser.areas_by_zone),
+        "glazing_data_from_csv": _plain(getattr(area_parser, "glazing_data_from_csv", {})),
+        "glazing_table_data": _plain(area_parser.get_glazing_table_data(materials_parser)),
+        "area_h_values": _plain(area_parser.get_area_h_values()),
+    }
+    if is_office_iso:
+        snapshot["table_data_by_individual_zones"] = _plain(
+            area_parser.get_area_table_data_by_individual_zones(materials_parser))
+        table_data = snapshot["table_data_by_individual_zones"]
+    else:
+        snapshot["groupings_by_base_zone"] = _plain(area_parser.get_area_groupings_by_base_zone())
+        snapshot["table_data_by_base_zone"] = _plain(area_parser.get_area_table_data_by_base_zone(materials_parser))
+        table_data = snapshot["table_data_by_base_zone"]
+
+    # Zone reports show the mass of the largest external wall construction
+    construction_mass = {}
+    if materials_parser:
+        for rows in table_data.values():
+            for row in rows:
+                construction = row.get("construction")
+                if construction and construction not in construction_mass:
+                    try:
+                        construction_mass[construction] = materials_parser.calculate_construction_mass_per_area(construction)
+                    except Exception as e:
+                        logger.debug(f"No snapshot mass for construction '{construction}': {e}")
+    snapshot["construction_mass_per_area"] = construction_mass
+    return snapshot
+
+
+def _snapshot_energy_rating_parser(energy_rating_parser, energy_rating_model: Tuple[Any, Any]) -> Dict[str, Any]:
+    if not energy_rating_parser or not energy_rating_parser.processed:
+        return {"processed": False}
+    model_year, model_area_definition = energy_rating_model
+    default_table = energy_rating_parser.get_energy_rating_table_data()
+    model_table = (energy_rating_parser.get_energy_rating_table_data(model_year, model_area_definition)
+                   if model_year and model_area_definition else [])
+    zone_ids = {row.get("zone_id") for row in (*default_table, *model_table) if row.get("zone_id")}
+    return {
+        "processed": True,
+        "model": [model_year, model_area_definition],
+        "default_table": _plain(default_table),
+        "model_table": _plain(model_table),
+        "floor_and_zone": {zone_id: tuple(energy_rating_parser._extract_floor_and_zone(zone_id, model_year))
+                           for zone_id in zone_ids},
+    }
+
+
+def _snapshot_ventilation_loads(load_parser) -> Dict[str, Any]:
+    loads_by_zone = getattr(load_parser, "loads_by_zone", None) or {}
+    return {zone_id: {"loads": {"ventilation": _plain(zone.get("loads", {}).get("ventilation", {}))}}
+            for zone_id, zone in loads_by_zone.items()}
+
+
+def write_run_snapshot(run_dir: str, snapshot: Dict[str, Any]) -> Optional[str]:
+    """
+    Write run-snapshot.bin into the run folder.
+
+    Returns:
+        Path of the snapshot, or None if the data could not be stored
+    """
+    snapshot_path = os.path.join(run_dir, SNAPSHOT_FILENAME)
+    try:
+        payload = zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL), 6)
+        # Fail now rather than on regeneration if a parser returned a non-plain object
+        _loads(payload)
+        temp_path = snapshot_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_SCHEMA_VERSION))
+            f.write(payload)
+        os.replace(temp_path, snapshot_path)
+    except (pickle.PicklingError, pickle.UnpicklingError, TypeError, AttributeError, OSError) as e:
+        logger.warning(f"Could not write run snapshot to '{snapshot_path}': {e}")
+        return None
+    logger.info(f"Run snapshot written to {snapshot_path} ({os.path.getsize(snapshot_path)} bytes)")
+    return snapshot_path
+
+
+def read_run_snapshot(path: str) -> Dict[str, Any]:
+    """
+    Read a run snapshot.
+
+    Args:
+        path: Run folder or snapshot file
+
+    Raises:
+        SnapshotError: If there is no readable snapshot with a supported schema
+    """
+    snapshot_path = os.path.join(path, SNAPSHOT_FILENAME) if os.path.isdir(path) else path
+    try:
+        with open(snapshot_path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise SnapshotError(f"No run snapshot at '{snapshot_path}': {e}") from e
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"'{snapshot_path}' is not a run snapshot")
+    magic, schema_version = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"'{snapshot_path}' is not a run snapshot")
+    if schema_version != SNAPSHOT_SCHEMA_VERSION:
+        raise SnapshotError(f"Run snapshot schema {schema_version} is not supported "
+                            f"(expected {SNAPSHOT_SCHEMA_VERSION}); reprocess the model")
+    try:
+        return _loads(data[_HEADER.size:])
+    except (zlib.error, pickle.UnpicklingError, EOFError, ValueError) as e:
+        raise SnapshotError(f"Run snapshot '{snapshot_path}' is corrupt: {e}") from e
+
+
+class MaterialsSnapshot:
+    """Stands in for the MaterialsParser the zone reports build from the DataLoader."""
+
+    def __init__(self, construction_mass_per_area: Dict[str, float]):
+        self._construction_mass_per_area = construction_mass_per_area
+
+    def calculate_construction_mass_per_area(self, construction_id: str) -> float:
+        return self._construction_mass_per_area.get(construction_id, 0.0)
+
+
+class AreaParserSnapshot:
+    """Answers the AreaParser queries of the zone report generators from a snapshot."""
+
+    data_loader = None
+
+    def __init__(self, snapshot: Dict[str, Any]):
+        self._snapshot = snapshot
+        self.processed = snapshot.get("processed", False)
+        self.areas_by_zone = snapshot.get("areas_by_zone", {})
+        self.glazing_data_from_csv = snapshot.get("glazing_data_from_csv", {})
+        self.report_materials_parser = MaterialsSnapshot(snapshot.get("construction_mass_per_area", {}))
+
+    def _recorded(self, key: str):
+        if key not in self._snapshot:
+            raise SnapshotError(f"The run snapshot has no '{key}' (the run used a different ISO type)")
+        return copy.deepcopy(self._snapshot[key])
+
+    def get_area_table_data(self, materials_parser=None) -> Dict[str, List[Dict[str, Any]]]:
+        return self._recorded("table_data")
+
+    def get_area_table_data_by_individual_zones(self, materials_parser=None) -> Dict[str, List[Dict[str, Any]]]:
+        return self._recorded("table_data_by_individual_zones")
+
+    def get_area_table_data_by_base_zone(self, materials_parser=None) -> Dict[str, List[Dict[str, Any]]]:
+        return self._recorded("table_data_by_base_zone")
+
+    def get_area_groupings_by_base_zone(self) -> Dict[str, List[str]]:
+        return self._recorded("groupings_by_base_zone")
+
+    def get_glazing_table_data(self, materials_parser=None) -> Dict[str, List[Dict[str, Any]]]:
+        return self._recorded("glazing_table_data")
+
+    def get_area_h_values(self) -> List[Dict[str, Any]]:
+        return self._recorded("area_h_values")
+
+
+class EnergyRatingParserSnapshot:
+    """Answers the EnergyRatingParser queries of the energy rating reports from a snapshot."""
+
+    def __init__(self, snapshot: Dict[str, Any]):
+        self._snapshot = snapshot
+        self.processed = snapshot.get("processed", False)
+
+    def process_output(self) -> None:
+        """Nothing to process; the results were recorded with the snapshot."""
+
+    def get_energy_rating_table_data(self, model_year=None, model_area_definition=None) -> List[Dict[str, Any]]:
+        if not self.processed:
+            return []
+        if model_year is None and model_area_definition is None:
+            return copy.deepcopy(self._snapshot["default_table"])
+        if [model_year, model_area_definition] != list(self._snapshot["model"]):
+            raise SnapshotError(f"The run snapshot holds the energy rating for {tuple(self._snapshot['model'])}, "
+                                f"not {(model_year, model_area_definition)}")
+        return copy.deepcopy(self._snapshot["model_table"])
+
+    def _extract_floor_and_zone(self, zone_id: str, model_year=None) -> tuple:
+        return self._snapshot["floor_and_zone"].get(zone_id, (zone_id, zone_id))
+
+
+class LoadParserSnapshot:
+    """Carries the zone ventilation rates the energy rating report reads from the LoadParser."""
+
+    def __init__(self, loads_by_zone: Dict[str, Any]):
+        self.loads_by_zone = loads_by_zone
+
+
+class DataLoaderSnapshot:
+    """Carries the DataLoader data the natural ventilation report reads."""
+
+    def __init__(self, natural_ventilation_data: Dict[str, Any]):
+        self._natural_ventilation_data = natural_ventilation_data
+
+    def get_natural_ventilation_data(self) -> Dict[str, Any]:
+        return self._natural_ventilation_data
@@ -7,6 +7,8 @@ from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_sentry_enabled = False
+
 def initialize_sentry():
     """
     Initialize Sentry for error monitoring and performance tracking.
@@ -16,6 +18,8 @@ def initialize_sentry():
     - SENTRY_ENVIRONMENT: Environment name (e.g., 'production', 'development')
     - SENTRY_TRACES_SAMPLE_RATE: Sample rate for performance monitoring (0.0 to 1.0)
     """
+    global _sentry_enabled
+    
     # Load environment variables from .env file
     load_dotenv()
     
@@ -53,12 +57,17 @@ def initialize_sentry():
             before_send=before_send_filter,
         )
         
+        _sentry_enabled = True
         logger.info(f"Sentry initialized successfully. Environment: {environment}, Sample rate: {traces_sample_rate}")
         return True
     except Exception as e:
         logger.error(f"Failed to initialize Sentry: {e}")
         return False
 
+def is_sentry_enabled():
+    """Whether initialize_sentry() set up Sentry in this process."""
+    return _sentry_enabled
+
 def before_send_filter(event, hint):
     """
     Filter events before sending to Sentry.
@@ -135,15 +144,21 @@ def add_breadcrumb(message, category=None, level='info', data=None):
         'data': data or {}
     })
 
-def start_transaction(name, op=None):
+def start_transaction(name, op=None, tracer=None):
     """
     Start a performance transaction.
     
     Args:
         name: Transaction name
         op: Operation type
+        tracer: Optional utils.tracing.Tracer whose spans are forwarded to the
+                transaction while Sentry is enabled (call tracer.forward_to(None)
+                before finishing the transaction)
         
     Returns:
         Transaction object
     """
-    return sentry_sdk.start_transaction(name=name, op=op)
\ No newline at end of file
+    transaction = sentry_sdk.start_transaction(name=name, op=op)
+    if tracer is not None and _sentry_enabled:
+        tracer.forward_to(transaction)
+    return transaction
\ No newline at end of file
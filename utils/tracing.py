@@ -0,0 +1,188 @@
+"""
+Span tracing for processing runs.
+
+Every profiler stage (loading, each DataLoader._cache_* step, the parsers,
+EnergyPlus and each report) opens a span on the run's Tracer, also when
+profiling is off: a span costs two clock reads and a list append. The spans of
+a run are written to trace.json in the Chrome trace event format next to its
+reports; open it in chrome://tracing or https://ui.perfetto.dev to see the
+stages of every thread on one timeline, i.e. the critical path of a slow job
+and how much of it actually ran in parallel.
+
+While a Sentry transaction is bound with forward_to (only when Sentry is
+configured, see utils.sentry_config.start_transaction), every span is also sent
+to Sentry as a child span of that transaction.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TRACE_FILENAME = "trace.json"
+
+
+class Tracer:
+    """
+    Records nested spans per thread for one run and exports them as a Chrome trace.
+    """
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._started_at = datetime.now()
+        self._sentry_root = None
+
+    def _stack(self) -> List[Any]:
+        """Open spans of the calling thread (their Sentry span, or None when not forwarded)."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def forward_to(self, sentry_transaction) -> None:
+        """Also send spans to Sentry as children of sentry_transaction; None stops forwarding."""
+        self._sentry_root = sentry_transaction
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args):
+        """
+        Record a span around the block.
+
+        Args:
+            name: Span name (e.g. "parse:materials")
+            category: Span group such as "load", "cache", "parser", "report" or "simulation"
+            **args: Extra fields shown with the span in the trace viewer
+        """
+        stack = self._stack()
+        sentry_span = None
+        sentry_root = self._sentry_root
+        if sentry_root is not None:
+            parent = stack[-1] if stack and stack[-1] is not None else sentry_root
+            try:
+                sentry_span = parent.start_child(op=category, description=name)
+            except Exception as e:
+                logger.debug(f"Could not start Sentry span '{name}': {e}")
+
+        stack.append(sentry_span)
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            if sentry_span is not None:
+                try:
+                    sentry_span.set_status("ok" if status == "ok" else "internal_error")
+                    sentry_span.finish()
+                except Exception as e:
+                    logger.debug(f"Could not finish Sentry span '{name}': {e}")
+
+            thread = threading.current_thread()
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'pid': os.getpid(),
+                'tid': thread.ident,
+                'args': dict(args, status=status, depth=len(stack)),
+            }
+            with self._lock:
+                self._events.append(event)
+                self._thread_names.setdefault(thread.ident, thread.name)
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """Get a copy of the recorded spans in completion order."""
+        with self._lock:
+            return list(self._events)
+
+    def clear(self) -> None:
+        """Drop the recorded spans and restart the clock for the next run."""
+        with self._lock:
+            self._events = []
+            self._thread_names = {}
+            self._origin = time.perf_counter()
+            self._started_at = datetime.now()
+
+    def to_chrome_trace(self, **metadata) -> Dict[str, Any]:
+        """
+        Build the trace in the Chrome trace event format.
+
+        Args:
+            **metadata: Extra run fields (input file, run_id...) stored under otherData
+
+        Returns:
+            Dictionary ready to be serialized as trace.json
+        """
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event['ts'])
+            thread_names = dict(self._thread_names)
+            started_at = self._started_at
+
+        pid = os.getpid()
+        trace_events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'IDF Reader'}}]
+        for tid, thread_name in thread_names.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                                 'args': {'name': thread_name}})
+        trace_events.extend(events)
+
+        # Time each thread spent inside its outermost spans
+        busy_us: Dict[str, float] = {}
+        for event in events:
+            if event['args']['depth'] == 0:
+                thread_name = thread_names.get(event['tid'], str(event['tid']))
+                busy_us[thread_name] = busy_us.get(thread_name, 0.0) + event['dur']
+        wall_us = max((event['ts'] + event['dur'] for event in events), default=0.0)
+
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                **{key: value for key, value in metadata.items() if value is not None},
+                'started_at': started_at.isoformat(timespec='seconds'),
+                'wall_s': round(wall_us / 1e6, 6),
+                'thread_busy_s': {name: round(us / 1e6, 6) for name, us in busy_us.items()},
+            },
+        }
+
+    def write(self, output_dir: str, **metadata) -> Optional[str]:
+        """
+        Write trace.json into output_dir and clear the recorded spans.
+
+        Args:
+            output_dir: Run folder the reports were written to
+            **metadata: Extra run fields to include in the trace
+
+        Returns:
+            Path to trace.json, or None if there was nothing to write or writing failed
+        """
+        if not self.get_events():
+            return None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            trace = self.to_chrome_trace(**metadata)
+            trace_path = os.path.join(output_dir, TRACE_FILENAME)
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, ensure_ascii=False, default=str)
+            logger.info(f"Run trace written to {trace_path}")
+            return trace_path
+        except Exception as e:
+            logger.error(f"Failed to write run trace to '{output_dir}': {e}", exc_info=True)
+            return None
+        finally:
+            self.clear()
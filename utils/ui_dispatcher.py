@@ -0,0 +1,142 @@
+"""
+Coalesced, frame-rate-limited page updates for the GUI.
+
+Worker threads used to call page.update() for every status line and progress
+change, and the progress animation started a new timer thread every 50 ms.
+UIDispatcher owns a single thread instead: callers mark the page dirty or post
+small UI changes, and the thread applies everything that arrived since the
+previous frame and sends one update, at most max_fps times a second.
+
+Posted changes are queued, never dropped: a burst of status messages is applied
+in one frame rather than one update per message. A change posted with a key
+replaces the pending change of that key, so redrawing the same panel several
+times between two frames runs once. Frame callbacks (the progress
+animation) run on the same thread once per frame while they are registered.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_FPS = 12
+
+
+class UIDispatcher:
+    """
+    Single thread that flushes UI changes at a bounded frame rate.
+
+    Args:
+        flush: Sends the pending changes to the client (page.update)
+        max_fps: Upper bound on flushes per second
+    """
+
+    def __init__(self, flush: Callable[[], None], max_fps: float = DEFAULT_MAX_FPS):
+        self._flush = flush
+        self._frame_interval = 1.0 / max_fps
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._dirty = False
+        # (key, change) in posting order; keyed changes are looked up in _keyed_changes
+        self._posted: Deque[Tuple[Optional[str], Optional[Callable[[], None]]]] = deque()
+        self._keyed_changes: Dict[str, Callable[[], None]] = {}
+        # key -> callback(now) run every frame until removed
+        self._frame_callbacks: Dict[str, Callable[[float], None]] = {}
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stopped.is_set()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="ui-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the thread after a last flush of whatever is pending."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def request_update(self) -> None:
+        """Mark the page dirty; it is flushed with the next frame."""
+        with self._lock:
+            self._dirty = True
+        self._wakeup.set()
+
+    def post(self, change: Callable[[], None], key: Optional[str] = None) -> None:
+        """
+        Apply change on the dispatcher thread before the next flush.
+
+        A keyed change replaces the pending change with the same key (keeping its place).
+        """
+        with self._lock:
+            if key is None:
+                self._posted.append((None, change))
+            else:
+                if key not in self._keyed_changes:
+                    self._posted.append((key, None))
+                self._keyed_changes[key] = change
+            self._dirty = True
+        self._wakeup.set()
+
+    def set_frame_callback(self, key: str, callback: Callable[[float], None]) -> None:
+        """Run callback(time.monotonic()) before every flush until removed."""
+        with self._lock:
+            self._frame_callbacks[key] = callback
+        self._wakeup.set()
+
+    def remove_frame_callback(self, key: str) -> None:
+        with self._lock:
+            self._frame_callbacks.pop(key, None)
+
+    def _run(self) -> None:
+        last_flush = 0.0
+        while True:
+            with self._lock:
+                animating = bool(self._frame_callbacks)
+            # Sleep until there is work; while animating, wake up every frame
+            self._wakeup.wait(self._frame_interval if animating else None)
+            # Bound the frame rate: changes arriving meanwhile are coalesced into this frame
+            wait = last_flush + self._frame_interval - time.monotonic()
+            if wait > 0 and not self._stopped.is_set():
+                self._stopped.wait(wait)
+            self._wakeup.clear()
+
+            with self._lock:
+                posted = [change if key is None else self._keyed_changes.pop(key) for key, change in self._posted]
+                self._posted.clear()
+                callbacks = list(self._frame_callbacks.values())
+                dirty = self._dirty or bool(callbacks)
+                self._dirty = False
+
+            for change in posted:
+                try:
+                    change()
+                except Exception as e:
+                    logger.error(f"Error applying UI change: {e}", exc_info=True)
+            now = time.monotonic()
+            for callback in callbacks:
+                try:
+                    callback(now)
+                except Exception as e:
+                    logger.error(f"Error in UI frame callback: {e}", exc_info=True)
+            if dirty:
+                try:
+                    self._flush()
+                except Exception as e:
+                    logger.error(f"Error flushing UI update: {e}")
+            last_flush = time.monotonic()
+
+            if self._stopped.is_set():
+                with self._lock:
+                    if not self._posted and not self._dirty:
+                        break
@@ -0,0 +1,359 @@
+"""
+Resumable, verified download of update installers.
+
+The file is downloaded into '<name>.part' next to a '<name>.part.json' state file
+listing the byte ranges already written. When the server supports range requests
+the file is fetched in fixed-size segments, several at a time, and an interrupted
+download (dropped connection, application closed) continues with the missing
+segments. Range requests carry If-Range with the ETag/Last-Modified of the first
+response, so a file replaced on the server is downloaded again from the start
+instead of being stitched together from two versions.
+
+Failed requests are retried with exponential backoff up to a bounded number of
+attempts. The finished file is checked against the expected size and SHA-256
+before it is moved to its final name; a mismatching file is deleted.
+"""
+import hashlib
+import json
+import os
+import re
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STATE_VERSION = 1
+USER_AGENT = "IDF-Reader-Auto-Updater/1.0"
+DEFAULT_SEGMENT_SIZE = 4 * 1024 * 1024
+DEFAULT_PARALLEL_SEGMENTS = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_TIMEOUT = 30
+READ_BLOCK_SIZE = 64 * 1024
+# HTTP statuses worth retrying; other 4xx responses fail immediately
+RETRYABLE_HTTP_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+_SHA256_PATTERN = re.compile(r"\b([0-9a-fA-F]{64})\b")
+
+
+class DownloadError(Exception):
+    """Raised when a file cannot be downloaded within the retry policy."""
+
+
+class ChecksumMismatchError(DownloadError):
+    """Raised when a downloaded file does not match the expected size or SHA-256."""
+
+
+class _RemoteFileChanged(Exception):
+    """The server answered a range request with the full (changed) file."""
+
+
+def normalize_sha256(value: Optional[str]) -> Optional[str]:
+    """
+    Extract a SHA-256 hex digest from release metadata.
+
+    Accepts a bare digest, 'sha256:<digest>' (GitHub asset digests) or the content
+    of a checksum file ('<digest>  <file name>').
+    """
+    if not value:
+        return None
+    match = _SHA256_PATTERN.search(value)
+    return match.group(1).lower() if match else None
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UpdateDownloader:
+    """
+    Downloads one file at a time into download_dir with resume, retries and verification.
+
+    Args:
+        download_dir: Folder for the partial and finished downloads; keep it across
+                      application restarts so interrupted downloads can resume
+        progress_callback: Called with (downloaded_bytes, total_bytes or None),
+                           possibly from worker threads
+        parallel_segments: Segments downloaded at once when ranges are supported
+        segment_size: Bytes per segment; the most a crash can cost per segment in flight
+        max_retries: Retries per request after the first attempt
+        backoff_base: Delay before the first retry in seconds; doubles per attempt
+        backoff_max: Upper bound of the retry delay in seconds
+        timeout: Socket timeout per request in seconds
+    """
+
+    def __init__(self, download_dir, progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+                 parallel_segments: int = DEFAULT_PARALLEL_SEGMENTS, segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.download_dir = Path(download_dir)
+        self.progress_callback = progress_callback
+        self.parallel_segments = max(1, parallel_segments)
+        self.segment_size = max(READ_BLOCK_SIZE, segment_size)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self._total = None
+
+    # --- HTTP helpers ---
+
+    def _open(self, url: str, headers: Optional[Dict[str, str]] = None):
+        request = Request(url, headers={"User-Agent": USER_AGENT, "Accept": "application/octet-stream",
+                                        **(headers or {})})
+        if url.lower().startswith("https:"):
+            return urlopen(request, timeout=self.timeout, context=self.ssl_context)
+        return urlopen(request, timeout=self.timeout)
+
+    def _with_retries(self, description: str, operation: Callable):
+        """Run operation, retrying transient network and server errors with backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return operation()
+            except _RemoteFileChanged:
+                raise
+            except HTTPError as e:
+                if e.code not in RETRYABLE_HTTP_STATUSES or attempt == self.max_retries:
+                    raise DownloadError(f"{description}: HTTP {e.code} {e.reason}") from e
+                error = e
+            except (URLError, OSError, DownloadError) as e:
+                # OSError covers timeouts and connections reset mid-body
+                if attempt == self.max_retries:
+                    raise DownloadError(f"{description}: {e}") from e
+                error = e
+            delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+            logger.warning(f"{description} failed ({error}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def fetch_text(self, url: str, max_bytes: int = 64 * 1024) -> str:
+        """Download a small text resource, such as a checksum file."""
+        def operation():
+            with self._open(url) as response:
+                return response.read(max_bytes).decode("utf-8", errors="replace")
+        return self._with_retries(f"Download of {url}", operation)
+
+    # --- Progress and state ---
+
+    def _add_progress(self, byte_count: int) -> None:
+        with self._lock:
+            self._downloaded += byte_count
+            downloaded, total = self._downloaded, self._total
+        if self.progress_callback:
+            self.progress_callback(downloaded, total)
+
+    @staticmethod
+    def _validators(headers) -> Dict[str, Optional[str]]:
+        return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+    def _load_state(self, state_path: Path, url: str, size: int, validators: dict,
+                    expected_sha256: Optional[str], part_path: Path) -> List[List[int]]:
+        """Return the finished segments of a matching earlier attempt, or [] to start over."""
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if (state.get("version") != STATE_VERSION or state.get("url") != url or state.get("size") != size
+                or state.get("validators") != validators or state.get("sha256") != expected_sha256
+                or not part_path.is_file() or part_path.stat().st_size != size):
+            logger.info(f"Discarding partial download of {url}; the remote file or request changed")
+            return []
+        return [list(segment) for segment in state.get("done", [])]
+
+    def _save_state(self, state_path: Path, url: str, size: int, validators: dict,
+                    expected_sha256: Optional[str], done: List[List[int]]) -> None:
+        temp_path = state_path.with_name(state_path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "url": url, "size": size, "validators": validators,
+                       "sha256": expected_sha256, "done": done}, f)
+        os.replace(temp_path, state_path)
+
+    @staticmethod
+    def _discard(*paths: Path) -> None:
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    # --- Download strategies ---
+
+    def _probe(self, url: str) -> Tuple[Optional[int], bool, dict, object]:
+        """
+        Request the first byte to learn the size and whether ranges are supported.
+
+        Returns:
+            (size, supports_ranges, validators, response); the response is still open
+            when the server ignored the range and is sending the whole file.
+        """
+        response = self._open(url, {"Range": "bytes=0-0"})
+        match = _CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+        if response.status == 206 and match and match.group(3) != "*":
+            validators = self._validators(response.headers)
+            response.close()
+            return int(match.group(3)), True, validators, None
+        if response.status == 206:
+            # A partial response without a usable total; fetch the file without ranges
+            response.close()
+            return None, False, {}, None
+        length = response.headers.get("Content-Length")
+        return (int(length) if length and length.isdigit() else None), False, self._validators(response.headers), response
+
+    def _download_whole(self, url: str, part_path: Path, response) -> None:
+        """Stream the file without ranges; a failure restarts it from the beginning."""
+        def operation():
+            nonlocal response
+            current = response or self._open(url)
+            response = None
+            with self._lock:
+                self._downloaded = 0
+            try:
+                with open(part_path, "wb") as f:
+                    for block in iter(lambda: current.read(READ_BLOCK_SIZE), b""):
+                        f.write(block)
+                        self._add_progress(len(block))
+            finally:
+                current.close()
+            length = current.headers.get("Content-Length")
+            if length and length.isdigit() and part_path.stat().st_size != int(length):
+                raise DownloadError(f"connection closed after {part_path.stat().st_size} of {length} bytes")
+        self._with_retries(f"Download of {url}", operation)
+
+    def _download_segment(self, url: str, part_path: Path, start: int, end: int, validators: dict) -> None:
+        """Download bytes start..end (inclusive) into the partial file, resuming within the segment on retry."""
+        written = 0
+
+        def operation():
+            nonlocal written
+            headers = {"Range": f"bytes={start + written}-{end}"}
+            if_range = validators.get("etag") or validators.get("last_modified")
+            if if_range:
+                headers["If-Range"] = if_range
+            with self._open(url, headers) as response:
+                if response.status != 206:
+                    raise _RemoteFileChanged()
+                with open(part_path, "r+b") as f:
+                    f.seek(start + written)
+                    for block in iter(lambda: response.read(min(READ_BLOCK_SIZE, end + 1 - start - written)), b""):
+                        f.write(block)
+                        written += len(block)
+                        self._add_progress(len(block))
+            if start + written <= end:
+                raise DownloadError(f"connection closed at byte {start + written} of segment {start}-{end}")
+        self._with_retries(f"Download of bytes {start}-{end} of {url}", operation)
+
+    def _download_segments(self, url: str, part_path: Path, state_path: Path, size: int,
+                           validators: dict, expected_sha256: Optional[str]) -> None:
+        done = self._load_state(state_path, url, size, validators, expected_sha256, part_path)
+        if not done:
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+        finished = {segment[0] for segment in done}
+        pending = [(start, min(start + self.segment_size, size) - 1)
+                   for start in range(0, size, self.segment_size) if start not in finished]
+        with self._lock:
+            self._downloaded = sum(end + 1 - start for start, end in done)
+        if done:
+            logger.info(f"Resuming download of {url}: {self._downloaded} of {size} bytes already present")
+        self._save_state(state_path, url, size, validators, expected_sha256, done)
+
+        def run(segment):
+            start, end = segment
+            self._download_segment(url, part_path, start, end, validators)
+            with self._lock:
+                done.append([start, end])
+                self._save_state(state_path, url, size, validators, expected_sha256, done)
+
+        with ThreadPoolExecutor(max_workers=self.parallel_segments, thread_name_prefix="update-download") as executor:
+            futures = [executor.submit(run, segment) for segment in pending]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # Drop the queued segments; finished ones stay recorded for the next attempt
+                for future in futures:
+                    future.cancel()
+                raise
+
+    # --- Public API ---
+
+    def download(self, url: str, filename: str, expected_sha256: Optional[str] = None,
+                 expected_size: Optional[int] = None) -> Path:
+        """
+        Download url to download_dir/filename and verify it.
+
+        Args:
+            url: File URL (redirects are followed)
+            filename: Name of the finished file inside download_dir
+            expected_sha256: Expected SHA-256 hex digest; any format normalize_sha256 accepts
+            expected_size: Expected size in bytes
+
+        Returns:
+            Path of the verified file
+
+        Raises:
+            ChecksumMismatchError: The file does not match expected_sha256/expected_size
+            DownloadError: The download failed within the retry policy
+        """
+        expected_sha256 = normalize_sha256(expected_sha256)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        destination = self.download_dir / filename
+        part_path = destination.with_name(destination.name + ".part")
+        state_path = destination.with_name(destination.name + ".part.json")
+
+        if destination.is_file() and expected_sha256 and file_sha256(destination) == expected_sha256:
+            logger.info(f"Update already downloaded and verified: {destination}")
+            return destination
+
+        for restart in range(2):
+            with self._lock:
+                self._downloaded, self._total = 0, None
+            size, supports_ranges, validators, response = self._with_retries(f"Download of {url}", lambda: self._probe(url))
+            if expected_size is not None and size is not None and size != expected_size:
+                if response is not None:
+                    response.close()
+                raise ChecksumMismatchError(f"Server reports {size} bytes, release lists {expected_size}")
+            with self._lock:
+                self._total = size
+            try:
+                if supports_ranges and size > 0:
+                    self._download_segments(url, part_path, state_path, size, validators, expected_sha256)
+                else:
+                    self._discard(state_path)
+                    self._download_whole(url, part_path, response)
+                break
+            except _RemoteFileChanged:
+                # The file was replaced on the server between requests: start over once
+                logger.warning(f"{url} changed during the download; restarting it")
+                self._discard(part_path, state_path)
+        else:
+            raise DownloadError(f"{url} kept changing during the download")
+
+        actual_size = part_path.stat().st_size
+        if expected_size is not None and actual_size != expected_size:
+            self._discard(part_path, state_path)
+            raise ChecksumMismatchError(f"Downloaded {actual_size} bytes, expected {expected_size}")
+        if expected_sha256:
+            actual_sha256 = file_sha256(part_path)
+            if actual_sha256 != expected_sha256:
+                self._discard(part_path, state_path)
+                raise ChecksumMismatchError(f"SHA-256 {actual_sha256} does not match the release ({expected_sha256})")
+        else:
+            logger.warning(f"No SHA-256 published for {url}; the download was not verified")
+        os.replace(part_path, destination)
+        self._discard(state_path)
+        return destination
@@ -11,13 +11,15 @@ import tempfile
 import zipfile
 import subprocess
 import threading
+import platform
 from pathlib import Path
-from urllib.request import urlopen, urlretrieve
+from urllib.request import urlopen
 from urllib.error import URLError, HTTPError
 import ssl
 import time
 
 from utils.logging_config import get_logger
+from utils.update_downloader import UpdateDownloader, ChecksumMismatchError, DownloadError, normalize_sha256
 from version import get_version, compare_versions, UPDATE_SERVER_URL, GITHUB_RELEASES_URL
 
 logger = get_logger(__name__)
@@ -40,6 +42,17 @@ class UpdateManager:
         # Update settings
         self.settings_file = Path(self.app_directory) / "update_settings.json"
         self.settings = self._load_update_settings()
+        
+        # Partial downloads are kept here so an interrupted download resumes after a restart
+        self.download_dir = self._get_download_dir()
+    
+    def _get_download_dir(self):
+        """Get the update download directory (inside the application data directory)."""
+        if platform.system() == "Windows":
+            app_data = os.getenv("APPDATA", os.path.expanduser("~"))
+            return Path(app_data) / "IDF Reader" / "updates"
+        else:
+            return Path.home() / ".idf-reader" / "updates"
     
     def _default_status(self, message):
         """Default status callback that just logs."""
@@ -52,7 +65,8 @@ class UpdateManager:
             "check_interval_hours": 24,
             "last_check": 0,
             "update_channel": "stable",  # stable, beta, alpha
-            "download_timeout": 300  # 5 minutes
+            "download_timeout": 300,  # 5 minutes
+            "require_checksum": False  # Refuse updates whose release publishes no SHA-256
         }
         
         try:
@@ -183,19 +197,33 @@ class UpdateManager:
                     version = data["tag_name"].lstrip('v')  # Remove 'v' prefix if present
                     
                     # Find appropriate asset (Windows executable)
-                    download_url = None
-                    for asset in data.get("assets", []):
+                    assets = data.get("assets", [])
+                    selected_asset = None
+                    for asset in assets:
                         if asset["name"].endswith((".exe", ".zip")) and "windows" in asset["name"].lower():
-                            download_url = asset["browser_download_url"]
+                            selected_asset = asset
                             break
                     
-                    if not download_url and data.get("assets"):
+                    if not selected_asset and assets:
                         # Fallback to first asset
-                        download_url = data["assets"][0]["browser_download_url"]
+                        selected_asset = assets[0]
+                    
+                    # Integrity metadata: the asset digest, or a '<asset>.sha256' / SHA256SUMS asset
+                    checksum_url = None
+                    if selected_asset:
+                        checksum_names = {f"{selected_asset['name']}.sha256".lower(), "sha256sums", "sha256sums.txt", "checksums.txt"}
+                        for asset in assets:
+                            if asset["name"].lower() in checksum_names:
+                                checksum_url = asset["browser_download_url"]
+                                break
                     
                     return {
                         "version": version,
-                        "download_url": download_url,
+                        "download_url": selected_asset["browser_download_url"] if selected_asset else None,
+                        "asset_name": selected_asset["name"] if selected_asset else None,
+                        "sha256": normalize_sha256(selected_asset.get("digest")) if selected_asset else None,
+                        "size": selected_asset.get("size") if selected_asset else None,
+                        "checksum_url": checksum_url,
                         "release_notes": data.get("body", ""),
                         "published_at": data.get("published_at"),
                         "source": "github"
@@ -228,6 +256,9 @@ class UpdateManager:
                     return {
                         "version": result["version"],
                         "download_url": result["download_url"],
+                        "sha256": normalize_sha256(result.get("sha256")),
+                        "size": result.get("size"),
+                        "checksum_url": result.get("checksum_url"),
                         "release_notes": result.get("release_notes", ""),
                         "source": "custom"
                     }
@@ -259,21 +290,22 @@ class UpdateManager:
                 self.status_callback("לא נמצא קישור הורדה לעדכון")
                 return False
             
+            expected_sha256 = self._get_expected_sha256(update_info)
+            if not expected_sha256 and self.settings.get("require_checksum"):
+                self.status_callback("העדכון לא פורסם עם חתימת SHA-256 - ההתקנה בוטלה")
+                return False
+            
             self.status_callback(f"מוריד עדכון לגרסה {new_version}...")
             
-            # Create temporary directory for download
+            # Determine file extension from URL
+            suffix = '.zip' if download_url.endswith('.zip') else '.exe'
+            download_file = self._download_file(download_url, f"update-{new_version}{suffix}",
+                                                expected_sha256, update_info.get("size"))
+            
+            # Create temporary directory for extraction
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
                 
-                # Determine file extension from URL
-                if download_url.endswith('.zip'):
-                    download_file = temp_path / "update.zip"
-                else:
-                    download_file = temp_path / "update.exe"
-                
-                # Download the update
-                self._download_file(download_url, download_file)
-                
                 if download_file.suffix == '.zip':
                     # Extract zip file
                     extract_dir = temp_path / "extracted"
@@ -293,7 +325,16 @@ class UpdateManager:
                     update_executable = download_file
                 
                 # Install the update
-                return self._install_update(update_executable, restart_callback)
+                installed = self._install_update(update_executable, restart_callback)
+            
+            if installed:
+                download_file.unlink(missing_ok=True)
+            return installed
+        
+        except ChecksumMismatchError as e:
+            logger.error(f"Update download failed verification: {e}")
+            self.status_callback(f"קובץ העדכון שהורד פגום ונמחק: {e}")
+            return False
         
         except Exception as e:
             logger.error(f"Error downloading/installing update: {e}")
@@ -303,27 +344,60 @@ class UpdateManager:
         finally:
             self.update_in_progress = False
     
-    def _download_file(self, url, destination):
-        """Download a file with progress tracking."""
+    def _get_expected_sha256(self, update_info):
+        """Get the SHA-256 published for the update, from the release metadata or its checksum file."""
+        if update_info.get("sha256"):
+            return update_info["sha256"]
+        checksum_url = update_info.get("checksum_url")
+        if not checksum_url:
+            return None
         try:
-            last_reported_percent = -1  # Track last reported percentage
-            
-            def progress_hook(block_num, block_size, total_size):
-                nonlocal last_reported_percent
-                if total_size > 0:
-                    percent = min(100, (block_num * block_size * 100) // total_size)
-                    
-                    # Only report progress every 10% to avoid spamming the UI
-                    # Report 100% only once when reached for the first time
-                    if percent >= last_reported_percent + 10 or (percent == 100 and last_reported_percent < 100):
-                        last_reported_percent = percent
-                        self.status_callback(f"מוריד... {percent}%")
-            
-            urlretrieve(url, destination, reporthook=progress_hook)
-            self.status_callback("ההורדה הושלמה")
-            
+            checksum_text = UpdateDownloader(self.download_dir).fetch_text(checksum_url)
+        except DownloadError as e:
+            logger.warning(f"Could not download the update checksum: {e}")
+            return None
+        # Checksum lists hold one '<sha256>  <file name>' line per asset
+        asset_name = update_info.get("asset_name")
+        for line in checksum_text.splitlines():
+            if asset_name and asset_name in line:
+                return normalize_sha256(line)
+        return normalize_sha256(checksum_text)
+    
+    def _download_file(self, url, filename, expected_sha256=None, expected_size=None):
+        """
+        Download a file into the update download directory with progress tracking.
+        
+        Interrupted downloads resume, servers that support ranges are read in parallel
+        segments, and the file is verified against expected_sha256/expected_size.
+        
+        Returns:
+            Path: The downloaded file
+        """
+        progress_lock = threading.Lock()
+        last_reported_percent = -1  # Track last reported percentage
+        
+        def progress_hook(downloaded, total_size):
+            nonlocal last_reported_percent
+            if total_size:
+                percent = min(100, (downloaded * 100) // total_size)
+                
+                # Only report progress every 10% to avoid spamming the UI
+                # Report 100% only once when reached for the first time
+                with progress_lock:
+                    if not (percent >= last_reported_percent + 10 or (percent == 100 and last_reported_percent < 100)):
+                        return
+                    last_reported_percent = percent
+                self.status_callback(f"מוריד... {percent}%")
+        
+        downloader = UpdateDownloader(self.download_dir, progress_callback=progress_hook)
+        try:
+            destination = downloader.download(url, filename, expected_sha256=expected_sha256, expected_size=expected_size)
+        except ChecksumMismatchError:
+            raise
         except Exception as e:
             raise Exception(f"כשל בהורדת הקובץ: {e}")
+        self.status_callback("ההורדה הושלמה ואומתה" if expected_sha256 else "ההורדה הושלמה")
+        return destination
     
     def _install_update(self, update_executable, restart_callback=None):
         """Install the downloaded update using a safe method."""
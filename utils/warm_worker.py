@@ -0,0 +1,285 @@
+"""
+Warm worker: a long-lived local process that runs CLI jobs.
+
+Every regular CLI run pays for Python startup, the pandas/ReportLab imports,
+font registration and DataLoader.load_file. The worker (--worker-serve) does
+the imports and font registration once and keeps recently loaded models in a
+DataLoaderCache, so a job on a model it already loaded goes straight to
+parsing. Thin clients (--worker) connect over localhost TCP, send one JSON
+request line and receive the job's status and progress messages as JSON lines,
+ending with a result message.
+
+The worker only listens on 127.0.0.1, on a free port that is written together
+with a random token to worker.json in the application data directory; requests
+without the token are refused. Jobs run one at a time, while status requests
+are answered during a job. A client that disconnects cancels its job.
+
+This module only imports the processing code inside the worker, so clients stay
+light.
+"""
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from utils.job_queue import get_default_queue_path
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STATE_FILENAME = "worker.json"
+DEFAULT_CACHE_SIZE = 4
+CONNECT_TIMEOUT_SECONDS = 2.0
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class WorkerUnavailable(Exception):
+    """No warm worker is running, or it does not answer."""
+
+
+def get_state_path() -> str:
+    """Return worker.json in the application data directory (next to the job queue)."""
+    return os.path.join(os.path.dirname(get_default_queue_path()), STATE_FILENAME)
+
+
+def _read_state(state_path: str) -> Dict[str, Any]:
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        raise WorkerUnavailable("No warm worker is running (start one with --worker-serve)")
+
+
+def worker_request(command: str, job: Optional[Dict[str, Any]] = None,
+                   on_message: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   state_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Send a request to the running warm worker and wait for its result.
+
+    Args:
+        command: "process", "status" or "shutdown"
+        job: For "process": input_file, output_dir (absolute paths) and the run options
+        on_message: Called with every status/progress message before the result
+        state_path: worker.json to read the port and token from (default get_state_path())
+
+    Returns:
+        The result message ('success' plus command-specific fields)
+
+    Raises:
+        WorkerUnavailable: No worker is running or the connection failed
+    """
+    state = _read_state(state_path or get_state_path())
+    try:
+        connection = socket.create_connection(('127.0.0.1', state['port']), timeout=CONNECT_TIMEOUT_SECONDS)
+    except (OSError, KeyError) as e:
+        raise WorkerUnavailable(f"The warm worker does not answer ({e})")
+
+    with connection:
+        # Jobs take as long as they take once connected
+        connection.settimeout(None)
+        request = {'token': state.get('token', ''), 'command': command, 'job': job}
+        try:
+            connection.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+            with connection.makefile('r', encoding='utf-8') as lines:
+                for line in lines:
+                    message = json.loads(line)
+                    if message.get('type') == 'result':
+                        return message
+                    if on_message:
+                        on_message(message)
+        except (OSError, ValueError) as e:
+            raise WorkerUnavailable(f"Lost the connection to the warm worker ({e})")
+    raise WorkerUnavailable("The warm worker closed the connection before sending a result")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one JSON request line and streams the JSON replies."""
+
+    def handle(self):
+        worker = self.server.worker
+        try:
+            request = json.loads(self.rfile.readline(MAX_REQUEST_BYTES))
+        except ValueError:
+            self._send({'type': 'result', 'success': False, 'error': "Malformed request"})
+            return
+        if not isinstance(request, dict) or not hmac.compare_digest(str(request.get('token', '')), worker.token):
+            self._send({'type': 'result', 'success': False, 'error': "Invalid worker token"})
+            return
+        worker.handle_request(request, self._send)
+
+    def _send(self, message: Dict[str, Any]) -> bool:
+        """Send one reply line; False once the client is gone."""
+        try:
+            self.wfile.write(json.dumps(message, ensure_ascii=False, default=str).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            return True
+        except OSError:
+            return False
+
+
+class _WorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+
+class WarmWorker:
+    """
+    Local job server keeping the processing modules and recent models loaded.
+
+    Args:
+        cache_size: Number of loaded models kept in memory
+        port: Port on 127.0.0.1 (0 picks a free one)
+        state_path: Where the port and token are written (default get_state_path())
+        status_callback: Optional callback for the worker's own status messages
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, port: int = 0, state_path: Optional[str] = None,
+                 status_callback: Optional[Callable[[str], None]] = None):
+        self.cache_size = cache_size
+        self.port = port
+        self.state_path = state_path or get_state_path()
+        self.status_callback = status_callback
+        self.token = secrets.token_hex(16)
+        self.loader_cache = None
+        self.started_at = time.time()
+        self.jobs_run = 0
+        self.current_job = None
+        self._job_lock = threading.Lock()
+        self._server = None
+
+    def update_status(self, message: str) -> None:
+        logger.info(message)
+        if self.status_callback:
+            self.status_callback(message)
+
+    def warm_up(self) -> float:
+        """
+        Import the processing code and register the report fonts.
+
+        Returns:
+            Seconds spent
+        """
+        start = time.perf_counter()
+        import processing_manager  # noqa: F401 - pandas, ReportLab, parsers and report generators
+        from utils.data_loader import DataLoaderCache
+        from utils.hebrew_text_utils import get_hebrew_font_name
+
+        get_hebrew_font_name()
+        if self.loader_cache is None:
+            self.loader_cache = DataLoaderCache(self.cache_size)
+        return time.perf_counter() - start
+
+    def serve_forever(self) -> None:
+        """
+        Warm up and serve requests until shutdown() or KeyboardInterrupt.
+
+        Raises:
+            RuntimeError: Another warm worker already answers on the state file's port
+        """
+        try:
+            status = worker_request('status', state_path=self.state_path)
+            raise RuntimeError(f"A warm worker is already running (pid {status.get('pid')})")
+        except WorkerUnavailable:
+            pass
+
+        warm_up_s = self.warm_up()
+        self._server = _WorkerServer(('127.0.0.1', self.port), _RequestHandler)
+        self._server.worker = self
+        port = self._server.server_address[1]
+        self._write_state(port)
+        self.update_status(f"Warm worker listening on 127.0.0.1:{port} (warm-up {warm_up_s:.2f}s, "
+                           f"up to {self.cache_size} models cached)")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._remove_state()
+            self.update_status("Warm worker stopped")
+
+    def shutdown(self) -> None:
+        """Stop serving; safe to call from a request thread."""
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _write_state(self, port: int) -> None:
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        # Readable by the current user only: the token authorizes job submission
+        descriptor = os.open(self.state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump({'port': port, 'token': self.token, 'pid': os.getpid(), 'started_at': self.started_at}, f)
+
+    def _remove_state(self) -> None:
+        try:
+            if _read_state(self.state_path).get('token') == self.token:
+                os.remove(self.state_path)
+        except (WorkerUnavailable, OSError):
+            pass
+
+    def get_status(self) -> Dict[str, Any]:
+        """Worker pid, uptime, jobs run, the running job and the model cache."""
+        return {
+            'pid': os.getpid(),
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'jobs_run': self.jobs_run,
+            'current_job': self.current_job,
+            'cache': self.loader_cache.get_stats() if self.loader_cache is not None else None,
+        }
+
+    def handle_request(self, request: Dict[str, Any], send: Callable[[Dict[str, Any]], bool]) -> None:
+        """Run one client request, replying through send."""
+        command = request.get('command')
+        if command == 'status':
+            send({'type': 'result', 'success': True, **self.get_status()})
+        elif command == 'shutdown':
+            send({'type': 'result', 'success': True})
+            self.shutdown()
+        elif command == 'process':
+            self._run_job(request.get('job') or {}, send)
+        else:
+            send({'type': 'result', 'success': False, 'error': f"Unknown command '{command}'"})
+
+    def _run_job(self, job: Dict[str, Any], send: Callable[[Dict[str, Any]], bool]) -> None:
+        from processing_manager import ProcessingManager
+        from utils.profiler import create_profiler
+
+        if not self._job_lock.acquire(blocking=False):
+            send({'type': 'status', 'message': f"Waiting for the running job ({self.current_job}) to finish"})
+            self._job_lock.acquire()
+        processor = None
+
+        def forward(message: Dict[str, Any]) -> None:
+            # A client that is gone (Ctrl+C) cancels its job
+            if not send(message) and processor is not None and not processor.is_cancelled:
+                logger.info(f"Client of {job.get('input_file')} disconnected; cancelling the job")
+                processor.cancel()
+
+        try:
+            start = time.perf_counter()
+            hits_before = self.loader_cache.hits
+            self.current_job = job.get('input_file')
+            processor = ProcessingManager(
+                status_callback=lambda message: forward({'type': 'status', 'message': message}),
+                progress_callback=lambda value: forward({'type': 'progress', 'value': value}),
+                profiler=create_profiler(enabled=bool(job.get('profile') or job.get('capture_cprofile')),
+                                         capture_cprofile=bool(job.get('capture_cprofile'))),
+                loader_cache=self.loader_cache
+            )
+            processor.reuse_unchanged_reports = not job.get('rebuild_reports', False)
+            processor.export_excel = bool(job.get('export_excel', False))
+            success = processor.process_idf(
+                input_file=job['input_file'],
+                idd_path=job.get('idd'),
+                output_dir=job['output_dir']
+            )
+            send({'type': 'result', 'success': success, 'elapsed_s': round(time.perf_counter() - start, 3),
+                  'model_cached': self.loader_cache.hits > hits_before})
+        except Exception as e:
+            logger.error(f"Error running worker job {job.get('input_file')}: {e}", exc_info=True)
+            send({'type': 'result', 'success': False, 'error': str(e)})
+        finally:
+            self.jobs_run += 1
+            self.current_job = None
+            self._job_lock.release()